@@ -0,0 +1,10 @@
+"""
+######################效能測試模組######################
+
+此模組包含可重複執行的效能測試：
+- scenarios: 各遊戲模式的固定情境（固定幀數、固定亂數種子）
+- run_scenarios: 執行情境並輸出更新/繪製時間分布與記憶體峰值的 JSON
+- micro: 熱點函式的微基準測試，與 baselines/micro.json 比較找出效能退化
+
+所有情境都透過 headless.py 的無視窗模擬器執行，不需要螢幕或音效卡。
+"""
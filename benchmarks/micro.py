@@ -0,0 +1,569 @@
+######################載入套件######################
+import os
+import io
+import gc
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+import contextlib
+from collections import OrderedDict
+
+# 必須在載入 pygame 之前指定 SDL 驅動，才能在沒有螢幕和音效卡的機器上執行
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 讓 python benchmarks/micro.py 也能找到專案根目錄的模組
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pygame
+import config
+from config import *
+
+######################測試登錄表######################
+# 測試名稱 → (說明, 建立函式)；建立函式回傳一個不帶參數、每次呼叫執行一批工作的函式
+MICRO_BENCHMARKS = OrderedDict()
+
+def micro_benchmark(name, description):
+    """
+    登錄微基準測試的裝飾器\n
+    \n
+    參數:\n
+    name (str): 測試名稱（也是基準 JSON 中的鍵）\n
+    description (str): 測試說明\n
+    """
+    def register(factory):
+        MICRO_BENCHMARKS[name] = (description, factory)
+        return factory
+    return register
+
+def _quiet():
+    """
+    暫時隱藏遊戲物件在終端機輸出的訊息\n
+    """
+    return contextlib.redirect_stdout(io.StringIO())
+
+def _screen():
+    """
+    取得繪製用的畫面（dummy 驅動下的視窗表面）\n
+    """
+    pygame.init()
+    screen = pygame.display.get_surface()
+    if screen is None:
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return screen
+
+def _hide_seek_world(rng, player_count=50, seeker_ratio=0.3):
+    """
+    建立躲貓貓地圖和一群分散在地圖上的 AI 玩家\n
+    \n
+    參數:\n
+    rng (random.Random): 測試資料用的亂數產生器\n
+    player_count (int): 玩家數量\n
+    seeker_ratio (float): 搜尋者比例\n
+    \n
+    回傳:\n
+    tuple: (HideSeekMap, 玩家串列)\n
+    """
+    from entities.hide_seek_map import HideSeekMap
+    from entities.hide_seek_player import HideSeekPlayer
+
+    with _quiet():
+        game_map = HideSeekMap(seed=rng.randrange(1, 10000))
+        players = [HideSeekPlayer(i, is_human=(i == 0), name=f"P{i}") for i in range(player_count)]
+
+    seekers = max(1, int(player_count * seeker_ratio))
+    for index, player in enumerate(players):
+        player.role = "seeker" if index < seekers else "hider"
+        player.x, player.y = game_map.get_random_safe_position()
+        player.x += rng.randint(-40, 40)
+        player.y += rng.randint(-40, 40)
+    return game_map, players
+
+######################熱點函式測試######################
+@micro_benchmark("check_collision_bulk", "check_collision：200 顆子彈 × 25 個敵人（5000 次檢查）")
+def bench_check_collision(rng):
+    """
+    建立測試資料，回傳每次呼叫執行一批工作的函式
+    """
+    from systems.collision import check_collision
+
+    bullets = [(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), 4, 10) for _ in range(200)]
+    enemies = [(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), 40, 40) for _ in range(25)]
+
+    def run():
+        for bx, by, bw, bh in bullets:
+            for ex, ey, ew, eh in enemies:
+                check_collision(bx, by, bw, bh, ex, ey, ew, eh)
+    return run
+
+@micro_benchmark("hide_seek_apply_movement", "HideSeekPlayer._apply_movement：50 名玩家對地圖障礙物移動一步")
+def bench_apply_movement(rng):
+    """
+    建立測試資料，回傳每次呼叫執行一批工作的函式
+    """
+    game_map, players = _hide_seek_world(rng)
+    obstacles = game_map.obstacles
+    steps = [(rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1))) for _ in players]
+
+    def run():
+        for player, (dx, dy) in zip(players, steps):
+            player._apply_movement(dx, dy, obstacles)
+            # 來回移動，讓玩家位置長期維持不變
+            player._apply_movement(-dx, -dy, obstacles)
+    return run
+
+@micro_benchmark("hide_seek_ai_direction", "HideSeekPlayer._update_ai_direction：50 名玩家（15 名搜尋者）")
+def bench_ai_direction(rng):
+    """
+    建立測試資料，回傳每次呼叫執行一批工作的函式
+    """
+    _, players = _hide_seek_world(rng)
+
+    def run():
+        with _quiet():
+            for player in players:
+                player._update_ai_direction(players)
+    return run
+
+@micro_benchmark("hide_seek_minimap_update", "HideSeekMiniMap.update：50 名玩家")
+def bench_minimap_update(rng):
+    """
+    建立測試資料，回傳每次呼叫執行一批工作的函式
+    """
+    from systems.hide_seek import HideSeekMiniMap
+
+    game_map, players = _hide_seek_world(rng)
+    minimap = HideSeekMiniMap(game_map)
+
+    def run():
+        minimap.update(players, [])
+    return run
+
+@micro_benchmark("hide_seek_draw_background", "HideSeekMap.draw_background：相機位於地圖中央")
+def bench_draw_background(rng):
+    """
+    建立測試資料，回傳每次呼叫執行一批工作的函式
+    """
+    game_map, _ = _hide_seek_world(rng, player_count=1)
+    screen = _screen()
+    camera_x = (game_map.width - SCREEN_WIDTH) // 2
+    camera_y = (game_map.height - SCREEN_HEIGHT) // 2
+
+    def run():
+        game_map.draw_background(screen, camera_x, camera_y)
+    return run
+
+@micro_benchmark("hide_seek_draw_obstacles", "HideSeekMap.draw_obstacles：相機位於地圖中央")
+def bench_draw_obstacles(rng):
+    """
+    建立測試資料，回傳每次呼叫執行一批工作的函式
+    """
+    game_map, _ = _hide_seek_world(rng, player_count=1)
+    screen = _screen()
+    camera_x = (game_map.width - SCREEN_WIDTH) // 2
+    camera_y = (game_map.height - SCREEN_HEIGHT) // 2
+
+    def run():
+        game_map.draw_obstacles(screen, camera_x, camera_y)
+    return run
+
+@micro_benchmark("bullet_draw", "Bullet.draw：500 顆各類型子彈（含 Boss 子彈）")
+def bench_bullet_draw(rng):
+    """
+    建立測試資料，回傳每次呼叫執行一批工作的函式
+    """
+    from entities.bullet import Bullet
+
+    screen = _screen()
+    bullet_types = list(WEAPON_STATS) + [f"boss_{name}" for name in BOSS_BULLET_STATS]
+    bullets = [Bullet(rng.randint(0, SCREEN_WIDTH - 10), rng.randint(0, SCREEN_HEIGHT - 10),
+                      bullet_types[i % len(bullet_types)]) for i in range(500)]
+
+    def run():
+        for bullet in bullets:
+            bullet.draw(screen)
+    return run
+
+@micro_benchmark("snowflake_draw", "Snowflake.draw：200 片雪花")
+def bench_snowflake_draw(rng):
+    """
+    建立測試資料，回傳每次呼叫執行一批工作的函式
+    """
+    from systems.visual_effects import Snowflake
+
+    screen = _screen()
+    seed_rng(rng.randrange(1 << 30))
+    snowflakes = [Snowflake(rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT)) for _ in range(200)]
+
+    def run():
+        for snowflake in snowflakes:
+            snowflake.draw(screen)
+    return run
+
+@micro_benchmark("create_font_cached", "create_font：快取命中（遊戲中常用的 6 種字體大小）")
+def bench_create_font_cached(rng):
+    """
+    建立測試資料，回傳每次呼叫執行一批工作的函式
+    """
+    pygame.font.init()
+    sizes = (16, 20, 24, 36, 48, 72)
+    for size in sizes:
+        create_font(size)
+
+    def run():
+        for size in sizes:
+            create_font(size)
+    return run
+
+@micro_benchmark("create_font_cold", "create_font：清空快取後載入字體檔")
+def bench_create_font_cold(rng):
+    """
+    建立測試資料，回傳每次呼叫執行一批工作的函式
+    """
+    pygame.font.init()
+    # 先探測一次字體路徑，只量測載入字體的成本
+    create_font(24)
+
+    def run():
+        config._font_cache.clear()
+        create_font(24)
+    return run
+
+######################快照測試######################
+def _scenario_game(name):
+    """
+    以情境效能測試的種子執行情境的前幾幀（不繪製），回傳進行中的遊戲\n
+    \n
+    參數:\n
+    name (str): benchmarks/scenarios.py 中的情境名稱\n
+    \n
+    回傳:\n
+    GameController: 遊戲控制器\n
+    """
+    from benchmarks.scenarios import build_scenarios
+    from benchmarks.run_scenarios import run_frames
+
+    scenario = build_scenarios()[name]
+    try:
+        runner, input_source, scenario_rng = scenario.start(BENCHMARK_SETTINGS["seed"], render=False)
+        run_frames(scenario, runner, input_source, scenario_rng, MICRO_BENCHMARK_SETTINGS["snapshot_warmup_frames"])
+    finally:
+        scenario.finish()
+    return runner.game
+
+def _snapshot_factory(name):
+    """
+    建立量測 GameController.snapshot() 的測試\n
+    """
+    def factory(rng):
+        return _scenario_game(name).snapshot
+    return factory
+
+def _restore_factory(name):
+    """
+    建立量測 GameController.restore() 的測試（反覆還原同一份快照）\n
+    """
+    def factory(rng):
+        game = _scenario_game(name)
+        data = game.snapshot()
+
+        def run():
+            game.restore(data)
+        return run
+    return factory
+
+def _register_snapshot_benchmarks():
+    """
+    為設定中的每個情境登錄快照與還原測試\n
+    """
+    frames = MICRO_BENCHMARK_SETTINGS["snapshot_warmup_frames"]
+    for name in MICRO_BENCHMARK_SETTINGS["snapshot_scenarios"]:
+        micro_benchmark(f"snapshot_{name}", f"GameController.snapshot：{name} 情境執行 {frames} 幀後")(
+            _snapshot_factory(name))
+        micro_benchmark(f"restore_{name}", f"GameController.restore：{name} 情境執行 {frames} 幀後")(
+            _restore_factory(name))
+
+_register_snapshot_benchmarks()
+
+######################量測######################
+def _reference_workload():
+    """
+    校正用的固定工作量（純 Python 迴圈），和每個測試交錯量測\n
+    """
+    total = 0
+    for i in range(20000):
+        total += i * i
+    return total
+
+def _calls_for(func, min_time):
+    """
+    暖身並決定每一輪的呼叫次數（讓一輪至少執行 min_time 秒）\n
+    """
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls
+        if elapsed < min_time / 10:
+            calls *= 10
+        else:
+            calls = int(calls * min_time * 1.1 / elapsed) + 1
+
+def _time_round(func, calls):
+    """
+    執行一輪並回傳每次呼叫的秒數\n
+    """
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+def measure(func, repeat, min_time):
+    """
+    量測函式每次呼叫的耗時\n
+    \n
+    先自動決定每一輪的呼叫次數（讓一輪至少執行 min_time 秒），\n
+    再量測 repeat 輪，回傳最快一輪與中位數。最快值受背景干擾最小。\n
+    量測期間暫停 GC（和 timeit 相同），避免前面測試留下的垃圾在某一輪觸發回收。\n
+    \n
+    每一輪之前先跑一輪固定的校正迴圈，relative 是「最快一輪 / 校正迴圈最快一輪」。\n
+    共用機器整段時間忽快忽慢時，兩者會一起變慢，比較效能退化時以 relative 為準。\n
+    \n
+    參數:\n
+    func (callable): 要量測的函式\n
+    repeat (int): 量測輪數\n
+    min_time (float): 每一輪至少執行的秒數\n
+    \n
+    回傳:\n
+    dict: 包含 best_us、median_us（每次呼叫的微秒數）、calls（每輪呼叫次數）、\n
+          reference_us（校正迴圈最快一輪）和 relative\n
+    """
+    calls = _calls_for(func, min_time)
+    reference_calls = _calls_for(_reference_workload, min_time)
+
+    samples = []
+    reference_samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            reference_samples.append(_time_round(_reference_workload, reference_calls))
+            samples.append(_time_round(func, calls))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        "best_us": round(min(samples) * 1e6, 3),
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "calls": calls,
+        "reference_us": round(min(reference_samples) * 1e6, 3),
+        "relative": round(min(samples) / min(reference_samples), 5)
+    }
+
+def run_benchmarks(names, repeat, min_time, seed):
+    """
+    執行指定的微基準測試\n
+    \n
+    參數:\n
+    names (list): 測試名稱串列\n
+    repeat (int): 量測輪數\n
+    min_time (float): 每一輪至少執行的秒數\n
+    seed (int): 建立測試資料用的亂數種子\n
+    \n
+    回傳:\n
+    dict: 包含 metadata 和 benchmarks 的結果\n
+    """
+    import platform
+    from benchmarks.run_scenarios import _git_revision
+
+    metadata = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "min_time": min_time,
+        "seed": seed
+    }
+    report = {"metadata": metadata, "benchmarks": OrderedDict()}
+
+    for name in names:
+        description, factory = MICRO_BENCHMARKS[name]
+        # 遊戲物件會使用 config 的亂數串流，每個測試前重設，讓測試資料固定
+        seed_rng(seed)
+        func = factory(random.Random(seed))
+        result = measure(func, repeat, min_time)
+        result["description"] = description
+        report["benchmarks"][name] = result
+        print(f"{name:<28} 最快 {result['best_us']:>11.2f} µs  中位數 {result['median_us']:>11.2f} µs  "
+              f"相對 {result['relative']:>9.4f}  （每輪 {result['calls']} 次）")
+
+    return report
+
+def compare_reports(baseline, current, threshold_percent):
+    """
+    比較目前結果與基準，找出變慢超過門檻的函式\n
+    \n
+    兩邊都有 relative 時以它計算變化（抵銷整台機器的速度變化），否則比較 best_us。\n
+    \n
+    參數:\n
+    baseline (dict): 基準結果\n
+    current (dict): 目前結果\n
+    threshold_percent (float): 允許變慢的百分比\n
+    \n
+    回傳:\n
+    list: 每個測試的比較結果 (名稱, 基準 µs, 目前 µs, 變化百分比, 是否退化)\n
+    """
+    rows = []
+    for name, result in current["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            rows.append((name, None, result["best_us"], None, False))
+            continue
+        key = "relative" if "relative" in base and "relative" in result else "best_us"
+        change = (result[key] - base[key]) / base[key] * 100.0 if base[key] else 0.0
+        rows.append((name, base["best_us"], result["best_us"], change, change > threshold_percent))
+    return rows
+
+######################命令列介面######################
+def _load_json(path):
+    """
+    讀取 JSON 檔\n
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _write_json(path, data):
+    """
+    寫入 JSON 檔（自動建立資料夾）\n
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+def main(argv=None):
+    """
+    微基準測試主程式\n
+    \n
+    子命令:\n
+    run: 執行測試，可用 --save-baseline 更新版本庫中的基準\n
+    compare: 執行測試（或讀取 --current 結果檔）並與基準比較，有退化時回傳 1\n
+    \n
+    參數:\n
+    argv (list): 命令列參數，None 表示使用 sys.argv\n
+    \n
+    回傳:\n
+    int: 結束代碼\n
+    """
+    settings = MICRO_BENCHMARK_SETTINGS
+    default_baseline = os.path.join(PROJECT_ROOT, settings["baseline_file"])
+
+    parser = argparse.ArgumentParser(description="Galaxy Blaster 熱點函式微基準測試")
+    subparsers = parser.add_subparsers(dest="command")
+
+    def add_common(sub):
+        sub.add_argument("names", nargs="*", help="只執行指定的測試（預設全部）")
+        sub.add_argument("--repeat", type=int, default=settings["repeat"], help="量測輪數")
+        sub.add_argument("--min-time", type=float, default=settings["min_time"], help="每一輪至少執行的秒數")
+        sub.add_argument("--seed", type=int, default=settings["seed"], help="亂數種子")
+        sub.add_argument("--baseline", default=default_baseline, help="基準 JSON 路徑")
+
+    run_parser = subparsers.add_parser("run", help="執行測試")
+    add_common(run_parser)
+    run_parser.add_argument("--output", default=None, help="結果 JSON 路徑")
+    run_parser.add_argument("--save-baseline", action="store_true", help="把結果寫入基準 JSON")
+
+    compare_parser = subparsers.add_parser("compare", help="與基準比較")
+    add_common(compare_parser)
+    compare_parser.add_argument("--current", default=None, help="使用已存在的結果 JSON，不重新量測")
+    compare_parser.add_argument("--threshold", type=float, default=settings["threshold_percent"],
+                                help="變慢超過這個百分比就視為退化")
+    compare_parser.add_argument("--retries", type=int, default=settings["retries"],
+                                help="超過門檻的測試最多重新量測幾次（取最快的結果）")
+
+    subparsers.add_parser("list", help="列出所有測試")
+    args = parser.parse_args(argv)
+
+    if args.command in (None, "list"):
+        for name, (description, _) in MICRO_BENCHMARKS.items():
+            print(f"{name:<28}{description}")
+        return 0
+
+    unknown = [name for name in args.names if name not in MICRO_BENCHMARKS]
+    if unknown:
+        parser.error(f"未知的測試: {', '.join(unknown)}")
+    names = args.names or list(MICRO_BENCHMARKS)
+
+    if args.command == "run":
+        report = run_benchmarks(names, args.repeat, args.min_time, args.seed)
+        if args.output:
+            _write_json(args.output, report)
+            print(f"結果已寫入 {args.output}")
+        if args.save_baseline:
+            # 只更新這次有執行的測試，保留其他測試的基準
+            if os.path.exists(args.baseline):
+                baseline = _load_json(args.baseline)
+                baseline["benchmarks"].update(report["benchmarks"])
+                baseline["metadata"] = report["metadata"]
+            else:
+                baseline = report
+            _write_json(args.baseline, baseline)
+            print(f"基準已更新 {args.baseline}")
+        pygame.quit()
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"找不到基準檔 {args.baseline}，請先執行 run --save-baseline")
+        return 2
+    baseline = _load_json(args.baseline)
+
+    if args.current:
+        current = _load_json(args.current)
+        current["benchmarks"] = {name: result for name, result in current["benchmarks"].items() if name in names}
+    else:
+        current = run_benchmarks(names, args.repeat, args.min_time, args.seed)
+        # 共用機器上偶爾整段時間都變慢：超過門檻的測試重新量測，保留最快的結果
+        # （真正的退化每次都會一樣慢，背景干擾則不會一直持續）
+        for attempt in range(args.retries):
+            slow = [name for name, _, _, _, regressed in compare_reports(baseline, current, args.threshold) if regressed]
+            if not slow:
+                break
+            print(f"\n重新量測 {len(slow)} 個超過門檻的測試（第 {attempt + 1}/{args.retries} 次）")
+            retry = run_benchmarks(slow, args.repeat, args.min_time, args.seed)
+            for name, result in retry["benchmarks"].items():
+                if result["relative"] < current["benchmarks"][name]["relative"]:
+                    current["benchmarks"][name] = result
+        pygame.quit()
+
+    print()
+    print(f"{'測試':<28}{'基準 µs':>12}{'目前 µs':>12}{'變化':>10}  （變化以相對校正迴圈的時間計算）")
+    regressions = []
+    for name, base_us, current_us, change, regressed in compare_reports(baseline, current, args.threshold):
+        if base_us is None:
+            print(f"{name:<28}{'-':>12}{current_us:>12.2f}{'（新測試）':>10}")
+            continue
+        mark = "  ← 退化" if regressed else ""
+        print(f"{name:<28}{base_us:>12.2f}{current_us:>12.2f}{change:>+9.1f}%{mark}")
+        if regressed:
+            regressions.append(name)
+
+    if regressions:
+        print(f"\n{len(regressions)} 個函式比基準慢超過 {args.threshold:.0f}%: {', '.join(regressions)}")
+        return 1
+    print(f"\n沒有函式比基準慢超過 {args.threshold:.0f}%")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
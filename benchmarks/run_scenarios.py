@@ -0,0 +1,241 @@
+######################載入套件######################
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+import tracemalloc
+
+# 讓 python benchmarks/run_scenarios.py 也能找到專案根目錄的模組
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.scenarios import build_scenarios
+from config import *
+
+######################統計工具######################
+def summarize(samples):
+    """
+    把每幀耗時（秒）整理成毫秒統計值\n
+    \n
+    參數:\n
+    samples (list): 每幀耗時\n
+    \n
+    回傳:\n
+    dict: 包含 mean、p50、p95、p99、max（毫秒）\n
+    """
+    if not samples:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+    values = [sample * 1000.0 for sample in samples]
+    if len(values) >= 2:
+        cut_points = statistics.quantiles(values, n=100, method="inclusive")
+        p50, p95, p99 = cut_points[49], cut_points[94], cut_points[98]
+    else:
+        p50 = p95 = p99 = values[0]
+
+    return {
+        "mean": round(statistics.fmean(values), 4),
+        "p50": round(p50, 4),
+        "p95": round(p95, 4),
+        "p99": round(p99, 4),
+        "max": round(max(values), 4)
+    }
+
+def count_entities(runner):
+    """
+    取得情境結束時各物件串列的數量\n
+    \n
+    參數:\n
+    runner (HeadlessRunner): 無視窗模擬器\n
+    \n
+    回傳:\n
+    dict: 串列名稱 → 數量\n
+    """
+    return {name: len(objects) for name, objects in runner.game.get_entity_lists().items()}
+
+######################情境執行######################
+def run_frames(scenario, runner, input_source, rng, frames):
+    """
+    執行情境的量測幀\n
+    \n
+    參數:\n
+    scenario (Scenario): 情境\n
+    runner (HeadlessRunner): 無視窗模擬器\n
+    input_source (object): 輸入來源\n
+    rng (random.Random): 情境亂數產生器\n
+    frames (int): 幀數\n
+    \n
+    回傳:\n
+    tuple: (更新耗時串列, 繪製耗時串列)\n
+    """
+    update_times = []
+    render_times = []
+    with runner._output():
+        for tick in range(frames):
+            if scenario.before_frame:
+                scenario.before_frame(runner, tick, rng)
+            update_time, render_time = runner.step(input_source.keys_for(tick))
+            update_times.append(update_time)
+            render_times.append(render_time)
+            if not runner.is_running():
+                break
+    return update_times, render_times
+
+def run_scenario(scenario, frames, seed, render=True, measure_memory=True):
+    """
+    執行單一情境並整理結果\n
+    \n
+    時間量測與記憶體量測分成兩次執行（相同種子），\n
+    避免 tracemalloc 的額外負擔影響時間數據。\n
+    \n
+    參數:\n
+    scenario (Scenario): 情境\n
+    frames (int): 量測幀數\n
+    seed (int): 亂數種子\n
+    render (bool): 是否繪製畫面\n
+    measure_memory (bool): 是否另外執行一次量測記憶體峰值\n
+    \n
+    回傳:\n
+    dict: 情境結果\n
+    """
+    try:
+        runner, input_source, rng = scenario.start(seed, render)
+        update_times, render_times = run_frames(scenario, runner, input_source, rng, frames)
+        entity_counts = count_entities(runner)
+        final_state = runner.game.game_state
+    finally:
+        scenario.finish()
+
+    frame_times = [update + render_time for update, render_time in zip(update_times, render_times)]
+    result = {
+        "description": scenario.description,
+        "mode": scenario.mode,
+        "frames": len(update_times),
+        "finished_early": len(update_times) < frames,
+        "final_state": final_state,
+        "update_ms": summarize(update_times),
+        "render_ms": summarize(render_times),
+        "frame_ms": summarize(frame_times),
+        "entity_counts": entity_counts,
+        "peak_memory_kb": None
+    }
+
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            runner, input_source, rng = scenario.start(seed, render)
+            tracemalloc.reset_peak()
+            run_frames(scenario, runner, input_source, rng, frames)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            scenario.finish()
+        result["peak_memory_kb"] = round(peak / 1024.0, 1)
+
+    return result
+
+######################結果輸出######################
+def _git_revision():
+    """
+    取得目前的 git commit（不是 git 倉庫時回傳 None）\n
+    """
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+def build_metadata(frames, seed, render):
+    """
+    建立結果檔的環境資訊\n
+    \n
+    參數:\n
+    frames (int): 量測幀數\n
+    seed (int): 亂數種子\n
+    render (bool): 是否繪製畫面\n
+    \n
+    回傳:\n
+    dict: 環境資訊\n
+    """
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": numpy_version,
+        "platform": platform.platform(),
+        "frames": frames,
+        "seed": seed,
+        "render": render
+    }
+
+def default_output_path():
+    """
+    產生預設的結果檔路徑（依時間命名）\n
+    """
+    results_dir = os.path.join(PROJECT_ROOT, BENCHMARK_SETTINGS["results_dir"])
+    return os.path.join(results_dir, time.strftime("scenarios-%Y%m%d-%H%M%S.json"))
+
+######################命令列介面######################
+def main(argv=None):
+    """
+    執行效能測試情境並輸出 JSON 結果\n
+    \n
+    參數:\n
+    argv (list): 命令列參數，None 表示使用 sys.argv\n
+    """
+    scenarios = build_scenarios()
+
+    parser = argparse.ArgumentParser(description="Galaxy Blaster 情境效能測試")
+    parser.add_argument("names", nargs="*", help="只執行指定的情境（預設全部）")
+    parser.add_argument("--frames", type=int, default=BENCHMARK_SETTINGS["frames"], help="每個情境量測的幀數")
+    parser.add_argument("--seed", type=int, default=BENCHMARK_SETTINGS["seed"], help="亂數種子")
+    parser.add_argument("--output", default=None, help="結果 JSON 路徑")
+    parser.add_argument("--no-render", action="store_true", help="只量測更新，不繪製畫面")
+    parser.add_argument("--no-memory", action="store_true", help="不另外量測記憶體峰值")
+    parser.add_argument("--list", action="store_true", help="列出所有情境後結束")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, scenario in scenarios.items():
+            print(f"{name:<22}{scenario.description}")
+        return
+
+    unknown = [name for name in args.names if name not in scenarios]
+    if unknown:
+        parser.error(f"未知的情境: {', '.join(unknown)}")
+    selected = args.names or list(scenarios)
+
+    render = not args.no_render
+    report = {"metadata": build_metadata(args.frames, args.seed, render), "scenarios": {}}
+
+    for name in selected:
+        result = run_scenario(scenarios[name], args.frames, args.seed, render, not args.no_memory)
+        report["scenarios"][name] = result
+        memory_text = f"{result['peak_memory_kb']:.0f} KB" if result["peak_memory_kb"] is not None else "-"
+        print(f"{name:<22} 更新 p50 {result['update_ms']['p50']:.3f} ms / p99 {result['update_ms']['p99']:.3f} ms  "
+              f"繪製 p50 {result['render_ms']['p50']:.3f} ms  記憶體峰值 {memory_text}"
+              + ("  （提前結束）" if result["finished_early"] else ""))
+
+    output_path = args.output or default_output_path()
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"結果已寫入 {output_path}")
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+######################載入套件######################
+import random
+from collections import OrderedDict
+
+# headless 必須最先載入（它會在 pygame 初始化前指定 SDL dummy 驅動）
+from headless import HeadlessRunner, KeyState, ScriptedInput, RandomInput
+import main as game_main
+from config import *
+from entities.bullet import bullet_pool
+
+######################設定覆寫######################
+class ConfigOverride:
+    """
+    暫時覆寫設定值，情境結束後還原\n
+    \n
+    目標可以是設定字典（例如 HIDE_SEEK_SETTINGS），\n
+    也可以是模組（例如 main 模組裡用 from config import * 匯入的常數）。\n
+    """
+
+    def __init__(self, target, **values):
+        """
+        初始化設定覆寫\n
+        \n
+        參數:\n
+        target (dict 或 module): 要覆寫的目標\n
+        **values: 欄位名稱 → 覆寫後的值\n
+        """
+        self.target = target
+        self.values = values
+        self.saved = {}
+
+    def apply(self):
+        """
+        套用覆寫並記住原本的值\n
+        """
+        for key, value in self.values.items():
+            if isinstance(self.target, dict):
+                self.saved[key] = self.target[key]
+                self.target[key] = value
+            else:
+                self.saved[key] = getattr(self.target, key)
+                setattr(self.target, key, value)
+
+    def restore(self):
+        """
+        還原成原本的值\n
+        """
+        for key, value in self.saved.items():
+            if isinstance(self.target, dict):
+                self.target[key] = value
+            else:
+                setattr(self.target, key, value)
+        self.saved.clear()
+
+######################情境類別######################
+class Scenario:
+    """
+    效能測試情境 - 一個固定、可重複執行的遊戲場景\n
+    \n
+    情境由四個部分組成:\n
+    1. overrides: 建立遊戲前套用的設定覆寫\n
+    2. setup(runner, rng): 進入模式後的前置步驟（不計時）\n
+    3. before_frame(runner, tick, rng): 每幀更新前維持場景條件（不計時）\n
+    4. input_factory(runner, rng): 建立按鍵輸入來源\n
+    \n
+    rng 是情境專用的亂數產生器，不會影響遊戲本身的亂數序列。\n
+    """
+
+    def __init__(self, name, mode, description, input_factory, overrides=None, setup=None, before_frame=None):
+        """
+        初始化情境\n
+        \n
+        參數:\n
+        name (str): 情境名稱\n
+        mode (str): 遊戲模式（classic、ship、hide、boss）\n
+        description (str): 情境說明\n
+        input_factory (callable): 建立輸入來源的函式\n
+        overrides (list): ConfigOverride 串列\n
+        setup (callable): 前置步驟\n
+        before_frame (callable): 每幀前的維持步驟\n
+        """
+        self.name = name
+        self.mode = mode
+        self.description = description
+        self.input_factory = input_factory
+        self.overrides = overrides or []
+        self.setup = setup
+        self.before_frame = before_frame
+
+    def start(self, seed, render=True):
+        """
+        套用設定覆寫、建立模擬器並完成前置步驟\n
+        \n
+        參數:\n
+        seed (int): 亂數種子\n
+        render (bool): 是否繪製畫面\n
+        \n
+        回傳:\n
+        tuple: (HeadlessRunner, 輸入來源, 情境亂數產生器)\n
+        """
+        for override in self.overrides:
+            override.apply()
+
+        rng = random.Random(seed)
+        runner = HeadlessRunner(self.mode, render=render, seed=seed)
+        with runner._output():
+            if self.setup:
+                self.setup(runner, rng)
+        return runner, self.input_factory(runner, rng), rng
+
+    def finish(self):
+        """
+        還原設定覆寫\n
+        """
+        for override in reversed(self.overrides):
+            override.restore()
+
+######################共用工具######################
+def _restore_health(*entities):
+    """
+    把物件的生命值補滿（讓情境不會因為角色死亡而提前結束）\n
+    \n
+    參數:\n
+    *entities: 具有 health 和 max_health 的物件，None 會被略過\n
+    """
+    for entity in entities:
+        if entity is not None:
+            entity.health = entity.max_health
+
+def _looping_input(segments, length):
+    """
+    建立循環播放的腳本輸入工廠\n
+    \n
+    參數:\n
+    segments (list): [開始, 結束, [按鍵名稱...]] 串列\n
+    length (int): 循環長度\n
+    \n
+    回傳:\n
+    callable: input_factory\n
+    """
+    def factory(runner, rng):
+        return ScriptedInput(segments + [[length - 1, length, []]], loop=True)
+    return factory
+
+######################經典模式情境######################
+def _classic_swarm_before_frame(runner, tick, rng):
+    """
+    維持場上子彈數量，並讓玩家不會死亡、Boss 不會出現\n
+    """
+    game = runner.game
+    _restore_health(game.player)
+    game_main.enemies_killed = 0
+
+    missing = BENCHMARK_SETTINGS["classic_bullet_count"] - len(game.bullets)
+    for _ in range(missing):
+        x = rng.randint(0, SCREEN_WIDTH - 4)
+        y = rng.randint(SCREEN_HEIGHT // 2, SCREEN_HEIGHT - 10)
+        game.bullets.add_bullet(bullet_pool.acquire(x, y, "basic"))
+
+def _classic_boss_setup(runner, rng):
+    """
+    直接觸發經典模式的 Boss 戰\n
+    """
+    runner.game.trigger_boss_fight()
+
+def _classic_boss_before_frame(runner, tick, rng):
+    """
+    讓玩家和 Boss 都不會死亡，維持 Boss 戰\n
+    """
+    _restore_health(runner.game.player, runner.game.boss)
+
+######################Boss Fight 模式情境######################
+def _make_boss_fight_setup(boss_index):
+    """
+    建立「直接挑戰第 N 個 Boss」的前置步驟\n
+    \n
+    參數:\n
+    boss_index (int): Boss 編號（1 起算）\n
+    \n
+    回傳:\n
+    callable: setup\n
+    """
+    def setup(runner, rng):
+        system = runner.game.boss_fight_system
+        system.current_boss_index = boss_index
+        system._spawn_next_boss()
+        system.boss_spawn_timer = 1  # 跳過準備階段
+    return setup
+
+def _boss_fight_before_frame(runner, tick, rng):
+    """
+    讓玩家、兩艘盟友和 Boss 都不會死亡\n
+    """
+    system = runner.game.boss_fight_system
+    _restore_health(system.player, system.current_boss, *system.ally_ships)
+
+######################Ship Battle 情境######################
+class RobotPilotInput:
+    """
+    機器人駕駛 - 用簡單的 AI 產生玩家按鍵，形成機器人對機器人的對戰\n
+    \n
+    追著對手的 x 座標移動並持續射擊，定期上下閃避、發動特殊攻擊，\n
+    血量偏低時使用血瓶。\n
+    """
+
+    def __init__(self, runner, rng):
+        """
+        初始化機器人駕駛\n
+        \n
+        參數:\n
+        runner (HeadlessRunner): 無視窗模擬器\n
+        rng (random.Random): 情境亂數產生器\n
+        """
+        self.system = runner.game.ship_battle_system
+        self.rng = rng
+        self.dodge_key = pygame.K_UP
+
+    def keys_for(self, tick):
+        """
+        依雙方位置產生這一幀的按鍵\n
+        \n
+        參數:\n
+        tick (int): 更新次數\n
+        \n
+        回傳:\n
+        KeyState: 按鍵狀態\n
+        """
+        keys = KeyState({pygame.K_LSHIFT: True})
+        player, robot = self.system.player, self.system.robot
+        if player is None or robot is None:
+            return keys
+
+        # 對準對手
+        offset = (robot.x + robot.width / 2) - (player.x + player.width / 2)
+        if offset < -10:
+            keys[pygame.K_LEFT] = True
+        elif offset > 10:
+            keys[pygame.K_RIGHT] = True
+
+        # 每隔一段時間隨機改變閃避方向
+        if tick % 45 == 0:
+            self.dodge_key = self.rng.choice((pygame.K_UP, pygame.K_DOWN))
+        keys[self.dodge_key] = True
+
+        if tick % 180 == 0:
+            keys[pygame.K_SPACE] = True
+        if player.health < player.max_health * 0.4:
+            keys[pygame.K_i] = True
+        return keys
+
+def _ship_battle_setup(runner, rng):
+    """
+    跳過準備倒數，直接開始對戰\n
+    """
+    runner.game.ship_battle_system.prepare_timer = 1
+
+def _ship_battle_before_frame(runner, tick, rng):
+    """
+    任一方血量過低時補滿，讓對戰持續進行（仍保留使用血瓶的機會）\n
+    """
+    system = runner.game.ship_battle_system
+    for ship in (system.player, system.robot):
+        if ship is not None and ship.health <= ship.max_health * 0.25:
+            ship.health = ship.max_health
+
+######################躲貓貓情境######################
+def _hide_seek_setup(runner, rng):
+    """
+    快轉大廳、傳送和角色顯示階段，直接進入遊戲階段（不計時）\n
+    """
+    system = runner.game.hide_seek_system
+    idle_keys = KeyState()
+    while system.game_state != GAME_STATE_HIDE_SEEK_PLAYING and runner.is_running():
+        system.phase_timer = min(system.phase_timer, 1)
+        runner.step(idle_keys)
+
+def _hide_seek_input(runner, rng):
+    """
+    真人玩家使用隨機按鍵移動\n
+    """
+    return RandomInput(HEADLESS_SETTINGS["mode_keys"]["hide"], seed=rng.randrange(1 << 30))
+
+def _hide_seek_overrides(player_count):
+    """
+    建立調整躲貓貓人數的設定覆寫\n
+    \n
+    參數:\n
+    player_count (int): 玩家總數\n
+    \n
+    回傳:\n
+    list: ConfigOverride 串列\n
+    """
+    seekers = max(1, int(player_count * BENCHMARK_SETTINGS["hide_seek_seeker_ratio"]))
+    return [ConfigOverride(HIDE_SEEK_SETTINGS, total_players=player_count,
+                           seekers_count=seekers, hiders_count=player_count - seekers)]
+
+######################情境清單######################
+def build_scenarios():
+    """
+    建立所有效能測試情境\n
+    \n
+    回傳:\n
+    OrderedDict: 情境名稱 → Scenario\n
+    """
+    scenarios = OrderedDict()
+
+    def add(scenario):
+        scenarios[scenario.name] = scenario
+
+    multiplier = BENCHMARK_SETTINGS["classic_spawn_multiplier"]
+    add(Scenario(
+        "classic_swarm", "classic",
+        f"經典模式，敵人生成速度 {multiplier} 倍，場上維持 {BENCHMARK_SETTINGS['classic_bullet_count']} 顆子彈",
+        _looping_input([[0, 60, ["K_LEFT", "K_LCTRL"]], [60, 120, ["K_RIGHT", "K_LCTRL"]]], 120),
+        overrides=[ConfigOverride(game_main, ENEMY_SPAWN_DELAY=max(1, ENEMY_SPAWN_DELAY // multiplier))],
+        before_frame=_classic_swarm_before_frame))
+
+    add(Scenario(
+        "classic_boss", "classic",
+        "經典模式 Boss 戰（entities/boss.py）",
+        _looping_input([[0, 90, ["K_LEFT", "K_LCTRL"]], [90, 180, ["K_RIGHT", "K_LCTRL"]]], 180),
+        setup=_classic_boss_setup,
+        before_frame=_classic_boss_before_frame))
+
+    for boss_index in sorted(BOSS_FIGHT_BOSSES):
+        add(Scenario(
+            f"boss_fight_{boss_index}", "boss",
+            f"Boss Fight 模式第 {boss_index} 個 Boss（{BOSS_FIGHT_BOSSES[boss_index]['name']}），兩艘盟友",
+            _looping_input([[0, 60, ["K_a", "K_SPACE"]], [60, 120, ["K_d", "K_SPACE"]], [100, 102, ["K_x"]]], 120),
+            setup=_make_boss_fight_setup(boss_index),
+            before_frame=_boss_fight_before_frame))
+
+    add(Scenario(
+        "ship_robot_vs_robot", "ship",
+        "Ship Battle 模式，玩家由機器人駕駛對戰機器人",
+        RobotPilotInput,
+        setup=_ship_battle_setup,
+        before_frame=_ship_battle_before_frame))
+
+    for player_count in BENCHMARK_SETTINGS["hide_seek_player_counts"]:
+        add(Scenario(
+            f"hide_seek_{player_count}", "hide",
+            f"躲貓貓模式，{player_count} 名玩家",
+            _hide_seek_input,
+            overrides=_hide_seek_overrides(player_count),
+            setup=_hide_seek_setup))
+
+    return scenarios
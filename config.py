@@ -1,6 +1,8 @@
 ######################載入套件######################
 import pygame
 import os
+import random
+from collections import OrderedDict
 
 ######################字體系統設定######################
 # 繁體中文字體檔案路徑（依序嘗試）
@@ -8,41 +10,327 @@ CHINESE_FONT_FILES = [
     "/System/Library/Fonts/STHeiti Medium.ttc",        # macOS 黑體（推薦）
     "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",  # Arial Unicode 
     "/Library/Fonts/Arial Unicode.ttf",                # 備用 Arial Unicode
-    "/System/Library/Fonts/STHeiti Light.ttc"          # 備用黑體
+    "/System/Library/Fonts/STHeiti Light.ttc",         # 備用黑體
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",      # Debian/Ubuntu Noto CJK
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",           # Arch/Fedora Noto CJK
+    "/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc",    # Fedora Noto CJK
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",              # 文泉驛微米黑
+    "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",                # 文泉驛正黑
+    "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",   # Droid 備援字體
+    "C:/Windows/Fonts/msjh.ttc",                       # Windows 微軟正黑體
+    "C:/Windows/Fonts/mingliu.ttc",                    # Windows 細明體
+    "C:/Windows/Fonts/msyh.ttc"                        # Windows 微軟雅黑
 ]
 
+# 找不到上列字體時，要掃描的字體目錄（不存在的目錄會自動略過）
+FONT_SEARCH_DIRS = [
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.local/share/fonts"),
+    os.path.expanduser("~/.fonts"),
+    "/System/Library/Fonts",
+    "/Library/Fonts",
+    os.path.expanduser("~/Library/Fonts"),
+    os.path.join(os.environ.get("WINDIR", "C:/Windows"), "Fonts")
+]
+
+# 字體探測快取設定
+FONT_DISCOVERY_SETTINGS = {
+    "cache_file": ".font_cache.json",     # 探測結果快取檔（相對於專案根目錄）
+    "use_fontconfig": True,               # 有 fc-match 時優先詢問 fontconfig
+    "fontconfig_timeout": 2.0,            # fc-match 最長等待秒數
+    # 掃描目錄時，檔名包含以下關鍵字（小寫）的字體視為可能支援中文
+    "name_keywords": [
+        "notosanscjk", "notoserifcjk", "notosanstc", "sourcehansans", "sourcehanserif",
+        "wqy", "droidsansfallback", "ukai", "uming", "arphic",
+        "msjh", "mingliu", "msyh", "simhei", "simsun",
+        "pingfang", "stheiti", "heiti", "arial unicode"
+    ],
+    "font_extensions": (".ttf", ".ttc", ".otf", ".otc")
+}
+
+def _test_font_file(font_path):
+    """
+    測試字體檔案是否能正常載入並渲染中文
+    
+    參數:
+    font_path (str): 字體檔案路徑
+    
+    回傳:
+    bool: True 表示字體可用
+    """
+    try:
+        # 測試字體檔案是否可以正常載入
+        test_font = pygame.font.Font(font_path, 24)
+        # 測試是否能渲染中文字元
+        test_surface = test_font.render("測試中文", True, (255, 255, 255))
+        return test_surface.get_width() > 0
+    except:
+        return False
+
+def _query_fontconfig():
+    """
+    透過 fontconfig 的 fc-match 詢問系統的繁體中文字體（僅限有安裝 fontconfig 的系統）
+    
+    回傳:
+    str 或 None: fontconfig 建議的字體檔案路徑
+    """
+    import shutil
+    import subprocess
+    
+    if not FONT_DISCOVERY_SETTINGS["use_fontconfig"] or shutil.which("fc-match") is None:
+        return None
+    
+    try:
+        result = subprocess.run(
+            ["fc-match", "-f", "%{file}", ":lang=zh-tw"],
+            capture_output=True, text=True,
+            timeout=FONT_DISCOVERY_SETTINGS["fontconfig_timeout"]
+        )
+        font_path = result.stdout.strip()
+        if result.returncode == 0 and font_path:
+            return font_path
+    except Exception as e:
+        print(f"警告：fc-match 執行失敗: {e}")
+    return None
+
+def _scan_font_dirs():
+    """
+    掃描字體目錄，找出檔名看起來支援中文的字體檔案
+    
+    回傳:
+    list: 可能支援中文的字體檔案路徑（依關鍵字順序排列）
+    """
+    keywords = FONT_DISCOVERY_SETTINGS["name_keywords"]
+    extensions = FONT_DISCOVERY_SETTINGS["font_extensions"]
+    found = []
+    
+    for font_dir in FONT_SEARCH_DIRS:
+        if not os.path.isdir(font_dir):
+            continue
+        for dir_path, _, file_names in os.walk(font_dir):
+            for file_name in file_names:
+                lower_name = file_name.lower()
+                if not lower_name.endswith(extensions):
+                    continue
+                for rank, keyword in enumerate(keywords):
+                    if keyword in lower_name:
+                        found.append((rank, os.path.join(dir_path, file_name)))
+                        break
+    
+    found.sort()
+    return [font_path for _, font_path in found]
+
+def _font_dirs_fingerprint():
+    """
+    計算字體目錄的指紋（所有子目錄的修改時間），安裝或移除字體時指紋會改變
+    
+    回傳:
+    str: 字體目錄指紋
+    """
+    import hashlib
+    
+    digest = hashlib.sha1()
+    for font_dir in FONT_SEARCH_DIRS:
+        if not os.path.isdir(font_dir):
+            continue
+        for dir_path, dir_names, _ in os.walk(font_dir):
+            dir_names.sort()
+            try:
+                digest.update(f"{dir_path}:{os.stat(dir_path).st_mtime_ns};".encode("utf-8"))
+            except OSError:
+                continue
+    return digest.hexdigest()
+
+def _font_cache_file_path():
+    """
+    取得字體探測快取檔的完整路徑
+    
+    回傳:
+    str: 快取檔路徑
+    """
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), FONT_DISCOVERY_SETTINGS["cache_file"])
+
+def _load_font_discovery_cache(fingerprint):
+    """
+    讀取字體探測快取，指紋不符或字體檔案已不存在時視為無效
+    
+    參數:
+    fingerprint (str): 目前的字體目錄指紋
+    
+    回傳:
+    dict 或 None: 有效的快取內容
+    """
+    import json
+    
+    try:
+        with open(_font_cache_file_path(), "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except Exception:
+        return None
+    
+    if cache.get("fingerprint") != fingerprint:
+        return None
+    font_path = cache.get("path")
+    if font_path is not None and not os.path.exists(font_path):
+        return None
+    return cache
+
+def _save_font_discovery_cache(font_path, is_chinese, fingerprint, discovery_ms):
+    """
+    儲存字體探測結果，讓下次啟動可以跳過探測
+    
+    參數:
+    font_path (str 或 None): 選定的字體檔案路徑
+    is_chinese (bool): 選定的字體是否支援中文
+    fingerprint (str): 字體目錄指紋
+    discovery_ms (float): 本次完整探測花費的毫秒數
+    """
+    import json
+    
+    try:
+        with open(_font_cache_file_path(), "w", encoding="utf-8") as f:
+            json.dump({
+                "path": font_path,
+                "chinese": is_chinese,
+                "fingerprint": fingerprint,
+                "discovery_ms": discovery_ms
+            }, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        print(f"警告：無法儲存字體快取: {e}")
+
 def get_working_font_path():
     """
-    測試並返回第一個可用的中文字體檔案路徑
+    完整探測並返回第一個可用的中文字體檔案路徑（不使用快取）
+    
+    依序嘗試: CHINESE_FONT_FILES → fontconfig → 掃描 FONT_SEARCH_DIRS
     
     回傳:
     str 或 None: 可用的字體檔案路徑，或 None 表示使用預設字體
     """
-    import os
-    import pygame.font
-    
     pygame.font.init()
     
+    tried = set()
+    
     for font_path in CHINESE_FONT_FILES:
-        if os.path.exists(font_path):
-            try:
-                # 測試字體檔案是否可以正常載入
-                test_font = pygame.font.Font(font_path, 24)
-                # 測試是否能渲染中文字元
-                test_surface = test_font.render("測試中文", True, (255, 255, 255))
-                if test_surface.get_width() > 0:
-                    return font_path
-            except:
-                continue
+        tried.add(font_path)
+        if os.path.exists(font_path) and _test_font_file(font_path):
+            return font_path
+    
+    font_path = _query_fontconfig()
+    if font_path and font_path not in tried:
+        tried.add(font_path)
+        if os.path.exists(font_path) and _test_font_file(font_path):
+            return font_path
+    
+    for font_path in _scan_font_dirs():
+        if font_path not in tried:
+            tried.add(font_path)
+            if _test_font_file(font_path):
+                return font_path
     
     # 如果所有字體檔案都不可用，返回 None
     return None
 
-def create_font(size):
+def _discover_font():
+    """
+    探測本行程使用的字體：優先讀取快取檔，快取無效時才完整探測並寫回快取
+    
+    回傳:
+    dict: 探測結果（path、chinese、source、elapsed_ms、discovery_ms）
+    """
+    import time
+    
+    start_time = time.perf_counter()
+    fingerprint = _font_dirs_fingerprint()
+    cache = _load_font_discovery_cache(fingerprint)
+    
+    if cache is not None:
+        return {
+            "path": cache.get("path"),
+            "chinese": cache.get("chinese", False),
+            "source": "cache",
+            "elapsed_ms": (time.perf_counter() - start_time) * 1000,
+            "discovery_ms": cache.get("discovery_ms")
+        }
+    
+    font_path = get_working_font_path()
+    is_chinese = font_path is not None
+    
+    # 找不到中文字體時，直接記住 Arial 的檔案路徑，避免每次啟動都由 SysFont 重新掃描系統字體
+    if font_path is None:
+        try:
+            font_path = pygame.font.match_font("arial")
+        except Exception:
+            font_path = None
+    
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    _save_font_discovery_cache(font_path, is_chinese, fingerprint, elapsed_ms)
+    
+    return {
+        "path": font_path,
+        "chinese": is_chinese,
+        "source": "discovery",
+        "elapsed_ms": elapsed_ms,
+        "discovery_ms": elapsed_ms
+    }
+
+######################字體快取設定######################
+# 字體物件快取設定（整個行程共用）
+FONT_CACHE_SETTINGS = {
+    "max_fonts": 32,    # 最多保留的 (路徑, 大小) 字體物件數量
+}
+
+# 字體探測結果（每個行程只探測一次）
+_font_probe = {
+    "done": False,      # 是否已完成探測
+    "path": None,       # 探測到的字體檔案路徑
+    "info": None        # 探測結果（來源與耗時）
+}
+
+# (字體路徑, 字體大小) → pygame.font.Font 的 LRU 快取
+_font_cache = OrderedDict()
+
+# 快取命中統計
+_font_cache_stats = {
+    "hits": 0,          # 快取命中次數
+    "misses": 0,        # 快取未命中次數（實際建立字體）
+    "evictions": 0,     # 因超出容量被移除的字體數量
+    "probes": 0         # 實際執行字體探測的次數
+}
+
+def get_font_path():
+    """
+    取得本行程使用的中文字體檔案路徑（只在第一次呼叫時探測）
+    
+    回傳:
+    str 或 None: 可用的字體檔案路徑，或 None 表示使用備援字體
+    """
+    if not _font_probe["done"]:
+        pygame.font.init()
+        info = _discover_font()
+        _font_probe["path"] = info["path"]
+        _font_probe["info"] = info
+        _font_probe["done"] = True
+        _font_cache_stats["probes"] += 1
+    return _font_probe["path"]
+
+def get_font_discovery_info():
     """
-    創建支援繁體中文的字體物件 - 使用直接字體檔案路徑
+    取得字體探測結果（必要時會先執行探測）
+    
+    回傳:
+    dict: 包含 path、chinese、source（cache 或 discovery）、elapsed_ms、discovery_ms
+    """
+    get_font_path()
+    return dict(_font_probe["info"])
+
+def _load_font(font_path, size):
+    """
+    實際建立字體物件（快取未命中時使用）
     
     參數:
+    font_path (str 或 None): 字體檔案路徑
     size (int): 字體大小
     
     回傳:
@@ -52,9 +340,6 @@ def create_font(size):
     
     pygame.font.init()
     
-    # 取得可用的字體檔案路徑
-    font_path = get_working_font_path()
-    
     if font_path:
         try:
             # 使用字體檔案直接創建字體物件
@@ -69,6 +354,69 @@ def create_font(size):
         # 最後的備援：pygame 預設字體
         return pygame.font.Font(None, size)
 
+def create_font(size):
+    """
+    創建支援繁體中文的字體物件 - 同一個 (路徑, 大小) 會重複使用快取中的字體
+    
+    注意：回傳的字體物件是共用的，請勿修改其粗體/斜體等屬性
+    
+    參數:
+    size (int): 字體大小
+    
+    回傳:
+    pygame.font.Font: 字體物件
+    """
+    font_path = get_font_path()
+    key = (font_path, size)
+    
+    font = _font_cache.get(key)
+    if font is not None:
+        _font_cache_stats["hits"] += 1
+        _font_cache.move_to_end(key)
+        return font
+    
+    _font_cache_stats["misses"] += 1
+    font = _load_font(font_path, size)
+    _font_cache[key] = font
+    
+    # 超出容量時移除最久未使用的字體
+    while len(_font_cache) > FONT_CACHE_SETTINGS["max_fonts"]:
+        _font_cache.popitem(last=False)
+        _font_cache_stats["evictions"] += 1
+    
+    return font
+
+def get_font_cache_stats():
+    """
+    取得字體快取統計資料
+    
+    回傳:
+    dict: 包含 hits、misses、evictions、probes、size 的統計字典
+    """
+    stats = dict(_font_cache_stats)
+    stats["size"] = len(_font_cache)
+    return stats
+
+def clear_font_cache():
+    """
+    清空字體快取並重新探測字體（例如 pygame.font 被重新初始化後使用）
+    """
+    _font_cache.clear()
+    _font_probe["done"] = False
+    _font_probe["path"] = None
+    _font_probe["info"] = None
+
+# 文字 Surface 快取設定（見 systems/text_cache.py）
+TEXT_CACHE_SETTINGS = {
+    "max_bytes": 8 * 1024 * 1024,    # 快取的文字像素資料上限（8 MB）
+}
+
+# 數字字形圖集設定（見 systems/glyph_atlas.py）
+GLYPH_ATLAS_SETTINGS = {
+    "characters": "0123456789-+.,:/%",  # 預先繪製的數字與分隔符號
+    "max_atlases": 64                    # 最多保留的 (字體, 顏色) 圖集數量
+}
+
 # 字體大小設定
 FONT_SIZES = {
     "extra_large": 72,    # 超大字體（標題）
@@ -118,6 +466,8 @@ MENU_TITLE_SIZE = 72  # 主畫面標題字體大小
 MENU_BUTTON_SIZE = 36  # 主畫面按鈕字體大小
 MENU_BUTTON_WIDTH = 200  # 按鈕寬度
 MENU_BUTTON_HEIGHT = 60  # 按鈕高度
+MENU_STAR_COUNT = 100  # 主畫面背景星星數量
+MENU_STAR_SEED = 42  # 主畫面星星位置的亂數種子（固定，星空每次都一樣）
 
 # 道具掉落機率
 POWERUP_DROP_CHANCE = 30  # 30%機率掉落道具
@@ -127,6 +477,13 @@ SPEED_POTION_CHANCE = 5   # 5%機率掉加速藥水
 PROTECT_POTION_CHANCE = 3 # 3%機率掉防護藥水
 BOMB_CHANCE = 2           # 2%機率掉炸彈
 
+######################碰撞檢測設定######################
+# 空間雜湊網格設定（見 systems/collision.py 的 SpatialHash）
+SPATIAL_HASH_SETTINGS = {
+    "cell_size": 64,    # 格子邊長（像素），約為一般敵人大小的 1~2 倍
+    "batch_min_rects": 96,  # query_rects() 至少有這麼多個矩形才用 NumPy 整批計算，否則逐一查詢
+}
+
 ######################武器系統設定######################
 # 武器類型和傷害值
 WEAPON_STATS = {
@@ -167,6 +524,11 @@ WEAPON_STATS = {
     }
 }
 
+# 子彈物件池設定（見 entities/bullet_pool.py）
+BULLET_POOL_SETTINGS = {
+    "max_free": 2048,    # 每種子彈最多保留的空閒物件數量
+}
+
 ######################太空船系統設定######################
 # 太空船類型和屬性
 SPACESHIP_STATS = {
@@ -817,4 +1179,262 @@ GAME_STATE_BOSS_FIGHT = "boss_fight"
 GAME_STATE_VICTORY = "victory"
 GAME_STATE_GAME_OVER = "game_over"
 GAME_STATE_SHIP_BATTLE = "ship_battle"
-GAME_STATE_HIDE_SEEK = "hide_seek"
\ No newline at end of file
+GAME_STATE_HIDE_SEEK = "hide_seek"
+
+######################固定時間步長設定######################
+# 遊戲邏輯固定以 tick_rate 更新，畫面更新率（render_fps）可以不同
+SIMULATION_SETTINGS = {
+    "tick_rate": 60,                 # 模擬更新頻率（Hz），所有以幀為單位的速度和計時器都以此為準
+    "render_fps": FPS,               # 畫面更新率上限（例如 30、60、144）
+    "max_catch_up_steps": 5,         # 一幀最多補跑幾次模擬，超過就放棄落後的時間（避免越跑越慢）
+    "max_frame_time": 0.25,          # 單幀最多計入的秒數（視窗被拖動或中斷點暫停後不會一次補太多）
+    "interpolate": True,             # 繪製時是否在上一步與這一步之間插值
+    "snap_distance": 100,            # 一步內位移超過這個距離（傳送、重複使用）就不插值
+}
+
+######################閒置畫面設定######################
+# 主畫面、遊戲結束、勝利和商店畫面沒有動畫時，不再以 60 FPS 重畫
+IDLE_SETTINGS = {
+    "enabled": True,                 # 是否在靜態畫面改用等待事件的省電模式
+    "max_wait_ms": 1000,             # 沒有事件時最多等待多久就醒來檢查一次
+}
+
+######################亂數串流######################
+# 每一局使用一個「對局種子」，各子系統從中衍生出互相獨立的亂數串流：
+# 某個子系統多抽或少抽幾次亂數（例如畫面特效），不會改變其他子系統的結果。
+RNG_SETTINGS = {
+    "seed": None,                    # 固定的對局種子（None 表示每局隨機產生，可用 --seed 指定）
+    "streams": (
+        "spawning",                  # 敵人生成、船艦選擇、躲貓貓道具與角色分配
+        "drops",                     # 藥水與道具掉落
+        "ai",                        # 敵人、機器人、Boss 和盟友的 AI 決策
+        "combat",                    # 戰鬥結果（凍結時間、傳送位置）
+        "map",                       # 躲貓貓地圖生成
+        "visuals",                   # 煙火、雪花、烏鴉等純視覺效果
+    ),
+}
+
+# 串流名稱 → random.Random（重新設定種子時原地更新，取得的物件可以長期保留）
+_rng_streams = {}
+
+# 目前對局使用的種子
+_rng_state = {
+    "seed": None,
+    "fixed": False      # 種子是否由使用者指定（--seed 或 RNG_SETTINGS）
+}
+
+def seed_rng(seed=None):
+    """
+    設定對局種子並重設所有亂數串流（每一局開始時呼叫）
+    
+    各串流的種子是 "對局種子:串流名稱"，同一個對局種子永遠得到相同的結果。
+    
+    參數:
+    seed (int): 對局種子，None 表示使用 RNG_SETTINGS["seed"]，也沒有設定時隨機產生
+    
+    回傳:
+    int: 實際使用的對局種子（可以用 --seed 重現這一局）
+    """
+    if seed is None:
+        seed = RNG_SETTINGS["seed"]
+    _rng_state["fixed"] = seed is not None
+    if seed is None:
+        seed = random.SystemRandom().randrange(1, 1 << 31)
+    
+    _rng_state["seed"] = seed
+    for name in RNG_SETTINGS["streams"]:
+        stream = _rng_streams.get(name)
+        if stream is None:
+            stream = _rng_streams[name] = random.Random()
+        stream.seed(f"{seed}:{name}")
+    return seed
+
+def get_rng(name):
+    """
+    取得子系統的亂數串流
+    
+    參數:
+    name (str): 串流名稱（見 RNG_SETTINGS["streams"]）
+    
+    回傳:
+    random.Random: 亂數產生器
+    """
+    stream = _rng_streams.get(name)
+    if stream is None:
+        if name not in RNG_SETTINGS["streams"]:
+            raise ValueError(f"未知的亂數串流: {name}")
+        # 還沒有開始任何一局（例如直接建立物件的工具程式），先用預設種子初始化
+        seed_rng()
+        stream = _rng_streams[name]
+    return stream
+
+def get_rng_seed():
+    """
+    取得目前對局使用的種子
+    
+    回傳:
+    int: 對局種子，還沒有設定過時回傳 None
+    """
+    return _rng_state["seed"]
+
+def is_rng_seed_fixed():
+    """
+    檢查目前的對局種子是否由使用者指定
+    
+    依賴上一局結果的隨機行為（例如避開上次的太空船）在固定種子時應該停用，
+    否則同一個種子重跑會得到不同的結果。
+    
+    回傳:
+    bool: 使用 --seed 或 RNG_SETTINGS["seed"] 時回傳 True
+    """
+    return _rng_state["fixed"]
+
+######################輸入錄製與重播設定######################
+# 每次模擬更新的按鍵壓成位元遮罩錄製下來，搭配對局種子就能重播整局（見 systems/input_recording.py）
+REPLAY_SETTINGS = {
+    "record": False,                 # 是否自動錄製每一局的輸入（也可以用 --record 開啟）
+    "output_dir": "replays",         # 錄製檔輸出資料夾
+    "flush_ticks": 60,               # 累積幾次更新才寫入一次檔案
+    # 各模式會讀取的按鍵（位元順序，最多 32 個；改變順序後舊的錄製檔仍可讀取，檔頭記有按鍵名稱）
+    "keys": (
+        "K_LEFT", "K_RIGHT", "K_UP", "K_DOWN",
+        "K_w", "K_a", "K_s", "K_d",
+        "K_SPACE", "K_LSHIFT", "K_RSHIFT", "K_LCTRL", "K_RCTRL",
+        "K_q", "K_e", "K_t", "K_i", "K_x", "K_c", "K_r",
+        "K_1", "K_2", "K_3", "K_4", "K_5", "K_6", "K_7", "K_8", "K_9", "K_0",
+        "K_RETURN", "K_ESCAPE",
+    ),
+}
+
+# 躲貓貓重播檔（見 systems/hide_seek_replay.py）：每一幀記錄所有玩家的狀態，可以直接跳到任意時間
+HIDE_SEEK_REPLAY_SETTINGS = {
+    "keyframe_seconds": 2,           # 每隔幾秒寫一個完整的關鍵幀（其餘幀只記錄有變化的玩家）
+    "output_dir": "replays",         # 重播檔輸出資料夾
+    "seek_seconds": 5,               # 重播檢視器按左右鍵一次跳幾秒
+}
+
+# 擊殺回放（見 systems/kill_cam.py）：躲貓貓擊殺或 Boss Fight 陣亡時重播最後幾秒
+KILL_CAM_SETTINGS = {
+    "enabled": True,
+    "seconds": 5,                    # 環狀緩衝區保留的秒數（回放長度）
+    "playback_speed": 0.5,           # 回放速度（每次模擬更新前進幾幀，0.5 = 慢動作）
+    "human_only": True,              # 躲貓貓只回放和真人玩家有關的擊殺
+    "max_projectiles": 512,          # Boss Fight 每幀最多記錄幾顆子彈（超過的不記錄）
+    "skip_keys": (pygame.K_SPACE, pygame.K_RETURN, pygame.K_ESCAPE),  # 跳過回放
+    "label_color": (255, 60, 60),
+    "label_y": 110,                  # 回放標示的位置（避開 Boss 血條）
+    "bar_height": 4,                 # 畫面底部回放進度條的高度
+}
+
+# 離線平行繪製輸入錄製檔（見 render_replay.py）
+RENDER_REPLAY_SETTINGS = {
+    "output_dir": "renders",         # 輸出資料夾
+    "format": "auto",                # auto（有編碼器時輸出影片，否則 PNG 序列）、encoder、png、raw
+    "fps": 30,                       # 輸出幀率（不可超過模擬頻率）
+    "segments_per_worker": 2,        # 每個工作行程平均分到幾個片段（片段越多，負載越平均）
+    "png_compression": 1,            # PNG 的 zlib 壓縮等級
+}
+
+######################除錯工具設定######################
+# 除錯功能鍵（遊戲中任何模式都可以按）
+DEBUG_KEYS = {
+    "performance_overlay": pygame.K_F3,  # 顯示/隱藏效能疊加層
+    "memory_report": pygame.K_F4,   # 在終端機列出目前模式的物件數量與記憶體用量
+    "profile_capture": pygame.K_F5,  # 開始/停止 cProfile 錄製目前模式的更新與繪製
+    "spike_detector": pygame.K_F6,  # 開啟/關閉幀時間突波偵測
+    "frame_capture": pygame.K_F7,   # 開始/停止錄製遊戲畫面
+}
+
+# 幀時間分析器設定（見 systems/frame_profiler.py）
+FRAME_PROFILER_SETTINGS = {
+    "history_frames": 240,           # 環狀緩衝區保留的幀數（60 FPS 下約 4 秒）
+}
+
+# 幀時間突波偵測設定（見 systems/spike_detector.py）
+SPIKE_DETECTOR_SETTINGS = {
+    "enabled": False,                # 遊戲啟動時是否就開啟（也可以用 F6 切換）
+    "median_factor": 2.0,            # 超過最近幾幀中位數的幾倍視為突波
+    "min_spike_ms": 1000 / FPS * 1.5,  # 低於這個毫秒數的幀不算突波（避免極短幀的雜訊）
+    "warmup_frames": 60,             # 開啟後先累積幾幀才開始判斷
+    "context_frames": 10,            # 報告中包含突波前的幾幀
+    "cooldown_frames": 120,          # 寫出報告後幾幀內不再重複報告（避免持續變慢時大量寫檔）
+    "report_dir": "spike_reports",   # 報告輸出資料夾
+}
+
+# cProfile 錄製設定（見 systems/profile_capture.py）
+PROFILE_CAPTURE_SETTINGS = {
+    "output_dir": "profiles",        # .pstats 與文字摘要的輸出資料夾
+    "sort_by": "cumulative",         # 文字摘要的排序方式
+    "top_functions": 40,             # 文字摘要列出的函式數量
+}
+
+# 遊戲畫面錄製（見 systems/frame_capture.py）：主執行緒只複製畫面，編碼和寫檔在背景執行緒
+FRAME_CAPTURE_SETTINGS = {
+    "output_dir": "captures",        # 輸出資料夾（每次錄製一個子資料夾或影片檔）
+    "format": "auto",                # auto（有編碼器就用，否則 png）、encoder、png、raw
+    "fps": 30,                       # 每秒最多擷取幾幀（畫面更新率較高時略過中間的幀）
+    "queue_frames": 8,               # 預先配置的畫面緩衝數量，全部等待寫入時丟棄新的幀
+    "png_compression": 1,            # PNG 的 zlib 壓縮等級（1 最快）
+    "encoder": "ffmpeg",             # 本機的影片編碼器（在 PATH 中找不到時不使用）
+    "encoder_args": ["-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p"],
+    "encoder_extension": ".mp4",
+}
+
+# 效能疊加層設定（見 systems/performance_overlay.py）
+PERFORMANCE_OVERLAY_SETTINGS = {
+    "x": 10,
+    "y": 110,
+    "width": 260,
+    "padding": 6,
+    "graph_height": 60,
+    "graph_scale_budgets": 2,        # 曲線頂端代表幾倍的單幀時間預算
+    "average_frames": 60,            # 各階段平均耗時使用最近幾幀
+    # 依序顯示的階段與子系統（沒有資料的會略過）
+    "phases": ("events", "update", "ai", "collisions", "minimap", "render", "map_draw", "tick"),
+    "background_color": (0, 0, 0, 170),
+    "text_color": WHITE,
+    "phase_color": (180, 220, 255),
+    "count_color": (200, 255, 180),
+    "graph_color": GREEN,
+    "graph_border_color": (90, 90, 90),
+    "budget_color": YELLOW,
+}
+
+######################無視窗模擬設定######################
+# headless.py 使用的設定（SDL dummy 驅動、不限幀率）
+HEADLESS_SETTINGS = {
+    "default_ticks": 3600,       # 預設模擬的更新次數（60 FPS 下約 1 分鐘）
+    "random_hold_ticks": 15,     # 隨機輸入每隔幾次更新換一組按鍵
+    "random_press_chance": 0.4,  # 隨機輸入時每個按鍵被按住的機率
+    # 各模式隨機輸入會用到的按鍵
+    "mode_keys": {
+        "classic": ["K_LEFT", "K_RIGHT", "K_UP", "K_DOWN", "K_LCTRL"],
+        "ship": ["K_LEFT", "K_RIGHT", "K_UP", "K_DOWN", "K_LSHIFT", "K_SPACE", "K_i"],
+        "hide": ["K_w", "K_a", "K_s", "K_d", "K_SPACE", "K_e"],
+        "boss": ["K_w", "K_a", "K_s", "K_d", "K_SPACE", "K_x", "K_e"],
+    },
+}
+
+######################效能測試設定######################
+# benchmarks/ 情境效能測試使用的設定
+BENCHMARK_SETTINGS = {
+    "frames": 600,                        # 每個情境量測的幀數
+    "seed": 20240601,                     # 固定亂數種子，確保每次執行相同
+    "results_dir": "benchmarks/results",  # 結果 JSON 的輸出資料夾
+    "classic_spawn_multiplier": 10,       # 經典模式敵人生成速度倍率
+    "classic_bullet_count": 500,          # 經典模式維持在場上的子彈數量
+    "hide_seek_player_counts": (10, 50, 200),  # 躲貓貓情境的玩家人數
+    "hide_seek_seeker_ratio": 0.3,        # 躲貓貓搜尋者佔玩家人數的比例
+}
+
+# benchmarks/micro.py 熱點函式微基準測試使用的設定
+MICRO_BENCHMARK_SETTINGS = {
+    "repeat": 15,                    # 每個測試量測幾輪（取最快與中位數，每一輪前先跑一輪校正迴圈）
+    "min_time": 0.05,                # 每一輪至少執行幾秒（自動決定呼叫次數）
+    "threshold_percent": 25.0,       # 相對校正迴圈的時間比基準慢超過這個百分比就視為效能退化
+    "retries": 3,                    # compare 時超過門檻的測試最多重新量測幾次（取最快的結果）
+    "baseline_file": "benchmarks/baselines/micro.json",  # 提交在版本庫中的基準 JSON
+    "seed": 20240601,                # 建立測試資料用的亂數種子
+    "snapshot_scenarios": ("classic_swarm", "boss_fight_7", "hide_seek_10", "hide_seek_50"),  # 量測快照/還原的情境
+    "snapshot_warmup_frames": 600,   # 快照測試前先執行情境的幀數（讓場上物件數量接近實際遊戲）
+}
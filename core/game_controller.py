@@ -1,7 +1,6 @@
 ######################載入套件######################
 import pygame
 import sys
-import random
 
 # 匯入遊戲設定
 from config import (
@@ -10,11 +9,11 @@ from config import (
     GAME_STATE_SHIP_BATTLE, GAME_STATE_HIDE_SEEK, GAME_STATE_GAME_OVER,
     ENEMY_SPAWN_DELAY, POWERUP_DROP_CHANCE, STAR_DROP_CHANCE,
     HEALTH_POTION_CHANCE, SPEED_POTION_CHANCE, PROTECT_POTION_CHANCE,
-    SHOP_UNLOCK_STARS
+    SHOP_UNLOCK_STARS, get_rng
 )
 
 # 匯入遊戲物件
-from entities import Player, Enemy, Boss, Bullet, PowerUp, Firework
+from entities import Player, Enemy, Boss, Bullet, PowerUp, Firework, EntityList, release_bullet
 
 # 匯入遊戲系統
 from systems import check_collision, UISystem, ShopSystem, MenuSystem, ShipBattleSystem, VisualEffectsSystem, HideSeekSystem
@@ -80,12 +79,12 @@ class GameController:
         """
         self.game_objects = {
             'player': Player(SCREEN_WIDTH // 2 - 25, SCREEN_HEIGHT - 80),
-            'bullets': [],
-            'enemies': [],
-            'powerups': [],
-            'fireworks': [],
+            'bullets': EntityList(on_remove=release_bullet),
+            'enemies': EntityList(),
+            'powerups': EntityList(),
+            'fireworks': EntityList(),
             'boss': None,
-            'boss_bullets': []
+            'boss_bullets': EntityList(on_remove=release_bullet)
         }
         
         # 重置計時器
@@ -244,16 +243,16 @@ class GameController:
                 self.game_objects['bullets'].append(new_bullet)
         
         # 更新所有子彈
-        for bullet in self.game_objects['bullets'][:]:
+        for bullet in self.game_objects['bullets']:
             bullet.move()
             if bullet.is_off_screen():
-                self.game_objects['bullets'].remove(bullet)
+                self.game_objects['bullets'].kill(bullet)
         
         # 更新Boss子彈
-        for boss_bullet in self.game_objects['boss_bullets'][:]:
+        for boss_bullet in self.game_objects['boss_bullets']:
             boss_bullet.move()
             if boss_bullet.is_off_screen():
-                self.game_objects['boss_bullets'].remove(boss_bullet)
+                self.game_objects['boss_bullets'].kill(boss_bullet)
         
         # 根據遊戲狀態更新敵人或Boss
         if game_state == GAME_STATE_PLAYING:
@@ -274,6 +273,9 @@ class GameController:
         # 更新煙火效果
         self._update_fireworks()
         
+        # 每幀只壓縮一次，移除這一幀標記為失效的物件
+        self._compact_game_objects()
+        
         # 勝利條件檢查
         if self.state_manager.boss_killed:
             if self.state_manager.update_victory_timer():
@@ -289,8 +291,9 @@ class GameController:
         
         if self.enemy_spawn_timer >= enemy_spawn_delay:
             self.enemy_spawn_timer = 0
-            enemy_type = random.choice(["basic", "basic", "fast"])
-            enemy_x = random.randint(0, SCREEN_WIDTH - 30)
+            spawning = get_rng("spawning")
+            enemy_type = spawning.choice(["basic", "basic", "fast"])
+            enemy_x = spawning.randint(0, SCREEN_WIDTH - 30)
             self.game_objects['enemies'].append(Enemy(enemy_x, -30, enemy_type))
             
             # 隨著分數增加，敵人生成速度加快
@@ -298,10 +301,10 @@ class GameController:
                 enemy_spawn_delay = max(30, 60 - self.state_manager.score // 50)
         
         # 更新敵人位置
-        for enemy in self.game_objects['enemies'][:]:
+        for enemy in self.game_objects['enemies']:
             enemy.move()
             if enemy.is_off_screen():
-                self.game_objects['enemies'].remove(enemy)
+                self.game_objects['enemies'].kill(enemy)
     
     def _trigger_boss_fight(self):
         """
@@ -347,18 +350,18 @@ class GameController:
     
     def _handle_bullet_enemy_collision(self):
         """處理子彈打中敵人的碰撞"""
-        for bullet in self.game_objects['bullets'][:]:
-            for enemy in self.game_objects['enemies'][:]:
+        for bullet in self.game_objects['bullets']:
+            for enemy in self.game_objects['enemies']:
                 if check_collision(bullet.x, bullet.y, bullet.width, bullet.height,
                                  enemy.x, enemy.y, enemy.width, enemy.height):
                     if enemy.take_damage(bullet.damage):
                         self._drop_powerups(enemy)
-                        self.game_objects['enemies'].remove(enemy)
+                        self.game_objects['enemies'].kill(enemy)
                         self.state_manager.update_score(enemy.score_value)
                         self.state_manager.update_stars(enemy.star_value)
                         self.state_manager.update_enemies_killed(1)
                     
-                    self.game_objects['bullets'].remove(bullet)
+                    self.game_objects['bullets'].kill(bullet)
                     break
     
     def _handle_bullet_boss_collision(self):
@@ -366,7 +369,7 @@ class GameController:
         if not self.game_objects['boss']:
             return
             
-        for bullet in self.game_objects['bullets'][:]:
+        for bullet in self.game_objects['bullets']:
             if check_collision(bullet.x, bullet.y, bullet.width, bullet.height,
                              self.game_objects['boss'].x, self.game_objects['boss'].y, 
                              self.game_objects['boss'].width, self.game_objects['boss'].height):
@@ -380,8 +383,8 @@ class GameController:
                     
                     # 生成慶祝煙火
                     for _ in range(8):
-                        firework_x = random.randint(100, SCREEN_WIDTH - 100)
-                        firework_y = random.randint(100, SCREEN_HEIGHT - 100)
+                        firework_x = get_rng("visuals").randint(100, SCREEN_WIDTH - 100)
+                        firework_y = get_rng("visuals").randint(100, SCREEN_HEIGHT - 100)
                         self.game_objects['fireworks'].append(Firework(firework_x, firework_y))
                     
                     # 獲得分數和星星
@@ -392,17 +395,17 @@ class GameController:
                     self.game_objects['boss'] = None
                     self.game_objects['boss_bullets'].clear()
                 
-                self.game_objects['bullets'].remove(bullet)
+                self.game_objects['bullets'].kill(bullet)
                 break
     
     def _handle_boss_bullet_player_collision(self):
         """處理Boss子彈打中玩家的碰撞"""
-        for boss_bullet in self.game_objects['boss_bullets'][:]:
+        for boss_bullet in self.game_objects['boss_bullets']:
             if check_collision(boss_bullet.x, boss_bullet.y, boss_bullet.width, boss_bullet.height,
                              self.game_objects['player'].x, self.game_objects['player'].y, 
                              self.game_objects['player'].width, self.game_objects['player'].height):
                 self.game_objects['player'].health -= boss_bullet.damage
-                self.game_objects['boss_bullets'].remove(boss_bullet)
+                self.game_objects['boss_bullets'].kill(boss_bullet)
                 
                 if self.game_objects['player'].health <= 0:
                     print(f"被Boss擊敗！最終分數：{self.state_manager.score}，星星數量：{self.state_manager.stars}")
@@ -410,12 +413,12 @@ class GameController:
     
     def _handle_player_enemy_collision(self):
         """處理玩家撞到敵人的碰撞"""
-        for enemy in self.game_objects['enemies'][:]:
+        for enemy in self.game_objects['enemies']:
             if check_collision(self.game_objects['player'].x, self.game_objects['player'].y, 
                              self.game_objects['player'].width, self.game_objects['player'].height,
                              enemy.x, enemy.y, enemy.width, enemy.height):
                 self.game_objects['player'].health -= 20
-                self.game_objects['enemies'].remove(enemy)
+                self.game_objects['enemies'].kill(enemy)
                 
                 if self.game_objects['player'].health <= 0:
                     print(f"遊戲結束！最終分數：{self.state_manager.score}，星星數量：{self.state_manager.stars}")
@@ -438,7 +441,7 @@ class GameController:
     
     def _handle_player_powerup_collision(self):
         """處理玩家撿到道具的碰撞"""
-        for powerup in self.game_objects['powerups'][:]:
+        for powerup in self.game_objects['powerups']:
             if check_collision(self.game_objects['player'].x, self.game_objects['player'].y, 
                              self.game_objects['player'].width, self.game_objects['player'].height,
                              powerup.x, powerup.y, powerup.width, powerup.height):
@@ -452,11 +455,11 @@ class GameController:
                     print(f"獲得Boss禮物！最終分數：{self.state_manager.score}，星星數量：{self.state_manager.stars}")
                     self.state_manager.set_game_state(GAME_STATE_MENU)
                 
-                self.game_objects['powerups'].remove(powerup)
+                self.game_objects['powerups'].kill(powerup)
     
     def _drop_powerups(self, enemy):
         """敵人死亡時掉落道具的邏輯"""
-        drop_chance = random.randint(1, 100)
+        drop_chance = get_rng("drops").randint(1, 100)
         if drop_chance <= POWERUP_DROP_CHANCE:
             if drop_chance <= STAR_DROP_CHANCE:
                 self.game_objects['powerups'].append(PowerUp(enemy.x + enemy.width // 2, enemy.y, "star"))
@@ -471,17 +474,22 @@ class GameController:
     
     def _update_powerups(self):
         """更新道具狀態"""
-        for powerup in self.game_objects['powerups'][:]:
+        for powerup in self.game_objects['powerups']:
             powerup.move()
             if powerup.is_off_screen():
-                self.game_objects['powerups'].remove(powerup)
+                self.game_objects['powerups'].kill(powerup)
     
     def _update_fireworks(self):
         """更新煙火效果"""
-        for firework in self.game_objects['fireworks'][:]:
+        for firework in self.game_objects['fireworks']:
             firework.update()
             if firework.is_dead():
-                self.game_objects['fireworks'].remove(firework)
+                self.game_objects['fireworks'].kill(firework)
+    
+    def _compact_game_objects(self):
+        """一次移除所有標記為失效的物件（每幀呼叫一次）"""
+        for name in ('bullets', 'boss_bullets', 'enemies', 'powerups', 'fireworks'):
+            self.game_objects[name].compact()
     
     def render(self):
         """
@@ -7,6 +7,7 @@ from config import (
     GAME_STATE_VICTORY, GAME_STATE_GAME_OVER, GAME_STATE_SHIP_BATTLE,
     GAME_STATE_HIDE_SEEK
 )
+from systems import render_text, draw_numeric_text
 
 ######################渲染管理器######################
 class Renderer:
@@ -172,11 +173,11 @@ class Renderer:
         progress_font = create_font(FONT_SIZES["normal"])
         
         if progress_info['remaining'] > 0:
-            progress_text = progress_font.render(
-                f"Boss 出現倒數: {progress_info['remaining']} 敵人", 
-                True, YELLOW
+            draw_numeric_text(
+                self.screen, progress_font,
+                ("Boss 出現倒數: ", progress_info['remaining'], " 敵人"),
+                True, YELLOW, topleft=(SCREEN_WIDTH - 200, 40)
             )
-            self.screen.blit(progress_text, (SCREEN_WIDTH - 200, 40))
         else:
             boss_ready_text = progress_font.render("Boss 即將出現！", True, RED)
             self.screen.blit(boss_ready_text, (SCREEN_WIDTH - 200, 40))
@@ -197,25 +198,25 @@ class Renderer:
         font_small = create_font(FONT_SIZES["normal"])
         
         # 遊戲結束文字
-        game_over_text = font_large.render("GAME OVER", True, RED)
+        game_over_text = render_text(font_large, "GAME OVER", True, RED)
         game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
         self.screen.blit(game_over_text, game_over_rect)
         
         # 最終分數
-        score_text = font_medium.render(f"最終分數: {state_manager.score}", True, WHITE)
+        score_text = render_text(font_medium, f"最終分數: {state_manager.score}", True, WHITE)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
         self.screen.blit(score_text, score_rect)
         
-        stars_text = font_medium.render(f"星星數量: {state_manager.stars}", True, YELLOW)
+        stars_text = render_text(font_medium, f"星星數量: {state_manager.stars}", True, YELLOW)
         stars_rect = stars_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
         self.screen.blit(stars_text, stars_rect)
         
-        killed_text = font_medium.render(f"擊敗敵人: {state_manager.enemies_killed}", True, GREEN)
+        killed_text = render_text(font_medium, f"擊敗敵人: {state_manager.enemies_killed}", True, GREEN)
         killed_rect = killed_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
         self.screen.blit(killed_text, killed_rect)
         
         # 操作提示
-        restart_text = font_small.render("按 R 重新開始 | 按 Enter 返回主畫面", True, WHITE)
+        restart_text = render_text(font_small, "按 R 重新開始 | 按 Enter 返回主畫面", True, WHITE)
         restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 120))
         self.screen.blit(restart_text, restart_rect)
     
@@ -235,24 +236,24 @@ class Renderer:
         font_small = create_font(FONT_SIZES["normal"])
         
         # 勝利文字
-        victory_text = font_large.render("VICTORY!", True, YELLOW)
+        victory_text = render_text(font_large, "VICTORY!", True, YELLOW)
         victory_rect = victory_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
         self.screen.blit(victory_text, victory_rect)
         
-        boss_text = font_medium.render("Boss 已被擊敗！", True, WHITE)
+        boss_text = render_text(font_medium, "Boss 已被擊敗！", True, WHITE)
         boss_rect = boss_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40))
         self.screen.blit(boss_text, boss_rect)
         
         # 最終分數
-        score_text = font_medium.render(f"最終分數: {state_manager.score}", True, WHITE)
+        score_text = render_text(font_medium, f"最終分數: {state_manager.score}", True, WHITE)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
         self.screen.blit(score_text, score_rect)
         
-        stars_text = font_medium.render(f"星星數量: {state_manager.stars}", True, YELLOW)
+        stars_text = render_text(font_medium, f"星星數量: {state_manager.stars}", True, YELLOW)
         stars_rect = stars_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
         self.screen.blit(stars_text, stars_rect)
         
         # 操作提示
-        continue_text = font_small.render("按 Enter 返回主畫面 | 按 R 重新開始", True, WHITE)
+        continue_text = render_text(font_small, "按 Enter 返回主畫面 | 按 R 重新開始", True, WHITE)
         continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 120))
         self.screen.blit(continue_text, continue_rect)
\ No newline at end of file
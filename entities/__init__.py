@@ -12,6 +12,9 @@
 - HideSeekPlayer: 躲貓貓遊戲玩家
 - Ghost: 幽靈模式
 - HideSeekMap: 躲貓貓地圖
+- ProjectileStore: 陣列式子彈儲存區
+- BulletPool: 子彈物件池
+- EntityList: 先標記、後壓縮的實體串列
 
 所有物件都遵循統一的設計模式，包含移動、繪製、碰撞檢測等基本功能。
 """
@@ -22,11 +25,15 @@ from .enemy import Enemy
 from .boss import Boss
 from .bullet import Bullet, RobotBullet
 from .powerup import PowerUp
-from .firework import Firework
+from .firework import Firework, FireworkParticle
 from .hide_seek_player import HideSeekPlayer
 from .ghost import Ghost
 from .hide_seek_map import HideSeekMap
 from .ally_ship import AllyShip
+from .projectile_store import ProjectileStore, ProjectileView
+from .bullet_pool import BulletPool, acquire_blank_bullet, release_bullet, release_bullets, get_bullet_pool_stats
+from .entity_list import EntityList
 
-__all__ = ['Player', 'Robot', 'Enemy', 'Boss', 'Bullet', 'RobotBullet', 'PowerUp', 'Firework', 
-           'HideSeekPlayer', 'Ghost', 'HideSeekMap', 'AllyShip']
\ No newline at end of file
+__all__ = ['Player', 'Robot', 'Enemy', 'Boss', 'Bullet', 'RobotBullet', 'PowerUp', 'Firework', 'FireworkParticle',
+           'HideSeekPlayer', 'Ghost', 'HideSeekMap', 'AllyShip', 'ProjectileStore', 'ProjectileView',
+           'BulletPool', 'acquire_blank_bullet', 'release_bullet', 'release_bullets', 'get_bullet_pool_stats', 'EntityList']
\ No newline at end of file
@@ -1,7 +1,6 @@
 ######################載入套件######################
 import pygame
 import math
-import random
 from config import *
 
 ######################盟友太空船類別######################
@@ -158,8 +157,8 @@ class AllyShip:
                 self.dodge_timer = 30  # 0.5秒閃避時間
                 
                 # 隨機選擇閃避方向
-                if random.choice([True, False]):
-                    self.dodge_direction = random.choice([-1, 1]) * 40
+                if get_rng("ai").choice([True, False]):
+                    self.dodge_direction = get_rng("ai").choice([-1, 1]) * 40
                 else:
                     self.dodge_direction = 0
                 
@@ -213,14 +212,9 @@ class AllyShip:
         
         if distance > 0:
             # 創建導向子彈
-            from entities.bullet import Bullet
-            bullet = Bullet(bullet_x - 2, bullet_y, "plasma")  # 使用等離子武器
-            
-            # 設定子彈方向（導向Boss）
-            bullet.dx = (dx / distance) * 8  # 子彈速度
-            bullet.dy = (dy / distance) * 8
-            
-            return bullet
+            from entities.bullet import bullet_pool
+            # 子彈和玩家子彈一樣直線向上（Bullet 只用 velocity_x、velocity_y 移動，不另外記錄方向）
+            return bullet_pool.acquire(bullet_x - 2, bullet_y, "plasma")  # 使用等離子武器
         
         return None
     
@@ -130,7 +130,7 @@ class Boss:
         回傳:\n
         list: 垃圾子彈清單\n
         """
-        from .bullet import Bullet
+        from .bullet import bullet_pool
         
         bullets = []
         
@@ -139,7 +139,7 @@ class Boss:
         center_y = self.y + self.height
         
         # 創建垃圾子彈
-        garbage_bullet = Bullet(center_x, center_y, "boss_garbage")
+        garbage_bullet = bullet_pool.acquire(center_x, center_y, "boss_garbage")
         bullets.append(garbage_bullet)
         
         return bullets
@@ -151,7 +151,7 @@ class Boss:
         回傳:\n
         list: 散彈子彈清單\n
         """
-        from .bullet import Bullet
+        from .bullet import bullet_pool
         
         bullets = []
         
@@ -167,7 +167,7 @@ class Boss:
             angle = start_angle + (i * angle_step)
             
             # 創建扇形散彈
-            spread_bullet = Bullet(center_x, center_y, "boss_spread", angle)
+            spread_bullet = bullet_pool.acquire(center_x, center_y, "boss_spread", angle)
             bullets.append(spread_bullet)
         
         return bullets
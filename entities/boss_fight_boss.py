@@ -1,8 +1,16 @@
 ######################載入套件######################
 import pygame
-import random
 import math
 from config import *
+from .bullet_pool import BulletPool
+
+######################Boss 子彈外觀######################
+# 子彈類型 → (寬度, 高度, 顏色)，未列出的類型使用 (6, 10, YELLOW)
+BOSS_BULLET_APPEARANCE = {
+    "normal": (6, 12, RED),
+    "spread": (5, 10, ORANGE),
+    "circle": (4, 8, PURPLE)
+}
 
 ######################Boss Fight Boss 類別######################
 class BossFightBoss:
@@ -76,8 +84,8 @@ class BossFightBoss:
         if self.move_timer >= 180:  # 每3秒
             self.move_timer = 0
             # 隨機上下移動
-            if random.random() < 0.5:
-                new_y = self.y + random.randint(-20, 20)
+            if get_rng("ai").random() < 0.5:
+                new_y = self.y + get_rng("ai").randint(-20, 20)
                 self.y = max(30, min(150, new_y))  # 限制在上半部
     
     def update(self, sounds=None):
@@ -127,7 +135,7 @@ class BossFightBoss:
             # 前兩個 Boss：單發子彈
             bullet_x = self.x + self.width // 2 - 3
             bullet_y = self.y + self.height
-            bullets.append(BossBullet(bullet_x, bullet_y, "normal", self.attack_damage))
+            bullets.append(boss_bullet_pool.acquire(bullet_x, bullet_y, "normal", self.attack_damage))
         
         elif self.boss_index <= 4:
             # 中級 Boss：雙發子彈
@@ -135,15 +143,15 @@ class BossFightBoss:
             right_bullet_x = self.x + self.width * 2 // 3 - 3
             bullet_y = self.y + self.height
             
-            bullets.append(BossBullet(left_bullet_x, bullet_y, "normal", self.attack_damage))
-            bullets.append(BossBullet(right_bullet_x, bullet_y, "normal", self.attack_damage))
+            bullets.append(boss_bullet_pool.acquire(left_bullet_x, bullet_y, "normal", self.attack_damage))
+            bullets.append(boss_bullet_pool.acquire(right_bullet_x, bullet_y, "normal", self.attack_damage))
         
         else:
             # 高級 Boss：三發子彈
             for i in range(3):
                 bullet_x = self.x + (i + 1) * self.width // 4 - 3
                 bullet_y = self.y + self.height
-                bullets.append(BossBullet(bullet_x, bullet_y, "normal", self.attack_damage))
+                bullets.append(boss_bullet_pool.acquire(bullet_x, bullet_y, "normal", self.attack_damage))
         
         return bullets
     
@@ -203,8 +211,8 @@ class BossFightBoss:
             speed_x = math.sin(angle_rad) * 3
             speed_y = math.cos(angle_rad) * 3
             
-            bullets.append(BossBullet(center_x - 3, center_y, "spread", 
-                                    self.attack_damage, speed_x, speed_y))
+            bullets.append(boss_bullet_pool.acquire(center_x - 3, center_y, "spread",
+                                                    self.attack_damage, speed_x, speed_y))
         
         return bullets
     
@@ -232,8 +240,8 @@ class BossFightBoss:
             speed_x = math.cos(angle_rad) * 2
             speed_y = math.sin(angle_rad) * 2
             
-            bullets.append(BossBullet(center_x - 3, center_y - 3, "circle", 
-                                    self.attack_damage, speed_x, speed_y))
+            bullets.append(boss_bullet_pool.acquire(center_x - 3, center_y - 3, "circle",
+                                                    self.attack_damage, speed_x, speed_y))
         
         return bullets
     
@@ -368,6 +376,10 @@ class BossBullet:
     Boss 專用子彈類別\n
     """
     
+    # Boss 彈幕一次會有上百顆，固定欄位不配置 __dict__
+    __slots__ = ("x", "y", "bullet_type", "damage", "speed_x", "speed_y", "in_pool",
+                 "width", "height", "color")
+    
     def __init__(self, x, y, bullet_type, damage, speed_x=0, speed_y=4):
         """
         初始化 Boss 子彈\n
@@ -380,30 +392,30 @@ class BossBullet:
         speed_x (float): X 方向速度\n
         speed_y (float): Y 方向速度\n
         """
+        self.reset(x, y, bullet_type, damage, speed_x, speed_y)
+    
+    def reset(self, x, y, bullet_type, damage, speed_x=0, speed_y=4):
+        """
+        重設子彈的所有欄位（物件池重用子彈時呼叫，參數與 __init__ 相同）\n
+        \n
+        參數:\n
+        x (int): 初始 X 座標\n
+        y (int): 初始 Y 座標\n
+        bullet_type (str): 子彈類型\n
+        damage (int): 傷害值\n
+        speed_x (float): X 方向速度\n
+        speed_y (float): Y 方向速度\n
+        """
         self.x = x
         self.y = y
         self.bullet_type = bullet_type
         self.damage = damage
         self.speed_x = speed_x
         self.speed_y = speed_y
+        self.in_pool = False  # 是否已歸還物件池
         
-        # 子彈外觀
-        if bullet_type == "normal":
-            self.width = 6
-            self.height = 12
-            self.color = RED
-        elif bullet_type == "spread":
-            self.width = 5
-            self.height = 10
-            self.color = ORANGE
-        elif bullet_type == "circle":
-            self.width = 4
-            self.height = 8
-            self.color = PURPLE
-        else:
-            self.width = 6
-            self.height = 10
-            self.color = YELLOW
+        # 子彈外觀（寬度, 高度, 顏色）
+        self.width, self.height, self.color = BOSS_BULLET_APPEARANCE.get(bullet_type, (6, 10, YELLOW))
     
     def move(self):
         """
@@ -436,4 +448,8 @@ class BossBullet:
         else:
             # 矩形子彈
             bullet_rect = pygame.Rect(int(self.x), int(self.y), self.width, self.height)
-            pygame.draw.rect(screen, self.color, bullet_rect)
\ No newline at end of file
+            pygame.draw.rect(screen, self.color, bullet_rect)
+
+######################子彈物件池######################
+# Boss Fight 模式的 Boss 子彈物件池
+boss_bullet_pool = BulletPool(BossBullet)
@@ -2,6 +2,53 @@
 import pygame
 import math
 from config import WEAPON_STATS, BOSS_BULLET_STATS, SCREEN_HEIGHT, SCREEN_WIDTH
+from .bullet_pool import BulletPool
+
+######################子彈類型快取######################
+# 子彈類型 → (是否為Boss子彈, 傷害, 顏色, 寬度, 高度, 基礎速度)
+_BULLET_TYPE_CACHE = {}
+
+# (基礎速度, 角度) → (velocity_x, velocity_y)，Boss散彈只有固定幾種角度
+_SPREAD_VELOCITY_CACHE = {}
+
+# 機器人子彈類型 → (傷害, 寬度, 高度, 顏色)
+_ROBOT_BULLET_TYPE_CACHE = {}
+
+def _build_bullet_type_stats(bullet_type):
+    """
+    從設定檔計算子彈類型的屬性並存入快取\n
+    \n
+    參數:\n
+    bullet_type (str): 子彈類型\n
+    \n
+    回傳:\n
+    tuple: (是否為Boss子彈, 傷害, 顏色, 寬度, 高度, 基礎速度)\n
+    """
+    is_boss_bullet = bullet_type.startswith("boss_")
+    
+    if is_boss_bullet:
+        # Boss子彈設定
+        if bullet_type in BOSS_BULLET_STATS:
+            bullet_data = BOSS_BULLET_STATS[bullet_type]
+            stats = (True, bullet_data["damage"], bullet_data["color"],
+                     bullet_data["width"], bullet_data["height"], bullet_data["speed"])
+        else:
+            # Boss子彈預設值
+            from config import RED
+            stats = (True, 20, RED, 8, 8, 3)
+    else:
+        # 玩家子彈設定
+        if bullet_type in WEAPON_STATS:
+            weapon_data = WEAPON_STATS[bullet_type]
+            stats = (False, weapon_data["damage"], weapon_data["color"],
+                     weapon_data["width"], weapon_data["height"], None)
+        else:
+            # 預設值
+            from config import YELLOW
+            stats = (False, 15, YELLOW, 4, 10, None)
+    
+    _BULLET_TYPE_CACHE[bullet_type] = stats
+    return stats
 
 ######################子彈類別######################
 class Bullet:
@@ -25,6 +72,10 @@ class Bullet:
     is_boss_bullet (bool): 是否為Boss子彈\n
     """
     
+    # 子彈數量最多，用 __slots__ 取代每顆子彈的 __dict__
+    __slots__ = ("x", "y", "bullet_type", "in_pool", "is_boss_bullet", "damage", "color",
+                 "width", "height", "velocity_x", "velocity_y")
+    
     def __init__(self, x, y, bullet_type="basic", angle=None):
         """
         初始化子彈\n
@@ -35,61 +86,44 @@ class Bullet:
         bullet_type (str): 武器類型，預設為 'basic'\n
         angle (float): 發射角度（用於Boss散彈攻擊）\n
         """
+        self.reset(x, y, bullet_type, angle)
+    
+    def reset(self, x, y, bullet_type="basic", angle=None):
+        """
+        重設子彈的所有欄位（物件池重用子彈時呼叫，參數與 __init__ 相同）\n
+        \n
+        參數:\n
+        x (int): 起始 x 座標\n
+        y (int): 起始 y 座標\n
+        bullet_type (str): 武器類型，預設為 'basic'\n
+        angle (float): 發射角度（用於Boss散彈攻擊）\n
+        """
         self.x = float(x)
         self.y = float(y)
         self.bullet_type = bullet_type
+        self.in_pool = False  # 是否已歸還物件池
         
-        # 判斷是否為Boss子彈
-        self.is_boss_bullet = bullet_type.startswith("boss_")
+        # 類型屬性只在第一次使用時從設定檔計算
+        stats = _BULLET_TYPE_CACHE.get(bullet_type)
+        if stats is None:
+            stats = _build_bullet_type_stats(bullet_type)
+        self.is_boss_bullet, self.damage, self.color, self.width, self.height, base_speed = stats
         
         if self.is_boss_bullet:
-            # Boss子彈設定
-            if bullet_type in BOSS_BULLET_STATS:
-                bullet_data = BOSS_BULLET_STATS[bullet_type]
-                self.damage = bullet_data["damage"]
-                self.color = bullet_data["color"]
-                self.width = bullet_data["width"]
-                self.height = bullet_data["height"]
-                base_speed = bullet_data["speed"]
-            else:
-                # Boss子彈預設值
-                from config import RED
-                self.damage = 20
-                self.color = RED
-                self.width = 8
-                self.height = 8
-                base_speed = 3
-            
             # 設定Boss子彈的移動方向
-            if bullet_type == "boss_garbage":
-                # 垃圾攻擊：直線向下
-                self.velocity_x = 0
-                self.velocity_y = base_speed
-            elif bullet_type == "boss_spread" and angle is not None:
-                # 散彈攻擊：根據角度計算速度分量
-                angle_rad = math.radians(angle)
-                self.velocity_x = base_speed * math.sin(angle_rad)
-                self.velocity_y = base_speed * math.cos(angle_rad)
+            if bullet_type == "boss_spread" and angle is not None:
+                # 散彈攻擊：根據角度計算速度分量（同一角度只計算一次三角函數）
+                velocity = _SPREAD_VELOCITY_CACHE.get((base_speed, angle))
+                if velocity is None:
+                    angle_rad = math.radians(angle)
+                    velocity = (base_speed * math.sin(angle_rad), base_speed * math.cos(angle_rad))
+                    _SPREAD_VELOCITY_CACHE[(base_speed, angle)] = velocity
+                self.velocity_x, self.velocity_y = velocity
             else:
-                # 預設向下移動
+                # 垃圾攻擊與其他Boss子彈：直線向下
                 self.velocity_x = 0
                 self.velocity_y = base_speed
         else:
-            # 玩家子彈設定
-            if bullet_type in WEAPON_STATS:
-                weapon_data = WEAPON_STATS[bullet_type]
-                self.damage = weapon_data["damage"]
-                self.color = weapon_data["color"]
-                self.width = weapon_data["width"]
-                self.height = weapon_data["height"]
-            else:
-                # 預設值
-                from config import YELLOW
-                self.damage = 15
-                self.color = YELLOW
-                self.width = 4
-                self.height = 10
-            
             # 玩家子彈向上移動
             self.velocity_x = 0
             self.velocity_y = -8  # 負值表示向上
@@ -187,6 +221,9 @@ class RobotBullet:
     bullet_type (str): 武器類型\n
     """
     
+    __slots__ = ("x", "y", "bullet_type", "in_pool", "damage", "width", "height", "color",
+                 "velocity_x", "velocity_y")
+    
     def __init__(self, x, y, bullet_type="basic"):
         """
         初始化機器人子彈\n
@@ -196,25 +233,36 @@ class RobotBullet:
         y (int): 起始 y 座標\n
         bullet_type (str): 武器類型\n
         """
+        self.reset(x, y, bullet_type)
+    
+    def reset(self, x, y, bullet_type="basic"):
+        """
+        重設機器人子彈的所有欄位（物件池重用子彈時呼叫，參數與 __init__ 相同）\n
+        \n
+        參數:\n
+        x (int): 起始 x 座標\n
+        y (int): 起始 y 座標\n
+        bullet_type (str): 武器類型\n
+        """
         self.x = float(x)
         self.y = float(y)
         self.bullet_type = bullet_type
+        self.in_pool = False  # 是否已歸還物件池
         
-        # 從武器設定載入屬性
-        if bullet_type in WEAPON_STATS:
-            weapon_data = WEAPON_STATS[bullet_type]
-            self.damage = weapon_data["damage"]
-            self.width = weapon_data["width"]
-            self.height = weapon_data["height"]
-            # 機器人子彈使用較暗的紅色系
-            original_color = weapon_data["color"]
-            self.color = self._convert_to_robot_color(original_color)
-        else:
-            # 預設值
-            self.damage = 15
-            self.width = 4
-            self.height = 10
-            self.color = (200, 50, 50)  # 暗紅色
+        # 類型屬性只在第一次使用時從設定檔計算
+        stats = _ROBOT_BULLET_TYPE_CACHE.get(bullet_type)
+        if stats is None:
+            # 從武器設定載入屬性
+            if bullet_type in WEAPON_STATS:
+                weapon_data = WEAPON_STATS[bullet_type]
+                # 機器人子彈使用較暗的紅色系
+                stats = (weapon_data["damage"], weapon_data["width"], weapon_data["height"],
+                         self._convert_to_robot_color(weapon_data["color"]))
+            else:
+                # 預設值（暗紅色）
+                stats = (15, 4, 10, (200, 50, 50))
+            _ROBOT_BULLET_TYPE_CACHE[bullet_type] = stats
+        self.damage, self.width, self.height, self.color = stats
         
         # 機器人子彈向下移動
         self.velocity_x = 0
@@ -302,4 +350,11 @@ class RobotBullet:
             return True
         if self.y < -self.height or self.y > SCREEN_HEIGHT:
             return True
-        return False
\ No newline at end of file
+        return False
+
+######################子彈物件池######################
+# 玩家、盟友與經典模式 Boss 共用的子彈物件池
+bullet_pool = BulletPool(Bullet)
+
+# 機器人子彈物件池
+robot_bullet_pool = BulletPool(RobotBullet)
@@ -0,0 +1,155 @@
+######################載入套件######################
+from config import BULLET_POOL_SETTINGS
+
+######################子彈物件池######################
+# 子彈類別 → 物件池（release_bullet 依子彈類別找到對應的物件池）
+_pools_by_class = {}
+
+class BulletPool:
+    """
+    子彈物件池 - 重複使用已失效的子彈物件\n
+    \n
+    持續射擊時每幀都會產生和丟棄大量子彈，物件池把失效的子彈收回空閒串列，\n
+    下次射擊時呼叫子彈的 reset() 原地重設欄位，不必重新建立物件，\n
+    讓配置速率維持平穩並減少 GC 停頓。\n
+    \n
+    子彈類別需要提供 reset()，參數與 __init__ 相同。\n
+    """
+
+    def __init__(self, bullet_class):
+        """
+        初始化物件池\n
+        \n
+        參數:\n
+        bullet_class (type): 子彈類別\n
+        """
+        self.bullet_class = bullet_class
+        self.free_list = []
+        self.max_free = BULLET_POOL_SETTINGS["max_free"]
+
+        # 統計資料
+        self.created = 0       # 實際新建的物件數
+        self.reused = 0        # 從空閒串列取出重用的次數
+        self.in_use = 0        # 目前借出中的物件數
+        self.high_water = 0    # 同時借出數量的最高紀錄
+
+        _pools_by_class[bullet_class] = self
+
+    def acquire(self, *args):
+        """
+        取得一顆子彈（有空閒物件時重用，否則新建）\n
+        \n
+        參數:\n
+        *args: 傳給子彈 __init__/reset 的參數\n
+        \n
+        回傳:\n
+        object: 子彈物件\n
+        """
+        if self.free_list:
+            bullet = self.free_list.pop()
+            bullet.reset(*args)
+            self.reused += 1
+        else:
+            bullet = self.bullet_class(*args)
+            self.created += 1
+
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return bullet
+
+    def acquire_blank(self):
+        """
+        取得一顆欄位尚未設定的子彈（還原快照時使用，由呼叫端填入所有欄位）\n
+        \n
+        回傳:\n
+        object: 子彈物件\n
+        """
+        if self.free_list:
+            bullet = self.free_list.pop()
+            self.reused += 1
+        else:
+            bullet = self.bullet_class.__new__(self.bullet_class)
+            self.created += 1
+
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return bullet
+
+    def release(self, bullet):
+        """
+        歸還失效的子彈（呼叫端必須已經把它從所有串列中移除）\n
+        \n
+        參數:\n
+        bullet (object): 子彈物件\n
+        """
+        # 已經在空閒串列中的子彈不重複收回，避免同一個物件被借出兩次
+        if bullet.in_pool:
+            return
+        bullet.in_pool = True
+
+        if self.in_use > 0:
+            self.in_use -= 1
+        if len(self.free_list) < self.max_free:
+            self.free_list.append(bullet)
+
+    def get_stats(self):
+        """
+        取得物件池統計資料\n
+        \n
+        回傳:\n
+        dict: 包含 created、reused、in_use、free、high_water\n
+        """
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "in_use": self.in_use,
+            "free": len(self.free_list),
+            "high_water": self.high_water
+        }
+
+def release_bullet(bullet):
+    """
+    把子彈歸還給所屬類別的物件池（沒有物件池的類別直接忽略）\n
+    \n
+    參數:\n
+    bullet (object): 子彈物件\n
+    """
+    pool = _pools_by_class.get(type(bullet))
+    if pool is not None:
+        pool.release(bullet)
+
+def acquire_blank_bullet(bullet_class):
+    """
+    從子彈類別的物件池取得一顆欄位尚未設定的子彈（還原快照時使用）\n
+    \n
+    參數:\n
+    bullet_class (type): 子彈類別\n
+    \n
+    回傳:\n
+    object: 子彈物件，沒有物件池的類別回傳 None\n
+    """
+    pool = _pools_by_class.get(bullet_class)
+    if pool is None:
+        return None
+    return pool.acquire_blank()
+
+def release_bullets(bullets):
+    """
+    一次歸還多顆子彈\n
+    \n
+    參數:\n
+    bullets (iterable): 子彈物件\n
+    """
+    for bullet in bullets:
+        release_bullet(bullet)
+
+def get_bullet_pool_stats():
+    """
+    取得所有子彈物件池的統計資料\n
+    \n
+    回傳:\n
+    dict: 子彈類別名稱 → 統計字典\n
+    """
+    return {bullet_class.__name__: pool.get_stats() for bullet_class, pool in _pools_by_class.items()}
@@ -24,6 +24,10 @@ class Enemy:
     enemy_type (str): 敵人類型，影響外觀和行為\n
     """
     
+    # 敵人欄位固定，使用 __slots__ 節省每個實例的記憶體
+    __slots__ = ("x", "y", "enemy_type", "movement_counter", "width", "height", "health",
+                 "speed", "color", "score_value", "star_value")
+    
     def __init__(self, x, y, enemy_type="basic"):
         """
         初始化敵人\n
@@ -0,0 +1,149 @@
+######################實體串列######################
+class EntityList:
+    """
+    實體串列 - 先標記失效、每幀再一次壓縮的遊戲物件容器\n
+    \n
+    原本的寫法是「for obj in objects[:]: ... objects.remove(obj)」，\n
+    每次迴圈都複製一份串列，每次移除又要 O(n) 搜尋和搬移。\n
+    改用 EntityList 後，更新迴圈只呼叫 kill() 把物件標記為失效，\n
+    走訪時會自動略過已失效的物件，每幀結束時呼叫一次 compact()\n
+    以 O(n) 原地移除所有失效物件，並保持剩下物件的先後順序（繪製順序不變）。\n
+    \n
+    可以指定 on_remove 回呼，物件真正被移除時呼叫（例如把子彈歸還物件池）。\n
+    """
+
+    def __init__(self, items=None, on_remove=None):
+        """
+        初始化實體串列\n
+        \n
+        參數:\n
+        items (iterable): 初始物件\n
+        on_remove (callable): 物件被移除時呼叫的函式，None 表示不處理\n
+        """
+        self.items = list(items) if items is not None else []
+        self.dead_ids = set()  # 已標記失效、等待壓縮的物件 id
+        self.on_remove = on_remove
+
+    ######################新增與標記######################
+    def append(self, entity):
+        """
+        新增一個物件\n
+        \n
+        參數:\n
+        entity (object): 遊戲物件\n
+        """
+        self.items.append(entity)
+        if self.dead_ids:
+            # 先前標記過的物件（或剛好重複使用同一個 id 的新物件）重新加入時不算失效
+            self.dead_ids.discard(id(entity))
+
+    def extend(self, entities):
+        """
+        一次新增多個物件\n
+        \n
+        參數:\n
+        entities (iterable): 遊戲物件\n
+        """
+        if self.dead_ids:
+            entities = list(entities)
+            self.dead_ids.difference_update(id(entity) for entity in entities)
+        self.items.extend(entities)
+
+    def kill(self, entity):
+        """
+        把物件標記為失效（實際移除等到 compact()；標記不在串列中的物件不影響數量）\n
+        \n
+        參數:\n
+        entity (object): 遊戲物件\n
+        """
+        self.dead_ids.add(id(entity))
+
+    def kill_many(self, entities):
+        """
+        一次標記多個物件為失效\n
+        \n
+        參數:\n
+        entities (iterable): 遊戲物件\n
+        """
+        self.dead_ids.update(id(entity) for entity in entities)
+
+    def is_alive(self, entity):
+        """
+        檢查物件是否尚未被標記為失效\n
+        \n
+        參數:\n
+        entity (object): 遊戲物件\n
+        \n
+        回傳:\n
+        bool: True 表示物件仍然有效\n
+        """
+        return id(entity) not in self.dead_ids
+
+    ######################壓縮與清空######################
+    def compact(self):
+        """
+        原地移除所有失效物件（只走訪一次串列，保持原本順序）\n
+        \n
+        回傳:\n
+        int: 移除的物件數量\n
+        """
+        dead_ids = self.dead_ids
+        if not dead_ids:
+            return 0
+
+        items = self.items
+        on_remove = self.on_remove
+        write = 0
+        for entity in items:
+            if id(entity) in dead_ids:
+                if on_remove is not None:
+                    on_remove(entity)
+            else:
+                items[write] = entity
+                write += 1
+
+        removed = len(items) - write
+        del items[write:]
+        dead_ids.clear()
+        return removed
+
+    def clear(self):
+        """
+        移除所有物件（每個物件都會呼叫 on_remove）\n
+        """
+        if self.on_remove is not None:
+            for entity in self.items:
+                self.on_remove(entity)
+        self.items.clear()
+        self.dead_ids.clear()
+
+    ######################走訪######################
+    def __iter__(self):
+        """
+        逐一產生仍然有效的物件（走訪途中被標記的物件也會立即略過）\n
+        """
+        dead_ids = self.dead_ids
+        for entity in self.items:
+            if not dead_ids or id(entity) not in dead_ids:
+                yield entity
+
+    def __len__(self):
+        """
+        回傳仍然有效的物件數量\n
+        \n
+        有待壓縮的標記時逐一計算，被標記的物件不一定在串列中\n
+        （例如同一個物件在兩個串列之間移動，或標記了早已移除的物件）。\n
+        """
+        dead_ids = self.dead_ids
+        if not dead_ids:
+            return len(self.items)
+        return sum(1 for entity in self.items if id(entity) not in dead_ids)
+
+    def __bool__(self):
+        """
+        串列中是否還有有效的物件\n
+        """
+        dead_ids = self.dead_ids
+        if not dead_ids:
+            return bool(self.items)
+        return any(id(entity) not in dead_ids for entity in self.items)
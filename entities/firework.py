@@ -1,8 +1,45 @@
 ######################載入套件######################
 import pygame
-import random
 import math
 
+######################煙火粒子類別######################
+class FireworkParticle:
+    """
+    煙火粒子 - 單一顆煙火火花\n
+    \n
+    每個煙火有 20 顆粒子，改用固定欄位的類別取代字典，\n
+    每顆粒子不必再帶一個 dict，欄位存取也比字典查詢快。\n
+    \n
+    屬性:\n
+    x (float): 粒子的 x 座標\n
+    y (float): 粒子的 y 座標\n
+    vx (float): x 方向速度\n
+    vy (float): y 方向速度\n
+    color (tuple): 粒子顏色\n
+    life (int): 剩餘壽命（幀數）\n
+    """
+    
+    __slots__ = ("x", "y", "vx", "vy", "color", "life")
+    
+    def __init__(self, x, y, vx, vy, color, life):
+        """
+        初始化煙火粒子\n
+        \n
+        參數:\n
+        x (int): 起始 x 座標\n
+        y (int): 起始 y 座標\n
+        vx (float): x 方向速度\n
+        vy (float): y 方向速度\n
+        color (tuple): 粒子顏色\n
+        life (int): 壽命（幀數）\n
+        """
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.color = color
+        self.life = life
+
 ######################煙火效果類別######################
 class Firework:
     """
@@ -27,21 +64,22 @@ class Firework:
         self.particles = []
         self.life = 60  # 煙火持續時間
         
-        # 匯入所需顏色
-        from config import RED, GREEN, BLUE, YELLOW, CYAN, MAGENTA, WHITE
+        # 匯入所需顏色和視覺效果亂數串流
+        from config import RED, GREEN, BLUE, YELLOW, CYAN, MAGENTA, WHITE, get_rng
+        rng = get_rng("visuals")
         
         # 生成煙火粒子
         for _ in range(20):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 8)
-            particle = {
-                'x': x,
-                'y': y,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'color': random.choice([RED, GREEN, BLUE, YELLOW, CYAN, MAGENTA, WHITE]),
-                'life': random.randint(30, 60)
-            }
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(2, 8)
+            particle = FireworkParticle(
+                x,
+                y,
+                math.cos(angle) * speed,
+                math.sin(angle) * speed,
+                rng.choice([RED, GREEN, BLUE, YELLOW, CYAN, MAGENTA, WHITE]),
+                rng.randint(30, 60)
+            )
             self.particles.append(particle)
     
     def update(self):
@@ -51,15 +89,14 @@ class Firework:
         self.life -= 1
         
         # 更新所有粒子
-        for particle in self.particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['vy'] += 0.2  # 重力效果
-            particle['life'] -= 1
-            
-            # 移除死亡的粒子
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
+        for particle in self.particles:
+            particle.x += particle.vx
+            particle.y += particle.vy
+            particle.vy += 0.2  # 重力效果
+            particle.life -= 1
+        
+        # 一次移除死亡的粒子（所有粒子同時誕生、壽命相近，通常會成批死亡）
+        self.particles = [particle for particle in self.particles if particle.life > 0]
     
     def draw(self, screen):
         """
@@ -69,8 +106,8 @@ class Firework:
         screen (pygame.Surface): 遊戲畫面物件\n
         """
         for particle in self.particles:
-            pygame.draw.circle(screen, particle['color'], 
-                             (int(particle['x']), int(particle['y'])), 3)
+            pygame.draw.circle(screen, particle.color, 
+                             (int(particle.x), int(particle.y)), 3)
     
     def is_dead(self):
         """
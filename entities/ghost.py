@@ -37,6 +37,7 @@ class Ghost:
         self.alive = False  # 幽靈不算活著
         self.is_ghost = True
         self.alpha = 100  # 半透明
+        self.age = 0  # 變成幽靈後經過的更新次數（下擺波浪動畫用）
         
         # 外觀屬性
         self.color = (150, 150, 150)  # 灰色
@@ -59,6 +60,8 @@ class Ghost:
         回傳:\n
         str: 如果按下T鍵返回 "return_to_menu"，否則返回 None\n
         """
+        self.age += 1
+        
         # 處理移動
         if self.is_human:
             action = self._handle_human_movement(keys)
@@ -115,12 +118,12 @@ class Ghost:
         """
         處理AI幽靈移動（簡單的隨機飛行）\n
         """
-        import random
+        rng = get_rng("ai")
         
         # AI幽靈隨機移動
-        if random.randint(1, 100) <= 5:  # 5%機率改變方向
-            self.x += random.randint(-self.speed, self.speed)
-            self.y += random.randint(-self.speed, self.speed)
+        if rng.randint(1, 100) <= 5:  # 5%機率改變方向
+            self.x += rng.randint(-self.speed, self.speed)
+            self.y += rng.randint(-self.speed, self.speed)
             
             # 保持在地圖附近
             self.x = max(0, min(HIDE_SEEK_MAP["map_width"], self.x))
@@ -198,10 +201,11 @@ class Ghost:
         pygame.draw.circle(surface, eye_color, (left_eye_x, eye_y), 2)
         pygame.draw.circle(surface, eye_color, (right_eye_x, eye_y), 2)
         
-        # 繪製波浪狀的下擺
+        # 繪製波浪狀的下擺（每秒擺動 10 弧度，以更新次數計時，重播和離線繪製的畫面才會相同）
+        wave_phase = self.age * 10 / SIMULATION_SETTINGS["tick_rate"]
         wave_points = []
         for i in range(0, self.width, 3):
-            wave_y = self.height - 5 + int(3 * math.sin(i * 0.5 + pygame.time.get_ticks() * 0.01))
+            wave_y = self.height - 5 + int(3 * math.sin(i * 0.5 + wave_phase))
             wave_points.append((i, wave_y))
         
         if len(wave_points) > 2:
@@ -24,13 +24,13 @@ class HideSeekMap:
         參數:\n
         seed (int): 隨機種子，用於生成固定地圖佈局\n
         """
-        # 設定隨機種子（如果提供）
+        # 地圖使用自己的亂數產生器，同一個種子永遠生成相同的佈局，
+        # 也不會重設其他系統使用的亂數
         if seed is not None:
-            random.seed(seed)
             self.seed = seed
         else:
-            self.seed = random.randint(1, 10000)
-            random.seed(self.seed)
+            self.seed = get_rng("map").randint(1, 10000)
+        self.random = random.Random(self.seed)
         
         # 地圖基本屬性
         self.width = HIDE_SEEK_MAP["map_width"]
@@ -70,10 +70,10 @@ class HideSeekMap:
             attempts += 1
             
             # 隨機生成障礙物尺寸和位置
-            width = random.randint(min_size, max_size)
-            height = random.randint(min_size, max_size)
-            x = random.randint(width // 2, self.width - width // 2)
-            y = random.randint(height // 2, self.height - height // 2)
+            width = self.random.randint(min_size, max_size)
+            height = self.random.randint(min_size, max_size)
+            x = self.random.randint(width // 2, self.width - width // 2)
+            y = self.random.randint(height // 2, self.height - height // 2)
             
             obstacle_rect = pygame.Rect(x - width // 2, y - height // 2, width, height)
             
@@ -109,10 +109,10 @@ class HideSeekMap:
         # 生成隨機星星作為背景裝飾
         star_count = 150
         for _ in range(star_count):
-            star_x = random.randint(0, self.width)
-            star_y = random.randint(0, self.height)
-            star_size = random.randint(1, 3)
-            star_brightness = random.randint(100, 255)
+            star_x = self.random.randint(0, self.width)
+            star_y = self.random.randint(0, self.height)
+            star_size = self.random.randint(1, 3)
+            star_brightness = self.random.randint(100, 255)
             
             decoration = {
                 "type": "star",
@@ -126,9 +126,9 @@ class HideSeekMap:
         # 生成小行星裝飾
         asteroid_count = 20
         for _ in range(asteroid_count):
-            asteroid_x = random.randint(50, self.width - 50)
-            asteroid_y = random.randint(50, self.height - 50)
-            asteroid_size = random.randint(8, 20)
+            asteroid_x = self.random.randint(50, self.width - 50)
+            asteroid_y = self.random.randint(50, self.height - 50)
+            asteroid_size = self.random.randint(8, 20)
             
             # 確保小行星不與障礙物重疊
             asteroid_rect = pygame.Rect(asteroid_x - asteroid_size, asteroid_y - asteroid_size,
@@ -146,7 +146,7 @@ class HideSeekMap:
                     "x": asteroid_x,
                     "y": asteroid_y,
                     "size": asteroid_size,
-                    "color": (random.randint(100, 150), random.randint(80, 120), random.randint(60, 100))
+                    "color": (self.random.randint(100, 150), self.random.randint(80, 120), self.random.randint(60, 100))
                 }
                 self.decorations.append(decoration)
     
@@ -183,7 +183,7 @@ class HideSeekMap:
         tuple: (x, y) 安全座標，如果沒有安全位置則返回地圖中央\n
         """
         if self.safe_zones:
-            return random.choice(self.safe_zones)
+            return self.random.choice(self.safe_zones)
         else:
             # 如果沒有安全區域，返回地圖中央
             return (self.width // 2, self.height // 2)
@@ -234,11 +234,11 @@ class HideSeekMap:
                 
                 # 從安全區域中選擇一個位置
                 if self.safe_zones:
-                    x, y = random.choice(self.safe_zones)
+                    x, y = self.random.choice(self.safe_zones)
                 else:
                     # 如果沒有安全區域，隨機選擇位置
-                    x = random.randint(100, self.width - 100)
-                    y = random.randint(100, self.height - 100)
+                    x = self.random.randint(100, self.width - 100)
+                    y = self.random.randint(100, self.height - 100)
                 
                 # 檢查與現有位置的距離
                 valid_position = True
@@ -272,8 +272,8 @@ class HideSeekMap:
             
             # 如果找不到有效位置，使用隨機位置
             if len(positions) <= i:
-                x = random.randint(100, self.width - 100)
-                y = random.randint(100, self.height - 100)
+                x = self.random.randint(100, self.width - 100)
+                y = self.random.randint(100, self.height - 100)
                 positions.append((x, y))
         
         return positions
@@ -1,8 +1,6 @@
 ######################載入套件######################
 import pygame
 import math
-import random
-import time
 from config import *
 
 ######################躲貓貓玩家類別######################
@@ -47,15 +45,12 @@ class HideSeekPlayer:
         # 角色身分（在遊戲開始時分配）
         self.role = "hider"  # "seeker" 或 "hider"
         
-        # 隨機分配太空船樣式 - 每個玩家使用不同的隨機種子
+        # 隨機分配太空船樣式 - 從生成串流依序抽取，每個玩家自然得到不同的結果
         style_keys = list(HIDE_SEEK_SPACESHIP_STYLES.keys())
-        # 為每個玩家建立獨特的隨機種子（玩家ID + 當前時間）
-        unique_seed = player_id * 12345 + int(time.time() * 1000) % 100000
-        random.seed(unique_seed)
-        self.spaceship_style = random.choice(style_keys)
+        self.spaceship_style = get_rng("spawning").choice(style_keys)
         style_config = HIDE_SEEK_SPACESHIP_STYLES[self.spaceship_style]
         
-        print(f"玩家 {player_id} 樣式種子：{unique_seed}，選中樣式：{self.spaceship_style}")
+        print(f"玩家 {player_id} 選中樣式：{self.spaceship_style}")
         
         # 根據樣式調整尺寸
         size_mod = style_config["size_modifier"]
@@ -73,11 +68,8 @@ class HideSeekPlayer:
         else:
             # 如果沒有指定道具，隨機分配
             potion_types = list(HIDE_SEEK_POTIONS.keys())
-            # 使用獨特種子確保真正隨機
-            potion_seed = player_id * 54321 + int(time.time() * 1000) % 100000
-            random.seed(potion_seed)
-            self.potion_type = random.choice(potion_types)
-            print(f"玩家 {player_id} 道具種子：{potion_seed}，選中道具：{self.potion_type}")
+            self.potion_type = get_rng("spawning").choice(potion_types)
+            print(f"玩家 {player_id} 選中道具：{self.potion_type}")
         
         self.potion_uses = HIDE_SEEK_POTIONS[self.potion_type]["uses"]
         
@@ -101,11 +93,11 @@ class HideSeekPlayer:
         
         # AI相關屬性
         if not self.is_human:
-            self.ai_direction_x = random.choice([-1, 0, 1])
-            self.ai_direction_y = random.choice([-1, 0, 1])
+            self.ai_direction_x = get_rng("ai").choice([-1, 0, 1])
+            self.ai_direction_y = get_rng("ai").choice([-1, 0, 1])
             self.ai_change_timer = 0
             self.ai_target_player = None
-            self.ai_last_potion_use = 0
+            self.ai_potion_cooldown = 0  # 距離下次可以使用道具還剩幾幀
         
         # 相機偏移（只有真人玩家需要）
         self.camera_x = 0
@@ -155,6 +147,10 @@ class HideSeekPlayer:
         if self.special_attack_cooldown > 0:
             self.special_attack_cooldown -= 1
         
+        # 更新AI道具冷卻時間（以幀計算，和模擬步數同步）
+        if not self.is_human and self.ai_potion_cooldown > 0:
+            self.ai_potion_cooldown -= 1
+        
         # 更新無敵時間
         if self.invulnerable_timer > 0:
             self.invulnerable_timer -= 1
@@ -336,9 +332,10 @@ class HideSeekPlayer:
         """
         AI隨機移動\n
         """
-        if random.randint(1, 100) <= HIDE_SEEK_AI["random_movement_chance"]:
+        rng = get_rng("ai")
+        if rng.randint(1, 100) <= HIDE_SEEK_AI["random_movement_chance"]:
             # 使用標準化的隨機方向向量
-            angle = random.uniform(0, 2 * math.pi)
+            angle = rng.uniform(0, 2 * math.pi)
             self.ai_direction_x = math.cos(angle)
             self.ai_direction_y = math.sin(angle)
     
@@ -355,7 +352,7 @@ class HideSeekPlayer:
         
         if distance_to_center < 200:
             # 移向隨機邊緣
-            angle = random.uniform(0, 2 * math.pi)
+            angle = get_rng("ai").uniform(0, 2 * math.pi)
             self.ai_direction_x = math.cos(angle)
             self.ai_direction_y = math.sin(angle)
         else:
@@ -498,7 +495,7 @@ class HideSeekPlayer:
                     if not player.freeze_immune:
                         player.frozen = True
                         # 隨機設定凍結時間為 0.5-1 秒（60fps，所以 30-60 幀）- 從原本1-3秒縮短
-                        freeze_frames = random.randint(30, 60)  # 30-60幀 = 0.5-1秒
+                        freeze_frames = get_rng("combat").randint(30, 60)  # 30-60幀 = 0.5-1秒
                         player.freeze_timer = freeze_frames
                         freeze_seconds = freeze_frames / 60
                         print(f"躲藏者 {self.name} 冰凍了搜尋者 {player.name}，持續時間：{freeze_seconds:.1f}秒")
@@ -540,8 +537,8 @@ class HideSeekPlayer:
         
         elif self.potion_type == "teleport":
             # 隨機傳送到地圖上的安全位置
-            safe_x = random.randint(50, HIDE_SEEK_MAP["map_width"] - 50)
-            safe_y = random.randint(50, HIDE_SEEK_MAP["map_height"] - 50)
+            safe_x = get_rng("combat").randint(50, HIDE_SEEK_MAP["map_width"] - 50)
+            safe_y = get_rng("combat").randint(50, HIDE_SEEK_MAP["map_height"] - 50)
             self.teleport_to_position(safe_x, safe_y)
         
         print(f"玩家 {self.name} 使用了 {potion_config['name']}，剩餘 {self.potion_uses} 次")
@@ -555,8 +552,7 @@ class HideSeekPlayer:
             return
         
         # 檢查冷卻時間
-        current_time = pygame.time.get_ticks()
-        if current_time - self.ai_last_potion_use < HIDE_SEEK_AI["potion_use_cooldown"] * 1000 / 60:
+        if self.ai_potion_cooldown > 0:
             return
         
         # 根據情況決定是否使用道具
@@ -571,7 +567,7 @@ class HideSeekPlayer:
         
         if should_use:
             if self.use_potion():
-                self.ai_last_potion_use = current_time
+                self.ai_potion_cooldown = HIDE_SEEK_AI["potion_use_cooldown"]
     
     def draw(self, screen, camera_x=0, camera_y=0):
         """
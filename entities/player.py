@@ -104,8 +104,8 @@ class Player:
             # 重置射擊冷卻時間
             self.shoot_cooldown = 10  # 10 幀才能再射擊一次
             
-            from entities.bullet import Bullet
-            return Bullet(bullet_x, bullet_y, self.current_weapon)
+            from entities.bullet import bullet_pool
+            return bullet_pool.acquire(bullet_x, bullet_y, self.current_weapon)
         return None
     
     def update(self):
@@ -171,35 +171,35 @@ class Player:
         if self.special_attack_cooldown > 0:
             return []
         
-        from entities.bullet import Bullet
+        from entities.bullet import bullet_pool
         bullets = []
         center_x = self.x + self.width // 2
         stats = SPACESHIP_STATS[self.spaceship_type]
         
         if self.spaceship_type == "explorer":
             # 探索者：三重射擊
-            bullets.append(Bullet(center_x - 10, self.y, self.current_weapon))
-            bullets.append(Bullet(center_x, self.y, self.current_weapon))
-            bullets.append(Bullet(center_x + 10, self.y, self.current_weapon))
+            bullets.append(bullet_pool.acquire(center_x - 10, self.y, self.current_weapon))
+            bullets.append(bullet_pool.acquire(center_x, self.y, self.current_weapon))
+            bullets.append(bullet_pool.acquire(center_x + 10, self.y, self.current_weapon))
             self.special_attack_cooldown = stats["special_cooldown"]
         elif self.spaceship_type == "fighter":
             # 戰鬥機：快速連射
             for i in range(5):
-                bullets.append(Bullet(center_x - 5 + i * 2, self.y - i * 5, self.current_weapon))
+                bullets.append(bullet_pool.acquire(center_x - 5 + i * 2, self.y - i * 5, self.current_weapon))
             self.special_attack_cooldown = stats["special_cooldown"]
         elif self.spaceship_type == "interceptor":
             # 攔截機：散射攻擊
             for angle in [-30, -15, 0, 15, 30]:
-                bullet = Bullet(center_x, self.y, self.current_weapon)
+                bullet = bullet_pool.acquire(center_x, self.y, self.current_weapon)
                 bullets.append(bullet)
             self.special_attack_cooldown = stats["special_cooldown"]
         elif self.spaceship_type == "destroyer":
             # 驅逐艦：重型飛彈
-            bullets.append(Bullet(center_x, self.y, "missile"))
+            bullets.append(bullet_pool.acquire(center_x, self.y, "missile"))
             self.special_attack_cooldown = stats["special_cooldown"]
         elif self.spaceship_type == "battleship":
             # 戰艦：離子砲轟擊
-            bullets.append(Bullet(center_x, self.y, "ion_cannon"))
+            bullets.append(bullet_pool.acquire(center_x, self.y, "ion_cannon"))
             self.special_attack_cooldown = stats["special_cooldown"]
         
         return bullets
@@ -1,6 +1,5 @@
 ######################載入套件######################
 import pygame
-import random
 from config import SCREEN_HEIGHT, GIFT_STATS
 
 ######################道具掉落類別######################
@@ -24,6 +23,8 @@ class PowerUp:
     speed (int): 掉落速度\n
     """
     
+    __slots__ = ("x", "y", "powerup_type", "speed", "width", "height", "color")
+    
     def __init__(self, x, y, powerup_type="star"):
         """
         初始化道具\n
@@ -139,7 +140,7 @@ class PowerUp:
             pygame.draw.circle(screen, (139, 0, 0), (bow_x, bow_y), 2)  # 深紅色中心
             
             # 發光效果（簡單閃爍）
-            if random.randint(1, 10) <= 3:  # 30%機率閃爍
+            if get_rng("visuals").randint(1, 10) <= 3:  # 30%機率閃爍
                 pygame.draw.rect(screen, WHITE, (self.x - 2, self.y - 2, self.width + 4, self.height + 4), 1)
     
     def is_off_screen(self):
@@ -198,7 +199,7 @@ class PowerUp:
         """
         # 隨機選擇一種藥水效果
         potion_types = ["health_potion", "speed_potion", "protect_potion"]
-        chosen_potion = random.choice(potion_types)
+        chosen_potion = get_rng("drops").choice(potion_types)
         
         if chosen_potion == "health_potion":
             # 給玩家2個回血藥水作為Boss獎勵
@@ -0,0 +1,558 @@
+######################載入套件######################
+import copy
+import sys
+from array import array
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
+
+# NumPy 為選用套件：沒有安裝時改用純 Python 串列運算（功能相同，只是比較慢）
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 欄位名稱、NumPy 型別、array 型別代碼（快照打包時使用，兩者的每個元素大小相同）
+_COLUMNS = (("x", "float64", "d"), ("y", "float64", "d"), ("vx", "float64", "d"), ("vy", "float64", "d"),
+            ("w", "int32", "i"), ("h", "int32", "i"), ("damage", "int32", "i"),
+            ("type_id", "int16", "h"), ("team", "int8", "b"))
+# 快照固定以 little-endian 存放欄位，NumPy 欄位直接以原始記憶體寫入和讀出
+_SNAPSHOT_DTYPES = {name: np.dtype(dtype).newbyteorder("<") for name, dtype, _ in _COLUMNS} if np is not None else {}
+
+######################陣列式子彈儲存區######################
+class ProjectileStore:
+    """
+    陣列式子彈儲存區 - 以「欄位陣列」(struct-of-arrays) 保存大量子彈\n
+    \n
+    每顆子彈不再是獨立的 Python 物件，而是各欄位陣列中的一列：\n
+    x、y、vx、vy、w、h、damage、type_id、team。\n
+    移動、出界剔除、與目標的 AABB 碰撞都是一次 NumPy 運算處理整批子彈，\n
+    適合 Boss 7~8 這類彈幕密集的場景。\n
+    \n
+    既有程式碼（例如盟友閃避子彈）仍可用 for 迴圈走訪，\n
+    每一列會包成輕量的 ProjectileView，提供 x、y、width、height 等屬性。\n
+    繪製時沿用原本子彈類別的 draw()，外觀和原本完全相同。\n
+    \n
+    經典模式、Ship Battle、Boss Fight 的子彈都使用這個儲存區。\n
+    目標只有一個或幾個時（玩家、Boss、機器人、盟友）用 hit_test() 一次檢查整批子彈；\n
+    經典模式的敵人數量多、又會在結算途中死亡，改用 query_grid() 透過 SpatialHash\n
+    找出每顆子彈附近的敵人，再依子彈順序結算「先命中的敵人先死」。\n
+    """
+
+    # 陣營代碼
+    TEAM_PLAYER = 0
+    TEAM_ALLY = 1
+    TEAM_ENEMY = 2
+
+    def __init__(self, default_team=TEAM_ENEMY, capacity=256, cull_margin=20, release=None):
+        """
+        初始化子彈儲存區\n
+        \n
+        參數:\n
+        default_team (int): extend()/add_bullet() 預設使用的陣營\n
+        capacity (int): 初始容量（不足時自動加倍）\n
+        cull_margin (int): 螢幕外保留的邊界寬度，None 表示依子彈尺寸判斷（和 Bullet.is_off_screen 相同）\n
+        release (callable): 子彈物件轉存後呼叫（例如 release_bullet 歸還物件池），None 表示不處理\n
+        """
+        self.default_team = default_team
+        self.cull_margin = cull_margin
+        self.release = release
+        self.count = 0
+        self.capacity = 0
+
+        # 子彈類型登錄：type_id → 原型物件（只保存外觀，不會被修改）
+        self.type_ids = {}
+        self.prototypes = []
+        self.draw_copies = []   # 繪製用的複本，座標每次繪製時覆寫
+
+        self._allocate(max(1, capacity))
+
+    ######################內部工具######################
+    def _allocate(self, capacity):
+        """
+        配置（或擴充）欄位陣列\n
+        \n
+        參數:\n
+        capacity (int): 新容量\n
+        """
+        for name, dtype, _ in _COLUMNS:
+            if np is not None:
+                new_column = np.zeros(capacity, dtype=dtype)
+                if self.count:
+                    new_column[:self.count] = getattr(self, name)[:self.count]
+            else:
+                new_column = (getattr(self, name)[:self.count] if self.count else []) + [0] * (capacity - self.count)
+            setattr(self, name, new_column)
+
+        self.capacity = capacity
+
+    def _register_type(self, bullet):
+        """
+        登錄子彈類型，第一次出現時複製一份原型物件供繪製使用\n
+        \n
+        參數:\n
+        bullet (object): 子彈物件\n
+        \n
+        回傳:\n
+        int: 類型代碼\n
+        """
+        key = (type(bullet), bullet.bullet_type, bullet.color)
+        type_id = self.type_ids.get(key)
+        if type_id is None:
+            type_id = len(self.prototypes)
+            self.type_ids[key] = type_id
+            # 原型只記錄外觀，位置歸零，快照內容才不會取決於哪一顆子彈先登錄
+            prototype = copy.copy(bullet)
+            prototype.x = prototype.y = 0.0
+            self.prototypes.append(prototype)
+            self.draw_copies.append(copy.copy(prototype))
+        return type_id
+
+    def _compact(self, keep):
+        """
+        依保留遮罩壓縮所有欄位（維持原本順序）\n
+        \n
+        參數:\n
+        keep (array 或 list): 每一列是否保留\n
+        """
+        n = self.count
+        if np is not None:
+            kept = int(keep.sum())
+            if kept == n:
+                return
+            for name in ("x", "y", "vx", "vy", "w", "h", "damage", "type_id", "team"):
+                column = getattr(self, name)
+                column[:kept] = column[:n][keep]
+        else:
+            kept = sum(1 for flag in keep if flag)
+            if kept == n:
+                return
+            for name in ("x", "y", "vx", "vy", "w", "h", "damage", "type_id", "team"):
+                column = getattr(self, name)
+                column[:kept] = [value for value, flag in zip(column[:n], keep) if flag]
+        self.count = kept
+
+    ######################新增與移除######################
+    def add(self, x, y, vx, vy, width, height, damage, type_id, team):
+        """
+        新增一顆子彈\n
+        \n
+        參數:\n
+        x, y (float): 左上角座標\n
+        vx, vy (float): 每幀速度\n
+        width, height (int): 尺寸\n
+        damage (int): 傷害值\n
+        type_id (int): 類型代碼（由 add_bullet 登錄取得）\n
+        team (int): 陣營代碼\n
+        \n
+        回傳:\n
+        int: 新子彈所在的列\n
+        """
+        if self.count >= self.capacity:
+            self._allocate(self.capacity * 2)
+
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.w[i] = width
+        self.h[i] = height
+        self.damage[i] = damage
+        self.type_id[i] = type_id
+        self.team[i] = team
+        self.count += 1
+        return i
+
+    def add_bullet(self, bullet, team=None):
+        """
+        把既有的子彈物件（Bullet、RobotBullet、BossBullet）轉存進儲存區\n
+        \n
+        有設定 release 時，轉存完成後子彈物件就交還給 release（呼叫端不能再使用它）。\n
+        \n
+        參數:\n
+        bullet (object): 子彈物件\n
+        team (int): 陣營代碼，預設使用 default_team\n
+        \n
+        回傳:\n
+        int: 新子彈所在的列\n
+        """
+        # BossBullet 使用 speed_x/speed_y，其他子彈使用 velocity_x/velocity_y
+        if hasattr(bullet, "speed_x"):
+            vx, vy = bullet.speed_x, bullet.speed_y
+        else:
+            vx, vy = bullet.velocity_x, bullet.velocity_y
+
+        row = self.add(bullet.x, bullet.y, vx, vy, bullet.width, bullet.height, bullet.damage,
+                       self._register_type(bullet), self.default_team if team is None else team)
+        if self.release is not None:
+            self.release(bullet)
+        return row
+
+    def extend(self, bullets):
+        """
+        一次轉存多顆子彈物件（與 list.extend 用法相同）\n
+        \n
+        參數:\n
+        bullets (iterable): 子彈物件\n
+        """
+        for bullet in bullets:
+            self.add_bullet(bullet)
+
+    def remove_rows(self, rows):
+        """
+        移除指定的列（例如命中目標的子彈）\n
+        \n
+        參數:\n
+        rows (iterable): 要移除的列索引\n
+        """
+        rows = list(rows)
+        if not rows:
+            return
+        if np is not None:
+            keep = np.ones(self.count, dtype=bool)
+            keep[rows] = False
+        else:
+            keep = [True] * self.count
+            for row in rows:
+                keep[row] = False
+        self._compact(keep)
+
+    def clear(self):
+        """
+        清空所有子彈\n
+        """
+        self.count = 0
+
+    ######################快照######################
+    def pack_rows(self):
+        """
+        把所有子彈的欄位打包成 bytes（逐欄連續存放，little-endian）\n
+        \n
+        回傳:\n
+        bytes: 打包結果，交給 unpack_rows() 還原\n
+        """
+        n = self.count
+        if np is not None:
+            # little-endian 的機器上 astype 不會複製，欄位的記憶體直接串接成結果
+            return b"".join(getattr(self, name)[:n].astype(_SNAPSHOT_DTYPES[name], copy=False)
+                            for name, _, _ in _COLUMNS)
+
+        parts = []
+        for name, _, typecode in _COLUMNS:
+            values = array(typecode, getattr(self, name)[:n])
+            if sys.byteorder == "big":
+                values.byteswap()
+            parts.append(values.tobytes())
+        return b"".join(parts)
+
+    def unpack_rows(self, data, count):
+        """
+        以 pack_rows() 的結果取代目前所有子彈\n
+        \n
+        參數:\n
+        data (bytes): pack_rows() 的回傳值\n
+        count (int): 子彈數量\n
+        """
+        if count > self.capacity:
+            self._allocate(max(count, self.capacity * 2))
+
+        offset = 0
+        for name, _, typecode in _COLUMNS:
+            column = getattr(self, name)
+            if np is not None:
+                dtype = _SNAPSHOT_DTYPES[name]
+                column[:count] = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+                offset += dtype.itemsize * count
+                continue
+            values = array(typecode)
+            size = values.itemsize * count
+            values.frombytes(data[offset:offset + size])
+            offset += size
+            if sys.byteorder == "big":
+                values.byteswap()
+            column[:count] = values.tolist()
+        self.count = count
+
+    def set_prototypes(self, prototypes):
+        """
+        以指定的原型物件重建子彈類型登錄（還原快照時使用，類型代碼依串列順序）\n
+        \n
+        參數:\n
+        prototypes (list): 子彈原型物件\n
+        """
+        self.prototypes = list(prototypes)
+        self.draw_copies = [copy.copy(bullet) for bullet in self.prototypes]
+        self.type_ids = {(type(bullet), bullet.bullet_type, bullet.color): type_id
+                         for type_id, bullet in enumerate(self.prototypes)}
+
+    def save_state(self, writer):
+        """
+        把原型物件和所有子彈的欄位寫入快照\n
+        \n
+        參數:\n
+        writer (SnapshotWriter): 快照寫入\n
+        """
+        writer.objects(self.prototypes)
+        writer.values(self.count)
+        writer.blob(self.pack_rows())
+
+    def load_state(self, reader):
+        """
+        從快照還原原型物件和所有子彈\n
+        \n
+        參數:\n
+        reader (SnapshotReader): 快照讀取\n
+        """
+        self.set_prototypes(reader.objects_list(pooled=False))
+        (count,) = reader.values()
+        self.unpack_rows(reader.blob(), count)
+
+    ######################批次運算######################
+    def step(self):
+        """
+        所有子彈依速度移動一幀\n
+        """
+        n = self.count
+        if np is not None:
+            self.x[:n] += self.vx[:n]
+            self.y[:n] += self.vy[:n]
+        else:
+            x, y, vx, vy = self.x, self.y, self.vx, self.vy
+            for i in range(n):
+                x[i] += vx[i]
+                y[i] += vy[i]
+
+    def rewind_positions(self, fraction):
+        """
+        暫時把所有子彈沿速度往回移（繪製插值用）\n
+        \n
+        參數:\n
+        fraction (float): 往回移動幾步（0~1）\n
+        \n
+        回傳:\n
+        tuple: 還原用的資料，交給 restore_positions()\n
+        """
+        n = self.count
+        if np is not None:
+            saved = (n, self.x[:n].copy(), self.y[:n].copy())
+            self.x[:n] -= self.vx[:n] * fraction
+            self.y[:n] -= self.vy[:n] * fraction
+        else:
+            saved = (n, self.x[:n], self.y[:n])
+            x, y, vx, vy = self.x, self.y, self.vx, self.vy
+            for i in range(n):
+                x[i] -= vx[i] * fraction
+                y[i] -= vy[i] * fraction
+        return saved
+
+    def restore_positions(self, saved):
+        """
+        還原 rewind_positions() 之前的位置（整段複製回去，沒有浮點誤差）\n
+        \n
+        參數:\n
+        saved (tuple): rewind_positions() 的回傳值\n
+        """
+        n, x, y = saved
+        self.x[:n] = x
+        self.y[:n] = y
+
+    def cull_off_screen(self):
+        """
+        移除飛出螢幕範圍的子彈\n
+        \n
+        有 cull_margin 時判斷方式與 BossBullet.is_off_screen 相同（固定邊界），\n
+        cull_margin 為 None 時與 Bullet/RobotBullet.is_off_screen 相同（左、上邊界是負的子彈尺寸）。\n
+        """
+        n = self.count
+        if not n:
+            return
+        margin = self.cull_margin
+
+        if np is not None:
+            x = self.x[:n]
+            y = self.y[:n]
+            if margin is None:
+                keep = (x >= -self.w[:n]) & (x <= SCREEN_WIDTH) & (y >= -self.h[:n]) & (y <= SCREEN_HEIGHT)
+            else:
+                keep = (x >= -margin) & (x <= SCREEN_WIDTH + margin) & (y >= -margin) & (y <= SCREEN_HEIGHT + margin)
+        elif margin is None:
+            keep = [-w <= x <= SCREEN_WIDTH and -h <= y <= SCREEN_HEIGHT
+                    for x, y, w, h in zip(self.x[:n], self.y[:n], self.w[:n], self.h[:n])]
+        else:
+            left, top = -margin, -margin
+            right, bottom = SCREEN_WIDTH + margin, SCREEN_HEIGHT + margin
+            keep = [left <= x <= right and top <= y <= bottom
+                    for x, y in zip(self.x[:n], self.y[:n])]
+        self._compact(keep)
+
+    def hit_test(self, targets, team=None):
+        """
+        一次檢查所有子彈與一組目標的 AABB 碰撞\n
+        \n
+        每顆子彈最多只算命中一個目標（目標串列中排在最前面的那一個），\n
+        和原本「先檢查玩家、再依序檢查盟友」的逐一判斷結果相同。\n
+        \n
+        參數:\n
+        targets (list): 目標物件（需有 x、y、width、height 屬性）\n
+        team (int): 只檢查此陣營的子彈，None 表示全部\n
+        \n
+        回傳:\n
+        list: (子彈列索引, 目標索引) 配對，依子彈順序排列\n
+        """
+        n = self.count
+        if not n or not targets:
+            return []
+
+        if np is not None:
+            target_x = np.array([t.x for t in targets], dtype="float64")
+            target_y = np.array([t.y for t in targets], dtype="float64")
+            target_w = np.array([t.width for t in targets], dtype="float64")
+            target_h = np.array([t.height for t in targets], dtype="float64")
+
+            x = self.x[:n, None]
+            y = self.y[:n, None]
+            overlap = ((x < target_x + target_w) & (x + self.w[:n, None] > target_x) &
+                       (y < target_y + target_h) & (y + self.h[:n, None] > target_y))
+            if team is not None:
+                overlap &= (self.team[:n] == team)[:, None]
+
+            rows = np.nonzero(overlap.any(axis=1))[0]
+            if not len(rows):
+                return []
+            first_targets = overlap[rows].argmax(axis=1)
+            return list(zip(rows.tolist(), first_targets.tolist()))
+
+        hits = []
+        target_rects = [(t.x, t.y, t.width, t.height) for t in targets]
+        for i in range(n):
+            if team is not None and self.team[i] != team:
+                continue
+            x, y, w, h = self.x[i], self.y[i], self.w[i], self.h[i]
+            for target_index, (tx, ty, tw, th) in enumerate(target_rects):
+                if x < tx + tw and x + w > tx and y < ty + th and y + h > ty:
+                    hits.append((i, target_index))
+                    break
+        return hits
+
+    def query_grid(self, grid, layer):
+        """
+        透過空間網格找出每顆子彈重疊的物件（目標多、需要依序結算命中時使用）\n
+        \n
+        hit_test() 只回傳第一個目標；目標可能在結算途中死亡時（例如經典模式的敵人），\n
+        呼叫端依子彈順序走訪這裡的結果，自己挑第一個還活著的物件。\n
+        所有子彈一次交給 SpatialHash.query_rects()，每顆子彈只和附近格子裡的物件比對。\n
+        \n
+        參數:\n
+        grid (SpatialHash): 已放入目標的空間網格\n
+        layer (str): 目標所在的圖層\n
+        \n
+        回傳:\n
+        list: (子彈列索引, [物件...]) 配對，依子彈順序排列，物件依放入網格的順序\n
+        """
+        n = self.count
+        if not n:
+            return []
+        return grid.query_rects(self.x[:n], self.y[:n], self.w[:n], self.h[:n], layer)
+
+    def get_memory_usage(self):
+        """
+        計算欄位陣列佔用的位元組數（依已配置的容量計算）\n
+        \n
+        回傳:\n
+        int: 位元組數\n
+        """
+        total = 0
+        for name in ("x", "y", "vx", "vy", "w", "h", "damage", "type_id", "team"):
+            column = getattr(self, name)
+            total += column.nbytes if np is not None else sys.getsizeof(column)
+        return total
+
+    ######################舊程式相容與繪製######################
+    def __len__(self):
+        """
+        回傳目前子彈數量\n
+        """
+        return self.count
+
+    def __iter__(self):
+        """
+        逐一產生每顆子彈的輕量檢視物件（只在下一次移除/壓縮前有效）\n
+        """
+        for i in range(self.count):
+            yield ProjectileView(self, i)
+
+    def draw(self, screen):
+        """
+        繪製所有子彈（借用各類型的繪製用複本呼叫原本的 draw()）\n
+        \n
+        原型物件本身不會被修改，快照內容不會因為有沒有繪製而不同。\n
+        \n
+        參數:\n
+        screen (pygame.Surface): 遊戲畫面物件\n
+        """
+        n = self.count
+        if np is not None:
+            xs, ys, type_ids = self.x[:n].tolist(), self.y[:n].tolist(), self.type_id[:n].tolist()
+        else:
+            xs, ys, type_ids = self.x[:n], self.y[:n], self.type_id[:n]
+
+        draw_copies = self.draw_copies
+        for x, y, type_id in zip(xs, ys, type_ids):
+            bullet = draw_copies[type_id]
+            bullet.x = x
+            bullet.y = y
+            bullet.draw(screen)
+
+######################子彈檢視物件######################
+class ProjectileView:
+    """
+    子彈檢視物件 - 讓既有程式碼可以用屬性存取儲存區中的某一列\n
+    """
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        """
+        初始化檢視物件\n
+        \n
+        參數:\n
+        store (ProjectileStore): 子彈儲存區\n
+        row (int): 列索引\n
+        """
+        self.store = store
+        self.row = row
+
+    @property
+    def x(self):
+        return float(self.store.x[self.row])
+
+    @property
+    def y(self):
+        return float(self.store.y[self.row])
+
+    @property
+    def width(self):
+        return int(self.store.w[self.row])
+
+    @property
+    def height(self):
+        return int(self.store.h[self.row])
+
+    @property
+    def speed_x(self):
+        return float(self.store.vx[self.row])
+
+    @property
+    def speed_y(self):
+        return float(self.store.vy[self.row])
+
+    @property
+    def damage(self):
+        return int(self.store.damage[self.row])
+
+    @property
+    def team(self):
+        return int(self.store.team[self.row])
+
+    @property
+    def bullet_type(self):
+        return self.store.prototypes[int(self.store.type_id[self.row])].bullet_type
@@ -1,6 +1,5 @@
 ######################載入套件######################
 import pygame
-import random
 import math
 from config import *
 
@@ -59,13 +58,13 @@ class Robot:
         self.shoot_cooldown = 0
         self.special_attack_cooldown = 0
         self.move_timer = 0
-        self.move_direction_x = random.choice([-1, 0, 1])  # 隨機初始移動方向
-        self.move_direction_y = random.choice([-1, 0, 1])
+        self.move_direction_x = get_rng("ai").choice([-1, 0, 1])  # 隨機初始移動方向
+        self.move_direction_y = get_rng("ai").choice([-1, 0, 1])
         self.direction_change_timer = 0
         
         # AI 決策參數
-        self.aggression_level = random.uniform(0.6, 1.0)  # 攻擊性 60%-100%
-        self.movement_pattern = random.choice(["aggressive", "defensive", "random"])
+        self.aggression_level = get_rng("ai").uniform(0.6, 1.0)  # 攻擊性 60%-100%
+        self.movement_pattern = get_rng("ai").choice(["aggressive", "defensive", "random"])
         
         print(f"機器人 {self.name} 準備就緒！")
         print(f"  等待太空船和武器配置...")
@@ -138,7 +137,7 @@ class Robot:
         self.direction_change_timer += 1
         
         # 每 60-120 幀（1-2秒）改變一次移動方向
-        if self.direction_change_timer >= random.randint(60, 120):
+        if self.direction_change_timer >= get_rng("ai").randint(60, 120):
             self.direction_change_timer = 0
             
             if self.movement_pattern == "aggressive":
@@ -172,13 +171,13 @@ class Robot:
                         self.move_direction_y = -1
                 else:
                     # 距離夠遠就隨機移動
-                    self.move_direction_x = random.choice([-1, 0, 1])
-                    self.move_direction_y = random.choice([-1, 0, 1])
+                    self.move_direction_x = get_rng("ai").choice([-1, 0, 1])
+                    self.move_direction_y = get_rng("ai").choice([-1, 0, 1])
             
             else:  # random
                 # 隨機移動
-                self.move_direction_x = random.choice([-1, 0, 1])
-                self.move_direction_y = random.choice([-1, 0, 1])
+                self.move_direction_x = get_rng("ai").choice([-1, 0, 1])
+                self.move_direction_y = get_rng("ai").choice([-1, 0, 1])
         
         # 計算新位置
         new_x = self.x + self.move_direction_x * self.move_speed
@@ -211,7 +210,7 @@ class Robot:
         shoot_chance = self.aggression_level * 0.8  # 最高 80% 機率射擊
         
         if (self.shoot_cooldown <= 0 and 
-            random.random() < shoot_chance):
+            get_rng("ai").random() < shoot_chance):
             
             # 計算子彈發射位置
             bullet_x = self.x + self.width // 2 - 2
@@ -221,8 +220,8 @@ class Robot:
             self.shoot_cooldown = ROBOT_STATS["shoot_cooldown"]
             
             # 建立子彈（需要建立一個適合機器人的子彈類別）
-            from entities.bullet import RobotBullet
-            bullets.append(RobotBullet(bullet_x, bullet_y, self.weapon_type))
+            from entities.bullet import robot_bullet_pool
+            bullets.append(robot_bullet_pool.acquire(bullet_x, bullet_y, self.weapon_type))
         
         return bullets
     
@@ -239,36 +238,36 @@ class Robot:
         special_chance = self.aggression_level * 0.3  # 最高 30% 機率使用特殊攻擊
         
         if (self.special_attack_cooldown <= 0 and 
-            random.random() < special_chance):
+            get_rng("ai").random() < special_chance):
             
-            from entities.bullet import RobotBullet
+            from entities.bullet import robot_bullet_pool
             center_x = self.x + self.width // 2
             bullet_y = self.y + self.height
             
             # 根據太空船類型執行不同的特殊攻擊
             if self.spaceship_type == "explorer":
                 # 三重射擊
-                bullets.append(RobotBullet(center_x - 10, bullet_y, self.weapon_type))
-                bullets.append(RobotBullet(center_x, bullet_y, self.weapon_type))
-                bullets.append(RobotBullet(center_x + 10, bullet_y, self.weapon_type))
+                bullets.append(robot_bullet_pool.acquire(center_x - 10, bullet_y, self.weapon_type))
+                bullets.append(robot_bullet_pool.acquire(center_x, bullet_y, self.weapon_type))
+                bullets.append(robot_bullet_pool.acquire(center_x + 10, bullet_y, self.weapon_type))
             
             elif self.spaceship_type == "fighter":
                 # 快速連射
                 for i in range(5):
-                    bullets.append(RobotBullet(center_x - 5 + i * 2, bullet_y + i * 3, self.weapon_type))
+                    bullets.append(robot_bullet_pool.acquire(center_x - 5 + i * 2, bullet_y + i * 3, self.weapon_type))
             
             elif self.spaceship_type == "interceptor":
                 # 散射攻擊
                 for offset in [-20, -10, 0, 10, 20]:
-                    bullets.append(RobotBullet(center_x + offset, bullet_y, self.weapon_type))
+                    bullets.append(robot_bullet_pool.acquire(center_x + offset, bullet_y, self.weapon_type))
             
             elif self.spaceship_type == "destroyer":
                 # 重型飛彈
-                bullets.append(RobotBullet(center_x, bullet_y, "missile"))
+                bullets.append(robot_bullet_pool.acquire(center_x, bullet_y, "missile"))
             
             elif self.spaceship_type == "battleship":
                 # 離子砲
-                bullets.append(RobotBullet(center_x, bullet_y, "ion_cannon"))
+                bullets.append(robot_bullet_pool.acquire(center_x, bullet_y, "ion_cannon"))
             
             # 設定特殊攻擊冷卻時間
             self.special_attack_cooldown = ROBOT_STATS["special_attack_cooldown"]
@@ -0,0 +1,336 @@
+######################載入套件######################
+import os
+import io
+import json
+import time
+import random
+import argparse
+import contextlib
+
+# 必須在載入 pygame 之前指定 SDL 驅動，才能在沒有螢幕和音效卡的機器上執行
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from config import *
+from main import GameController
+from systems import MATCH_STATES, KeyState, InputReplay, HideSeekReplayWriter
+
+######################模式對照表######################
+# 模式名稱 → 該模式進行中會出現的遊戲狀態（離開這些狀態代表這一局結束）
+MODE_STATES = {
+    "classic": MATCH_STATES[GAME_STATE_PLAYING],
+    "ship": MATCH_STATES[GAME_STATE_SHIP_BATTLE],
+    "hide": MATCH_STATES[GAME_STATE_HIDE_SEEK],
+    "boss": MATCH_STATES[GAME_STATE_BOSS_FIGHT_MODE],
+}
+
+def mode_for_state(game_state):
+    """
+    由一局開始時的遊戲狀態找出模式名稱（例如錄製檔記錄的狀態）\n
+    \n
+    參數:\n
+    game_state (str): 遊戲狀態\n
+    \n
+    回傳:\n
+    str: 模式名稱（classic、ship、hide、boss）\n
+    """
+    for mode, states in MODE_STATES.items():
+        if states[0] == game_state:
+            return mode
+    raise ValueError(f"未知的遊戲狀態: {game_state}")
+
+######################輸入來源######################
+class ScriptedInput:
+    """
+    腳本輸入 - 依照預先寫好的時間區段按住按鍵\n
+    \n
+    腳本是 [開始更新次數, 結束更新次數, [按鍵名稱...]] 的串列，\n
+    同一次更新可以同時落在多個區段中（按鍵會合併）。\n
+    """
+
+    def __init__(self, segments, loop=False):
+        """
+        初始化腳本輸入\n
+        \n
+        參數:\n
+        segments (list): 時間區段串列\n
+        loop (bool): 腳本結束後是否從頭重複\n
+        """
+        self.segments = [(start, end, KeyState.from_names(names)) for start, end, names in segments]
+        self.length = max((end for _, end, _ in self.segments), default=0)
+        self.loop = loop
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        從 JSON 檔載入腳本（格式：{"segments": [...], "loop": false}）\n
+        \n
+        參數:\n
+        path (str): 腳本檔路徑\n
+        \n
+        回傳:\n
+        ScriptedInput: 腳本輸入\n
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["segments"], data.get("loop", False))
+
+    def keys_for(self, tick):
+        """
+        取得某一次更新的按鍵狀態\n
+        \n
+        參數:\n
+        tick (int): 更新次數（從 0 開始）\n
+        \n
+        回傳:\n
+        KeyState: 按鍵狀態\n
+        """
+        if self.loop and self.length:
+            tick %= self.length
+
+        keys = KeyState()
+        for start, end, segment_keys in self.segments:
+            if start <= tick < end:
+                keys.update(segment_keys)
+        return keys
+
+class RandomInput:
+    """
+    隨機輸入 - 每隔一段時間隨機換一組按住的按鍵\n
+    \n
+    使用獨立的亂數產生器，不會影響遊戲本身的亂數序列。\n
+    """
+
+    def __init__(self, key_names, seed=None, hold_ticks=None, press_chance=None):
+        """
+        初始化隨機輸入\n
+        \n
+        參數:\n
+        key_names (list): 可能被按下的按鍵名稱\n
+        seed (int): 亂數種子，None 表示不固定\n
+        hold_ticks (int): 每組按鍵維持的更新次數\n
+        press_chance (float): 每個按鍵被按住的機率\n
+        """
+        self.key_codes = [getattr(pygame, name) for name in key_names]
+        self.rng = random.Random(seed)
+        self.hold_ticks = hold_ticks or HEADLESS_SETTINGS["random_hold_ticks"]
+        self.press_chance = HEADLESS_SETTINGS["random_press_chance"] if press_chance is None else press_chance
+        self.current_keys = KeyState()
+
+    def keys_for(self, tick):
+        """
+        取得某一次更新的按鍵狀態\n
+        \n
+        參數:\n
+        tick (int): 更新次數（從 0 開始）\n
+        \n
+        回傳:\n
+        KeyState: 按鍵狀態\n
+        """
+        if tick % self.hold_ticks == 0:
+            self.current_keys = KeyState((code, True) for code in self.key_codes
+                                         if self.rng.random() < self.press_chance)
+        return self.current_keys
+
+######################無視窗模擬器######################
+class HeadlessRunner:
+    """
+    無視窗模擬器 - 在 SDL dummy 驅動下執行任一遊戲模式\n
+    \n
+    不經過事件佇列和 clock.tick()，直接把按鍵狀態傳給\n
+    GameController.update_game_objects()，CPU 能跑多快就更新多快。\n
+    預設不繪製畫面，需要量測繪製成本時可以開啟 render。\n
+    """
+
+    def __init__(self, mode="classic", render=False, seed=None, quiet=True, player_name=None, last_ship=None):
+        """
+        初始化模擬器並進入指定模式\n
+        \n
+        參數:\n
+        mode (str): 遊戲模式（classic、ship、hide、boss）\n
+        render (bool): 每次更新後是否也繪製畫面\n
+        seed (int): 對局種子（見 config.seed_rng），None 表示每局隨機產生\n
+        quiet (bool): 是否隱藏遊戲在終端機輸出的訊息\n
+        player_name (str): 玩家名稱，None 表示使用預設名稱\n
+        last_ship (str): Ship Battle 要排除的上一局太空船，None 表示讀取 .last_ship.txt（重播錄製檔時傳入檔頭的值）\n
+        """
+        if mode not in MODE_STATES:
+            raise ValueError(f"未知的遊戲模式: {mode}")
+
+        self.mode = mode
+        self.render = render
+        self.quiet = quiet
+        self.ticks = 0
+
+        with self._output():
+            self.game = GameController(seed=seed)
+            if player_name is not None:
+                self.game.menu_system.player_name = player_name
+            self.game.start_mode(MODE_STATES[mode][0], last_ship)
+
+    def _output(self):
+        """
+        依 quiet 設定決定是否暫時隱藏標準輸出\n
+        """
+        if self.quiet:
+            return contextlib.redirect_stdout(io.StringIO())
+        return contextlib.nullcontext()
+
+    def is_running(self):
+        """
+        檢查這一局是否還在進行\n
+        \n
+        回傳:\n
+        bool: 遊戲狀態仍屬於目前模式時回傳 True\n
+        """
+        return self.game.game_state in MODE_STATES[self.mode]
+
+    def step(self, keys, events=None):
+        """
+        執行一次更新（必要時繪製）\n
+        \n
+        參數:\n
+        keys (KeyState): 這一次更新的按鍵狀態\n
+        events (list): 這一次更新之前要處理的 KEYDOWN 事件（重播錄製檔時使用）\n
+        \n
+        回傳:\n
+        tuple: (更新耗時, 繪製耗時)，單位為秒，沒有繪製時繪製耗時為 0\n
+        """
+        # 清空事件佇列，避免 SDL 佇列塞滿
+        pygame.event.pump()
+
+        start = time.perf_counter()
+        if events:
+            self.game.handle_events(events)
+        self.game.update_game_objects(keys)
+        updated = time.perf_counter()
+
+        render_time = 0.0
+        if self.render:
+            self.game.render()
+            render_time = time.perf_counter() - updated
+
+        self.ticks += 1
+        return updated - start, render_time
+
+    def run(self, ticks, input_source, stop_when_finished=True):
+        """
+        連續執行多次更新\n
+        \n
+        參數:\n
+        ticks (int): 最多執行的更新次數\n
+        input_source (object): 提供 keys_for(tick) 的輸入來源（有 events_for(tick) 時也會處理按鍵事件）\n
+        stop_when_finished (bool): 這一局結束（離開模式）時是否提前停止\n
+        \n
+        回傳:\n
+        dict: 包含 mode、ticks、elapsed_s、ticks_per_second、final_state\n
+        """
+        start_tick = self.ticks
+        start_time = time.perf_counter()
+        events_for = getattr(input_source, "events_for", None)
+
+        with self._output():
+            for tick in range(ticks):
+                self.step(input_source.keys_for(tick), events_for(tick) if events_for else None)
+                if stop_when_finished and not self.is_running():
+                    break
+
+        elapsed = time.perf_counter() - start_time
+        executed = self.ticks - start_tick
+        return {
+            "mode": self.mode,
+            "ticks": executed,
+            "elapsed_s": elapsed,
+            "ticks_per_second": executed / elapsed if elapsed > 0 else 0.0,
+            "final_state": self.game.game_state
+        }
+
+######################命令列介面######################
+def parse_args(argv=None):
+    """
+    解析命令列參數\n
+    \n
+    參數:\n
+    argv (list): 命令列參數，None 表示使用 sys.argv\n
+    \n
+    回傳:\n
+    argparse.Namespace: 解析結果\n
+    """
+    parser = argparse.ArgumentParser(description="Galaxy Blaster 無視窗模擬器")
+    parser.add_argument("--mode", choices=sorted(MODE_STATES), default="classic", help="遊戲模式")
+    parser.add_argument("--ticks", type=int, default=None,
+                        help=f"最多執行的更新次數（預設 {HEADLESS_SETTINGS['default_ticks']}，重播時為錄製長度）")
+    parser.add_argument("--seed", type=int, default=None, help="亂數種子（遊戲與隨機輸入共用）")
+    parser.add_argument("--script", default=None, help="按鍵腳本 JSON 檔，未指定時使用隨機輸入")
+    parser.add_argument("--replay", default=None, help="輸入錄製檔（模式和種子取自錄製檔，預設執行到檔尾）")
+    parser.add_argument("--hide-seek-replay", default=None,
+                        help="躲貓貓模式時同時寫出可跳轉的重播檔（可用 replay_viewer.py 開啟）")
+    parser.add_argument("--render", action="store_true", help="每次更新後也繪製畫面")
+    parser.add_argument("--keep-going", action="store_true", help="這一局結束後仍繼續執行到指定次數")
+    parser.add_argument("--verbose", action="store_true", help="顯示遊戲在終端機輸出的訊息")
+    return parser.parse_args(argv)
+
+def print_result(result):
+    """
+    印出模擬結果摘要\n
+    \n
+    參數:\n
+    result (dict): HeadlessRunner.run() 的回傳值\n
+    """
+    print(f"模式: {result['mode']}  更新次數: {result['ticks']}  "
+          f"耗時: {result['elapsed_s']:.2f} 秒  速度: {result['ticks_per_second']:.0f} 次/秒  "
+          f"結束狀態: {result['final_state']}")
+
+def start_hide_seek_replay(runner, path):
+    """
+    在躲貓貓模式開始寫入可跳轉的重播檔\n
+    \n
+    參數:\n
+    runner (HeadlessRunner): 模擬器\n
+    path (str): 重播檔路徑，None 表示不寫入\n
+    """
+    if not path:
+        return
+    game = runner.game
+    if game.hide_seek_system is None:
+        raise SystemExit("--hide-seek-replay 只能用在躲貓貓模式（--mode hide 或躲貓貓的輸入錄製檔）")
+    game.input_session.hide_seek_replay = HideSeekReplayWriter(path, game.hide_seek_system, game.match_seed)
+
+def main(argv=None):
+    """
+    無視窗模擬器主程式\n
+    \n
+    參數:\n
+    argv (list): 命令列參數，None 表示使用 sys.argv\n
+    """
+    args = parse_args(argv)
+
+    if args.replay:
+        replay = InputReplay.load(args.replay)
+        runner = HeadlessRunner(mode_for_state(replay.game_state), render=args.render, seed=replay.seed,
+                                quiet=not args.verbose, player_name=replay.player_name, last_ship=replay.last_ship)
+        start_hide_seek_replay(runner, args.hide_seek_replay)
+        result = runner.run(args.ticks or replay.ticks, replay, stop_when_finished=not args.keep_going)
+        print(f"重播: {args.replay}（種子 {replay.seed}）")
+        print_result(result)
+        runner.game.input_session.stop()
+        pygame.quit()
+        return
+
+    runner = HeadlessRunner(args.mode, render=args.render, seed=args.seed, quiet=not args.verbose)
+    start_hide_seek_replay(runner, args.hide_seek_replay)
+    if args.script:
+        input_source = ScriptedInput.from_file(args.script)
+    else:
+        input_source = RandomInput(HEADLESS_SETTINGS["mode_keys"][args.mode], seed=args.seed)
+
+    result = runner.run(args.ticks or HEADLESS_SETTINGS["default_ticks"], input_source,
+                        stop_when_finished=not args.keep_going)
+    print_result(result)
+    runner.game.input_session.stop()
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,16 @@
 ######################載入套件######################
 import pygame
 import sys
-import random
+import time
 
 # 匯入遊戲設定
 from config import *
 
 # 匯入遊戲物件
-from entities import Player, Enemy, Boss, Bullet, PowerUp, Firework
+from entities import Player, Enemy, Boss, PowerUp, Firework, EntityList, ProjectileStore, release_bullet, get_bullet_pool_stats
 
 # 匯入遊戲系統
-from systems import check_collision, UISystem, ShopSystem, MenuSystem, ShipBattleSystem, VisualEffectsSystem, HideSeekSystem, BossFightSystem
+from systems import check_collision, SpatialHash, render_text, draw_numeric_text, UISystem, ShopSystem, MenuSystem, ShipBattleSystem, VisualEffectsSystem, HideSeekSystem, BossFightSystem, print_memory_report, frame_profiler, PerformanceOverlay, SpikeDetector, ProfileCapture, RenderInterpolator, IdleScreen, MATCH_STATES, InputReplay, InputSession, HideSeekKillCam, BossFightKillCam, FrameCapture, SnapshotWriter, SnapshotReader, write_rng_state, read_rng_state
 
 ######################遊戲狀態常數######################
 GAME_STATE_MENU = "menu"
@@ -44,10 +44,23 @@ class GameController:
     7. Boss戰觸發和管理\n
     """
     
-    def __init__(self):
+    def __init__(self, seed=None, record=None, capture=None):
         """
         初始化遊戲控制器\n
+        \n
+        參數:\n
+        seed (int): 固定的對局種子（--seed），None 表示每局隨機產生\n
+        record (bool): 是否錄製每一局的輸入（--record），None 表示使用設定檔\n
+        capture (str): 啟動時就開始錄製畫面的輸出格式（--capture），None 表示不錄製\n
         """
+        # 對局種子設定（每一局開始時由此衍生所有亂數串流）
+        self.seed = seed
+        self.match_seed = None
+        self.match_started = False  # 這一幀是否開始了新的一局
+        
+        # 輸入錄製與重播（--record、--replay）
+        self.input_session = InputSession(self, record)
+        
         # 初始化 Pygame
         pygame.init()
         
@@ -61,21 +74,70 @@ class GameController:
         # 設定遊戲時鐘
         self.clock = pygame.time.Clock()
         
+        # 探測中文字體（有快取檔時直接沿用上次的結果）並回報啟動耗時
+        self._report_font_discovery()
+        
         # 初始化遊戲系統
         self.ui_system = UISystem()
         self.shop_system = ShopSystem()
         self.menu_system = MenuSystem()
         self.ship_battle_system = ShipBattleSystem(self.sounds)
         self.visual_effects_system = VisualEffectsSystem()
+        self.collision_grid = SpatialHash()  # 碰撞檢測用空間網格
+        self.performance_overlay = PerformanceOverlay()  # 效能疊加層（F3 切換）
+        self.spike_detector = SpikeDetector()  # 幀時間突波偵測（F6 切換）
+        self.profile_capture = ProfileCapture()  # cProfile 錄製（F5 切換）
+        self.frame_capture = FrameCapture(capture)  # 遊戲畫面錄製（F7 切換）
+        self.interpolator = RenderInterpolator()  # 固定時間步長的繪製插值
+        self.idle_screen = IdleScreen(self)  # 靜態畫面的省電模式
         self.hide_seek_system = None  # 躲貓貓系統（按需創建）
         self.boss_fight_system = None  # Boss Fight系統（按需創建）
+        self.kill_cam = None  # 擊殺回放（躲貓貓與 Boss Fight 模式）
         
         # 遊戲狀態管理
         self.game_state = GAME_STATE_MENU
         self.running = True
         
+        # 經典模式的物件串列只建立一次，之後重新開始時清空
+        # 子彈使用陣列式儲存（轉存後子彈物件立即歸還物件池）
+        self.bullets = ProjectileStore(ProjectileStore.TEAM_PLAYER, cull_margin=None, release=release_bullet)
+        self.enemies = EntityList()
+        self.powerups = EntityList()
+        self.fireworks = EntityList()
+        self.boss_bullets = ProjectileStore(ProjectileStore.TEAM_ENEMY, cull_margin=None, release=release_bullet)  # Boss攻擊子彈
+        
         # 初始化遊戲變數
         self.reset_game()
+        
+        if capture:
+            self.frame_capture.start(self.screen, self.game_state)
+    
+    def _report_font_discovery(self):
+        """
+        執行字體探測並印出冷啟動（完整探測）與熱啟動（讀取快取）的耗時\n
+        """
+        info = get_font_discovery_info()
+        font_name = info["path"] or "pygame 預設字體"
+        
+        if info["source"] == "cache":
+            message = f"字體快取命中：{font_name}，耗時 {info['elapsed_ms']:.1f} ms"
+            if info["discovery_ms"] is not None:
+                saved_ms = info["discovery_ms"] - info["elapsed_ms"]
+                message += f"（完整探測需 {info['discovery_ms']:.1f} ms，節省 {saved_ms:.1f} ms）"
+            print(message)
+        else:
+            print(f"字體探測完成：{font_name}，耗時 {info['elapsed_ms']:.1f} ms（已寫入快取，下次啟動將跳過探測）")
+        
+        if not info["chinese"]:
+            print("警告：找不到支援中文的字體，中文文字可能無法正常顯示")
+    
+    def start_match_rng(self):
+        """
+        開始新的一局時重設所有亂數串流，並印出這一局的種子（用 --seed 可以重現）\n
+        """
+        self.match_seed = seed_rng(self.seed)
+        self.match_started = True
+        print(f"本局亂數種子：{self.match_seed}")
     
     def reset_game(self):
         """
@@ -83,14 +145,16 @@ class GameController:
         """
         global score, stars, boss_killed, victory_timer, enemies_killed
         
+        # 重設亂數串流
+        self.start_match_rng()
+        
         # 初始化遊戲物件
         self.player = Player(SCREEN_WIDTH // 2 - 25, SCREEN_HEIGHT - 80)
-        self.bullets = []
-        self.enemies = []
-        self.powerups = []
-        self.fireworks = []
         self.boss = None
-        self.boss_bullets = []  # Boss攻擊子彈
+        
+        # 清空上一局的物件
+        for entity_list in (self.bullets, self.boss_bullets, self.enemies, self.powerups, self.fireworks):
+            entity_list.clear()
         
         # 遊戲狀態
         self.shop_open = False
@@ -103,18 +167,22 @@ class GameController:
         victory_timer = 0
         enemies_killed = 0
     
-    def start_ship_battle(self):
+    def start_ship_battle(self, last_ship=None):
         """
         開始 Ship Battle 模式\n
+        \n
+        參數:\n
+        last_ship (str): 要排除的上一局太空船，None 表示讀取 .last_ship.txt（重播時使用錄製檔的值）\n
         """
         print("開始 Ship Battle 模式")
+        self.start_match_rng()
         
         # 建立玩家物件
         player = Player(SCREEN_WIDTH // 2 - 25, SCREEN_HEIGHT - 80)
         player_name = self.menu_system.get_player_name()
         
         # 開始戰鬥
-        self.ship_battle_system.start_battle(player, player_name)
+        self.ship_battle_system.start_battle(player, player_name, last_ship)
         
         # 切換到 Ship Battle 狀態
         self.game_state = GAME_STATE_SHIP_BATTLE
@@ -124,6 +192,7 @@ class GameController:
         開始躲貓貓遊戲\n
         """
         print("開始躲貓貓遊戲")
+        self.start_match_rng()
         
         # 創建躲貓貓遊戲系統
         player_name = self.menu_system.get_player_name()
@@ -131,12 +200,14 @@ class GameController:
         
         # 切換到躲貓貓狀態
         self.game_state = GAME_STATE_HIDE_SEEK
+        self.start_kill_cam()
     
     def start_boss_fight_mode(self):
         """
         開始 Boss Fight 模式\n
         """
         print("開始 Boss Fight 模式")
+        self.start_match_rng()
         
         # 創建 Boss Fight 系統
         player_name = self.menu_system.get_player_name()
@@ -144,14 +215,53 @@ class GameController:
         
         # 切換到 Boss Fight 狀態
         self.game_state = GAME_STATE_BOSS_FIGHT_MODE
+        self.start_kill_cam()
+    
+    def start_kill_cam(self):
+        """
+        依目前的模式建立擊殺回放（只有躲貓貓和 Boss Fight 模式有）\n
+        """
+        self.kill_cam = None
+        if not KILL_CAM_SETTINGS["enabled"]:
+            return
+        if self.game_state == GAME_STATE_HIDE_SEEK and self.hide_seek_system:
+            self.kill_cam = HideSeekKillCam(self.hide_seek_system)
+        elif self.game_state == GAME_STATE_BOSS_FIGHT_MODE and self.boss_fight_system:
+            self.kill_cam = BossFightKillCam(self.boss_fight_system)
+    
+    def start_mode(self, game_state, last_ship=None):
+        """
+        開始指定的遊戲模式（與主選單的操作相同）\n
+        \n
+        參數:\n
+        game_state (str): 這一局開始時的遊戲狀態（MATCH_STATES 的鍵）\n
+        last_ship (str): Ship Battle 要排除的上一局太空船，None 表示讀取 .last_ship.txt\n
+        """
+        if game_state == GAME_STATE_PLAYING:
+            self.game_state = GAME_STATE_PLAYING
+            self.reset_game()
+        elif game_state == GAME_STATE_SHIP_BATTLE:
+            self.start_ship_battle(last_ship)
+        elif game_state == GAME_STATE_HIDE_SEEK:
+            self.start_hide_seek()
+        elif game_state == GAME_STATE_BOSS_FIGHT_MODE:
+            self.start_boss_fight_mode()
+        else:
+            raise ValueError(f"無法開始的遊戲狀態: {game_state}")
     
-    def handle_events(self):
+    def handle_events(self, events=None):
         """
         處理遊戲事件\n
+        \n
+        參數:\n
+        events (list): 要處理的事件，None 時從事件佇列取出\n
         """
         global stars
         
-        for event in pygame.event.get():
+        if events is None:
+            events = pygame.event.get()
+        
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
             
@@ -171,6 +281,18 @@ class GameController:
                             self.start_boss_fight_mode()
             
             elif event.type == pygame.KEYDOWN:
+                # 除錯功能鍵（任何模式都有效）
+                if event.key == DEBUG_KEYS["performance_overlay"]:
+                    self.performance_overlay.toggle()
+                if event.key == DEBUG_KEYS["memory_report"]:
+                    self.print_memory_report()
+                if event.key == DEBUG_KEYS["spike_detector"]:
+                    self.spike_detector.toggle()
+                if event.key == DEBUG_KEYS["profile_capture"]:
+                    self.profile_capture.toggle(self.game_state)
+                if event.key == DEBUG_KEYS["frame_capture"]:
+                    self.frame_capture.toggle(self.screen, self.game_state)
+                
                 if self.game_state == GAME_STATE_MENU:
                     # 如果正在編輯名稱，先處理文字輸入
                     if self.menu_system.is_editing_name:
@@ -199,6 +321,7 @@ class GameController:
                         if result == "return_to_menu":
                             self.game_state = GAME_STATE_MENU
                             self.hide_seek_system = None
+                            self.kill_cam = None
                 
                 elif self.game_state in [GAME_STATE_PLAYING, GAME_STATE_BOSS_FIGHT]:
                     if self.shop_open:
@@ -250,15 +373,21 @@ class GameController:
                 if self.game_state == GAME_STATE_MENU:
                     self.menu_system.handle_text_input(event)
     
-    def update_game_objects(self):
+    def update_game_objects(self, keys=None):
         """
         更新所有遊戲物件的狀態\n
+        \n
+        參數:\n
+        keys (pygame.key): 按鍵狀態，None 時讀取鍵盤（無視窗模擬時由外部傳入）\n
         """
         global score, stars, boss_killed, victory_timer, enemies_killed
         
+        # 取得按鍵狀態
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        
         # Ship Battle 模式的更新邏輯
         if self.game_state == GAME_STATE_SHIP_BATTLE:
-            keys = pygame.key.get_pressed()
             battle_result = self.ship_battle_system.update(keys)
             
             # 更新視覺效果
@@ -281,12 +410,15 @@ class GameController:
         # 躲貓貓模式的更新邏輯
         if self.game_state == GAME_STATE_HIDE_SEEK:
             if self.hide_seek_system:
-                keys = pygame.key.get_pressed()
                 result = self.hide_seek_system.update(keys)
+                self.input_session.record_hide_seek(self.hide_seek_system)
+                if self.kill_cam is not None:
+                    self.kill_cam.record()
                 
                 if result == "return_to_menu":
                     print("躲貓貓遊戲結束，返回主選單")
                     self.hide_seek_system = None
+                    self.kill_cam = None
                     self.game_state = GAME_STATE_MENU
             
             return  # 躲貓貓模式不執行下面的邏輯
@@ -294,20 +426,24 @@ class GameController:
         # Boss Fight 模式的更新邏輯
         if self.game_state == GAME_STATE_BOSS_FIGHT_MODE:
             if self.boss_fight_system:
-                keys = pygame.key.get_pressed()
                 result = self.boss_fight_system.update(keys)
+                if self.kill_cam is not None:
+                    self.kill_cam.record()
                 
                 if result == "victory":
                     print("Boss Fight 模式完成，恭喜擊敗所有Boss！")
                     self.boss_fight_system = None
+                    self.kill_cam = None
                     self.game_state = GAME_STATE_MENU
                 elif result == "defeat":
                     print("Boss Fight 模式失敗，被Boss擊敗")
                     self.boss_fight_system = None
+                    self.kill_cam = None
                     self.game_state = GAME_STATE_MENU
                 elif result == "quit":
                     print("退出 Boss Fight 模式")
                     self.boss_fight_system = None
+                    self.kill_cam = None
                     self.game_state = GAME_STATE_MENU
             
             return  # Boss Fight 模式不執行下面的邏輯
@@ -316,9 +452,6 @@ class GameController:
         if self.game_state not in [GAME_STATE_PLAYING, GAME_STATE_BOSS_FIGHT]:
             return
         
-        # 取得按鍵狀態
-        keys = pygame.key.get_pressed()
-        
         # 只有在商店關閉時才更新遊戲邏輯
         if not self.shop_open:
             # 更新玩家
@@ -329,28 +462,21 @@ class GameController:
             if keys[pygame.K_LCTRL] or keys[pygame.K_RCTRL] or keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]:
                 new_bullet = self.player.shoot()
                 if new_bullet:
-                    self.bullets.append(new_bullet)
+                    self.bullets.add_bullet(new_bullet)
                     # 播放雷射音效
                     play_sound(self.sounds, "laser_shoot")
             
-            # 更新所有子彈
-            for bullet in self.bullets[:]:  # 用切片複製清單，避免修改時出錯
-                bullet.move()
-                # 移除飛出螢幕的子彈
-                if bullet.is_off_screen():
-                    self.bullets.remove(bullet)
-            
-            # 更新Boss子彈
-            for boss_bullet in self.boss_bullets[:]:
-                boss_bullet.move()
-                if boss_bullet.is_off_screen():
-                    self.boss_bullets.remove(boss_bullet)
+            # 更新所有子彈和Boss子彈（整批移動並剔除出界子彈）
+            for store in (self.bullets, self.boss_bullets):
+                store.step()
+                store.cull_off_screen()
             
             # 根據遊戲狀態更新敵人或Boss
             if self.game_state == GAME_STATE_PLAYING:
                 # 普通遊戲狀態：生成和更新敵人
                 self.spawn_enemies()
-                self.update_enemies()
+                with frame_profiler.probe("ai"):
+                    self.update_enemies()
                 
                 # 檢查是否達到Boss戰條件
                 if enemies_killed >= BOSS_TRIGGER_KILLS and not self.boss:
@@ -358,20 +484,22 @@ class GameController:
             
             elif self.game_state == GAME_STATE_BOSS_FIGHT:
                 # Boss戰狀態：更新Boss
-                self.update_boss()
+                with frame_profiler.probe("ai"):
+                    self.update_boss()
             
             # 碰撞檢測
-            self.handle_collisions()
+            with frame_profiler.probe("collisions"):
+                self.handle_collisions()
             
             # 更新所有道具
-            for powerup in self.powerups[:]:
+            for powerup in self.powerups:
                 powerup.move()
-                # 移除離開螢幕的道具
+                # 標記離開螢幕的道具
                 if powerup.is_off_screen():
-                    self.powerups.remove(powerup)
+                    self.powerups.kill(powerup)
             
             # 碰撞檢測：玩家撿到道具
-            for powerup in self.powerups[:]:
+            for powerup in self.powerups:
                 if check_collision(self.player.x, self.player.y, self.player.width, self.player.height,
                                  powerup.x, powerup.y, powerup.width, powerup.height):
                     # 套用道具效果
@@ -386,13 +514,16 @@ class GameController:
                         print(f"獲得Boss禮物！最終分數：{score}，星星數量：{stars}")
                         self.game_state = GAME_STATE_MENU
                     
-                    self.powerups.remove(powerup)
+                    self.powerups.kill(powerup)
         
         # 更新煙火效果
-        for firework in self.fireworks[:]:
+        for firework in self.fireworks:
             firework.update()
             if firework.is_dead():
-                self.fireworks.remove(firework)
+                self.fireworks.kill(firework)
+        
+        # 每幀只壓縮一次，移除這一幀標記為失效的物件
+        self.compact_entities()
         
         # 勝利條件檢查
         if boss_killed:
@@ -442,8 +573,8 @@ class GameController:
         if self.enemy_spawn_timer >= enemy_spawn_delay:
             self.enemy_spawn_timer = 0
             # 隨機選擇敵人類型和位置
-            enemy_type = random.choice(["basic", "basic", "fast"])  # 增加基本敵人的比例
-            enemy_x = random.randint(0, SCREEN_WIDTH - 30)
+            enemy_type = get_rng("spawning").choice(["basic", "basic", "fast"])  # 增加基本敵人的比例
+            enemy_x = get_rng("spawning").randint(0, SCREEN_WIDTH - 30)
             self.enemies.append(Enemy(enemy_x, -30, enemy_type))
             
             # 隨著分數增加，敵人生成速度加快
@@ -454,11 +585,185 @@ class GameController:
         """
         更新所有敵人\n
         """
-        for enemy in self.enemies[:]:
+        for enemy in self.enemies:
             enemy.move()
-            # 移除離開螢幕的敵人
+            # 標記離開螢幕的敵人
             if enemy.is_off_screen():
-                self.enemies.remove(enemy)
+                self.enemies.kill(enemy)
+    
+    def snapshot(self):
+        """
+        把目前這一局的完整狀態打包成快照（快速存檔、倒轉、比較效能時從相同狀態開始）\n
+        \n
+        包含遊戲狀態、目前模式的所有物件、經典模式的全域分數和所有亂數串流，\n
+        用 restore() 還原後繼續模擬的結果和沒有中斷時完全相同。\n
+        \n
+        回傳:\n
+        bytes: 快照資料\n
+        """
+        global score, stars, boss_killed, victory_timer, enemies_killed
+        
+        writer = SnapshotWriter()
+        writer.values(self.game_state, self.match_seed)
+        
+        if self.game_state == GAME_STATE_SHIP_BATTLE:
+            self.ship_battle_system.save_state(writer)
+            self.visual_effects_system.save_state(writer)
+        elif self.game_state == GAME_STATE_HIDE_SEEK and self.hide_seek_system:
+            self.hide_seek_system.save_state(writer)
+        elif self.game_state == GAME_STATE_BOSS_FIGHT_MODE and self.boss_fight_system:
+            self.boss_fight_system.save_state(writer)
+        elif self.game_state in MATCH_STATES[GAME_STATE_PLAYING]:
+            writer.values(score, stars, boss_killed, victory_timer, enemies_killed)
+            writer.fields(self, ("shop_open", "enemy_spawn_timer"))
+            writer.object(self.player)
+            writer.object(self.boss)
+            self.bullets.save_state(writer)
+            self.boss_bullets.save_state(writer)
+            writer.objects(self.enemies)
+            writer.objects(self.powerups)
+            writer.objects(self.fireworks)
+        else:
+            raise ValueError(f"目前的遊戲狀態沒有可以快照的對局: {self.game_state}")
+        
+        write_rng_state(writer)
+        return writer.getvalue()
+    
+    def restore(self, data):
+        """
+        還原 snapshot() 建立的快照（可以從任何狀態還原，需要時會建立該模式的系統）\n
+        \n
+        參數:\n
+        data (bytes): 快照資料\n
+        """
+        global score, stars, boss_killed, victory_timer, enemies_killed
+        
+        reader = SnapshotReader(data)
+        game_state, match_seed = reader.values()
+        
+        if game_state == GAME_STATE_SHIP_BATTLE:
+            self.ship_battle_system.load_state(reader)
+            self.visual_effects_system.load_state(reader)
+        elif game_state == GAME_STATE_HIDE_SEEK:
+            if self.hide_seek_system is None:
+                self.hide_seek_system = HideSeekSystem(self.menu_system.get_player_name(), self.sounds)
+            self.hide_seek_system.load_state(reader)
+        elif game_state == GAME_STATE_BOSS_FIGHT_MODE:
+            if self.boss_fight_system is None:
+                self.boss_fight_system = BossFightSystem(self.menu_system.get_player_name(), self.sounds)
+            self.boss_fight_system.load_state(reader)
+        else:
+            score, stars, boss_killed, victory_timer, enemies_killed = reader.values()
+            reader.fields(self)
+            self.player = reader.object()
+            self.boss = reader.object()
+            self.bullets.load_state(reader)
+            self.boss_bullets.load_state(reader)
+            for entity_list in (self.enemies, self.powerups, self.fireworks):
+                entity_list.clear()
+                entity_list.extend(reader.objects_list())
+        
+        # 亂數串流最後還原（建立系統時抽取的亂數不影響結果）
+        read_rng_state(reader)
+        reader.finish()
+        
+        self.game_state = game_state
+        self.match_seed = match_seed
+        self.collision_grid.clear()
+        self.interpolator.clear()
+        self.start_kill_cam()
+        self.idle_screen.mark_dirty()
+    
+    def get_entity_lists(self):
+        """
+        取得目前模式中所有的物件串列（記憶體報告使用）\n
+        \n
+        回傳:\n
+        dict: 串列名稱 → 物件串列\n
+        """
+        if self.game_state == GAME_STATE_SHIP_BATTLE:
+            entity_lists = dict(self.ship_battle_system.get_entity_lists())
+            entity_lists.update(self.visual_effects_system.get_entity_lists())
+            return entity_lists
+        
+        if self.game_state == GAME_STATE_HIDE_SEEK:
+            return self.hide_seek_system.get_entity_lists() if self.hide_seek_system else {}
+        
+        if self.game_state == GAME_STATE_BOSS_FIGHT_MODE:
+            return self.boss_fight_system.get_entity_lists() if self.boss_fight_system else {}
+        
+        return {
+            "bullets": self.bullets,
+            "boss_bullets": self.boss_bullets,
+            "enemies": self.enemies,
+            "powerups": self.powerups,
+            "fireworks": self.fireworks,
+            "firework_particles": [particle for firework in self.fireworks for particle in firework.particles]
+        }
+    
+    def get_interpolation_entities(self):
+        """
+        取得不在物件串列中、但需要繪製插值的單一物件\n
+        \n
+        回傳:\n
+        tuple: 物件（可能包含 None）\n
+        """
+        if self.game_state == GAME_STATE_SHIP_BATTLE:
+            return (self.ship_battle_system.player, self.ship_battle_system.robot)
+        
+        if self.game_state == GAME_STATE_HIDE_SEEK:
+            return ()
+        
+        if self.game_state == GAME_STATE_BOSS_FIGHT_MODE:
+            if self.boss_fight_system:
+                return (self.boss_fight_system.player, self.boss_fight_system.current_boss)
+            return ()
+        
+        if self.game_state in [GAME_STATE_PLAYING, GAME_STATE_BOSS_FIGHT]:
+            return (self.player, self.boss)
+        return ()
+    
+    def get_debug_state(self):
+        """
+        取得目前的遊戲狀態摘要（突波報告使用）\n
+        \n
+        回傳:\n
+        dict: 模式、各系統的階段和主要數值\n
+        """
+        state = {
+            "game_state": self.game_state,
+            "match_seed": self.match_seed,
+            "shop_open": self.shop_open,
+            "score": score,
+            "stars": stars,
+            "enemies_killed": enemies_killed,
+            "boss_active": self.boss is not None
+        }
+        
+        if self.game_state == GAME_STATE_SHIP_BATTLE:
+            state["battle_state"] = self.ship_battle_system.battle_state
+        elif self.game_state == GAME_STATE_HIDE_SEEK and self.hide_seek_system:
+            state["hide_seek_state"] = self.hide_seek_system.game_state
+            state["hide_seek_players"] = len(self.hide_seek_system.players)
+        elif self.game_state == GAME_STATE_BOSS_FIGHT_MODE and self.boss_fight_system:
+            state["boss_fight_state"] = self.boss_fight_system.game_state
+            state["boss_index"] = self.boss_fight_system.current_boss_index
+        
+        return state
+    
+    def print_memory_report(self):
+        """
+        在終端機印出目前模式的物件數量與記憶體用量\n
+        """
+        print_memory_report(self.game_state, self.get_entity_lists(), get_bullet_pool_stats())
+    
+    def compact_entities(self):
+        """
+        一次移除所有標記為失效的物件（每幀呼叫一次）\n
+        """
+        self.enemies.compact()
+        self.powerups.compact()
+        self.fireworks.compact()
     
     def handle_collisions(self):
         """
@@ -466,34 +771,43 @@ class GameController:
         """
         global score, stars, boss_killed, victory_timer, enemies_killed
         
+        # 每幀重建空間網格：每顆子彈和玩家都只檢查自己附近格子裡的敵人
+        grid = self.collision_grid
+        grid.clear()
+        grid.rebuild("enemies", self.enemies)
         # 碰撞檢測：玩家子彈打中敵人
-        for bullet in self.bullets[:]:
+        # 先找出每顆子彈重疊的敵人（依串列順序）和打中Boss的子彈，再依子彈順序結算
+        # （前面的子彈打死的敵人，後面的子彈就打不到）
+        enemy_hits = dict(self.bullets.query_grid(grid, "enemies"))
+        boss_rows = {row for row, _ in self.bullets.hit_test([self.boss])} if self.boss else set()
+        damage = self.bullets.damage
+        hit_rows = []
+        for row in sorted(enemy_hits.keys() | boss_rows):
+            bullet_damage = int(damage[row])
             hit_target = False
             
-            # 檢查子彈是否打中普通敵人
-            for enemy in self.enemies[:]:
-                if check_collision(bullet.x, bullet.y, bullet.width, bullet.height,
-                                 enemy.x, enemy.y, enemy.width, enemy.height):
-                    # 子彈打中敵人
-                    if enemy.take_damage(bullet.damage):
-                        # 敵人死亡，隨機掉落道具
-                        self.drop_powerups(enemy)
-                        
-                        self.enemies.remove(enemy)
-                        score += enemy.score_value
-                        stars += enemy.star_value
-                        enemies_killed += 1  # 增加擊殺計數
+            # 檢查子彈是否打中普通敵人（取串列中最前面、還活著的那一個）
+            enemy = next((enemy for enemy in enemy_hits.get(row, ()) if self.enemies.is_alive(enemy)), None)
+            if enemy is not None:
+                # 子彈打中敵人
+                if enemy.take_damage(bullet_damage):
+                    # 敵人死亡，隨機掉落道具
+                    self.drop_powerups(enemy)
                     
-                    self.bullets.remove(bullet)
-                    hit_target = True
-                    break
+                    grid.remove(enemy, "enemies")
+                    self.enemies.kill(enemy)
+                    score += enemy.score_value
+                    stars += enemy.star_value
+                    enemies_killed += 1  # 增加擊殺計數
+                
+                hit_rows.append(row)
+                hit_target = True
             
             # 檢查子彈是否打中Boss
             if not hit_target and self.boss:
-                if check_collision(bullet.x, bullet.y, bullet.width, bullet.height,
-                                 self.boss.x, self.boss.y, self.boss.width, self.boss.height):
+                if row in boss_rows:
                     # 子彈打中Boss
-                    if self.boss.take_damage(bullet.damage):
+                    if self.boss.take_damage(bullet_damage):
                         # Boss被擊敗
                         boss_killed = True
                         victory_timer = 180  # 3 秒勝利畫面
@@ -504,8 +818,8 @@ class GameController:
                         
                         # 生成慶祝煙火
                         for _ in range(8):
-                            firework_x = random.randint(100, SCREEN_WIDTH - 100)
-                            firework_y = random.randint(100, SCREEN_HEIGHT - 100)
+                            firework_x = get_rng("visuals").randint(100, SCREEN_WIDTH - 100)
+                            firework_y = get_rng("visuals").randint(100, SCREEN_HEIGHT - 100)
                             self.fireworks.append(Firework(firework_x, firework_y))
                         
                         # 獲得分數和星星
@@ -517,44 +831,44 @@ class GameController:
                         # 清除Boss子彈
                         self.boss_bullets.clear()
                     
-                    self.bullets.remove(bullet)
+                    hit_rows.append(row)
                     hit_target = True
+        self.bullets.remove_rows(hit_rows)
         
         # 碰撞檢測：Boss子彈打中玩家
-        for boss_bullet in self.boss_bullets[:]:
-            if check_collision(boss_bullet.x, boss_bullet.y, boss_bullet.width, boss_bullet.height,
-                             self.player.x, self.player.y, self.player.width, self.player.height):
-                # Boss子彈打中玩家
-                damage = boss_bullet.damage
-                if self.player.has_protect_effect():
-                    damage = damage // 2  # 防護效果減少50%傷害
-                    print(f"防護效果啟動！傷害減少至 {damage}")
-                
-                self.player.health -= damage
-                self.boss_bullets.remove(boss_bullet)
-                
-                # 檢查遊戲是否結束
-                if self.player.health <= 0:
-                    print(f"被Boss擊敗！最終分數：{score}，星星數量：{stars}")
-                    self.game_state = GAME_STATE_GAME_OVER
+        hits = self.boss_bullets.hit_test([self.player])
+        boss_damage = self.boss_bullets.damage
+        for row, _ in hits:
+            # Boss子彈打中玩家
+            damage = int(boss_damage[row])
+            if self.player.has_protect_effect():
+                damage = damage // 2  # 防護效果減少50%傷害
+                print(f"防護效果啟動！傷害減少至 {damage}")
+            
+            self.player.health -= damage
+            
+            # 檢查遊戲是否結束
+            if self.player.health <= 0:
+                print(f"被Boss擊敗！最終分數：{score}，星星數量：{stars}")
+                self.game_state = GAME_STATE_GAME_OVER
+        self.boss_bullets.remove_rows(row for row, _ in hits)
         
         # 碰撞檢測：玩家撞到敵人
-        for enemy in self.enemies[:]:
-            if check_collision(self.player.x, self.player.y, self.player.width, self.player.height,
-                             enemy.x, enemy.y, enemy.width, enemy.height):
-                # 玩家撞到敵人，減少生命值
-                damage = 20
-                if self.player.has_protect_effect():
-                    damage = damage // 2  # 防護效果減少50%傷害
-                    print(f"防護效果啟動！撞擊傷害減少至 {damage}")
-                
-                self.player.health -= damage
-                self.enemies.remove(enemy)
-                
-                # 檢查遊戲是否結束
-                if self.player.health <= 0:
-                    print(f"遊戲結束！最終分數：{score}，星星數量：{stars}")
-                    self.game_state = GAME_STATE_GAME_OVER
+        crashed_enemies = grid.query_rect(self.player.x, self.player.y, self.player.width, self.player.height, "enemies")
+        for enemy in crashed_enemies:
+            # 玩家撞到敵人，減少生命值
+            damage = 20
+            if self.player.has_protect_effect():
+                damage = damage // 2  # 防護效果減少50%傷害
+                print(f"防護效果啟動！撞擊傷害減少至 {damage}")
+            
+            self.player.health -= damage
+            
+            # 檢查遊戲是否結束
+            if self.player.health <= 0:
+                print(f"遊戲結束！最終分數：{score}，星星數量：{stars}")
+                self.game_state = GAME_STATE_GAME_OVER
+        self.enemies.kill_many(crashed_enemies)
         
         # 碰撞檢測：玩家撞到Boss
         if self.boss:
@@ -580,7 +894,7 @@ class GameController:
         參數:\n
         enemy (Enemy): 死亡的敵人物件\n
         """
-        drop_chance = random.randint(1, 100)
+        drop_chance = get_rng("drops").randint(1, 100)
         if drop_chance <= POWERUP_DROP_CHANCE:  # 30% 機率掉落道具
             if drop_chance <= STAR_DROP_CHANCE:  # 15% 機率掉星星
                 self.powerups.append(PowerUp(enemy.x + enemy.width // 2, enemy.y, "star"))
@@ -616,13 +930,17 @@ class GameController:
             self.visual_effects_system.draw(self.screen)
         
         elif self.game_state == GAME_STATE_HIDE_SEEK:
-            # 繪製躲貓貓遊戲
-            if self.hide_seek_system:
+            # 繪製躲貓貓遊戲（擊殺回放中改畫回放的畫面）
+            if self.kill_cam is not None and self.kill_cam.playing:
+                self.kill_cam.draw(self.screen)
+            elif self.hide_seek_system:
                 self.hide_seek_system.draw(self.screen)
         
         elif self.game_state == GAME_STATE_BOSS_FIGHT_MODE:
-            # 繪製 Boss Fight 模式
-            if self.boss_fight_system:
+            # 繪製 Boss Fight 模式（擊殺回放中改畫回放的畫面）
+            if self.kill_cam is not None and self.kill_cam.playing:
+                self.kill_cam.draw(self.screen)
+            elif self.boss_fight_system:
                 self.boss_fight_system.draw(self.screen)
         
         else:
@@ -634,12 +952,10 @@ class GameController:
                 self.player.draw(self.screen)
                 
                 # 繪製所有子彈
-                for bullet in self.bullets:
-                    bullet.draw(self.screen)
+                self.bullets.draw(self.screen)
                 
                 # 繪製Boss子彈
-                for boss_bullet in self.boss_bullets:
-                    boss_bullet.draw(self.screen)
+                self.boss_bullets.draw(self.screen)
                 
                 # 繪製所有敵人
                 for enemy in self.enemies:
@@ -663,8 +979,8 @@ class GameController:
                 progress_font = create_font(FONT_SIZES["normal"])
                 remaining = BOSS_TRIGGER_KILLS - enemies_killed
                 if remaining > 0:
-                    progress_text = progress_font.render(f"Boss 出現倒數: {remaining} 敵人", True, YELLOW)
-                    self.screen.blit(progress_text, (SCREEN_WIDTH - 200, 40))
+                    draw_numeric_text(self.screen, progress_font, ("Boss 出現倒數: ", remaining, " 敵人"), True, YELLOW,
+                                      topleft=(SCREEN_WIDTH - 200, 40))
                 else:
                     boss_ready_text = progress_font.render("Boss 即將出現！", True, RED)
                     self.screen.blit(boss_ready_text, (SCREEN_WIDTH - 200, 40))
@@ -689,6 +1005,14 @@ class GameController:
             elif self.game_state == GAME_STATE_VICTORY:
                 self._draw_victory_screen()
         
+        # 錄製畫面（F7）：只複製畫面，編碼在背景執行緒；效能疊加層不錄進去
+        if self.frame_capture.active:
+            self.frame_capture.capture(self.screen)
+        
+        # 效能疊加層（F3）畫在所有畫面的最上層
+        if self.performance_overlay.visible:
+            self.performance_overlay.draw(self.screen, self.clock.get_fps(), self.get_entity_lists())
+        
         # 更新畫面
         pygame.display.flip()
     
@@ -707,25 +1031,25 @@ class GameController:
         font_medium = create_font(FONT_SIZES["medium"])
         font_small = create_font(FONT_SIZES["normal"])
         
-        game_over_text = font_large.render("GAME OVER", True, RED)
+        game_over_text = render_text(font_large, "GAME OVER", True, RED)
         game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
         self.screen.blit(game_over_text, game_over_rect)
         
         # 最終分數
-        score_text = font_medium.render(f"最終分數: {score}", True, WHITE)
+        score_text = render_text(font_medium, f"最終分數: {score}", True, WHITE)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
         self.screen.blit(score_text, score_rect)
         
-        stars_text = font_medium.render(f"星星數量: {stars}", True, YELLOW)
+        stars_text = render_text(font_medium, f"星星數量: {stars}", True, YELLOW)
         stars_rect = stars_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
         self.screen.blit(stars_text, stars_rect)
         
-        killed_text = font_medium.render(f"擊敗敵人: {enemies_killed}", True, GREEN)
+        killed_text = render_text(font_medium, f"擊敗敵人: {enemies_killed}", True, GREEN)
         killed_rect = killed_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
         self.screen.blit(killed_text, killed_rect)
         
         # 操作提示
-        restart_text = font_small.render("按 R 重新開始 | 按 Enter 返回主畫面", True, WHITE)
+        restart_text = render_text(font_small, "按 R 重新開始 | 按 Enter 返回主畫面", True, WHITE)
         restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 120))
         self.screen.blit(restart_text, restart_rect)
     
@@ -744,56 +1068,146 @@ class GameController:
         font_medium = create_font(FONT_SIZES["medium"])
         font_small = create_font(FONT_SIZES["normal"])
         
-        victory_text = font_large.render("VICTORY!", True, YELLOW)
+        victory_text = render_text(font_large, "VICTORY!", True, YELLOW)
         victory_rect = victory_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
         self.screen.blit(victory_text, victory_rect)
         
-        boss_text = font_medium.render("Boss 已被擊敗！", True, WHITE)
+        boss_text = render_text(font_medium, "Boss 已被擊敗！", True, WHITE)
         boss_rect = boss_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40))
         self.screen.blit(boss_text, boss_rect)
         
         # 最終分數
-        score_text = font_medium.render(f"最終分數: {score}", True, WHITE)
+        score_text = render_text(font_medium, f"最終分數: {score}", True, WHITE)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
         self.screen.blit(score_text, score_rect)
         
-        stars_text = font_medium.render(f"星星數量: {stars}", True, YELLOW)
+        stars_text = render_text(font_medium, f"星星數量: {stars}", True, YELLOW)
         stars_rect = stars_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
         self.screen.blit(stars_text, stars_rect)
         
         # 操作提示
-        continue_text = font_small.render("按 Enter 返回主畫面 | 按 R 重新開始", True, WHITE)
+        continue_text = render_text(font_small, "按 Enter 返回主畫面 | 按 R 重新開始", True, WHITE)
         continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 120))
         self.screen.blit(continue_text, continue_rect)
     
     def run(self):
         """
         執行主遊戲迴圈\n
+        \n
+        使用固定時間步長：累積實際經過的時間，每滿 1/tick_rate 秒就執行一次\n
+        update_game_objects()，所以畫面更新率不同或某一幀比較慢時，\n
+        遊戲速度都不會改變。一幀最多補跑 max_catch_up_steps 次，\n
+        剩下不足一步的時間用來計算繪製插值的比例。\n
         """
+        settings = SIMULATION_SETTINGS
+        step_seconds = 1.0 / settings["tick_rate"]
+        max_steps = settings["max_catch_up_steps"]
+        accumulator = step_seconds  # 第一幀直接執行一次更新
+        
         while self.running:
-            # 處理事件
-            self.handle_events()
+            # 靜態畫面改用等待事件的閒置模式
+            if self.idle_screen.is_active(bool(self.fireworks) or boss_killed):
+                self.idle_screen.run_frame()
+                accumulator = step_seconds
+                continue
+            self.idle_screen.mark_dirty()  # 下次進入閒置畫面時先完整重畫一次
+            
+            frame_start = time.perf_counter()
             
-            # 更新遊戲狀態
-            self.update_game_objects()
+            # 處理事件（重播時只處理關閉視窗和除錯功能鍵，遊戲按鍵來自錄製檔）
+            with frame_profiler.probe("events"):
+                events = self.input_session.filter_events(pygame.event.get())
+                # 擊殺回放中的按鍵只用來跳過回放，不交給遊戲也不錄製
+                if self.kill_cam is not None and self.kill_cam.playing:
+                    events = self.kill_cam.handle_events(events)
+                self.handle_events(events)
+                self.input_session.after_events(events)
+            
+            # 更新遊戲狀態並繪製畫面（F5 錄製 cProfile 時只記錄這兩段）
+            with self.profile_capture.section():
+                steps = min(int(accumulator / step_seconds), max_steps)
+                for step in range(steps):
+                    # 上一次更新觸發了擊殺回放：保存目前狀態，之後暫停模擬，改用同樣的時間步長推進回放
+                    if self.kill_cam is not None and self.kill_cam.pending:
+                        self.kill_cam.start()
+                        self.interpolator.clear()
+                    if self.kill_cam is not None and self.kill_cam.playing:
+                        self.kill_cam.step()
+                        accumulator -= step_seconds
+                        continue
+                    
+                    # 最後一次模擬前記下位置，繪製時在這一步前後插值
+                    if settings["interpolate"] and step == steps - 1:
+                        self.interpolator.capture(self.get_entity_lists(), self.get_interpolation_entities())
+                    
+                    with frame_profiler.probe("update"):
+                        self.update_game_objects(self.input_session.step_keys())
+                    accumulator -= step_seconds
+                
+                self.input_session.after_updates()
+                
+                # 補跑次數用完仍然落後時，放棄落後的時間（避免越跑越慢的死亡螺旋）
+                if accumulator >= step_seconds:
+                    accumulator %= step_seconds
+                
+                alpha = accumulator / step_seconds if settings["interpolate"] else 1.0
+                with frame_profiler.probe("render"), self.interpolator.apply(alpha):
+                    self.render()
             
-            # 繪製畫面
-            self.render()
+            # 控制畫面更新率，並把這一幀實際經過的時間加入累積器
+            with frame_profiler.probe("tick"):
+                elapsed_ms = self.clock.tick(settings["render_fps"])
+            accumulator += min(elapsed_ms / 1000.0, settings["max_frame_time"])
             
-            # 控制遊戲幀率
-            self.clock.tick(FPS)
+            # 記錄這一幀的各階段耗時（效能疊加層和突波偵測都關閉時直接返回）
+            frame_profiler.end_frame(time.perf_counter() - frame_start)
+            if self.spike_detector.enabled:
+                self.spike_detector.check(self)
+        
+        # 關閉遊戲前先寫出還在錄製的 cProfile、畫面和輸入錄製檔
+        if self.profile_capture.active:
+            self.profile_capture.stop()
+        if self.frame_capture.active:
+            self.frame_capture.stop()
+        self.input_session.stop()
         
-        # 關閉遊戲
         pygame.quit()
         sys.exit()
 
 ######################主程式函數######################
-def main():
+def parse_args(argv=None):
+    """
+    解析命令列參數\n
+    \n
+    參數:\n
+    argv (list): 命令列參數，None 表示使用 sys.argv\n
+    \n
+    回傳:\n
+    argparse.Namespace: 解析結果\n
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description="Galaxy Blaster - Space Shooter")
+    parser.add_argument("--seed", type=int, default=RNG_SETTINGS["seed"],
+                        help="固定的對局種子，每一局都會重現相同的亂數結果")
+    InputSession.add_arguments(parser)
+    parser.add_argument("--capture", nargs="?", const=FRAME_CAPTURE_SETTINGS["format"], default=None,
+                        choices=("auto", "encoder", "png", "raw"),
+                        help=f"啟動時就開始錄製畫面到 {FRAME_CAPTURE_SETTINGS['output_dir']}/（也可以在遊戲中按 F7 切換）")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """
     遊戲主程式 - 建立並執行遊戲控制器\n
+    \n
+    參數:\n
+    argv (list): 命令列參數，None 表示使用 sys.argv\n
     """
-    game = GameController()
+    args = parse_args(argv)
+    game = GameController(seed=args.seed, record=args.record, capture=args.capture)
+    if args.replay:
+        game.input_session.start_replay(InputReplay.load(args.replay))
     game.run()
 
-# 啟動遊戲
-main()
\ No newline at end of file
+# 啟動遊戲（被其他模組匯入時不自動啟動，例如 headless.py）
+if __name__ == "__main__":
+    main()
\ No newline at end of file
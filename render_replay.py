@@ -0,0 +1,272 @@
+######################載入套件######################
+import os
+import io
+import time
+import zlib
+import shutil
+import argparse
+import tempfile
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# 必須在載入 pygame 之前指定 SDL 驅動，工作行程才能在沒有螢幕和音效卡的機器上繪製
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from config import *
+from headless import HeadlessRunner, mode_for_state
+from systems import InputReplay, create_rgb_surface, rgb_bytes, encoder_available, open_writer
+
+######################片段規劃######################
+def plan_segments(ticks, count):
+    """
+    把時間軸平均切成數個片段\n
+    \n
+    參數:\n
+    ticks (int): 總更新次數\n
+    count (int): 片段數量\n
+    \n
+    回傳:\n
+    list: [(開始更新次數, 結束更新次數), ...]，不含空的片段\n
+    """
+    count = max(1, min(count, ticks))
+    bounds = [(ticks * i // count, ticks * (i + 1) // count) for i in range(count)]
+    return [(start, end) for start, end in bounds if end > start]
+
+def is_frame_tick(tick, tick_rate, fps):
+    """
+    檢查第 tick 次更新之後是否要繪製一幀（輸出幀率低於模擬頻率時平均跳過一些更新）\n
+    \n
+    第 tick 次更新之後繪製的幀編號是 (tick + 1) * fps // tick_rate - 1，\n
+    任何片段都可以直接算出自己的幀編號，拼接時不必重新編號。\n
+    """
+    return (tick + 1) * fps // tick_rate > tick * fps // tick_rate
+
+def simulate_snapshots(replay, starts, ticks):
+    """
+    第一階段：不繪製、全速模擬一次，在每個片段開始的地方建立快照\n
+    \n
+    參數:\n
+    replay (InputReplay): 輸入重播\n
+    starts (list): 片段開始的更新次數\n
+    ticks (int): 最多模擬的更新次數\n
+    \n
+    回傳:\n
+    tuple: ({更新次數: 快照}, 實際更新次數)（這一局提前結束時實際次數較少）\n
+    """
+    runner = HeadlessRunner(mode_for_state(replay.game_state), seed=replay.seed, player_name=replay.player_name,
+                            last_ship=replay.last_ship)
+    wanted = set(starts)
+    snapshots = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for tick in range(ticks):
+            if tick in wanted:
+                snapshots[tick] = runner.game.snapshot()
+            runner.step(replay.keys_for(tick), replay.events_for(tick))
+            if not runner.is_running():
+                ticks = tick + 1
+                break
+        # 最後一個片段的結束狀態也留下來，用來檢查工作行程的模擬結果
+        if runner.is_running():
+            snapshots[ticks] = runner.game.snapshot()
+    return snapshots, ticks
+
+######################工作行程######################
+_worker = None
+
+def _init_worker(path):
+    """
+    工作行程初始化：載入錄製檔並建立一個無視窗模擬器（之後每個片段都重複使用）\n
+    \n
+    參數:\n
+    path (str): 輸入錄製檔路徑\n
+    """
+    global _worker
+    replay = InputReplay.load(path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner = HeadlessRunner(mode_for_state(replay.game_state), seed=replay.seed, player_name=replay.player_name,
+                                last_ship=replay.last_ship)
+    _worker = (replay, runner, create_rgb_surface(runner.game.screen.get_size()))
+
+def _render_segment(index, snapshot, start, end, fps, format_name, base_path):
+    """
+    工作行程：從快照還原，模擬並繪製一個片段\n
+    \n
+    參數:\n
+    index (int): 片段編號\n
+    snapshot (bytes): 片段開始時的快照\n
+    start (int): 開始的更新次數\n
+    end (int): 結束的更新次數（不含）\n
+    fps (int): 輸出幀率\n
+    format_name (str): png 或 raw\n
+    base_path (str): 輸出路徑（PNG 為所有片段共用的資料夾，raw 為這個片段自己的檔案）\n
+    \n
+    回傳:\n
+    tuple: (片段編號, 幀數, 耗時秒數, 結束狀態的 CRC32，已離開這一局時為 None)\n
+    """
+    replay, runner, frame = _worker
+    game = runner.game
+    tick_rate = replay.tick_rate
+    width, height = frame.get_size()
+    began = time.perf_counter()
+    frames = 0
+
+    writer = open_writer(format_name, base_path, width, height, fps)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.restore(snapshot)
+        runner.ticks = start
+        for tick in range(start, end):
+            runner.step(replay.keys_for(tick), replay.events_for(tick))
+            if is_frame_tick(tick, tick_rate, fps):
+                game.render()
+                frame.blit(game.screen, (0, 0))
+                writer.write((tick + 1) * fps // tick_rate - 1, rgb_bytes(frame))
+                frames += 1
+        checksum = zlib.crc32(game.snapshot()) if runner.is_running() else None
+    writer.close()
+    return index, frames, time.perf_counter() - began, checksum
+
+######################拼接######################
+def stitch_raw_segments(parts, format_name, base_path, width, height, fps):
+    """
+    依序把各片段的原始像素寫進最後的輸出（raw 檔或影片編碼器）\n
+    \n
+    參數:\n
+    parts (list): 各片段的 .rgb 檔路徑（依時間順序）\n
+    format_name (str): raw 或 encoder\n
+    base_path (str): 不含副檔名的輸出路徑\n
+    width (int): 寬度\n
+    height (int): 高度\n
+    fps (int): 幀率\n
+    \n
+    回傳:\n
+    str: 輸出路徑\n
+    """
+    frame_size = width * height * 3
+    writer = open_writer(format_name, base_path, width, height, fps)
+    index = 0
+    for part in parts:
+        with open(part, "rb") as f:
+            while True:
+                data = f.read(frame_size)
+                if len(data) < frame_size:
+                    break
+                writer.write(index, data)
+                index += 1
+    writer.close()
+    return writer.path
+
+######################命令列介面######################
+def parse_args(argv=None):
+    """
+    解析命令列參數\n
+    \n
+    參數:\n
+    argv (list): 命令列參數，None 表示使用 sys.argv\n
+    \n
+    回傳:\n
+    argparse.Namespace: 解析結果\n
+    """
+    settings = RENDER_REPLAY_SETTINGS
+    parser = argparse.ArgumentParser(description="Galaxy Blaster 離線平行繪製輸入錄製檔")
+    parser.add_argument("replay", help="輸入錄製檔（.gbr）")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="工作行程數量（預設為 CPU 核心數）")
+    parser.add_argument("--segments", type=int, default=None,
+                        help=f"片段數量（預設為工作行程數 × {settings['segments_per_worker']}）")
+    parser.add_argument("--fps", type=int, default=settings["fps"], help="輸出幀率")
+    parser.add_argument("--format", choices=("auto", "encoder", "png", "raw"), default=settings["format"],
+                        help="輸出格式")
+    parser.add_argument("--ticks", type=int, default=None, help="最多繪製的更新次數（預設為錄製長度）")
+    parser.add_argument("--output", default=None,
+                        help=f"不含副檔名的輸出路徑（預設為 {settings['output_dir']}/render-錄製檔名稱）")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    離線平行繪製主程式\n
+    \n
+    1. 主行程不繪製、全速模擬一次，在每個片段開始的地方建立快照\n
+    2. 工作行程各自從快照還原，模擬並繪製自己的片段（SDL dummy 驅動）\n
+    3. PNG 序列的檔名就是幀編號，直接寫進同一個資料夾；raw 和影片依片段順序拼接\n
+    每個片段結束時比對工作行程和第一階段的狀態，確認畫面和循序繪製的結果相同。\n
+    \n
+    參數:\n
+    argv (list): 命令列參數，None 表示使用 sys.argv\n
+    """
+    args = parse_args(argv)
+    replay = InputReplay.load(args.replay)
+    tick_rate = replay.tick_rate
+    if not 0 < args.fps <= tick_rate:
+        raise SystemExit(f"--fps 必須介於 1 和模擬頻率 {tick_rate} 之間")
+
+    format_name = args.format
+    if format_name == "auto":
+        format_name = "encoder" if encoder_available() else "png"
+    elif format_name == "encoder" and not encoder_available():
+        print(f"找不到編碼器 {FRAME_CAPTURE_SETTINGS['encoder']}，改為輸出 PNG 序列")
+        format_name = "png"
+
+    workers = max(1, args.workers)
+    segment_count = args.segments or workers * RENDER_REPLAY_SETTINGS["segments_per_worker"]
+    base_path = args.output or os.path.join(RENDER_REPLAY_SETTINGS["output_dir"],
+                                            "render-" + os.path.splitext(os.path.basename(args.replay))[0])
+    os.makedirs(os.path.dirname(base_path) or ".", exist_ok=True)
+
+    started = time.perf_counter()
+    ticks = min(args.ticks or replay.ticks, replay.ticks)
+    if ticks <= 0:
+        raise SystemExit(f"錄製檔沒有任何更新紀錄: {args.replay}")
+    segments = plan_segments(ticks, segment_count)
+    snapshots, ticks = simulate_snapshots(replay, [start for start, _ in segments], ticks)
+    segments = [(start, min(end, ticks)) for start, end in segments if start < ticks]
+    simulated = time.perf_counter()
+    print(f"第一階段：模擬 {ticks} 次更新、建立 {len(segments)} 個快照，耗時 {simulated - started:.2f} 秒")
+
+    # PNG 由工作行程直接寫進輸出資料夾；raw 和影片先寫成各片段的 .rgb，再依序拼接
+    part_dir = None if format_name == "png" else tempfile.mkdtemp(prefix="render-", dir=os.path.dirname(base_path) or ".")
+    part_paths = [base_path if part_dir is None else os.path.join(part_dir, f"part_{index:04d}")
+                  for index in range(len(segments))]
+    frame_count = 0
+    mismatched = []
+
+    # 先算好每個片段結束狀態的 CRC32：某個片段的結束就是下一個片段的開始，那份快照送出後就不再保留
+    expected = {end: zlib.crc32(snapshots[end]) for _, end in segments if end in snapshots}
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(min(workers, len(segments)), mp_context=context,
+                             initializer=_init_worker, initargs=(args.replay,)) as pool:
+        futures = [pool.submit(_render_segment, index, snapshots.pop(start), start, end, args.fps,
+                               "png" if part_dir is None else "raw", part_paths[index])
+                   for index, (start, end) in enumerate(segments)]
+        for done, future in enumerate(as_completed(futures), 1):
+            index, frames, seconds, checksum = future.result()
+            frame_count += frames
+            end = segments[index][1]
+            if end in expected and checksum != expected[end]:
+                mismatched.append(index)
+            print(f"片段 {done}/{len(segments)} 完成：第 {segments[index][0]}-{segments[index][1]} 次更新，"
+                  f"{frames} 幀，{seconds:.2f} 秒")
+    rendered = time.perf_counter()
+
+    if part_dir is None:
+        output = base_path
+    else:
+        output = stitch_raw_segments([path + ".rgb" for path in part_paths], format_name, base_path,
+                                     SCREEN_WIDTH, SCREEN_HEIGHT, args.fps)
+        shutil.rmtree(part_dir)
+    finished = time.perf_counter()
+
+    match_seconds = ticks / tick_rate
+    total = finished - started
+    print(f"繪製 {frame_count} 幀（{args.fps} FPS，{workers} 個工作行程）：平行繪製 {rendered - simulated:.2f} 秒，"
+          f"拼接 {finished - rendered:.2f} 秒，總共 {total:.2f} 秒"
+          f"（對局長度 {match_seconds:.1f} 秒，{total / match_seconds:.2f} 倍實際時間）")
+    if mismatched:
+        print(f"警告：片段 {sorted(mismatched)} 的結束狀態和第一階段的模擬不同，畫面可能和循序繪製不一致")
+    print(f"輸出：{output}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+######################載入套件######################
+import io
+import argparse
+import contextlib
+import pygame
+from config import *
+from systems import HideSeekSystem, HideSeekReplayFile, apply_hide_seek_state, render_text, draw_numeric_text
+
+######################重播檢視器######################
+class ReplayViewer:
+    """
+    躲貓貓重播檢視器 - 開啟可跳轉的重播檔，用遊戲原本的繪製程式播放\n
+    \n
+    以重播檔記錄的對局種子重建同一張地圖和同一批玩家，\n
+    每一幀從檔案取出當時的狀態套用上去再繪製，不執行任何遊戲邏輯，\n
+    所以可以任意往前、往後跳，不必從頭重新模擬。\n
+    \n
+    操作:\n
+    空白鍵: 暫停/繼續\n
+    左右鍵: 往前/往後跳 seek_seconds 秒\n
+    , / .: 暫停時往前/往後一幀\n
+    Home / End: 跳到開頭/結尾\n
+    Esc: 離開\n
+    """
+
+    def __init__(self, path):
+        """
+        開啟重播檔並重建躲貓貓場景\n
+        \n
+        參數:\n
+        path (str): 躲貓貓重播檔路徑\n
+        """
+        self.replay = HideSeekReplayFile(path)
+        self.seek_frames = HIDE_SEEK_REPLAY_SETTINGS["seek_seconds"] * self.replay.tick_rate
+        self.frame = 0
+        self.paused = False
+        self.running = True
+
+        pygame.init()
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption(f"Galaxy Blaster - 躲貓貓重播（種子 {self.replay.match_seed}）")
+        self.clock = pygame.time.Clock()
+        self.font = create_font(FONT_SIZES["small"])
+
+        # 同一個種子會產生同樣的地圖、太空船樣式與道具（建立過程的訊息不需要再印一次）
+        with contextlib.redirect_stdout(io.StringIO()):
+            seed_rng(self.replay.match_seed)
+            self.system = HideSeekSystem(self.replay.player_name)
+        if len(self.system.players) != self.replay.player_count:
+            raise ValueError(f"重播檔有 {self.replay.player_count} 位玩家，重建的場景有 {len(self.system.players)} 位，"
+                             "請確認 HIDE_SEEK_SETTINGS 與錄製時相同")
+
+    def seek(self, frame):
+        """
+        跳到指定的幀\n
+        \n
+        參數:\n
+        frame (int): 幀編號（超出範圍時停在開頭或結尾）\n
+        """
+        self.frame = max(0, min(frame, self.replay.frame_count - 1))
+
+    def handle_events(self):
+        """
+        處理播放控制按鍵\n
+        """
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.running = False
+                elif event.key == pygame.K_SPACE:
+                    self.paused = not self.paused
+                elif event.key == pygame.K_LEFT:
+                    self.seek(self.frame - self.seek_frames)
+                elif event.key == pygame.K_RIGHT:
+                    self.seek(self.frame + self.seek_frames)
+                elif event.key == pygame.K_COMMA:
+                    self.paused = True
+                    self.seek(self.frame - 1)
+                elif event.key == pygame.K_PERIOD:
+                    self.paused = True
+                    self.seek(self.frame + 1)
+                elif event.key == pygame.K_HOME:
+                    self.seek(0)
+                elif event.key == pygame.K_END:
+                    self.seek(self.replay.frame_count - 1)
+
+    def draw(self):
+        """
+        套用目前這一幀的狀態並繪製畫面\n
+        """
+        system = self.system
+        apply_hide_seek_state(system, self.replay.state_at(self.frame))
+        system.minimap_system.update(system.players, system.ghosts)
+
+        self.screen.fill(BLACK)
+        system.draw(self.screen)
+
+        # 播放進度（秒）
+        tick_rate = self.replay.tick_rate
+        draw_numeric_text(self.screen, self.font,
+                          ("重播 ", self.frame // tick_rate, " / ", (self.replay.frame_count - 1) // tick_rate, " 秒"),
+                          True, YELLOW, topleft=(10, SCREEN_HEIGHT - 30))
+        if self.paused:
+            paused_text = render_text(self.font, "暫停（, . 逐幀、左右鍵跳轉）", True, YELLOW)
+            self.screen.blit(paused_text, (10, SCREEN_HEIGHT - 55))
+        pygame.display.flip()
+
+    def run(self):
+        """
+        播放迴圈（以錄製時的模擬頻率前進）\n
+        """
+        while self.running:
+            self.handle_events()
+            self.draw()
+            if not self.paused and self.frame < self.replay.frame_count - 1:
+                self.frame += 1
+            self.clock.tick(self.replay.tick_rate)
+
+        self.replay.close()
+        pygame.quit()
+
+######################命令列介面######################
+def main(argv=None):
+    """
+    重播檢視器主程式\n
+    \n
+    參數:\n
+    argv (list): 命令列參數，None 表示使用 sys.argv\n
+    """
+    parser = argparse.ArgumentParser(description="Galaxy Blaster 躲貓貓重播檢視器")
+    parser.add_argument("path", help="躲貓貓重播檔（.gbhs）")
+    args = parser.parse_args(argv)
+    ReplayViewer(args.path).run()
+
+if __name__ == "__main__":
+    main()
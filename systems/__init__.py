@@ -3,6 +3,8 @@
 
 此模組包含所有遊戲系統功能：
 - collision: 碰撞檢測系統
+- text_cache: 文字 Surface 快取
+- glyph_atlas: 數字字形圖集
 - ui: 使用者介面系統
 - shop: 商店系統
 - menu: 主畫面系統
@@ -10,11 +12,25 @@
 - visual_effects: 視覺效果系統
 - hide_seek: 躲貓貓遊戲系統
 - boss_fight: Boss Fight 模式系統
+- memory_report: 物件記憶體用量報告（除錯用）
+- frame_profiler: 每幀各階段耗時的環狀緩衝區（除錯用）
+- performance_overlay: FPS、幀時間曲線與物件數量的疊加層（除錯用）
+- spike_detector: 偵測變慢的幀並寫出當時的耗時與遊戲狀態（除錯用）
+- profile_capture: 熱鍵切換的 cProfile 錄製（除錯用）
+- interpolation: 固定時間步長的繪製插值
+- idle_screen: 靜態畫面等待事件、只在外觀改變時重畫
+- input_recording: 輸入錄製與重播（按鍵位元遮罩）
+- hide_seek_replay: 躲貓貓可跳轉重播檔（關鍵幀 + 差異幀）
+- snapshot: 遊戲狀態快照的二進位打包與還原
+- kill_cam: 最後幾秒的擊殺回放（環狀緩衝區）
+- frame_capture: 背景執行緒寫檔的遊戲畫面錄製
 
 這些系統負責處理遊戲邏輯，與遊戲物件分離，提高程式碼的模組化程度。
 """
 
-from .collision import check_collision
+from .collision import check_collision, SpatialHash
+from .text_cache import TextSurfaceCache, render_text, get_text_cache_stats
+from .glyph_atlas import GlyphAtlas, get_glyph_atlas, draw_numeric_text
 from .ui import UISystem
 from .shop import ShopSystem
 from .menu import MenuSystem
@@ -22,5 +38,17 @@ from .ship_battle import ShipBattleSystem
 from .visual_effects import VisualEffectsSystem
 from .hide_seek import HideSeekSystem
 from .boss_fight import BossFightSystem
+from .memory_report import build_memory_report, format_memory_report, print_memory_report
+from .frame_profiler import FrameProfiler, frame_profiler
+from .performance_overlay import PerformanceOverlay
+from .spike_detector import SpikeDetector
+from .profile_capture import ProfileCapture
+from .interpolation import RenderInterpolator
+from .idle_screen import IdleScreen
+from .input_recording import MATCH_STATES, KeyState, InputRecorder, InputReplay, InputSession
+from .hide_seek_replay import HideSeekReplayWriter, HideSeekReplayFile, apply_hide_seek_state
+from .snapshot import SnapshotWriter, SnapshotReader, write_rng_state, read_rng_state, write_random_state, read_random_state
+from .kill_cam import KillCamRing, KillCam, HideSeekKillCam, BossFightKillCam
+from .frame_capture import FrameCapture, encode_png, create_rgb_surface, rgb_bytes, encoder_available, open_writer
 
-__all__ = ['check_collision', 'UISystem', 'ShopSystem', 'MenuSystem', 'ShipBattleSystem', 'VisualEffectsSystem', 'HideSeekSystem', 'BossFightSystem']
\ No newline at end of file
+__all__ = ['check_collision', 'SpatialHash', 'TextSurfaceCache', 'render_text', 'get_text_cache_stats', 'GlyphAtlas', 'get_glyph_atlas', 'draw_numeric_text', 'UISystem', 'ShopSystem', 'MenuSystem', 'ShipBattleSystem', 'VisualEffectsSystem', 'HideSeekSystem', 'BossFightSystem', 'build_memory_report', 'format_memory_report', 'print_memory_report', 'FrameProfiler', 'frame_profiler', 'PerformanceOverlay', 'SpikeDetector', 'ProfileCapture', 'RenderInterpolator', 'IdleScreen', 'MATCH_STATES', 'KeyState', 'InputRecorder', 'InputReplay', 'InputSession', 'HideSeekReplayWriter', 'HideSeekReplayFile', 'apply_hide_seek_state', 'SnapshotWriter', 'SnapshotReader', 'write_rng_state', 'read_rng_state', 'KillCamRing', 'KillCam', 'HideSeekKillCam', 'BossFightKillCam', 'FrameCapture', 'encode_png', 'create_rgb_surface', 'rgb_bytes', 'encoder_available', 'open_writer']
\ No newline at end of file
@@ -1,8 +1,9 @@
 ######################載入套件######################
 import pygame
-import random
 from config import *
-from entities import Player, Bullet, AllyShip
+from entities import Player, AllyShip, ProjectileStore, release_bullet
+from .collision import check_collision
+from .frame_profiler import frame_profiler
 
 ######################Boss Fight 系統類別######################
 class BossFightSystem:
@@ -61,10 +62,10 @@ class BossFightSystem:
         self.current_boss = None
         self.boss_spawn_timer = 0
         
-        # 遊戲物件列表
-        self.player_bullets = []
-        self.ally_bullets = []  # 盟友子彈
-        self.boss_bullets = []
+        # 子彈都使用陣列式儲存（轉存後子彈物件立即歸還物件池）
+        self.player_bullets = ProjectileStore(ProjectileStore.TEAM_PLAYER, cull_margin=None, release=release_bullet)
+        self.ally_bullets = ProjectileStore(ProjectileStore.TEAM_ALLY, cull_margin=None, release=release_bullet)  # 盟友子彈
+        self.boss_bullets = ProjectileStore(ProjectileStore.TEAM_ENEMY, release=release_bullet)  # Boss 彈幕
         
         # 遊戲狀態
         self.game_state = "preparing"  # preparing, fighting, boss_defeated, victory, defeat
@@ -90,7 +91,7 @@ class BossFightSystem:
         print(f"可用太空船：{available_ships}")
         
         # 隨機選擇一艘太空船
-        selected_ship = random.choice(available_ships)
+        selected_ship = get_rng("spawning").choice(available_ships)
         
         # 設置玩家的太空船類型
         self.player.spaceship_type = selected_ship
@@ -197,18 +198,19 @@ class BossFightSystem:
         # 更新玩家
         self._update_player(keys)
         
-        # 更新盟友太空船
-        self._update_ally_ships()
-        
-        # 更新 Boss
-        if self.current_boss:
-            self._update_boss()
+        # 更新盟友太空船和 Boss（AI）
+        with frame_profiler.probe("ai"):
+            self._update_ally_ships()
+            
+            if self.current_boss:
+                self._update_boss()
         
         # 更新子彈
         self._update_bullets()
         
         # 碰撞檢測
-        self._handle_collisions()
+        with frame_profiler.probe("collisions"):
+            self._handle_collisions()
         
         # 檢查戰鬥結果
         if self.player.health <= 0:
@@ -244,7 +246,7 @@ class BossFightSystem:
         if keys[pygame.K_SPACE]:
             new_bullet = self.player.shoot()
             if new_bullet:
-                self.player_bullets.append(new_bullet)
+                self.player_bullets.add_bullet(new_bullet)
                 # 播放射擊音效
                 from config import play_sound
                 play_sound(self.sounds, "laser_shoot")
@@ -299,67 +301,40 @@ class BossFightSystem:
         """
         更新所有子彈\n
         """
-        # 更新玩家子彈
-        for bullet in self.player_bullets[:]:
-            bullet.move()
-            if bullet.is_off_screen():
-                self.player_bullets.remove(bullet)
-        
-        # 更新盟友子彈
-        for bullet in self.ally_bullets[:]:
-            bullet.move()
-            if bullet.is_off_screen():
-                self.ally_bullets.remove(bullet)
-        
-        # 更新 Boss 子彈
-        for bullet in self.boss_bullets[:]:
-            bullet.move()
-            if bullet.is_off_screen():
-                self.boss_bullets.remove(bullet)
+        # 整批移動並剔除出界子彈
+        for store in (self.player_bullets, self.ally_bullets, self.boss_bullets):
+            store.step()
+            store.cull_off_screen()
     
     def _handle_collisions(self):
         """
         處理所有碰撞檢測\n
         """
-        from systems.collision import check_collision
-        
-        # 玩家子彈打中 Boss
-        for bullet in self.player_bullets[:]:
-            if self.current_boss:
-                if check_collision(bullet.x, bullet.y, bullet.width, bullet.height,
-                                 self.current_boss.x, self.current_boss.y, 
-                                 self.current_boss.width, self.current_boss.height):
-                    # 造成傷害
-                    self.current_boss.take_damage(bullet.damage)
-                    self.player_bullets.remove(bullet)
-        
-        # 盟友子彈打中 Boss
-        for bullet in self.ally_bullets[:]:
-            if self.current_boss:
-                if check_collision(bullet.x, bullet.y, bullet.width, bullet.height,
-                                 self.current_boss.x, self.current_boss.y, 
-                                 self.current_boss.width, self.current_boss.height):
-                    # 造成傷害
-                    self.current_boss.take_damage(bullet.damage)
-                    self.ally_bullets.remove(bullet)
-        
-        # Boss 子彈打中玩家
-        for bullet in self.boss_bullets[:]:
-            if check_collision(bullet.x, bullet.y, bullet.width, bullet.height,
-                             self.player.x, self.player.y, self.player.width, self.player.height):
-                # 造成傷害
-                self.player.health -= bullet.damage
-                self.boss_bullets.remove(bullet)
-        
-        # Boss 子彈打中盟友
-        for bullet in self.boss_bullets[:]:
-            for ally in self.ally_ships:
-                if check_collision(bullet.x, bullet.y, bullet.width, bullet.height,
-                                 ally.x, ally.y, ally.width, ally.height):
-                    # 盟友受傷
-                    ally.take_damage(bullet.damage)
-                    self.boss_bullets.remove(bullet)
-                    break  # 避免一個子彈打中多個盟友
+        # 這個模式只有一個 Boss 和少數幾個玩家方目標，不用空間網格：
+        # 把每顆子彈放進網格要跑 Python 迴圈，直接用 hit_test() 對整欄子彈做向量化判斷更快
+        if self.current_boss:
+            boss = self.current_boss
+            
+            # 玩家子彈、盟友子彈打中 Boss（依子彈順序造成傷害）
+            for store in (self.player_bullets, self.ally_bullets):
+                hits = store.hit_test([boss])
+                damage = store.damage
+                for row, _ in hits:
+                    boss.take_damage(int(damage[row]))
+                store.remove_rows(row for row, _ in hits)
+        
+        # Boss 子彈打中玩家或盟友（一次檢查整批子彈，每顆子彈只打中排在最前面的目標）
+        targets = [self.player] + self.ally_ships
+        hits = self.boss_bullets.hit_test(targets)
+        damage = self.boss_bullets.damage
+        for row, target_index in hits:
+            if target_index == 0:
+                # 玩家受傷
+                self.player.health -= int(damage[row])
+            else:
+                # 盟友受傷
+                self.ally_ships[target_index - 1].take_damage(int(damage[row]))
+        self.boss_bullets.remove_rows(row for row, _ in hits)
         
         # 玩家撞到 Boss
         if self.current_boss:
@@ -404,7 +379,7 @@ class BossFightSystem:
         self.total_score += boss_config["score"]
         
         # 隨機獲得治療藥水
-        if random.randint(1, 100) <= BOSS_FIGHT_POTIONS["random_drop_chance"]:
+        if get_rng("drops").randint(1, 100) <= BOSS_FIGHT_POTIONS["random_drop_chance"]:
             self.health_potions = min(BOSS_FIGHT_POTIONS["max_potions"], 
                                     self.health_potions + 1)
             print("擊敗 Boss 獲得額外治療藥水！")
@@ -451,6 +426,49 @@ class BossFightSystem:
         
         return None
     
+    def get_entity_lists(self):
+        """
+        取得這個模式中的物件串列（記憶體報告使用）\n
+        \n
+        回傳:\n
+        dict: 串列名稱 → 物件串列\n
+        """
+        return {
+            "player_bullets": self.player_bullets,
+            "ally_bullets": self.ally_bullets,
+            "boss_bullets": self.boss_bullets,
+            "ally_ships": self.ally_ships
+        }
+    
+    def save_state(self, writer):
+        """
+        把 Boss Fight 狀態寫入快照（子彈直接打包欄位陣列）\n
+        \n
+        參數:\n
+        writer (SnapshotWriter): 快照寫入\n
+        """
+        writer.fields(self, ("player_name", "health_potions", "potion_heal_amount", "current_boss_index",
+                             "boss_spawn_timer", "game_state", "state_timer", "total_score"))
+        writer.object(self.player)
+        writer.objects(self.ally_ships)
+        writer.object(self.current_boss)
+        for store in (self.player_bullets, self.ally_bullets, self.boss_bullets):
+            store.save_state(writer)
+    
+    def load_state(self, reader):
+        """
+        從快照還原 Boss Fight 狀態\n
+        \n
+        參數:\n
+        reader (SnapshotReader): 快照讀取\n
+        """
+        reader.fields(self)
+        self.player = reader.object()
+        self.ally_ships = reader.objects_list()
+        self.current_boss = reader.object()
+        for store in (self.player_bullets, self.ally_bullets, self.boss_bullets):
+            store.load_state(reader)
+    
     def draw(self, screen):
         """
         繪製 Boss Fight 畫面\n
@@ -521,12 +539,10 @@ class BossFightSystem:
             ally.draw(screen)
         
         # 繪製玩家子彈
-        for bullet in self.player_bullets:
-            bullet.draw(screen)
+        self.player_bullets.draw(screen)
         
         # 繪製盟友子彈
-        for bullet in self.ally_bullets:
-            bullet.draw(screen)
+        self.ally_bullets.draw(screen)
         
         # 繪製 Boss
         if self.current_boss:
@@ -534,8 +550,7 @@ class BossFightSystem:
             self.current_boss.draw_health_bar(screen)
         
         # 繪製 Boss 子彈
-        for bullet in self.boss_bullets:
-            bullet.draw(screen)
+        self.boss_bullets.draw(screen)
         
         # 繪製 UI
         self._draw_ui(screen)
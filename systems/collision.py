@@ -1,3 +1,12 @@
+######################載入套件######################
+from config import SPATIAL_HASH_SETTINGS
+
+# NumPy 為選用套件：有安裝時批次查詢一次計算所有矩形，沒有時逐一呼叫 query_rect()
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 ######################碰撞檢測系統######################
 
 def check_collision(obj1_x, obj1_y, obj1_width, obj1_height, obj2_x, obj2_y, obj2_width, obj2_height):
@@ -17,4 +26,298 @@ def check_collision(obj1_x, obj1_y, obj1_width, obj1_height, obj2_x, obj2_y, obj
     return (obj1_x < obj2_x + obj2_width and
             obj1_x + obj1_width > obj2_x and
             obj1_y < obj2_y + obj2_height and
-            obj1_y + obj1_height > obj2_y)
\ No newline at end of file
+            obj1_y + obj1_height > obj2_y)
+
+######################空間雜湊網格######################
+class SpatialHash:
+    """
+    均勻網格空間雜湊 - 碰撞檢測的粗篩階段（broadphase）\n
+    \n
+    把物件依矩形範圍放進固定大小的格子，查詢時只檢查附近格子的物件，\n
+    讓子彈對敵人的檢測不必兩兩比對。物件依「圖層」分組（例如子彈、敵人），\n
+    每幀用 rebuild() 重建，或用 insert()/remove() 個別更新。\n
+    \n
+    物件需要有 x、y、width、height 屬性（也可以在 insert 時直接給矩形）。\n
+    查詢結果一律依插入順序排列，和原本逐一掃描串列的順序相同。\n
+    """
+
+    def __init__(self, cell_size=None):
+        """
+        初始化空間雜湊\n
+        \n
+        參數:\n
+        cell_size (int): 格子邊長（像素），預設使用 SPATIAL_HASH_SETTINGS\n
+        """
+        self.cell_size = cell_size or SPATIAL_HASH_SETTINGS["cell_size"]
+        self.cells = {}    # 圖層 → {(格子x, 格子y): [項目, ...]}
+        self.entries = {}  # 圖層 → {id(物件): 項目}
+        self.next_order = 0
+
+    def clear(self, layer=None):
+        """
+        清空網格\n
+        \n
+        參數:\n
+        layer (str): 只清空指定圖層，None 表示全部清空\n
+        """
+        if layer is None:
+            self.cells.clear()
+            self.entries.clear()
+            self.next_order = 0
+        else:
+            self.cells.pop(layer, None)
+            self.entries.pop(layer, None)
+
+    def rebuild(self, layer, objects):
+        """
+        以物件串列重建一個圖層\n
+        \n
+        參數:\n
+        layer (str): 圖層名稱\n
+        objects (iterable): 要放入的物件\n
+        """
+        self.clear(layer)
+        for obj in objects:
+            self.insert(obj, layer)
+
+    def insert(self, obj, layer, x=None, y=None, width=None, height=None):
+        """
+        將物件放入網格\n
+        \n
+        參數:\n
+        obj (object): 要放入的物件\n
+        layer (str): 圖層名稱\n
+        x, y, width, height (int): 物件矩形，省略時讀取物件屬性\n
+        """
+        if x is None:
+            x, y, width, height = obj.x, obj.y, obj.width, obj.height
+
+        # 項目格式: [插入順序, 物件, x, y, 寬, 高, 是否有效]
+        entry = [self.next_order, obj, x, y, width, height, True]
+        self.next_order += 1
+
+        layer_entries = self.entries.setdefault(layer, {})
+        old_entry = layer_entries.get(id(obj))
+        if old_entry is not None:
+            old_entry[6] = False
+        layer_entries[id(obj)] = entry
+
+        layer_cells = self.cells.setdefault(layer, {})
+        cell_size = self.cell_size
+        for cell_x in range(int(x // cell_size), int((x + width) // cell_size) + 1):
+            for cell_y in range(int(y // cell_size), int((y + height) // cell_size) + 1):
+                bucket = layer_cells.get((cell_x, cell_y))
+                if bucket is None:
+                    layer_cells[(cell_x, cell_y)] = [entry]
+                else:
+                    bucket.append(entry)
+
+    def remove(self, obj, layer):
+        """
+        將物件從網格移除（例如敵人在同一幀內被擊毀）\n
+        \n
+        參數:\n
+        obj (object): 要移除的物件\n
+        layer (str): 圖層名稱\n
+        """
+        layer_entries = self.entries.get(layer)
+        if layer_entries:
+            entry = layer_entries.pop(id(obj), None)
+            if entry is not None:
+                # 只標記失效，格子內的項目在下次重建時自然清除
+                entry[6] = False
+
+    def query_rect(self, x, y, width, height, layer):
+        """
+        查詢與矩形重疊的物件\n
+        \n
+        參數:\n
+        x, y, width, height (int): 查詢矩形\n
+        layer (str): 圖層名稱\n
+        \n
+        回傳:\n
+        list: 重疊的物件（依插入順序）\n
+        """
+        layer_cells = self.cells.get(layer)
+        if not layer_cells:
+            return []
+
+        found = None
+        cell_size = self.cell_size
+        right = x + width
+        bottom = y + height
+        for cell_x in range(int(x // cell_size), int(right // cell_size) + 1):
+            for cell_y in range(int(y // cell_size), int(bottom // cell_size) + 1):
+                bucket = layer_cells.get((cell_x, cell_y))
+                if not bucket:
+                    continue
+                for entry in bucket:
+                    if (entry[6] and x < entry[2] + entry[4] and right > entry[2] and
+                            y < entry[3] + entry[5] and bottom > entry[3]):
+                        # 跨越多個格子的物件可能重複出現，以插入順序為鍵去除重複
+                        if found is None:
+                            found = {}
+                        found[entry[0]] = entry[1]
+
+        if found is None:
+            return []
+        if len(found) > 1:
+            return [found[order] for order in sorted(found)]
+        return list(found.values())
+
+    def query_rects(self, xs, ys, widths, heights, layer):
+        """
+        一次查詢多個矩形（例如陣列式儲存區裡的所有子彈）\n
+        \n
+        結果和對每個矩形呼叫 query_rect() 相同。有 NumPy 而且矩形夠多時整批計算：\n
+        先算出每個矩形碰到的格子，只展開那些格子裡的物件做 AABB 檢查，\n
+        成本和「矩形數量 + 候選配對數量」成正比，不會變成矩形數 × 物件數。\n
+        \n
+        參數:\n
+        xs, ys, widths, heights (sequence): 各矩形的位置和尺寸（長度相同）\n
+        layer (str): 圖層名稱\n
+        \n
+        回傳:\n
+        list: (矩形索引, [重疊的物件...]) 配對，依矩形索引排列，物件依插入順序；沒有重疊的矩形不列出\n
+        """
+        layer_cells = self.cells.get(layer)
+        if not layer_cells or not len(xs):
+            return []
+        if np is None or len(xs) < SPATIAL_HASH_SETTINGS["batch_min_rects"]:
+            # 矩形不多時逐一查詢比較快（整批計算有固定的陣列準備成本）
+            if np is not None:
+                xs, ys = np.asarray(xs).tolist(), np.asarray(ys).tolist()
+                widths, heights = np.asarray(widths).tolist(), np.asarray(heights).tolist()
+            hits = []
+            for index, (x, y, width, height) in enumerate(zip(xs, ys, widths, heights)):
+                found = self.query_rect(x, y, width, height, layer)
+                if found:
+                    hits.append((index, found))
+            return hits
+
+        # 有物件的格子依序編號，每個格子的物件攤平成連續的陣列（start、count 指出每個格子的範圍）
+        objects = {}
+        cell_index = {}
+        starts, counts, entry_columns = [], [], []
+        for cell, bucket in layer_cells.items():
+            valid = [entry for entry in bucket if entry[6]]
+            if valid:
+                cell_index[cell] = len(starts)
+                starts.append(len(entry_columns))
+                counts.append(len(valid))
+                for entry in valid:
+                    objects[entry[0]] = entry[1]
+                    entry_columns.append((entry[0], entry[2], entry[3], entry[4], entry[5]))
+        if not cell_index:
+            return []
+        orders, entry_x, entry_y, entry_w, entry_h = np.array(entry_columns, dtype=np.float64).T
+        orders = orders.astype(np.int64)
+        starts = np.array(starts, dtype=np.int64)
+        counts = np.array(counts, dtype=np.int64)
+
+        # 格子座標 → 格子編號的查表（範圍只涵蓋有物件的格子，-1 表示空格子）
+        cells = np.array(list(cell_index), dtype=np.int64)
+        left, top = cells.min(axis=0)
+        lookup = np.full((cells[:, 1].max() - top + 1, cells[:, 0].max() - left + 1), -1, dtype=np.int64)
+        lookup[cells[:, 1] - top, cells[:, 0] - left] = np.arange(len(cells))
+
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        rights = xs + np.asarray(widths, dtype=np.float64)
+        bottoms = ys + np.asarray(heights, dtype=np.float64)
+        cell_size = self.cell_size
+        x0 = (xs // cell_size).astype(np.int64) - left
+        x1 = (rights // cell_size).astype(np.int64) - left
+        y0 = (ys // cell_size).astype(np.int64) - top
+        y1 = (bottoms // cell_size).astype(np.int64) - top
+
+        # 每個矩形碰到的格子：依最大跨度逐一位移（子彈通常只碰到 1~4 個格子）
+        query_parts, cell_parts = [], []
+        height_cells, width_cells = lookup.shape
+        for dy in range(int((y1 - y0).max()) + 1):
+            cell_y = y0 + dy
+            for dx in range(int((x1 - x0).max()) + 1):
+                cell_x = x0 + dx
+                inside = ((cell_x <= x1) & (cell_y <= y1) & (cell_x >= 0) & (cell_x < width_cells) &
+                          (cell_y >= 0) & (cell_y < height_cells))
+                queries = np.nonzero(inside)[0]
+                found = lookup[cell_y[queries], cell_x[queries]]
+                occupied = found >= 0
+                query_parts.append(queries[occupied])
+                cell_parts.append(found[occupied])
+        queries = np.concatenate(query_parts)
+        if not len(queries):
+            return []
+        found_cells = np.concatenate(cell_parts)
+
+        # 展開成 (矩形, 物件) 候選配對，再做精確的 AABB 檢查
+        pair_counts = counts[found_cells]
+        total = int(pair_counts.sum())
+        pair_queries = np.repeat(queries, pair_counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+        entries = np.repeat(starts[found_cells], pair_counts) + offsets
+        overlap = ((xs[pair_queries] < entry_x[entries] + entry_w[entries]) & (rights[pair_queries] > entry_x[entries]) &
+                   (ys[pair_queries] < entry_y[entries] + entry_h[entries]) & (bottoms[pair_queries] > entry_y[entries]))
+        if not overlap.any():
+            return []
+
+        # 跨越多個格子的物件可能重複出現；依 (矩形, 插入順序) 排序並去除重複
+        order_range = int(orders.max()) + 1
+        keys = np.unique(pair_queries[overlap] * order_range + orders[entries[overlap]])
+        hit_queries, hit_orders = np.divmod(keys, order_range)
+        hits = []
+        for query, order in zip(hit_queries.tolist(), hit_orders.tolist()):
+            if hits and hits[-1][0] == query:
+                hits[-1][1].append(objects[order])
+            else:
+                hits.append((query, [objects[order]]))
+        return hits
+
+    def query_radius(self, center_x, center_y, radius, layer):
+        """
+        查詢與圓形範圍重疊的物件\n
+        \n
+        參數:\n
+        center_x, center_y (float): 圓心座標\n
+        radius (float): 半徑\n
+        layer (str): 圖層名稱\n
+        \n
+        回傳:\n
+        list: 矩形與圓形重疊的物件（依插入順序）\n
+        """
+        candidates = self.query_rect(center_x - radius, center_y - radius, radius * 2, radius * 2, layer)
+        layer_entries = self.entries[layer] if candidates else None
+        radius_squared = radius * radius
+
+        result = []
+        for obj in candidates:
+            entry = layer_entries[id(obj)]
+            # 找出矩形上離圓心最近的點
+            nearest_x = min(max(center_x, entry[2]), entry[2] + entry[4])
+            nearest_y = min(max(center_y, entry[3]), entry[3] + entry[5])
+            dx = center_x - nearest_x
+            dy = center_y - nearest_y
+            if dx * dx + dy * dy <= radius_squared:
+                result.append(obj)
+        return result
+
+    def candidate_pairs(self, layer_a, layer_b):
+        """
+        找出兩個圖層之間矩形重疊的所有物件配對\n
+        \n
+        參數:\n
+        layer_a (str): 第一個圖層名稱\n
+        layer_b (str): 第二個圖層名稱\n
+        \n
+        回傳:\n
+        list: (圖層A物件, 圖層B物件) 配對，依 A 再依 B 的插入順序排列\n
+        """
+        entries_a = self.entries.get(layer_a)
+        if not entries_a or not self.cells.get(layer_b):
+            return []
+
+        pairs = []
+        for entry in sorted(entries_a.values()):
+            for other in self.query_rect(entry[2], entry[3], entry[4], entry[5], layer_b):
+                pairs.append((entry[1], other))
+        return pairs
@@ -0,0 +1,390 @@
+######################載入套件######################
+import os
+import sys
+import json
+import time
+import zlib
+import queue
+import shutil
+import struct
+import threading
+import subprocess
+import pygame
+from config import *
+
+######################PNG 編碼######################
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+def _png_chunk(kind, data):
+    """
+    組出一個 PNG 區塊（長度、種類、資料、CRC）\n
+    """
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def encode_png(data, width, height, pitch, level=1):
+    """
+    把 RGB24 像素資料編碼成 PNG\n
+    \n
+    壓縮使用 zlib.compress，壓縮期間會釋放 GIL，\n
+    在背景執行緒編碼時主執行緒可以繼續執行遊戲迴圈\n
+    （pygame.image.save 存 PNG 時大部分時間都持有 GIL）。\n
+    \n
+    參數:\n
+    data (bytes): 像素資料（每列 pitch bytes，前 width * 3 bytes 為 R、G、B）\n
+    width (int): 寬度\n
+    height (int): 高度\n
+    pitch (int): 每列的 bytes 數\n
+    level (int): zlib 壓縮等級\n
+    \n
+    回傳:\n
+    bytes: PNG 檔案內容\n
+    """
+    row_size = width * 3
+    # 每列前面加上篩選類型 0（不篩選）
+    rows = b"".join(b"\x00" + data[y * pitch:y * pitch + row_size] for y in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (_PNG_SIGNATURE + _png_chunk(b"IHDR", header)
+            + _png_chunk(b"IDAT", zlib.compress(rows, level)) + _png_chunk(b"IEND", b""))
+
+######################畫面轉換######################
+def create_rgb_surface(size):
+    """
+    建立 RGB24 Surface（記憶體順序就是 R、G、B，像素可以直接寫出，不必再轉換）\n
+    \n
+    參數:\n
+    size (tuple): (寬, 高)\n
+    \n
+    回傳:\n
+    pygame.Surface: RGB24 Surface\n
+    """
+    masks = (0xFF, 0xFF00, 0xFF0000, 0) if sys.byteorder == "little" else (0xFF0000, 0xFF00, 0xFF, 0)
+    return pygame.Surface(size, 0, 24, masks)
+
+def rgb_bytes(surface):
+    """
+    讀出 create_rgb_surface() 建立的 Surface 的像素（去掉每列尾端的對齊空間）\n
+    \n
+    參數:\n
+    surface (pygame.Surface): RGB24 Surface\n
+    \n
+    回傳:\n
+    bytes: 每列 width * 3 bytes 的 RGB24 像素\n
+    """
+    data = surface.get_buffer().raw
+    pitch = surface.get_pitch()
+    width, height = surface.get_size()
+    row_size = width * 3
+    if pitch != row_size:
+        data = b"".join(data[y * pitch:y * pitch + row_size] for y in range(height))
+    return data
+
+######################輸出格式######################
+class _RawWriter:
+    """
+    原始像素輸出 - 所有幀依序寫入同一個 .rgb 檔，旁邊附一個說明格式的 .json\n
+    """
+
+    extension = ".rgb"
+
+    def __init__(self, path, width, height, fps):
+        self.path = path
+        self.file = open(path, "wb")
+        with open(os.path.splitext(path)[0] + ".json", "w", encoding="utf-8") as f:
+            json.dump({"width": width, "height": height, "fps": fps, "pixel_format": "rgb24",
+                       "convert": f"ffmpeg -f rawvideo -pix_fmt rgb24 -s {width}x{height} -r {fps} "
+                                  f"-i {os.path.basename(path)} clip.mp4"}, f, ensure_ascii=False, indent=2)
+
+    def write(self, index, data):
+        """
+        寫入一幀（index 為擷取序號，data 為 RGB24 像素）\n
+        """
+        self.file.write(data)
+
+    def close(self):
+        """
+        結束輸出\n
+        """
+        self.file.close()
+
+class _PngWriter:
+    """
+    PNG 序列輸出 - 每幀一個檔案，檔名是擷取序號（被丟棄的幀會留下缺號）\n
+    """
+
+    extension = ""
+
+    def __init__(self, path, width, height, fps):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.level = FRAME_CAPTURE_SETTINGS["png_compression"]
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, index, data):
+        """
+        寫入一幀（index 為擷取序號，data 為 RGB24 像素）\n
+        """
+        png = encode_png(data, self.width, self.height, self.width * 3, self.level)
+        with open(os.path.join(self.path, f"frame_{index:06d}.png"), "wb") as f:
+            f.write(png)
+
+    def close(self):
+        """
+        結束輸出\n
+        """
+        pass
+
+class _EncoderWriter:
+    """
+    影片編碼器輸出 - 把原始像素寫進本機編碼器（ffmpeg）的標準輸入\n
+    \n
+    編碼在另一個行程執行，寫入管線時會釋放 GIL。\n
+    """
+
+    extension = FRAME_CAPTURE_SETTINGS["encoder_extension"]
+
+    def __init__(self, path, width, height, fps):
+        settings = FRAME_CAPTURE_SETTINGS
+        self.path = path
+        command = [shutil.which(settings["encoder"]), "-y", "-loglevel", "error",
+                   "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps),
+                   "-i", "-", *settings["encoder_args"], path]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, index, data):
+        """
+        寫入一幀（index 為擷取序號，data 為 RGB24 像素）\n
+        """
+        self.process.stdin.write(data)
+
+    def close(self):
+        """
+        結束輸出\n
+        """
+        self.process.stdin.close()
+        self.process.wait()
+
+def encoder_available():
+    """
+    檢查本機是否安裝了設定的影片編碼器\n
+    \n
+    回傳:\n
+    bool: 找得到編碼器時回傳 True\n
+    """
+    return shutil.which(FRAME_CAPTURE_SETTINGS["encoder"]) is not None
+
+def _choose_writer(name):
+    """
+    依設定選擇輸出格式（找不到編碼器時改用 PNG 序列）\n
+    \n
+    參數:\n
+    name (str): auto、encoder、png 或 raw\n
+    \n
+    回傳:\n
+    type: 輸出類別\n
+    """
+    if name in ("auto", "encoder"):
+        if encoder_available():
+            return _EncoderWriter
+        if name == "encoder":
+            print(f"找不到編碼器 {FRAME_CAPTURE_SETTINGS['encoder']}，改為輸出 PNG 序列")
+        return _PngWriter
+    if name == "png":
+        return _PngWriter
+    if name == "raw":
+        return _RawWriter
+    raise ValueError(f"不支援的錄製格式: {name}")
+
+def open_writer(format_name, base_path, width, height, fps):
+    """
+    開啟輸出（副檔名依輸出格式決定）\n
+    \n
+    參數:\n
+    format_name (str): auto、encoder、png 或 raw\n
+    base_path (str): 不含副檔名的輸出路徑（PNG 序列為資料夾）\n
+    width (int): 寬度\n
+    height (int): 高度\n
+    fps (int): 幀率\n
+    \n
+    回傳:\n
+    object: 輸出物件（write(index, data)、close()、path）\n
+    """
+    writer_class = _choose_writer(format_name)
+    return writer_class(base_path + writer_class.extension, width, height, fps)
+
+######################畫面錄製######################
+class FrameCapture:
+    """
+    畫面錄製 - 主執行緒只複製畫面，編碼和寫檔都在背景執行緒\n
+    \n
+    開始錄製時預先配置 queue_frames 個 RGB24 Surface：\n
+    1. 主執行緒每幀（依 fps 限制）從空閒佇列取一個 Surface，把畫面 blit 進去，放進待寫入佇列\n
+    2. 背景執行緒取出 Surface，讀出像素交給輸出格式寫檔，再放回空閒佇列\n
+    背景寫入跟不上時空閒佇列是空的，這一幀直接丟棄，主執行緒永遠不會等待。\n
+    停止時統計寫入與丟棄的幀數、主執行緒每幀的擷取耗時和背景每幀的寫入耗時。\n
+    """
+
+    def __init__(self, format_name=None):
+        """
+        初始化畫面錄製\n
+        \n
+        參數:\n
+        format_name (str): 輸出格式，None 表示使用設定檔\n
+        """
+        self.config = FRAME_CAPTURE_SETTINGS
+        self.format_name = format_name or self.config["format"]
+        self.interval = 1.0 / self.config["fps"]
+        self.writer = None
+        self.thread = None
+        self.free_frames = None
+        self.pending_frames = None
+        self.reset_stats()
+
+    @property
+    def active(self):
+        """
+        是否正在錄製\n
+        """
+        return self.writer is not None
+
+    def reset_stats(self):
+        """
+        清除統計數據\n
+        """
+        self.next_capture = 0.0
+        self.index = 0             # 擷取序號（包含被丟棄的幀）
+        self.captured = 0
+        self.dropped = 0
+        self.written = 0
+        self.capture_seconds = 0.0
+        self.max_capture_seconds = 0.0
+        self.write_seconds = 0.0
+        self.started_at = 0.0
+
+    def toggle(self, screen, mode):
+        """
+        開始或停止錄製\n
+        \n
+        參數:\n
+        screen (pygame.Surface): 遊戲畫面\n
+        mode (str): 目前的遊戲模式（用於檔名）\n
+        """
+        if self.active:
+            self.stop()
+        else:
+            self.start(screen, mode)
+
+    def start(self, screen, mode):
+        """
+        開始錄製（預先配置畫面緩衝並啟動背景執行緒）\n
+        \n
+        參數:\n
+        screen (pygame.Surface): 遊戲畫面\n
+        mode (str): 目前的遊戲模式（用於檔名）\n
+        """
+        if self.active:
+            return
+        width, height = screen.get_size()
+        os.makedirs(self.config["output_dir"], exist_ok=True)
+        base_path = os.path.join(self.config["output_dir"], time.strftime(f"capture-{mode}-%Y%m%d-%H%M%S"))
+        self.writer = open_writer(self.format_name, base_path, width, height, self.config["fps"])
+
+        count = self.config["queue_frames"]
+        self.free_frames = queue.Queue(count)
+        self.pending_frames = queue.Queue(count + 1)   # 多一格給結束訊號
+        for _ in range(count):
+            self.free_frames.put(create_rgb_surface((width, height)))
+
+        self.reset_stats()
+        self.started_at = time.perf_counter()
+        self.thread = threading.Thread(target=self._run, name="frame-capture", daemon=True)
+        self.thread.start()
+        print(f"開始錄製畫面（{self.config['fps']} FPS）：{self.writer.path}，再按一次停止")
+
+    def capture(self, screen):
+        """
+        擷取一幀（在畫面繪製完成、翻頁之前呼叫）\n
+        \n
+        參數:\n
+        screen (pygame.Surface): 遊戲畫面\n
+        """
+        now = time.perf_counter()
+        if now < self.next_capture:
+            return
+        # 以固定間隔推進，不會因為某一幀比較晚而整體漂移
+        self.next_capture = max(self.next_capture + self.interval, now)
+
+        index = self.index
+        self.index += 1
+        try:
+            frame = self.free_frames.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return
+        frame.blit(screen, (0, 0))
+        self.pending_frames.put_nowait((index, frame))
+        self.captured += 1
+
+        elapsed = time.perf_counter() - now
+        self.capture_seconds += elapsed
+        if elapsed > self.max_capture_seconds:
+            self.max_capture_seconds = elapsed
+
+    def _run(self):
+        """
+        背景執行緒：依序寫出待寫入的幀，收到 None 時結束\n
+        """
+        writer = self.writer
+        while True:
+            item = self.pending_frames.get()
+            if item is None:
+                break
+            index, frame = item
+            start = time.perf_counter()
+            writer.write(index, rgb_bytes(frame))
+            self.write_seconds += time.perf_counter() - start
+            self.written += 1
+            self.free_frames.put(frame)
+
+    def stop(self):
+        """
+        停止錄製：等背景執行緒寫完剩下的幀，關閉輸出並印出統計\n
+        \n
+        回傳:\n
+        dict: 統計數據（get_stats() 的結果）\n
+        """
+        if not self.active:
+            return None
+        self.pending_frames.put(None)
+        self.thread.join()
+        self.writer.close()
+        stats = self.get_stats()
+        print(f"畫面錄製結束：寫入 {stats['written']} 幀、丟棄 {stats['dropped']} 幀（{stats['drop_rate']:.1%}），"
+              f"主執行緒每幀 {stats['capture_ms']:.2f} ms（最多 {stats['max_capture_ms']:.2f} ms），"
+              f"背景每幀 {stats['write_ms']:.1f} ms：{self.writer.path}")
+        self.writer = None
+        self.thread = None
+        self.free_frames = None
+        self.pending_frames = None
+        return stats
+
+    def get_stats(self):
+        """
+        取得錄製統計\n
+        \n
+        回傳:\n
+        dict: 擷取、寫入、丟棄的幀數，丟棄比例，主執行緒平均/最大擷取耗時，背景平均寫入耗時（毫秒），\n
+              錄製秒數與輸出路徑\n
+        """
+        offered = self.captured + self.dropped
+        return {
+            "captured": self.captured,
+            "written": self.written,
+            "dropped": self.dropped,
+            "drop_rate": self.dropped / offered if offered else 0.0,
+            "capture_ms": self.capture_seconds / self.captured * 1000 if self.captured else 0.0,
+            "max_capture_ms": self.max_capture_seconds * 1000,
+            "write_ms": self.write_seconds / self.written * 1000 if self.written else 0.0,
+            "seconds": time.perf_counter() - self.started_at if self.started_at else 0.0,
+            "path": self.writer.path if self.writer else None,
+        }
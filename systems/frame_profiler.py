@@ -0,0 +1,232 @@
+######################載入套件######################
+import time
+import statistics
+from array import array
+from config import *
+
+######################計時探針######################
+class _Probe:
+    """
+    計時探針 - with 區塊結束時把耗時累加到目前這一幀\n
+    \n
+    每個名稱只建立一個探針並重複使用，開啟分析時也不會每次配置新物件。\n
+    """
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + (time.perf_counter() - self.start)
+        return False
+
+class _NullProbe:
+    """
+    關閉分析時使用的空探針（什麼都不做）\n
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NULL_PROBE = _NullProbe()
+
+######################幀時間分析器######################
+class FrameProfiler:
+    """
+    幀時間分析器 - 記錄主迴圈各階段與各子系統每幀的耗時\n
+    \n
+    用法:\n
+    with frame_profiler.probe("collisions"):\n
+        self._handle_collisions()\n
+    \n
+    每幀結束時呼叫 end_frame()，這一幀各名稱的累計耗時會寫入\n
+    固定大小的環狀緩衝區（array），舊資料直接被覆蓋，不會持續配置記憶體。\n
+    關閉時 probe() 回傳共用的空探針，end_frame() 立即返回，\n
+    每個探針只多一次屬性檢查。\n
+    \n
+    效能疊加層和突波偵測器都會使用分析器，透過 set_active() 登記，\n
+    只要還有一個功能在使用就保持開啟。\n
+    """
+
+    def __init__(self, history_size=None):
+        """
+        初始化幀時間分析器\n
+        \n
+        參數:\n
+        history_size (int): 環狀緩衝區保留的幀數，None 表示使用設定檔\n
+        """
+        self.history_size = history_size or FRAME_PROFILER_SETTINGS["history_frames"]
+        self.enabled = False
+        self.users = set()     # 目前正在使用分析器的功能名稱
+        self.current = {}      # 名稱 → 目前這一幀累計的秒數
+        self.history = {}      # 名稱 → array('d')，每幀的毫秒數
+        self.frame_history = array("d", [0.0] * self.history_size)
+        self._probes = {}
+        self.index = 0         # 下一幀要寫入的位置
+        self.count = 0         # 已記錄的幀數（最多 history_size）
+        self.total_frames = 0  # 開啟後累計記錄的幀數
+
+    def set_enabled(self, enabled):
+        """
+        開啟或關閉分析（開啟時清空舊資料）\n
+        \n
+        參數:\n
+        enabled (bool): 是否開啟\n
+        """
+        if enabled and not self.enabled:
+            self.reset()
+        self.enabled = enabled
+
+    def set_active(self, user, active):
+        """
+        登記某個功能開始或停止使用分析器\n
+        \n
+        參數:\n
+        user (str): 功能名稱，例如 "overlay"\n
+        active (bool): 是否使用中\n
+        """
+        if active:
+            self.users.add(user)
+        else:
+            self.users.discard(user)
+        self.set_enabled(bool(self.users))
+
+    def reset(self):
+        """
+        清空所有記錄\n
+        """
+        self.current.clear()
+        self.history.clear()
+        self.frame_history = array("d", [0.0] * self.history_size)
+        self.index = 0
+        self.count = 0
+        self.total_frames = 0
+
+    def probe(self, name):
+        """
+        取得計時探針\n
+        \n
+        參數:\n
+        name (str): 階段或子系統名稱\n
+        \n
+        回傳:\n
+        context manager: 開啟時為計時探針，關閉時為空探針\n
+        """
+        if not self.enabled:
+            return _NULL_PROBE
+        probe = self._probes.get(name)
+        if probe is None:
+            probe = self._probes[name] = _Probe(self, name)
+        return probe
+
+    def end_frame(self, frame_seconds):
+        """
+        結束一幀，把這一幀的耗時寫入環狀緩衝區\n
+        \n
+        參數:\n
+        frame_seconds (float): 整幀耗時（包含等待下一幀的時間）\n
+        """
+        if not self.enabled:
+            return
+
+        index = self.index
+        current = self.current
+        for name in current:
+            if name not in self.history:
+                self.history[name] = array("d", [0.0] * self.history_size)
+        for name, samples in self.history.items():
+            samples[index] = current.get(name, 0.0) * 1000.0
+        current.clear()
+
+        self.frame_history[index] = frame_seconds * 1000.0
+        self.index = (index + 1) % self.history_size
+        self.count = min(self.count + 1, self.history_size)
+        self.total_frames += 1
+
+    def _recent_indexes(self, frames):
+        """
+        取得最近幾幀在緩衝區中的位置（由舊到新）\n
+        """
+        frames = min(frames, self.count)
+        start = self.index - frames
+        return [(start + i) % self.history_size for i in range(frames)]
+
+    def recent_frame_times(self, frames=None):
+        """
+        取得最近幾幀的整幀耗時\n
+        \n
+        參數:\n
+        frames (int): 幀數，None 表示全部記錄\n
+        \n
+        回傳:\n
+        list: 毫秒數（由舊到新）\n
+        """
+        frame_history = self.frame_history
+        return [frame_history[i] for i in self._recent_indexes(frames or self.history_size)]
+
+    def recent_frames(self, frames):
+        """
+        取得最近幾幀的完整記錄（整幀耗時與各名稱耗時）\n
+        \n
+        參數:\n
+        frames (int): 幀數\n
+        \n
+        回傳:\n
+        list: 每幀一個字典 {"frame": 幀編號, "frame_ms": 毫秒, "phases": {名稱: 毫秒}}（由舊到新）\n
+        """
+        indexes = self._recent_indexes(frames)
+        first_frame = self.total_frames - len(indexes)
+        return [{
+            "frame": first_frame + offset,
+            "frame_ms": round(self.frame_history[i], 3),
+            "phases": {name: round(samples[i], 3) for name, samples in self.history.items()}
+        } for offset, i in enumerate(indexes)]
+
+    def averages(self, frames=None):
+        """
+        計算最近幾幀各名稱的平均耗時\n
+        \n
+        參數:\n
+        frames (int): 幀數，None 表示全部記錄\n
+        \n
+        回傳:\n
+        dict: 名稱 → 平均毫秒數\n
+        """
+        indexes = self._recent_indexes(frames or self.history_size)
+        if not indexes:
+            return {}
+        return {name: sum(samples[i] for i in indexes) / len(indexes) for name, samples in self.history.items()}
+
+    def medians(self, skip_latest=0):
+        """
+        計算各名稱在記錄中的中位數耗時\n
+        \n
+        參數:\n
+        skip_latest (int): 不計入最新的幾幀（例如排除剛發生的突波幀）\n
+        \n
+        回傳:\n
+        dict: 名稱 → 中位數毫秒數\n
+        """
+        indexes = self._recent_indexes(self.history_size)
+        if skip_latest:
+            indexes = indexes[:-skip_latest]
+        if not indexes:
+            return {}
+        return {name: statistics.median(samples[i] for i in indexes) for name, samples in self.history.items()}
+
+######################全域分析器######################
+# 主迴圈和各系統共用的分析器
+frame_profiler = FrameProfiler()
@@ -0,0 +1,182 @@
+######################載入套件######################
+import pygame
+from collections import OrderedDict
+from config import *
+from .text_cache import render_text
+
+######################數字字形圖集類別######################
+class GlyphAtlas:
+    """
+    數字字形圖集 - 把數字與常用分隔符號預先繪製在同一張 Surface 上\n
+    \n
+    經常變動的數值（分數、血量、倒數秒數）直接拼接字形 blit，\n
+    數值改變時不需要重新呼叫 font.render()，也不會讓文字快取一直換新。\n
+    每個 (字體, 顏色, 反鋸齒) 組合各有一張圖集。\n
+    """
+
+    def __init__(self, font, color, antialias=True):
+        """
+        建立字形圖集\n
+        \n
+        參數:\n
+        font (pygame.font.Font): 字體物件\n
+        color (tuple): 文字顏色\n
+        antialias (bool): 是否反鋸齒\n
+        """
+        characters = GLYPH_ATLAS_SETTINGS["characters"]
+        glyph_surfaces = [font.render(ch, antialias, color) for ch in characters]
+
+        self.height = max(surface.get_height() for surface in glyph_surfaces)
+        total_width = sum(surface.get_width() for surface in glyph_surfaces)
+
+        # 所有字形水平排列在同一張透明 Surface 上
+        self.surface = pygame.Surface((max(1, total_width), max(1, self.height)), pygame.SRCALPHA)
+        self.glyphs = {}  # 字元 → (圖集中的區域, 字寬)
+
+        x = 0
+        for ch, glyph_surface in zip(characters, glyph_surfaces):
+            width = glyph_surface.get_width()
+            self.surface.blit(glyph_surface, (x, 0))
+            self.glyphs[ch] = (pygame.Rect(x, 0, width, glyph_surface.get_height()), width)
+            x += width
+
+    def supports(self, text):
+        """
+        檢查文字是否全部由圖集中的字元組成\n
+        \n
+        參數:\n
+        text (str): 要檢查的文字\n
+        \n
+        回傳:\n
+        bool: True 表示可以用圖集繪製\n
+        """
+        glyphs = self.glyphs
+        for ch in text:
+            if ch not in glyphs:
+                return False
+        return True
+
+    def measure(self, text):
+        """
+        計算文字以圖集繪製時的寬度\n
+        \n
+        參數:\n
+        text (str): 要計算的文字（須全部為圖集字元）\n
+        \n
+        回傳:\n
+        int: 文字寬度（像素）\n
+        """
+        glyphs = self.glyphs
+        return sum(glyphs[ch][1] for ch in text)
+
+    def draw(self, screen, text, x, y):
+        """
+        以圖集字形繪製文字\n
+        \n
+        參數:\n
+        screen (pygame.Surface): 目標畫面\n
+        text (str): 要繪製的文字（須全部為圖集字元）\n
+        x (int): 左上角 x 座標\n
+        y (int): 左上角 y 座標\n
+        \n
+        回傳:\n
+        int: 繪製後的下一個 x 座標\n
+        """
+        glyphs = self.glyphs
+        atlas = self.surface
+        blit_list = []
+        for ch in text:
+            area, width = glyphs[ch]
+            blit_list.append((atlas, (x, y), area))
+            x += width
+        screen.blits(blit_list, False)
+        return x
+
+######################圖集管理######################
+# (字體, 顏色, 反鋸齒) → GlyphAtlas
+_atlases = OrderedDict()
+
+def get_glyph_atlas(font, color, antialias=True):
+    """
+    取得（必要時建立）字體與顏色對應的字形圖集\n
+    \n
+    參數:\n
+    font (pygame.font.Font): 字體物件\n
+    color (tuple): 文字顏色\n
+    antialias (bool): 是否反鋸齒\n
+    \n
+    回傳:\n
+    GlyphAtlas: 字形圖集\n
+    """
+    if not isinstance(color, tuple):
+        color = tuple(color)
+    key = (font, color, antialias)
+
+    atlas = _atlases.get(key)
+    if atlas is not None:
+        _atlases.move_to_end(key)
+        return atlas
+
+    atlas = GlyphAtlas(font, color, antialias)
+    _atlases[key] = atlas
+    if len(_atlases) > GLYPH_ATLAS_SETTINGS["max_atlases"]:
+        _atlases.popitem(last=False)
+    return atlas
+
+def draw_numeric_text(screen, font, parts, antialias, color, topleft=None, center=None):
+    """
+    繪製由固定文字與數值組成的字串，例如 ("Health: ", 80, "/", 100)\n
+    \n
+    字串部分走共用文字快取，數值部分用字形圖集拼接，\n
+    所以數值變動時不會重新 render 整行文字。\n
+    \n
+    參數:\n
+    screen (pygame.Surface): 目標畫面\n
+    font (pygame.font.Font): 字體物件\n
+    parts (tuple): 依序排列的字串與數值（int 或 float）\n
+    antialias (bool): 是否反鋸齒\n
+    color (tuple): 文字顏色\n
+    topleft (tuple): 左上角座標（與 center 擇一）\n
+    center (tuple): 中心座標（與 topleft 擇一）\n
+    \n
+    回傳:\n
+    pygame.Rect: 實際繪製的範圍\n
+    """
+    atlas = get_glyph_atlas(font, color, antialias)
+
+    # 先準備每一段的繪製方式並計算總寬度
+    pieces = []
+    total_width = 0
+    height = atlas.height
+    for part in parts:
+        if isinstance(part, str):
+            surface = render_text(font, part, antialias, color)
+            pieces.append((surface, None))
+            total_width += surface.get_width()
+            height = max(height, surface.get_height())
+        else:
+            text = str(part)
+            if atlas.supports(text):
+                pieces.append((None, text))
+                total_width += atlas.measure(text)
+            else:
+                surface = render_text(font, text, antialias, color)
+                pieces.append((surface, None))
+                total_width += surface.get_width()
+                height = max(height, surface.get_height())
+
+    rect = pygame.Rect(0, 0, total_width, height)
+    if center is not None:
+        rect.center = center
+    elif topleft is not None:
+        rect.topleft = topleft
+
+    x = rect.x
+    for surface, text in pieces:
+        if surface is not None:
+            screen.blit(surface, (x, rect.y))
+            x += surface.get_width()
+        else:
+            x = atlas.draw(screen, text, x, rect.y)
+
+    return rect
@@ -1,10 +1,11 @@
 ######################載入套件######################
 import pygame
-import random
 import math
-import time
 from config import *
 from entities import HideSeekPlayer, Ghost, HideSeekMap
+from .glyph_atlas import draw_numeric_text
+from .frame_profiler import frame_profiler
+from .snapshot import write_random_state, read_random_state
 
 ######################躲貓貓遊戲系統類別######################
 class HideSeekSystem:
@@ -55,9 +56,11 @@ class HideSeekSystem:
         self.game_over = False
         self.victory_message = ""
         self.game_over_timer = 0
+        self.last_kill = None  # 這一次更新發生的擊殺 (搜尋者, 躲藏者)，擊殺回放使用
         
         # 小地圖系統
         self.minimap_system = None
+        self.minimap_stale = False  # 還原快照後小地圖還沒重新繪製（下次繪製時才更新）
         
         # 初始化遊戲
         self._initialize_game()
@@ -68,10 +71,7 @@ class HideSeekSystem:
         """
         初始化遊戲（創建玩家、地圖、分配角色）\n
         """
-        # 設定隨機種子，確保每次遊戲都有不同的隨機結果
-        random.seed(time.time())
-        
-        # 創建地圖
+        # 創建地圖（地圖種子取自地圖亂數串流，同一個對局種子會得到相同的地圖）
         self.game_map = HideSeekMap()
         
         # 創建玩家
@@ -98,11 +98,6 @@ class HideSeekSystem:
         """
         total_players = HIDE_SEEK_SETTINGS["total_players"]
         
-        # 重新設置隨機種子以確保道具分配的隨機性
-        player_seed = int(time.time() * 1000) % 100000
-        random.seed(player_seed)
-        print(f"道具分配種子：{player_seed}")
-        
         # 準備道具分配 - 確保多樣性
         potion_types = list(HIDE_SEEK_POTIONS.keys())
         assigned_potions = self._distribute_potions(potion_types, total_players)
@@ -140,14 +135,14 @@ class HideSeekSystem:
         # 確保每種道具至少分配一次（如果道具種類 >= 玩家數量）
         if len(potion_types) >= total_players:
             # 隨機選擇不重複的道具
-            assigned_potions = random.sample(potion_types, total_players)
+            assigned_potions = get_rng("spawning").sample(potion_types, total_players)
         else:
             # 道具種類少於玩家數量，確保盡可能多樣化
             assigned_potions = potion_types.copy()
             while len(assigned_potions) < total_players:
-                assigned_potions.append(random.choice(potion_types))
+                assigned_potions.append(get_rng("spawning").choice(potion_types))
             # 再次隨機打亂，增加隨機性
-            random.shuffle(assigned_potions)
+            get_rng("spawning").shuffle(assigned_potions)
         
         # 輸出分配結果以供除錯
         print(f"道具分配結果：{assigned_potions}")
@@ -158,20 +153,17 @@ class HideSeekSystem:
         """
         隨機分配角色身分\n
         """
-        # 重新設置隨機種子以確保角色分配的隨機性
-        role_seed = int(time.time() * 1000) % 100000 + 1000  # 避免和道具種子相同
-        random.seed(role_seed)
-        print(f"角色分配種子：{role_seed}")
+        rng = get_rng("spawning")
         
         # 隨機選擇搜尋者
         seekers_count = HIDE_SEEK_SETTINGS["seekers_count"]
         all_players = self.players.copy()
         
         # 確保隨機性
-        random.shuffle(all_players)
+        rng.shuffle(all_players)
         
         # 隨機選擇搜尋者
-        self.seekers = random.sample(all_players, seekers_count)
+        self.seekers = rng.sample(all_players, seekers_count)
         self.hiders = [player for player in all_players if player not in self.seekers]
         
         # 設置玩家角色
@@ -206,6 +198,8 @@ class HideSeekSystem:
         回傳:\n
         str: 遊戲狀態變更或None\n
         """
+        self.last_kill = None
+        
         # 處理遊戲階段更新
         result = self._update_game_phase(keys)
         if result:
@@ -213,7 +207,8 @@ class HideSeekSystem:
         
         # 更新玩家
         if self.game_state == GAME_STATE_HIDE_SEEK_PLAYING:
-            self._update_players(keys)
+            with frame_profiler.probe("ai"):
+                self._update_players(keys)
             self._check_victory_conditions()
         
         # 更新幽靈
@@ -228,7 +223,9 @@ class HideSeekSystem:
         
         # 更新小地圖
         if self.minimap_system:
-            self.minimap_system.update(self.players, self.ghosts)
+            with frame_profiler.probe("minimap"):
+                self.minimap_system.update(self.players, self.ghosts)
+            self.minimap_stale = False
         
         return None
     
@@ -251,6 +248,10 @@ class HideSeekSystem:
         if self.phase_timer > 0:
             self.phase_timer -= 1
         
+        # 結束畫面的倒數在更新時進行（繪製不改變遊戲狀態，不繪製的模擬和快照才會一致）
+        if self.game_over and self.game_over_timer > 0:
+            self.game_over_timer -= 1
+        
         # 階段轉換邏輯
         if self.game_state == GAME_STATE_HIDE_SEEK_LOBBY:
             if self.phase_timer == 0:
@@ -327,6 +328,7 @@ class HideSeekSystem:
                     # 玩家死亡，創建幽靈
                     ghost = Ghost(target)
                     self.ghosts.append(ghost)
+                    self.last_kill = (player, target)
                     
                     if target.is_human:
                         self.human_ghost = ghost
@@ -403,11 +405,10 @@ class HideSeekSystem:
         # 確定相機位置（跟隨真人玩家或幽靈）
         camera_x, camera_y = self._get_camera_position()
         
-        # 繪製地圖背景
-        self.game_map.draw_background(screen, camera_x, camera_y)
-        
-        # 繪製地圖障礙物
-        self.game_map.draw_obstacles(screen, camera_x, camera_y)
+        # 繪製地圖背景和障礙物
+        with frame_profiler.probe("map_draw"):
+            self.game_map.draw_background(screen, camera_x, camera_y)
+            self.game_map.draw_obstacles(screen, camera_x, camera_y)
         
         # 繪製玩家
         for player in self.players:
@@ -420,6 +421,9 @@ class HideSeekSystem:
         
         # 繪製小地圖
         if self.minimap_system:
+            if self.minimap_stale:
+                self.minimap_system.update(self.players, self.ghosts)
+                self.minimap_stale = False
             self.minimap_system.draw(screen, self.human_player, self.human_ghost)
         
         # 繪製UI
@@ -479,9 +483,7 @@ class HideSeekSystem:
         繪製等待階段UI\n
         """
         seconds_left = max(0, self.phase_timer // 60)
-        countdown_text = font.render(f"遊戲開始倒數：{seconds_left}", True, WHITE)
-        countdown_rect = countdown_text.get_rect(center=(SCREEN_WIDTH // 2, 50))
-        screen.blit(countdown_text, countdown_rect)
+        draw_numeric_text(screen, font, ("遊戲開始倒數：", seconds_left), True, WHITE, center=(SCREEN_WIDTH // 2, 50))
         
         # 玩家列表
         y_offset = 100
@@ -535,25 +537,21 @@ class HideSeekSystem:
             
             # 道具資訊
             potion_name = HIDE_SEEK_POTIONS[self.human_player.potion_type]["name"]
-            potion_text = f"道具：{potion_name} ({self.human_player.potion_uses}次)"
-            potion_surface = create_font(FONT_SIZES["normal"]).render(potion_text, True, WHITE)
-            screen.blit(potion_surface, (10, 40))
+            draw_numeric_text(screen, create_font(FONT_SIZES["normal"]),
+                              (f"道具：{potion_name} (", self.human_player.potion_uses, "次)"), True, WHITE, topleft=(10, 40))
             
             # 攻擊冷卻
             if self.human_player.special_attack_cooldown > 0:
                 cooldown_seconds = self.human_player.special_attack_cooldown // 60 + 1
-                cooldown_text = f"攻擊冷卻：{cooldown_seconds}秒"
-                cooldown_surface = create_font(FONT_SIZES["normal"]).render(cooldown_text, True, YELLOW)
-                screen.blit(cooldown_surface, (10, 70))
+                draw_numeric_text(screen, create_font(FONT_SIZES["normal"]),
+                                  ("攻擊冷卻：", cooldown_seconds, "秒"), True, YELLOW, topleft=(10, 70))
         
         # 存活玩家統計
         alive_seekers = len([p for p in self.seekers if p.alive])
         alive_hiders = len([p for p in self.hiders if p.alive])
         
-        stats_text = f"搜尋者：{alive_seekers}  躲藏者：{alive_hiders}"
-        stats_surface = create_font(28).render(stats_text, True, WHITE)
-        stats_rect = stats_surface.get_rect(center=(SCREEN_WIDTH // 2, 30))
-        screen.blit(stats_surface, stats_rect)
+        draw_numeric_text(screen, create_font(28), ("搜尋者：", alive_seekers, "  躲藏者：", alive_hiders), True, WHITE,
+                          center=(SCREEN_WIDTH // 2, 30))
         
         # 幽靈模式提示
         if self.human_ghost:
@@ -587,8 +585,6 @@ class HideSeekSystem:
             return_text = create_font(FONT_SIZES["medium"]).render("按任意鍵返回主畫面", True, WHITE)
             return_rect = return_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80))
             screen.blit(return_text, return_rect)
-        else:
-            self.game_over_timer -= 1
     
     def _draw_controls_info(self, screen):
         """
@@ -601,6 +597,60 @@ class HideSeekSystem:
             control_text = controls_font.render(control, True, (180, 180, 180))
             screen.blit(control_text, (SCREEN_WIDTH - 200, SCREEN_HEIGHT - 100 + i * 20))
     
+    def get_entity_lists(self):
+        """
+        取得這個模式中的物件串列（記憶體報告使用）\n
+        \n
+        回傳:\n
+        dict: 串列名稱 → 物件串列\n
+        """
+        return {
+            "players": self.players,
+            "ghosts": self.ghosts
+        }
+    
+    def save_state(self, writer):
+        """
+        把躲貓貓狀態寫入快照（地圖只記錄種子和地圖亂數產生器的狀態，還原時重新生成）\n
+        \n
+        參數:\n
+        writer (SnapshotWriter): 快照寫入\n
+        """
+        writer.fields(self, ("human_player_name", "game_state", "game_timer", "phase_timer",
+                             "game_over", "victory_message", "game_over_timer"))
+        writer.values(self.game_map.seed)
+        write_random_state(writer, self.game_map.random)
+        writer.objects(self.players)
+        writer.objects(self.ghosts)
+        writer.ref(self.human_player)
+        writer.ref(self.human_ghost)
+        writer.refs(self.seekers)
+        writer.refs(self.hiders)
+    
+    def load_state(self, reader):
+        """
+        從快照還原躲貓貓狀態\n
+        \n
+        參數:\n
+        reader (SnapshotReader): 快照讀取\n
+        """
+        reader.fields(self)
+        (map_seed,) = reader.values()
+        if self.game_map is None or self.game_map.seed != map_seed:
+            self.game_map = HideSeekMap(map_seed)
+            self.minimap_system = HideSeekMiniMap(self.game_map)
+        # 地圖亂數在生成後還會用來選傳送位置，沿用同一張地圖時也要還原到快照時的狀態
+        read_random_state(reader, self.game_map.random)
+        self.players = reader.objects_list()
+        self.ghosts = reader.objects_list()
+        self.human_player = reader.ref()
+        self.human_ghost = reader.ref()
+        self.seekers = reader.refs()
+        self.hiders = reader.refs()
+        self.last_kill = None
+        # 小地圖只影響畫面，等到下次繪製時才重新畫（連續還原多次時不必每次都畫）
+        self.minimap_stale = True
+    
     def handle_key_press(self, key):
         """
         處理按鍵事件\n
@@ -645,17 +695,18 @@ class HideSeekMiniMap:
         # 小地圖設定
         self.config = HIDE_SEEK_MINIMAP
         
-        # 創建小地圖表面
-        self.minimap_surface = pygame.Surface((self.config["width"], self.config["height"]), pygame.SRCALPHA)
+        # 創建小地圖背景表面（只畫一次），每次更新從背景複製出新的小地圖再畫上玩家
+        self.background_surface = pygame.Surface((self.config["width"], self.config["height"]), pygame.SRCALPHA)
         
         # 預繪製地圖背景
         self._render_map_background()
+        self.minimap_surface = self.background_surface.copy()
     
     def _render_map_background(self):
         """
         預繪製小地圖背景和障礙物\n
         """
-        self.minimap_surface.fill(self.config["background_color"])
+        self.background_surface.fill(self.config["background_color"])
         
         # 繪製障礙物
         scale = self.config["scale_factor"]
@@ -667,10 +718,10 @@ class HideSeekMiniMap:
             minimap_height = max(2, int(obstacle.height * scale))
             
             minimap_rect = pygame.Rect(minimap_x, minimap_y, minimap_width, minimap_height)
-            pygame.draw.rect(self.minimap_surface, (100, 100, 100), minimap_rect)
+            pygame.draw.rect(self.background_surface, (100, 100, 100), minimap_rect)
         
         # 繪製邊框
-        pygame.draw.rect(self.minimap_surface, self.config["border_color"], 
+        pygame.draw.rect(self.background_surface, self.config["border_color"], 
                         (0, 0, self.config["width"], self.config["height"]), 2)
     
     def update(self, players, ghosts):
@@ -681,8 +732,8 @@ class HideSeekMiniMap:
         players (list): 玩家列表\n
         ghosts (list): 幽靈列表\n
         """
-        # 重置到背景狀態
-        temp_surface = self.minimap_surface.copy()
+        # 重置到背景狀態（從背景複製，上一次更新的玩家點不會殘留）
+        temp_surface = self.background_surface.copy()
         
         # 繪製活著的玩家
         for player in players:
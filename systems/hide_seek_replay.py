@@ -0,0 +1,410 @@
+######################載入套件######################
+import os
+import sys
+import mmap
+import time
+import struct
+from array import array
+from operator import attrgetter
+from config import *
+from entities import Ghost
+
+######################檔案格式######################
+# 檔頭：識別碼、版本、模擬頻率、關鍵幀間隔、玩家人數、對局種子，接著是「長度 + UTF-8」的玩家名稱
+# 每一幀：幀標頭 + 勝負訊息 + 玩家區段 + 幽靈區段
+#   關鍵幀的玩家區段是全部玩家；差異幀只有和上一幀不同的玩家（玩家數量 + (玩家索引, 玩家狀態)...）
+# 檔尾：每一幀在檔案中的位置（array('Q')），最後是固定長度的結尾（索引位置、幀數、識別碼）
+_HEADER = struct.Struct("<4sHHHHq")
+_FRAME = struct.Struct("<IBBBHIH")         # 幀編號、種類、階段、是否結束、階段計時、遊戲計時、結束計時
+_PLAYER = struct.Struct("<ffhBB7H")        # x、y、血量、狀態旗標、道具次數、6 個效果計時與特殊攻擊冷卻
+_GHOST = struct.Struct("<Hff")             # 原本的玩家索引、x、y
+_COUNT = struct.Struct("<H")
+_TRAILER = struct.Struct("<QI4s")
+_MAGIC = b"GBHS"
+_INDEX_MAGIC = b"GBHI"
+_VERSION = 1
+
+_KEYFRAME = 0
+_DELTA = 1
+
+# 躲貓貓階段 ↔ 編號
+_PHASES = (GAME_STATE_HIDE_SEEK_LOBBY, GAME_STATE_HIDE_SEEK_TELEPORT, GAME_STATE_HIDE_SEEK_ROLE_REVEAL,
+           GAME_STATE_HIDE_SEEK_PLAYING, GAME_STATE_HIDE_SEEK_GHOST)
+_PHASE_CODES = {phase: code for code, phase in enumerate(_PHASES)}
+
+# 狀態旗標的位元順序
+_FLAGS = ("alive", "frozen", "invisible", "shielded", "speed_boosted", "freeze_immune", "invulnerable")
+_SEEKER_FLAG = 1 << len(_FLAGS)
+
+# 效果計時器（與 _PLAYER 的 7 個 H 欄位對應）
+_TIMERS = ("freeze_timer", "invisible_timer", "shield_timer", "speed_boost_timer",
+           "freeze_immune_timer", "invulnerable_timer", "special_attack_cooldown")
+
+# 一次取出所有旗標和計時器（每幀每位玩家都要讀，比逐一 getattr 快）
+_FLAG_VALUES = attrgetter(*_FLAGS)
+_FLAG_BITS = tuple(1 << bit for bit in range(len(_FLAGS)))
+_TIMER_VALUES = attrgetter(*_TIMERS)
+
+def _player_flags(player):
+    """
+    把玩家的角色和狀態旗標合成一個位元遮罩\n
+    """
+    flags = _SEEKER_FLAG if player.role == "seeker" else 0
+    for bit, value in zip(_FLAG_BITS, _FLAG_VALUES(player)):
+        if value:
+            flags |= bit
+    return flags
+
+# 每位玩家狀態的固定長度（bytes）
+PLAYER_RECORD_SIZE = _PLAYER.size
+
+def pack_player_into(buffer, offset, player):
+    """
+    把玩家狀態直接寫進預先配置的緩衝區（不產生新的 bytes）\n
+    \n
+    參數:\n
+    buffer (bytearray): 緩衝區\n
+    offset (int): 寫入位置（需要 PLAYER_RECORD_SIZE bytes）\n
+    player (HideSeekPlayer): 玩家\n
+    """
+    flags = _player_flags(player)
+    try:
+        _PLAYER.pack_into(buffer, offset, player.x, player.y, int(player.health), flags, player.potion_uses,
+                          *_TIMER_VALUES(player))
+    except struct.error:
+        # 計時器不是整數或超出 0~65535 時才逐一轉換（一般情況直接寫入）
+        _PLAYER.pack_into(buffer, offset, player.x, player.y, int(player.health), flags, player.potion_uses,
+                          *(min(max(int(value), 0), 0xFFFF) for value in _TIMER_VALUES(player)))
+
+def _pack_player(player):
+    """
+    把玩家狀態打包成固定長度的 bytes\n
+    """
+    buffer = bytearray(PLAYER_RECORD_SIZE)
+    pack_player_into(buffer, 0, player)
+    return bytes(buffer)
+
+def unpack_player(buffer, offset):
+    """
+    讀出 pack_player_into() 寫入的玩家狀態\n
+    \n
+    回傳:\n
+    tuple: 玩家狀態欄位（apply_hide_seek_state 使用的格式）\n
+    """
+    return _PLAYER.unpack_from(buffer, offset)
+
+def _pack_string(text):
+    """
+    把字串打包成「長度 + UTF-8」\n
+    """
+    data = text.encode("utf-8")
+    return _COUNT.pack(len(data)) + data
+
+######################躲貓貓重播寫入######################
+class HideSeekReplayWriter:
+    """
+    躲貓貓重播寫入 - 每次更新記錄一幀，可以快速跳到任意時間的重播檔\n
+    \n
+    每 keyframe_seconds 秒寫一個包含全部玩家的關鍵幀，其餘幀只寫有變化的玩家；\n
+    結束時在檔尾寫入每一幀的位置索引。讀取時任何時間點最多只要\n
+    讀一個關鍵幀加上不到一個間隔的差異幀，不必從第 0 幀重新模擬。\n
+    """
+
+    def __init__(self, path, system, match_seed):
+        """
+        建立重播檔並寫入檔頭\n
+        \n
+        參數:\n
+        path (str): 重播檔路徑\n
+        system (HideSeekSystem): 躲貓貓系統\n
+        match_seed (int): 對局種子（檢視器用它重建同樣的地圖和玩家）\n
+        """
+        self.path = path
+        self.keyframe_interval = max(1, int(HIDE_SEEK_REPLAY_SETTINGS["keyframe_seconds"] * SIMULATION_SETTINGS["tick_rate"]))
+        self.player_index = {player.player_id: index for index, player in enumerate(system.players)}
+        self.previous = [None] * len(system.players)
+        self.offsets = array("Q")
+        self.tick = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "wb")
+        self.file.write(_HEADER.pack(_MAGIC, _VERSION, SIMULATION_SETTINGS["tick_rate"], self.keyframe_interval,
+                                     len(system.players), match_seed))
+        self.file.write(_pack_string(system.human_player_name))
+        self.position = self.file.tell()
+
+    @classmethod
+    def start(cls, system, match_seed):
+        """
+        在輸出資料夾建立有時間戳記的重播檔\n
+        \n
+        參數:\n
+        system (HideSeekSystem): 躲貓貓系統\n
+        match_seed (int): 對局種子\n
+        \n
+        回傳:\n
+        HideSeekReplayWriter: 寫入中的物件\n
+        """
+        filename = time.strftime("hide_seek-%Y%m%d-%H%M%S") + f"-{match_seed}.gbhs"
+        writer = cls(os.path.join(HIDE_SEEK_REPLAY_SETTINGS["output_dir"], filename), system, match_seed)
+        print(f"開始錄製躲貓貓重播：{writer.path}")
+        return writer
+
+    def record(self, system):
+        """
+        記錄一幀（每次躲貓貓系統更新後呼叫）\n
+        \n
+        參數:\n
+        system (HideSeekSystem): 躲貓貓系統\n
+        """
+        keyframe = self.tick % self.keyframe_interval == 0
+        parts = [_FRAME.pack(self.tick, _KEYFRAME if keyframe else _DELTA, _PHASE_CODES[system.game_state],
+                             system.game_over, system.phase_timer, system.game_timer, max(system.game_over_timer, 0)),
+                 _pack_string(system.victory_message)]
+
+        previous = self.previous
+        if keyframe:
+            parts.append(_COUNT.pack(len(previous)))
+            for index, player in enumerate(system.players):
+                previous[index] = data = _pack_player(player)
+                parts.append(data)
+        else:
+            changed = []
+            for index, player in enumerate(system.players):
+                data = _pack_player(player)
+                if data != previous[index]:
+                    previous[index] = data
+                    changed.append(_COUNT.pack(index))
+                    changed.append(data)
+            parts.append(_COUNT.pack(len(changed) // 2))
+            parts.extend(changed)
+
+        player_index = self.player_index
+        parts.append(_COUNT.pack(len(system.ghosts)))
+        for ghost in system.ghosts:
+            parts.append(_GHOST.pack(player_index[ghost.player_id], ghost.x, ghost.y))
+
+        frame = b"".join(parts)
+        self.offsets.append(self.position)
+        self.file.write(frame)
+        self.position += len(frame)
+        self.tick += 1
+
+    def close(self):
+        """
+        寫入索引與結尾並關閉檔案\n
+        \n
+        回傳:\n
+        str: 重播檔路徑\n
+        """
+        if self.file.closed:
+            return self.path
+        index_offset = self.position
+        offsets = self.offsets
+        if sys.byteorder == "big":
+            offsets = array("Q", offsets)
+            offsets.byteswap()
+        self.file.write(offsets.tobytes())
+        self.file.write(_TRAILER.pack(index_offset, len(self.offsets), _INDEX_MAGIC))
+        self.file.close()
+        size_kb = os.path.getsize(self.path) / 1024
+        print(f"躲貓貓重播錄製結束（{self.tick} 幀，{size_kb:.1f} KB）：{self.path}")
+        return self.path
+
+######################躲貓貓重播讀取######################
+class HideSeekReplayFile:
+    """
+    躲貓貓重播讀取 - 以記憶體對映開啟重播檔，依幀編號取得當時的完整狀態\n
+    \n
+    幀位置索引直接從對映的檔尾讀取（不複製），跳到任一幀只需要\n
+    找到前一個關鍵幀，再套用之後的差異幀。\n
+    沒有檔尾的檔案（錄製中當機）會在開啟時循序掃描一次建立索引。\n
+    """
+
+    def __init__(self, path):
+        """
+        開啟重播檔\n
+        \n
+        參數:\n
+        path (str): 重播檔路徑\n
+        """
+        self.path = path
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.tick_rate, self.keyframe_interval, self.player_count, self.match_seed = _HEADER.unpack_from(self.data, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"不是躲貓貓重播檔: {path}")
+        if version != _VERSION:
+            raise ValueError(f"不支援的重播檔版本: {version}")
+        self.player_name, self.frames_start = self._read_string(_HEADER.size)
+
+        index_offset, frame_count, index_magic = _TRAILER.unpack_from(self.data, len(self.data) - _TRAILER.size)
+        if index_magic == _INDEX_MAGIC and sys.byteorder == "little":
+            self.offsets = memoryview(self.data)[index_offset:index_offset + frame_count * 8].cast("Q")
+        elif index_magic == _INDEX_MAGIC:
+            self.offsets = array("Q", self.data[index_offset:index_offset + frame_count * 8])
+            self.offsets.byteswap()
+        else:
+            self.offsets = self._scan_offsets()
+        self.frame_count = len(self.offsets)
+
+    def _read_string(self, offset):
+        """
+        讀出「長度 + UTF-8」字串\n
+        \n
+        回傳:\n
+        tuple: (字串, 下一個欄位的位置)\n
+        """
+        (length,) = _COUNT.unpack_from(self.data, offset)
+        offset += _COUNT.size
+        return bytes(self.data[offset:offset + length]).decode("utf-8"), offset + length
+
+    def _scan_offsets(self):
+        """
+        沒有索引時循序掃描所有幀，建立幀位置索引\n
+        \n
+        回傳:\n
+        array: 每一幀的位置\n
+        """
+        offsets = array("Q")
+        offset = self.frames_start
+        end = len(self.data)
+        while offset + _FRAME.size <= end:
+            try:
+                _, next_offset = self._decode_frame(offset, None)
+            except struct.error:
+                break  # 最後一幀不完整
+            if next_offset > end:
+                break
+            offsets.append(offset)
+            offset = next_offset
+        return offsets
+
+    def _read_frame_header(self, offset):
+        """
+        讀出幀標頭與勝負訊息\n
+        \n
+        回傳:\n
+        tuple: (幀標頭欄位, 勝負訊息, 玩家區段的位置)\n
+        """
+        header = _FRAME.unpack_from(self.data, offset)
+        message, offset = self._read_string(offset + _FRAME.size)
+        return header, message, offset
+
+    def _decode_frame(self, offset, state):
+        """
+        解碼一幀並套用到 state（state 為 None 時只計算長度）\n
+        \n
+        參數:\n
+        offset (int): 這一幀的位置\n
+        state (dict): 要更新的狀態\n
+        \n
+        回傳:\n
+        tuple: (更新後的狀態, 下一幀的位置)\n
+        """
+        data = self.data
+        header, message, offset = self._read_frame_header(offset)
+        tick, kind, phase, game_over, phase_timer, game_timer, game_over_timer = header
+
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        if state is not None:
+            state.update(tick=tick, phase=_PHASES[phase], game_over=bool(game_over), phase_timer=phase_timer,
+                         game_timer=game_timer, game_over_timer=game_over_timer, victory_message=message)
+            players = state["players"]
+
+        if kind == _KEYFRAME:
+            for index in range(count):
+                if state is not None:
+                    players[index] = _PLAYER.unpack_from(data, offset)
+                offset += _PLAYER.size
+        else:
+            for _ in range(count):
+                (index,) = _COUNT.unpack_from(data, offset)
+                if state is not None:
+                    players[index] = _PLAYER.unpack_from(data, offset + _COUNT.size)
+                offset += _COUNT.size + _PLAYER.size
+
+        (ghost_count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        if state is not None:
+            state["ghosts"] = [_GHOST.unpack_from(data, offset + i * _GHOST.size) for i in range(ghost_count)]
+        offset += ghost_count * _GHOST.size
+        return state, offset
+
+    def state_at(self, frame):
+        """
+        取得某一幀的完整狀態\n
+        \n
+        參數:\n
+        frame (int): 幀編號（超出範圍時取最接近的一幀）\n
+        \n
+        回傳:\n
+        dict: tick、phase、phase_timer、game_timer、game_over、game_over_timer、\n
+              victory_message、players（每位玩家的狀態欄位）、ghosts（玩家索引、x、y）\n
+        """
+        frame = max(0, min(frame, self.frame_count - 1))
+        keyframe = frame - frame % self.keyframe_interval
+        state = {"players": [None] * self.player_count}
+        for index in range(keyframe, frame + 1):
+            self._decode_frame(self.offsets[index], state)
+        return state
+
+    def close(self):
+        """
+        關閉檔案\n
+        """
+        if isinstance(self.offsets, memoryview):
+            self.offsets.release()
+        self.data.close()
+        self.file.close()
+
+######################套用重播狀態######################
+def apply_hide_seek_state(system, state):
+    """
+    把重播狀態套用到躲貓貓系統（檢視器用，之後用原本的繪製程式畫出來）\n
+    \n
+    參數:\n
+    system (HideSeekSystem): 以同一個對局種子建立的躲貓貓系統\n
+    state (dict): HideSeekReplayFile.state_at() 的結果\n
+    """
+    system.game_state = state["phase"]
+    system.phase_timer = state["phase_timer"]
+    system.game_timer = state["game_timer"]
+    system.game_over = state["game_over"]
+    system.game_over_timer = state["game_over_timer"]
+    system.victory_message = state["victory_message"]
+
+    for player, values in zip(system.players, state["players"]):
+        x, y, health, flags, potion_uses = values[:5]
+        player.x = x
+        player.y = y
+        player.health = health
+        player.potion_uses = potion_uses
+        player.role = "seeker" if flags & _SEEKER_FLAG else "hider"
+        for bit, name in enumerate(_FLAGS):
+            setattr(player, name, bool(flags & (1 << bit)))
+        for name, value in zip(_TIMERS, values[5:]):
+            setattr(player, name, value)
+        if player.is_human:
+            player._update_camera()
+    system.seekers = [player for player in system.players if player.role == "seeker"]
+    system.hiders = [player for player in system.players if player.role == "hider"]
+
+    # 幽靈只會增加不會減少，依玩家索引重建缺少的幽靈
+    ghosts_by_player = {ghost.player_id: ghost for ghost in system.ghosts}
+    ghosts = []
+    for index, x, y in state["ghosts"]:
+        player = system.players[index]
+        ghost = ghosts_by_player.get(player.player_id)
+        if ghost is None:
+            ghost = Ghost(player)
+        ghost.x = x
+        ghost.y = y
+        ghost.age += 1  # 重播檔不記錄動畫，每套用一幀就讓下擺動畫前進一次
+        if ghost.is_human:
+            ghost._update_camera()
+        ghosts.append(ghost)
+    system.ghosts = ghosts
+    system.human_ghost = next((ghost for ghost in ghosts if ghost.is_human), None)
@@ -0,0 +1,104 @@
+######################載入套件######################
+import pygame
+from config import *
+
+######################閒置畫面######################
+class IdleScreen:
+    """
+    閒置畫面 - 靜態畫面改用等待事件的省電模式\n
+    \n
+    主畫面、遊戲結束、勝利畫面，以及沒有動畫的商店畫面只會因為輸入而改變，\n
+    不需要每秒重畫 60 次。主迴圈在這些畫面呼叫 run_frame()：\n
+    用 pygame.event.wait() 阻塞等待事件，只有外觀真的改變時才重畫。\n
+    """
+
+    def __init__(self, game):
+        """
+        初始化閒置畫面\n
+        \n
+        參數:\n
+        game (GameController): 遊戲控制器（處理事件、繪製畫面）\n
+        """
+        self.game = game
+        self.dirty = True          # 下一次閒置幀是否一定要重畫
+        self.visual_state = None   # 上次繪製時的外觀狀態
+
+    def mark_dirty(self):
+        """
+        要求下一次閒置幀完整重畫（離開閒置畫面或還原快照後呼叫）\n
+        """
+        self.dirty = True
+
+    def is_active(self, shop_animating=False):
+        """
+        檢查目前是否為不需要持續更新的靜態畫面\n
+        \n
+        效能疊加層開啟或錄製畫面時不算閒置（需要持續顯示即時數據、錄製固定幀率）。\n
+        \n
+        參數:\n
+        shop_animating (bool): 商店背後是否還有煙火或勝利倒數\n
+        \n
+        回傳:\n
+        bool: True 表示可以進入閒置模式\n
+        """
+        game = self.game
+        if not IDLE_SETTINGS["enabled"] or game.performance_overlay.visible or game.frame_capture.active:
+            return False
+
+        if game.game_state in (GAME_STATE_MENU, GAME_STATE_GAME_OVER, GAME_STATE_VICTORY):
+            return True
+
+        if game.game_state in (GAME_STATE_PLAYING, GAME_STATE_BOSS_FIGHT) and game.shop_open:
+            # 錄製或重播時仍然每幀執行（無作用的）更新，商店中的每次按鍵才會落在不同的更新紀錄
+            if game.input_session.active:
+                return False
+            return not shop_animating
+
+        return False
+
+    def get_visual_state(self):
+        """
+        取得靜態畫面的外觀狀態（與上次不同時才需要重畫）\n
+        \n
+        回傳:\n
+        tuple: 外觀狀態\n
+        """
+        game = self.game
+        if game.game_state == GAME_STATE_MENU:
+            return (game.game_state, game.menu_system.get_visual_state(pygame.mouse.get_pos()))
+        return (game.game_state, game.shop_open)
+
+    def run_frame(self):
+        """
+        執行一次閒置畫面的迴圈\n
+        \n
+        用 pygame.event.wait() 阻塞等待事件（有動畫時以下一次動畫時間為逾時），\n
+        只有在輸入事件、hover 改變或動畫相位改變時才重畫，\n
+        沒有變化時幾乎不使用 CPU。\n
+        """
+        game = self.game
+        timeout = IDLE_SETTINGS["max_wait_ms"]
+        if game.game_state == GAME_STATE_MENU:
+            interval = game.menu_system.get_animation_interval()
+            if interval is not None:
+                timeout = min(timeout, interval)
+
+        first_event = pygame.event.wait(timeout)
+        events = [] if first_event.type == pygame.NOEVENT else [first_event]
+        events.extend(pygame.event.get())
+
+        # 滑鼠移動只有在 hover 狀態改變時才需要重畫，其他事件一律重畫
+        dirty = self.dirty or any(event.type != pygame.MOUSEMOTION for event in events)
+        game.handle_events(events)
+
+        visual_state = self.get_visual_state()
+        if visual_state != self.visual_state:
+            dirty = True
+
+        if dirty:
+            game.render()
+            self.visual_state = visual_state
+            self.dirty = False
+
+        # 重設時鐘，離開閒置畫面時不會把等待的時間當成落後
+        game.clock.tick()
@@ -0,0 +1,466 @@
+######################載入套件######################
+import os
+import sys
+import time
+import struct
+from array import array
+import pygame
+from config import *
+from .hide_seek_replay import HideSeekReplayWriter
+
+######################對局狀態######################
+# 一局開始時的遊戲狀態 → 這一局進行中會出現的遊戲狀態（離開這些狀態代表這一局結束）
+MATCH_STATES = {
+    GAME_STATE_PLAYING: (GAME_STATE_PLAYING, GAME_STATE_BOSS_FIGHT),
+    GAME_STATE_SHIP_BATTLE: (GAME_STATE_SHIP_BATTLE,),
+    GAME_STATE_HIDE_SEEK: (GAME_STATE_HIDE_SEEK,),
+    GAME_STATE_BOSS_FIGHT_MODE: (GAME_STATE_BOSS_FIGHT_MODE,),
+}
+
+######################檔案格式######################
+# 檔頭：識別碼、格式版本、對局種子、模擬頻率，之後是四個「長度 + UTF-8」字串
+# （開始狀態、玩家名稱、以逗號分隔的按鍵名稱、Ship Battle 排除的上一局太空船），再來是每次更新一筆的紀錄：
+# 按住的按鍵位元遮罩與這次更新前剛按下的按鍵位元遮罩，各 4 bytes（little-endian）
+_HEADER = struct.Struct("<4sHqH")
+_STRING_LENGTH = struct.Struct("<H")
+_MAGIC = b"GBRP"
+_VERSION = 2
+_RECORD_ITEMS = 2
+
+def _pack_string(text):
+    """
+    把字串打包成「長度 + UTF-8」\n
+    """
+    data = text.encode("utf-8")
+    return _STRING_LENGTH.pack(len(data)) + data
+
+def _unpack_string(data, offset):
+    """
+    從 offset 讀出「長度 + UTF-8」字串\n
+    \n
+    回傳:\n
+    tuple: (字串, 下一個欄位的 offset)\n
+    """
+    (length,) = _STRING_LENGTH.unpack_from(data, offset)
+    offset += _STRING_LENGTH.size
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+######################按鍵狀態######################
+class KeyState(dict):
+    """
+    模擬 pygame.key.get_pressed() 的按鍵狀態\n
+    \n
+    以按鍵常數為索引，沒有按下的按鍵一律回傳 False，\n
+    遊戲程式可以照原本的 keys[pygame.K_LEFT] 寫法使用。\n
+    """
+
+    def __missing__(self, key):
+        return False
+
+    @classmethod
+    def from_names(cls, names):
+        """
+        由按鍵名稱建立按鍵狀態\n
+        \n
+        參數:\n
+        names (iterable): 按鍵常數名稱，例如 "K_LEFT"\n
+        \n
+        回傳:\n
+        KeyState: 這些按鍵為按下狀態\n
+        """
+        return cls((getattr(pygame, name), True) for name in names)
+
+######################輸入錄製######################
+class InputRecorder:
+    """
+    輸入錄製 - 把每次模擬更新的按鍵狀態壓成位元遮罩寫入二進位檔\n
+    \n
+    每次更新一筆紀錄（8 bytes）：\n
+    1. 按住的按鍵：各模式透過 pygame.key.get_pressed() 讀取的按鍵\n
+    2. 剛按下的按鍵：這次更新之前收到的 KEYDOWN 事件（切換武器、開商店、使用藥水等）\n
+       同一次更新之前的多個按鍵依位元順序重播，同一個按鍵按兩次只記一次。\n
+    \n
+    搭配檔頭的對局種子和開始狀態，重播時可以完整重現這一局。\n
+    紀錄先累積在 array 中，每 flush_ticks 次更新才寫入一次檔案。\n
+    """
+
+    def __init__(self, path, game_state, seed, player_name="", key_names=None, last_ship=""):
+        """
+        建立錄製檔並寫入檔頭\n
+        \n
+        參數:\n
+        path (str): 錄製檔路徑\n
+        game_state (str): 這一局開始時的遊戲狀態\n
+        seed (int): 對局種子\n
+        player_name (str): 玩家名稱\n
+        key_names (tuple): 要錄製的按鍵名稱，None 表示使用設定檔（最多 32 個）\n
+        last_ship (str): Ship Battle 這一局排除的上一局太空船（依 .last_ship.txt 決定，重播時要一樣）\n
+        """
+        key_names = tuple(key_names or REPLAY_SETTINGS["keys"])
+        if len(key_names) > 32:
+            raise ValueError(f"最多只能錄製 32 個按鍵，目前設定了 {len(key_names)} 個")
+
+        self.path = path
+        self.game_state = game_state
+        self.match_states = MATCH_STATES[game_state]
+        self.seed = seed
+        self.flush_ticks = REPLAY_SETTINGS["flush_ticks"]
+        self.key_bits = [(getattr(pygame, name), 1 << bit) for bit, name in enumerate(key_names)]
+        self.key_masks = dict(self.key_bits)
+        self.buffer = array("I")
+        self.pending_pressed = 0
+        self.ticks = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "wb")
+        self.file.write(_HEADER.pack(_MAGIC, _VERSION, seed, SIMULATION_SETTINGS["tick_rate"]))
+        self.file.write(_pack_string(game_state))
+        self.file.write(_pack_string(player_name))
+        self.file.write(_pack_string(",".join(key_names)))
+        self.file.write(_pack_string(last_ship))
+
+    @classmethod
+    def start(cls, game_state, seed, player_name="", last_ship=""):
+        """
+        在輸出資料夾建立有時間戳記的錄製檔\n
+        \n
+        參數:\n
+        game_state (str): 這一局開始時的遊戲狀態\n
+        seed (int): 對局種子\n
+        player_name (str): 玩家名稱\n
+        last_ship (str): Ship Battle 這一局排除的上一局太空船\n
+        \n
+        回傳:\n
+        InputRecorder: 錄製中的物件\n
+        """
+        filename = time.strftime(f"replay-{game_state}-%Y%m%d-%H%M%S") + f"-{seed}.gbr"
+        recorder = cls(os.path.join(REPLAY_SETTINGS["output_dir"], filename), game_state, seed, player_name,
+                       last_ship=last_ship)
+        print(f"開始錄製輸入：{recorder.path}")
+        return recorder
+
+    def note_events(self, events):
+        """
+        記下這一幀的 KEYDOWN 事件（寫入下一次更新的紀錄）\n
+        \n
+        參數:\n
+        events (list): 這一幀處理過的事件\n
+        """
+        key_masks = self.key_masks
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                self.pending_pressed |= key_masks.get(event.key, 0)
+
+    def record(self, keys):
+        """
+        記錄一次模擬更新的按鍵狀態\n
+        \n
+        參數:\n
+        keys (pygame.key.ScancodeWrapper): 這次更新使用的按鍵狀態\n
+        """
+        held = 0
+        for code, bit in self.key_bits:
+            if keys[code]:
+                held |= bit
+        self.buffer.append(held)
+        self.buffer.append(self.pending_pressed)
+        self.pending_pressed = 0
+        self.ticks += 1
+        if self.ticks % self.flush_ticks == 0:
+            self.flush()
+
+    def flush(self):
+        """
+        把累積的紀錄寫入檔案\n
+        """
+        if not self.buffer:
+            return
+        if sys.byteorder == "big":
+            self.buffer.byteswap()
+        self.file.write(self.buffer.tobytes())
+        self.file.flush()
+        del self.buffer[:]
+
+    def close(self):
+        """
+        寫出剩下的紀錄並關閉檔案\n
+        \n
+        回傳:\n
+        str: 錄製檔路徑\n
+        """
+        if self.file.closed:
+            return self.path
+        self.flush()
+        self.file.close()
+        size_kb = os.path.getsize(self.path) / 1024
+        print(f"輸入錄製結束（{self.ticks} 次更新，{size_kb:.1f} KB）：{self.path}")
+        return self.path
+
+######################輸入重播######################
+class InputReplay:
+    """
+    輸入重播 - 讀取錄製檔，依更新次數提供按鍵狀態和 KEYDOWN 事件\n
+    \n
+    和 headless.py 的腳本輸入一樣提供 keys_for(tick)，另外提供 events_for(tick)。\n
+    相同的位元遮罩共用同一個 KeyState 和事件串列，重播時幾乎不配置新物件。\n
+    """
+
+    def __init__(self, game_state, seed, player_name, key_names, held, pressed, tick_rate, last_ship=""):
+        """
+        初始化輸入重播\n
+        \n
+        參數:\n
+        game_state (str): 這一局開始時的遊戲狀態\n
+        seed (int): 對局種子\n
+        player_name (str): 玩家名稱\n
+        key_names (list): 按鍵名稱（位元順序）\n
+        held (array): 每次更新按住的按鍵遮罩\n
+        pressed (array): 每次更新前剛按下的按鍵遮罩\n
+        tick_rate (int): 錄製時的模擬頻率\n
+        last_ship (str): Ship Battle 這一局排除的上一局太空船，空字串表示沒有排除\n
+        """
+        self.game_state = game_state
+        self.match_states = MATCH_STATES[game_state]
+        self.seed = seed
+        self.player_name = player_name
+        self.key_names = key_names
+        self.key_bits = [(getattr(pygame, name), 1 << bit) for bit, name in enumerate(key_names)]
+        self.held = held
+        self.pressed = pressed
+        self.tick_rate = tick_rate
+        self.last_ship = last_ship
+        self.ticks = len(held)
+        self._key_states = {}
+        self._events = {}
+
+    @classmethod
+    def load(cls, path):
+        """
+        讀取錄製檔（檔尾不完整的紀錄會被忽略，例如錄製中當機）\n
+        \n
+        參數:\n
+        path (str): 錄製檔路徑\n
+        \n
+        回傳:\n
+        InputReplay: 輸入重播\n
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version, seed, tick_rate = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"不是輸入錄製檔: {path}")
+        if version not in (1, _VERSION):
+            raise ValueError(f"不支援的錄製檔版本: {version}")
+
+        offset = _HEADER.size
+        game_state, offset = _unpack_string(data, offset)
+        player_name, offset = _unpack_string(data, offset)
+        key_names, offset = _unpack_string(data, offset)
+        # 第 1 版沒有記錄排除的太空船（重播時視為沒有排除）
+        last_ship = ""
+        if version >= 2:
+            last_ship, offset = _unpack_string(data, offset)
+
+        records = array("I")
+        record_size = records.itemsize * _RECORD_ITEMS
+        end = offset + (len(data) - offset) // record_size * record_size
+        records.frombytes(data[offset:end])
+        if sys.byteorder == "big":
+            records.byteswap()
+
+        return cls(game_state, seed, player_name, key_names.split(",") if key_names else [],
+                   records[0::2], records[1::2], tick_rate, last_ship)
+
+    def keys_for(self, tick):
+        """
+        取得某一次更新的按鍵狀態\n
+        \n
+        參數:\n
+        tick (int): 更新次數（從 0 開始），超過錄製長度時沒有按鍵\n
+        \n
+        回傳:\n
+        KeyState: 按鍵狀態\n
+        """
+        mask = self.held[tick] if tick < self.ticks else 0
+        keys = self._key_states.get(mask)
+        if keys is None:
+            keys = self._key_states[mask] = KeyState((code, True) for code, bit in self.key_bits if mask & bit)
+        return keys
+
+    def events_for(self, tick):
+        """
+        取得某一次更新之前要處理的 KEYDOWN 事件\n
+        \n
+        參數:\n
+        tick (int): 更新次數（從 0 開始）\n
+        \n
+        回傳:\n
+        list: pygame 事件（沒有時為空串列）\n
+        """
+        mask = self.pressed[tick] if tick < self.ticks else 0
+        events = self._events.get(mask)
+        if events is None:
+            events = self._events[mask] = [pygame.event.Event(pygame.KEYDOWN, key=code, mod=0, unicode="", scancode=0)
+                                           for code, bit in self.key_bits if mask & bit]
+        return events
+
+######################錄製與重播流程######################
+class InputSession:
+    """
+    輸入錄製與重播的流程控制 - GameController 每一幀把輸入相關的工作委派給這個物件\n
+    \n
+    1. 錄製（--record）：每開始新的一局就開新的錄製檔（躲貓貓另外寫可跳轉的重播檔），\n
+       記下每次更新的按鍵和之前的 KEYDOWN 事件，這一局結束時寫出\n
+    2. 重播（--replay）：以錄製檔的種子和模式開始這一局，遊戲按鍵改由錄製檔提供，\n
+       播到檔尾或這一局結束時交還鍵盤控制\n
+    """
+
+    def __init__(self, game, record=None):
+        """
+        初始化錄製與重播流程\n
+        \n
+        參數:\n
+        game (GameController): 遊戲控制器\n
+        record (bool): 是否錄製每一局的輸入（--record），None 表示使用設定檔\n
+        """
+        self.game = game
+        self.record_inputs = REPLAY_SETTINGS["record"] if record is None else record
+        self.recorder = None
+        self.hide_seek_replay = None  # 躲貓貓可跳轉重播檔（錄製躲貓貓時一起寫入）
+        self.replay = None
+        self.replay_tick = 0
+
+    @staticmethod
+    def add_arguments(parser):
+        """
+        加入 --record 和 --replay 命令列參數\n
+        \n
+        參數:\n
+        parser (argparse.ArgumentParser): 命令列解析器\n
+        """
+        parser.add_argument("--record", action="store_true", default=REPLAY_SETTINGS["record"],
+                            help=f"錄製每一局的輸入到 {REPLAY_SETTINGS['output_dir']}/")
+        parser.add_argument("--replay", default=None,
+                            help="在視窗中重播輸入錄製檔（無視窗全速重播請用 headless.py --replay）")
+
+    @property
+    def active(self):
+        """
+        是否正在錄製或重播（這時每次更新都要執行，不能進入閒置模式）\n
+        """
+        return self.recorder is not None or self.replay is not None
+
+    def start_replay(self, replay):
+        """
+        以錄製檔的種子、玩家名稱和模式開始重播\n
+        \n
+        錄製檔的種子只用來開始這一局，之後的新對局仍使用原本的 --seed 設定。\n
+        \n
+        參數:\n
+        replay (InputReplay): 輸入重播\n
+        """
+        game = self.game
+        seed = game.seed
+        game.seed = replay.seed
+        try:
+            game.menu_system.player_name = replay.player_name
+            game.start_mode(replay.game_state, replay.last_ship)
+        finally:
+            game.seed = seed
+        game.match_started = False  # 重播不另外錄製
+        self.replay = replay
+        self.replay_tick = 0
+        print(f"開始重播（{replay.ticks} 次更新，種子 {replay.seed}）")
+
+    def filter_events(self, events):
+        """
+        重播時只保留關閉視窗和除錯功能鍵（遊戲按鍵來自錄製檔）\n
+        \n
+        參數:\n
+        events (list): 這一幀的事件\n
+        \n
+        回傳:\n
+        list: 要交給遊戲處理的事件\n
+        """
+        if self.replay is None:
+            return events
+        return [event for event in events if event.type == pygame.QUIT
+                or (event.type == pygame.KEYDOWN and event.key in DEBUG_KEYS.values())]
+
+    def after_events(self, events):
+        """
+        處理完這一幀的事件後更新錄製（開始新的一局時開新檔，否則記下 KEYDOWN 事件）\n
+        \n
+        參數:\n
+        events (list): 這一幀處理過的事件\n
+        """
+        game = self.game
+        if game.match_started:
+            game.match_started = False
+            self.stop()
+            if self.record_inputs and self.replay is None and game.game_state in MATCH_STATES:
+                last_ship = game.ship_battle_system.excluded_ship if game.game_state == GAME_STATE_SHIP_BATTLE else ""
+                self.recorder = InputRecorder.start(game.game_state, game.match_seed,
+                                                    game.menu_system.get_player_name(), last_ship)
+                if game.game_state == GAME_STATE_HIDE_SEEK:
+                    self.hide_seek_replay = HideSeekReplayWriter.start(game.hide_seek_system, game.match_seed)
+        elif self.recorder is not None:
+            self.recorder.note_events(events)
+
+    def step_keys(self):
+        """
+        取得這一次模擬更新的按鍵狀態\n
+        \n
+        重播時先處理錄製檔中這次更新之前的 KEYDOWN 事件，再回傳錄製的按鍵；\n
+        錄製時讀取鍵盤並寫入錄製檔。重播到檔尾或這一局結束（離開模式）時交還鍵盤控制。\n
+        \n
+        回傳:\n
+        pygame.key.ScancodeWrapper 或 KeyState: 按鍵狀態\n
+        """
+        game = self.game
+        replay = self.replay
+        if replay is not None:
+            if self.replay_tick < replay.ticks and game.game_state in replay.match_states:
+                tick = self.replay_tick
+                self.replay_tick += 1
+                events = replay.events_for(tick)
+                if events:
+                    game.handle_events(events)
+                return replay.keys_for(tick)
+            print(f"重播結束（{self.replay_tick} 次更新），交還鍵盤控制")
+            self.replay = None
+
+        keys = pygame.key.get_pressed()
+        recorder = self.recorder
+        if recorder is not None and game.game_state in recorder.match_states:
+            recorder.record(keys)
+        return keys
+
+    def record_hide_seek(self, system):
+        """
+        把躲貓貓這一次更新後的狀態寫入可跳轉重播檔（沒有在寫入時不做任何事）\n
+        \n
+        參數:\n
+        system (HideSeekSystem): 躲貓貓系統\n
+        """
+        if self.hide_seek_replay is not None:
+            self.hide_seek_replay.record(system)
+
+    def after_updates(self):
+        """
+        這一幀的更新結束後呼叫：這一局已經結束時立即寫出錄製檔（結束畫面是閒置模式，不會再執行更新）\n
+        """
+        if self.recorder is not None and self.game.game_state not in self.recorder.match_states:
+            self.stop()
+
+    def stop(self):
+        """
+        結束目前的輸入錄製與躲貓貓重播檔（沒有在錄製時不做任何事）\n
+        """
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.hide_seek_replay is not None:
+            self.hide_seek_replay.close()
+            self.hide_seek_replay = None
@@ -0,0 +1,117 @@
+######################載入套件######################
+from config import *
+from entities import ProjectileStore
+
+######################繪製插值######################
+class RenderInterpolator:
+    """
+    繪製插值 - 固定時間步長下，讓畫面位置落在「上一步」和「這一步」之間\n
+    \n
+    模擬固定以 60 Hz 更新，但畫面更新率可能是 30、60 或 144 Hz，\n
+    繪製時刻通常落在兩次模擬之間。最後一次模擬前先記下每個物件的位置，\n
+    繪製時依 alpha（0~1，距離上一步的比例）暫時把座標換成插值位置，\n
+    繪製完再換回模擬的實際座標，所以遊戲邏輯完全不受影響。\n
+    \n
+    ProjectileStore 的子彈是欄位陣列，列的順序會因為移除而改變，\n
+    改用「目前位置 - 速度 ×（1 - alpha）」直接推回插值位置。\n
+    位移超過 snap_distance 的物件（傳送、物件池重複使用）不插值，直接畫在新位置。\n
+    """
+
+    def __init__(self):
+        """
+        初始化繪製插值\n
+        """
+        self.snap_distance = SIMULATION_SETTINGS["snap_distance"]
+        self.snapshots = []   # (物件, x, y, camera_x, camera_y)
+        self.stores = []      # 需要插值的 ProjectileStore
+        self.alpha = 1.0
+        self.saved = []       # 繪製期間暫存的實際座標
+        self.saved_stores = []
+
+    def capture(self, entity_lists, entities=()):
+        """
+        記下模擬前的位置（在每一幀最後一次模擬之前呼叫）\n
+        \n
+        參數:\n
+        entity_lists (dict): 串列名稱 → 物件串列（GameController.get_entity_lists()）\n
+        entities (iterable): 不在串列中的單一物件，例如玩家和 Boss，None 會被略過\n
+        """
+        snapshots = []
+        stores = []
+        append = snapshots.append
+
+        for entity in entities:
+            if entity is not None:
+                append((entity, entity.x, entity.y,
+                        getattr(entity, "camera_x", None), getattr(entity, "camera_y", None)))
+
+        for objects in entity_lists.values():
+            if isinstance(objects, ProjectileStore):
+                stores.append(objects)
+                continue
+            for entity in objects:
+                append((entity, entity.x, entity.y,
+                        getattr(entity, "camera_x", None), getattr(entity, "camera_y", None)))
+
+        self.snapshots = snapshots
+        self.stores = stores
+
+    def clear(self):
+        """
+        清除記錄（模式切換或停用插值時使用）\n
+        """
+        self.snapshots = []
+        self.stores = []
+
+    def apply(self, alpha):
+        """
+        設定這次繪製的插值比例，搭配 with 使用\n
+        \n
+        參數:\n
+        alpha (float): 距離上一步的比例（0 = 上一步位置，1 = 目前位置）\n
+        \n
+        回傳:\n
+        RenderInterpolator: 自己（with 區塊內座標為插值位置）\n
+        """
+        self.alpha = alpha
+        return self
+
+    def __enter__(self):
+        alpha = self.alpha
+        if alpha >= 1.0:
+            return self
+
+        snap_distance = self.snap_distance
+        saved = self.saved
+        for entity, old_x, old_y, old_camera_x, old_camera_y in self.snapshots:
+            x, y = entity.x, entity.y
+            if abs(x - old_x) + abs(y - old_y) > snap_distance:
+                continue
+            camera_x = getattr(entity, "camera_x", None) if old_camera_x is not None else None
+            camera_y = getattr(entity, "camera_y", None) if old_camera_y is not None else None
+            saved.append((entity, x, y, camera_x, camera_y))
+
+            entity.x = old_x + (x - old_x) * alpha
+            entity.y = old_y + (y - old_y) * alpha
+            if camera_x is not None:
+                entity.camera_x = old_camera_x + (camera_x - old_camera_x) * alpha
+                entity.camera_y = old_camera_y + (camera_y - old_camera_y) * alpha
+
+        for store in self.stores:
+            if store.count:
+                self.saved_stores.append((store, store.rewind_positions(1.0 - alpha)))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for entity, x, y, camera_x, camera_y in self.saved:
+            entity.x = x
+            entity.y = y
+            if camera_x is not None:
+                entity.camera_x = camera_x
+                entity.camera_y = camera_y
+        self.saved.clear()
+
+        for store, saved in self.saved_stores:
+            store.restore_positions(saved)
+        self.saved_stores.clear()
+        return False
@@ -0,0 +1,490 @@
+######################載入套件######################
+import copy
+import struct
+import pygame
+from config import *
+from .text_cache import render_text
+from .hide_seek_replay import PLAYER_RECORD_SIZE, pack_player_into, unpack_player, apply_hide_seek_state
+from .snapshot import SnapshotWriter, SnapshotReader, write_rng_state, read_rng_state
+
+# NumPy 為選用套件：有安裝時 Boss 彈幕整欄複製，沒有時逐顆寫入
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+######################環狀緩衝區######################
+class KillCamRing:
+    """
+    擊殺回放的環狀緩衝區 - 固定幀數、每幀固定長度，建立時一次配置完成\n
+    \n
+    一個 bytearray 依幀切成 frames 段，寫滿後從最舊的一幀開始覆寫。\n
+    錄製時只用 struct.pack_into 或預先建立的檢視寫入，不會配置新的緩衝區。\n
+    """
+
+    def __init__(self, frames, frame_size):
+        """
+        配置環狀緩衝區\n
+        \n
+        參數:\n
+        frames (int): 保留的幀數\n
+        frame_size (int): 每幀的長度（bytes）\n
+        """
+        self.frames = frames
+        self.frame_size = frame_size
+        self.data = bytearray(frames * frame_size)
+        self.head = 0      # 下一幀要寫入的位置
+        self.length = 0    # 目前保存的幀數
+
+    def next_slot(self):
+        """
+        取得下一幀的位置（寫滿時覆寫最舊的一幀）\n
+        \n
+        回傳:\n
+        int: 幀位置（0 ~ frames - 1），資料從 slot * frame_size 開始\n
+        """
+        slot = self.head
+        self.head = slot + 1 if slot + 1 < self.frames else 0
+        if self.length < self.frames:
+            self.length += 1
+        return slot
+
+    def slots(self):
+        """
+        由舊到新列出目前保存的幀位置\n
+        \n
+        回傳:\n
+        list: 幀位置\n
+        """
+        start = (self.head - self.length) % self.frames
+        return [(start + i) % self.frames for i in range(self.length)]
+
+    def clear(self):
+        """
+        清空緩衝區（不釋放記憶體）\n
+        """
+        self.head = 0
+        self.length = 0
+
+######################擊殺回放######################
+class KillCam:
+    """
+    擊殺回放基底類別 - 持續錄製最後幾秒，觸發後暫停遊戲並重播\n
+    \n
+    每次模擬更新後呼叫 record()，把精簡的物件狀態寫進環狀緩衝區；\n
+    觸發後主迴圈呼叫 start()，回放期間以 step() 取代模擬更新、以 draw() 取代原本的繪製。\n
+    回放前先用快照保存系統和亂數狀態，回放時把每一幀的狀態直接寫回物件，\n
+    再呼叫系統原本的 draw()；結束時還原快照，遊戲從觸發的那一刻繼續，\n
+    結果和沒有回放時完全相同（輸入錄製與重播也不受影響）。\n
+    \n
+    子類別提供:\n
+    _should_record(): 這一次更新是否要錄製\n
+    _write(slot): 把系統目前的狀態寫入 slot\n
+    _apply(slot): 把 slot 的狀態寫回系統\n
+    _is_triggered(): 這一次更新是否需要回放\n
+    """
+
+    def __init__(self, system, frame_size):
+        """
+        初始化擊殺回放\n
+        \n
+        參數:\n
+        system (object): 要錄製的模式系統（需要 save_state/load_state/draw）\n
+        frame_size (int): 每幀的長度（bytes）\n
+        """
+        settings = KILL_CAM_SETTINGS
+        self.system = system
+        self.frames = max(1, int(settings["seconds"] * SIMULATION_SETTINGS["tick_rate"]))
+        self.ring = KillCamRing(self.frames, frame_size)
+        self.playback_speed = settings["playback_speed"]
+        self.skip_keys = settings["skip_keys"]
+        self.pending = False   # 已觸發，等待主迴圈開始回放
+        self.playing = False
+        self.playback_slots = []
+        self.position = 0.0    # 回放位置（幀，慢動作時是小數）
+        self.saved_state = None
+        self.font = None
+
+    ######################錄製######################
+    def record(self):
+        """
+        錄製這一次模擬更新後的狀態，並檢查是否觸發回放\n
+        """
+        if self._should_record():
+            self._write(self.ring.next_slot())
+        if self._is_triggered() and self.ring.length:
+            self.pending = True
+
+    def _should_record(self):
+        """
+        這一次更新是否要錄製（預設每次都錄）\n
+        """
+        return True
+
+    def _write(self, slot):
+        """
+        把系統目前的狀態寫入環狀緩衝區的 slot\n
+        """
+        raise NotImplementedError
+
+    def _apply(self, slot):
+        """
+        把 slot 的狀態寫回系統（回放繪製前呼叫）\n
+        """
+        raise NotImplementedError
+
+    def _is_triggered(self):
+        """
+        這一次更新是否需要回放\n
+        """
+        raise NotImplementedError
+
+    ######################回放######################
+    def start(self):
+        """
+        開始回放（保存目前的系統與亂數狀態）\n
+        """
+        writer = SnapshotWriter()
+        self.system.save_state(writer)
+        write_rng_state(writer)
+        self.saved_state = writer.getvalue()
+
+        self.pending = False
+        self.playing = True
+        self.playback_slots = self.ring.slots()
+        self.position = 0.0
+        print(f"擊殺回放（{len(self.playback_slots)} 幀）")
+
+    def step(self):
+        """
+        回放前進一次模擬更新的時間，播完時自動結束\n
+        """
+        self.position += self.playback_speed
+        if self.position >= len(self.playback_slots):
+            self.stop()
+
+    def stop(self):
+        """
+        結束回放並還原開始回放時的狀態\n
+        """
+        if not self.playing:
+            return
+        reader = SnapshotReader(self.saved_state)
+        self.system.load_state(reader)
+        read_rng_state(reader)
+        reader.finish()
+        self.saved_state = None
+        self.playing = False
+        self.playback_slots = []
+
+    def handle_events(self, events):
+        """
+        回放中攔截事件：跳過鍵結束回放，其他遊戲按鍵不交給遊戲處理\n
+        \n
+        參數:\n
+        events (list): 這一幀的事件\n
+        \n
+        回傳:\n
+        list: 仍要交給遊戲處理的事件（關閉視窗與除錯功能鍵）\n
+        """
+        remaining = []
+        for event in events:
+            if event.type == pygame.QUIT:
+                remaining.append(event)
+            elif event.type == pygame.KEYDOWN:
+                if event.key in DEBUG_KEYS.values():
+                    remaining.append(event)
+                elif event.key in self.skip_keys:
+                    self.stop()
+        return remaining
+
+    def draw(self, screen):
+        """
+        套用目前回放位置的狀態，用系統原本的繪製程式畫出來\n
+        \n
+        參數:\n
+        screen (pygame.Surface): 遊戲畫面\n
+        """
+        slots = self.playback_slots
+        index = min(int(self.position), len(slots) - 1)
+        self._apply(slots[index])
+        self.system.draw(screen)
+        self._draw_overlay(screen, (index + 1) / len(slots))
+
+    def _draw_overlay(self, screen, progress):
+        """
+        繪製回放標示與進度條\n
+        \n
+        參數:\n
+        screen (pygame.Surface): 遊戲畫面\n
+        progress (float): 回放進度（0~1）\n
+        """
+        settings = KILL_CAM_SETTINGS
+        if self.font is None:
+            self.font = create_font(FONT_SIZES["small"])
+
+        color = settings["label_color"]
+        label = render_text(self.font, "擊殺回放（空白鍵跳過）", True, color)
+        screen.blit(label, label.get_rect(midtop=(SCREEN_WIDTH // 2, settings["label_y"])))
+
+        bar_height = settings["bar_height"]
+        pygame.draw.rect(screen, color, (0, SCREEN_HEIGHT - bar_height, int(SCREEN_WIDTH * progress), bar_height))
+
+######################躲貓貓擊殺回放######################
+# 幀標頭：是否結束、階段計時、遊戲計時、結束計時、幽靈數量；之後是每位玩家的狀態和每個幽靈
+_HIDE_SEEK_FRAME = struct.Struct("<BHIHH")
+_HIDE_SEEK_GHOST = struct.Struct("<Hff")   # 原本的玩家索引、x、y
+
+class HideSeekKillCam(KillCam):
+    """
+    躲貓貓擊殺回放 - 搜尋者擊殺躲藏者時重播最後幾秒\n
+    \n
+    每幀的玩家狀態和躲貓貓重播檔相同（位置、血量、狀態旗標、效果計時），\n
+    回放時用 apply_hide_seek_state() 寫回玩家和幽靈。\n
+    相機跟著真人玩家（死亡後跟著幽靈），和遊戲中看到的畫面相同。\n
+    """
+
+    def __init__(self, system):
+        """
+        初始化躲貓貓擊殺回放\n
+        \n
+        參數:\n
+        system (HideSeekSystem): 躲貓貓系統\n
+        """
+        player_count = len(system.players)
+        super().__init__(system, _HIDE_SEEK_FRAME.size + player_count * (PLAYER_RECORD_SIZE + _HIDE_SEEK_GHOST.size))
+        self.human_only = KILL_CAM_SETTINGS["human_only"]
+        self.player_index = {player.player_id: index for index, player in enumerate(system.players)}
+        # 字串欄位只保存參照（預先配置好的串列，不需要打包）
+        self.phases = [None] * self.frames
+        self.messages = [""] * self.frames
+        self.ghosts = []   # 回放開始時所有的幽靈（較早的幀會暫時拿掉後來才出現的幽靈）
+
+    def start(self):
+        """
+        開始回放（先記下目前所有的幽靈）\n
+        """
+        self.ghosts = list(self.system.ghosts)
+        super().start()
+
+    def _write(self, slot):
+        system = self.system
+        data = self.ring.data
+        offset = slot * self.ring.frame_size
+        _HIDE_SEEK_FRAME.pack_into(data, offset, system.game_over, system.phase_timer, system.game_timer,
+                                   max(system.game_over_timer, 0), len(system.ghosts))
+        self.phases[slot] = system.game_state
+        self.messages[slot] = system.victory_message
+
+        offset += _HIDE_SEEK_FRAME.size
+        for player in system.players:
+            pack_player_into(data, offset, player)
+            offset += PLAYER_RECORD_SIZE
+
+        player_index = self.player_index
+        for ghost in system.ghosts:
+            _HIDE_SEEK_GHOST.pack_into(data, offset, player_index[ghost.player_id], ghost.x, ghost.y)
+            offset += _HIDE_SEEK_GHOST.size
+
+    def _apply(self, slot):
+        system = self.system
+        data = self.ring.data
+        offset = slot * self.ring.frame_size
+        game_over, phase_timer, game_timer, game_over_timer, ghost_count = _HIDE_SEEK_FRAME.unpack_from(data, offset)
+
+        offset += _HIDE_SEEK_FRAME.size
+        players = []
+        for _ in range(len(self.player_index)):
+            players.append(unpack_player(data, offset))
+            offset += PLAYER_RECORD_SIZE
+        ghosts = [_HIDE_SEEK_GHOST.unpack_from(data, offset + i * _HIDE_SEEK_GHOST.size) for i in range(ghost_count)]
+
+        system.ghosts = self.ghosts
+        apply_hide_seek_state(system, {
+            "phase": self.phases[slot], "phase_timer": phase_timer, "game_timer": game_timer,
+            "game_over": bool(game_over), "game_over_timer": game_over_timer,
+            "victory_message": self.messages[slot], "players": players, "ghosts": ghosts
+        })
+        system.minimap_system.update(system.players, system.ghosts)
+
+    def _is_triggered(self):
+        kill = self.system.last_kill
+        if kill is None:
+            return False
+        seeker, hider = kill
+        return not self.human_only or seeker.is_human or hider.is_human
+
+######################Boss Fight 擊殺回放######################
+# 幀標頭：玩家 x、y、血量，Boss x、y、血量，是否有 Boss，子彈數量；之後是每艘盟友和子彈欄位
+_BOSS_FIGHT_FRAME = struct.Struct("<3f3fBH")
+_BOSS_FIGHT_ALLY = struct.Struct("<3f")    # 盟友 x、y、血量
+
+class BossFightKillCam(KillCam):
+    """
+    Boss Fight 擊殺回放 - 玩家陣亡時重播最後幾秒\n
+    \n
+    每幀記錄玩家、盟友、Boss 的位置和血量，以及所有子彈的位置和類型\n
+    （x、y 欄位為 float32，類型為 uint16，每幀最多 max_projectiles 顆）。\n
+    子彈類型和 ProjectileStore 一樣以 (類別, bullet_type, color) 登錄原型物件；\n
+    回放時把所有子彈放進 Boss 彈幕儲存區，借用它原本的繪製程式畫出來。\n
+    換下一個 Boss 時清空緩衝區，回放中只會出現目前這個 Boss。\n
+    """
+
+    def __init__(self, system):
+        """
+        初始化 Boss Fight 擊殺回放\n
+        \n
+        參數:\n
+        system (BossFightSystem): Boss Fight 系統\n
+        """
+        self.max_projectiles = KILL_CAM_SETTINGS["max_projectiles"]
+        self.ally_count = len(system.ally_ships)
+        header_size = _BOSS_FIGHT_FRAME.size + self.ally_count * _BOSS_FIGHT_ALLY.size
+        self.columns_offset = (header_size + 3) // 4 * 4   # 子彈欄位對齊 4 bytes
+        frame_size = (self.columns_offset + self.max_projectiles * 10 + 3) // 4 * 4
+        super().__init__(system, frame_size)
+
+        # 每一幀的子彈欄位（x、y、類型）第一次用到時建立檢視並保留，之後錄製直接寫入
+        # （還原快照時會重新建立擊殺回放，不在這裡一次建立所有幀的檢視）
+        self.columns = [None] * self.frames
+        self.states = [None] * self.frames
+
+        # 子彈類型登錄：(類別, bullet_type, color) → 類型代碼
+        self.kind_ids = {}
+        self.prototypes = []
+        self.store_kinds = {}          # 儲存區 → (上次對應過的原型串列, type_id → 類型代碼)
+
+        self.boss_index = system.current_boss_index
+        self.last_state = system.game_state
+
+    def _column_views(self, slot):
+        """
+        取得某一幀子彈欄位的檢視（與緩衝區共用記憶體，第一次呼叫時建立）\n
+        \n
+        回傳:\n
+        tuple: (x 欄位, y 欄位, 類型欄位)\n
+        """
+        views = self.columns[slot]
+        if views is None:
+            views = self.columns[slot] = self._create_column_views(slot)
+        return views
+
+    def _create_column_views(self, slot):
+        """
+        建立某一幀子彈欄位的檢視\n
+        """
+        count = self.max_projectiles
+        start = slot * self.ring.frame_size + self.columns_offset
+        if np is not None:
+            return (np.frombuffer(self.ring.data, np.float32, count, start),
+                    np.frombuffer(self.ring.data, np.float32, count, start + count * 4),
+                    np.frombuffer(self.ring.data, np.uint16, count, start + count * 8))
+        view = memoryview(self.ring.data)
+        return (view[start:start + count * 4].cast("f"),
+                view[start + count * 4:start + count * 8].cast("f"),
+                view[start + count * 8:start + count * 10].cast("H"))
+
+    def _kind(self, bullet):
+        """
+        取得子彈的類型代碼，第一次出現時複製一份原型物件供回放繪製\n
+        """
+        key = (type(bullet), bullet.bullet_type, bullet.color)
+        kind = self.kind_ids.get(key)
+        if kind is None:
+            kind = self.kind_ids[key] = len(self.prototypes)
+            self.prototypes.append(copy.copy(bullet))
+        return kind
+
+    def _store_kind_map(self, store):
+        """
+        取得子彈儲存區 type_id → 類型代碼的對照（原型有變化時才重建）\n
+        """
+        prototypes = store.prototypes
+        cached = self.store_kinds.get(store)
+        if cached is None or cached[0] is not prototypes or len(cached[1]) != len(prototypes):
+            kinds = [self._kind(prototype) for prototype in prototypes]
+            cached = self.store_kinds[store] = (prototypes, np.array(kinds, dtype=np.uint16) if np is not None else kinds)
+        return cached[1]
+
+    def _should_record(self):
+        system = self.system
+        if system.current_boss_index != self.boss_index:
+            self.boss_index = system.current_boss_index
+            self.ring.clear()
+        # 陣亡的那一次更新也要錄（畫成戰鬥畫面），之後的失敗畫面不錄
+        return system.game_state != "victory" and (system.game_state != "defeat" or self.last_state != "defeat")
+
+    def _write(self, slot):
+        system = self.system
+        data = self.ring.data
+        offset = slot * self.ring.frame_size
+        self.states[slot] = "fighting" if system.game_state == "defeat" else system.game_state
+
+        # 子彈：Boss 彈幕優先（陣亡通常是被它打中），超過上限的不記錄
+        xs, ys, kinds = self._column_views(slot)
+        limit = self.max_projectiles
+        count = 0
+        for store in (system.boss_bullets, system.player_bullets, system.ally_bullets):
+            added = min(store.count, limit - count)
+            if added <= 0:
+                break
+            kind_map = self._store_kind_map(store)
+            end = count + added
+            if np is not None:
+                xs[count:end] = store.x[:added]
+                ys[count:end] = store.y[:added]
+                kinds[count:end] = kind_map[store.type_id[:added]]
+            else:
+                for i in range(added):
+                    xs[count + i] = store.x[i]
+                    ys[count + i] = store.y[i]
+                    kinds[count + i] = kind_map[store.type_id[i]]
+            count = end
+
+        player = system.player
+        boss = system.current_boss
+        if boss is not None:
+            _BOSS_FIGHT_FRAME.pack_into(data, offset, player.x, player.y, player.health,
+                                        boss.x, boss.y, boss.health, 1, count)
+        else:
+            _BOSS_FIGHT_FRAME.pack_into(data, offset, player.x, player.y, player.health, 0.0, 0.0, 0.0, 0, count)
+
+        offset += _BOSS_FIGHT_FRAME.size
+        for ally in system.ally_ships:
+            _BOSS_FIGHT_ALLY.pack_into(data, offset, ally.x, ally.y, ally.health)
+            offset += _BOSS_FIGHT_ALLY.size
+
+    def _apply(self, slot):
+        system = self.system
+        data = self.ring.data
+        offset = slot * self.ring.frame_size
+        player_x, player_y, player_health, boss_x, boss_y, boss_health, has_boss, count = \
+            _BOSS_FIGHT_FRAME.unpack_from(data, offset)
+
+        system.game_state = self.states[slot]
+        player = system.player
+        player.x, player.y, player.health = player_x, player_y, player_health
+        if has_boss and system.current_boss is not None:
+            boss = system.current_boss
+            boss.x, boss.y, boss.health = boss_x, boss_y, boss_health
+
+        offset += _BOSS_FIGHT_FRAME.size
+        for ally in system.ally_ships:
+            ally.x, ally.y, ally.health = _BOSS_FIGHT_ALLY.unpack_from(data, offset)
+            offset += _BOSS_FIGHT_ALLY.size
+
+        # 所有子彈都放進 Boss 彈幕儲存區，用它原本的繪製程式畫出來
+        system.player_bullets.clear()
+        system.ally_bullets.clear()
+        store = system.boss_bullets
+        store.set_prototypes(self.prototypes)
+        store.clear()
+        xs, ys, kinds = self._column_views(slot)
+        for i in range(count):
+            store.add(float(xs[i]), float(ys[i]), 0.0, 0.0, 0, 0, 0, int(kinds[i]), store.default_team)
+
+    def _is_triggered(self):
+        state = self.system.game_state
+        triggered = state == "defeat" and self.last_state != "defeat"
+        self.last_state = state
+        return triggered
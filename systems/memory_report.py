@@ -0,0 +1,115 @@
+######################載入套件######################
+import sys
+
+######################記憶體用量計算######################
+def measure_instance(obj):
+    """
+    計算單一物件本身佔用的位元組數（物件本體加上 __dict__，不含屬性值）\n
+    \n
+    屬性值（顏色 tuple、類型字串等）大多是多個物件共用的，\n
+    所以只計算每個實例獨有的部分，才能看出 __slots__ 省下多少。\n
+    \n
+    參數:\n
+    obj (object): 要計算的物件\n
+    \n
+    回傳:\n
+    int: 位元組數\n
+    """
+    size = sys.getsizeof(obj)
+    instance_dict = getattr(obj, "__dict__", None)
+    if instance_dict is not None:
+        size += sys.getsizeof(instance_dict)
+    return size
+
+def build_memory_report(entity_lists):
+    """
+    統計每個物件串列中各類別的數量與記憶體用量\n
+    \n
+    參數:\n
+    entity_lists (dict): 串列名稱 → 物件集合（有 get_memory_usage() 的集合直接使用其回報值）\n
+    \n
+    回傳:\n
+    list: 每一列是 dict，包含 list、type、count、bytes、has_dict\n
+    """
+    rows = []
+    for list_name, collection in entity_lists.items():
+        # 陣列式儲存區（例如 ProjectileStore）自行回報欄位陣列的大小
+        get_memory_usage = getattr(collection, "get_memory_usage", None)
+        if get_memory_usage is not None:
+            rows.append({
+                "list": list_name,
+                "type": type(collection).__name__,
+                "count": len(collection),
+                "bytes": get_memory_usage(),
+                "has_dict": False
+            })
+            continue
+
+        # 一般物件串列：依類別分組加總
+        per_type = {}
+        for obj in collection:
+            obj_type = type(obj)
+            entry = per_type.get(obj_type)
+            if entry is None:
+                entry = per_type[obj_type] = [0, 0, hasattr(obj, "__dict__")]
+            entry[0] += 1
+            entry[1] += measure_instance(obj)
+
+        for obj_type, (count, total_bytes, has_dict) in per_type.items():
+            rows.append({
+                "list": list_name,
+                "type": obj_type.__name__,
+                "count": count,
+                "bytes": total_bytes,
+                "has_dict": has_dict
+            })
+    return rows
+
+def format_memory_report(mode_name, rows, pool_stats=None):
+    """
+    把記憶體報告整理成可以直接印出的文字行\n
+    \n
+    參數:\n
+    mode_name (str): 目前的遊戲模式名稱\n
+    rows (list): build_memory_report() 的結果\n
+    pool_stats (dict): 子彈物件池統計資料（可省略）\n
+    \n
+    回傳:\n
+    list: 文字行\n
+    """
+    lines = [f"===== 記憶體報告：{mode_name} =====",
+             f"{'串列':<20}{'類別':<18}{'數量':>8}{'位元組':>10}{'每個':>8}  __dict__"]
+
+    total_count = 0
+    total_bytes = 0
+    for row in rows:
+        count = row["count"]
+        per_instance = row["bytes"] // count if count else 0
+        lines.append(f"{row['list']:<20}{row['type']:<18}{count:>8}{row['bytes']:>10}{per_instance:>8}  "
+                     f"{'有' if row['has_dict'] else '無'}")
+        total_count += count
+        total_bytes += row["bytes"]
+    lines.append(f"{'合計':<38}{total_count:>8}{total_bytes:>10}")
+
+    if pool_stats:
+        lines.append("物件池（空閒 / 借出 / 最高借出）:")
+        for class_name, stats in pool_stats.items():
+            lines.append(f"  {class_name:<18}{stats['free']:>8} / {stats['in_use']} / {stats['high_water']}")
+    return lines
+
+def print_memory_report(mode_name, entity_lists, pool_stats=None):
+    """
+    在終端機印出目前模式的物件數量與記憶體用量\n
+    \n
+    參數:\n
+    mode_name (str): 目前的遊戲模式名稱\n
+    entity_lists (dict): 串列名稱 → 物件集合\n
+    pool_stats (dict): 子彈物件池統計資料（可省略）\n
+    \n
+    回傳:\n
+    list: build_memory_report() 的結果\n
+    """
+    rows = build_memory_report(entity_lists)
+    for line in format_memory_report(mode_name, rows, pool_stats):
+        print(line)
+    return rows
@@ -1,6 +1,8 @@
 ######################載入套件######################
 import pygame
+import random
 from config import *
+from .text_cache import render_text
 
 ######################主畫面系統類別######################
 class MenuSystem:
@@ -43,6 +45,24 @@ class MenuSystem:
         self.is_editing_name = False
         self.name_input_rect = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 30, 200, 30)
         
+        # 靜態背景快取（填色、星空、標題、操作說明、版權資訊），只在畫面尺寸改變時重建
+        self.backdrop = None
+        
+        # 遊戲模式按鈕：(狀態變更, 按鈕文字, 邊框顏色)，由左到右排列
+        mode_buttons = [
+            ("start_game", "一般模式", GREEN),
+            ("ship_battle", "Ship Battle", RED),
+            ("hide_seek", "躲貓貓", PURPLE),
+            ("boss_fight", "Boss Fight", ORANGE),
+        ]
+        self.mode_button_styles = {name: (label, color) for name, label, color in mode_buttons}
+        
+        # 會隨滑鼠 hover 改變外觀的區域，繪製按鈕和點擊檢測都使用這裡的位置
+        self.hover_rects = [("name", self.name_input_rect)]
+        for index, (name, label, color) in enumerate(mode_buttons):
+            button_rect = pygame.Rect(SCREEN_WIDTH // 2 - 200 + index * 105, SCREEN_HEIGHT // 2 + 30, 90, 40)
+            self.hover_rects.append((name, button_rect))
+        
         print("主畫面系統初始化完成")
     
     def handle_text_input(self, event):
@@ -127,27 +147,46 @@ class MenuSystem:
         screen (pygame.Surface): 遊戲畫面物件\n
         mouse_pos (tuple): 滑鼠位置 (x, y)，可選參數\n
         """
+        # 繪製靜態背景（第一次或畫面尺寸改變時才重建）
+        if self.backdrop is None or self.backdrop.get_size() != screen.get_size():
+            self.backdrop = self._build_backdrop(screen)
+        screen.blit(self.backdrop, (0, 0))
+        
+        # 繪製玩家名稱區域（會隨編輯狀態和 hover 改變，每次重畫）
+        self._draw_player_name_section(screen, mouse_pos)
+        
+        # 繪製遊戲模式選擇（會隨 hover 改變，每次重畫）
+        self._draw_game_mode_buttons(screen, mouse_pos)
+    
+    def _build_backdrop(self, screen):
+        """
+        把主畫面中不會變動的部分預先繪製到一張 Surface 上\n
+        \n
+        參數:\n
+        screen (pygame.Surface): 遊戲畫面物件（決定尺寸和像素格式）\n
+        \n
+        回傳:\n
+        pygame.Surface: 背景快取\n
+        """
+        backdrop = pygame.Surface(screen.get_size(), 0, screen)
+        
         # 清空螢幕（深藍色太空背景）
         space_blue = (10, 10, 40)
-        screen.fill(space_blue)
+        backdrop.fill(space_blue)
         
         # 繪製星空背景
-        self._draw_stars_background(screen)
+        self._draw_stars_background(backdrop)
         
         # 繪製遊戲標題
-        self._draw_title(screen)
-        
-        # 繪製玩家名稱區域
-        self._draw_player_name_section(screen, mouse_pos)
-        
-        # 繪製遊戲模式選擇
-        self._draw_game_mode_buttons(screen, mouse_pos)
+        self._draw_title(backdrop)
         
         # 繪製操作說明
-        self._draw_instructions(screen)
+        self._draw_instructions(backdrop)
         
         # 繪製版權資訊
-        self._draw_credits(screen)
+        self._draw_credits(backdrop)
+        
+        return backdrop
     
     def _draw_stars_background(self, screen):
         """
@@ -156,15 +195,14 @@ class MenuSystem:
         參數:\n
         screen (pygame.Surface): 遊戲畫面物件\n
         """
-        import random
-        
-        # 在固定位置繪製星星（避免每幀都隨機產生）
-        random.seed(42)  # 使用固定種子確保星星位置一致
-        
-        for _ in range(100):  # 繪製100顆星星
-            star_x = random.randint(0, SCREEN_WIDTH)
-            star_y = random.randint(0, SCREEN_HEIGHT)
-            star_size = random.randint(1, 3)
+        # 使用獨立的亂數產生器和固定種子，星星位置每次相同，也不會重設遊戲使用的全域亂數
+        star_random = random.Random(MENU_STAR_SEED)
+        
+        width, height = screen.get_size()
+        for _ in range(MENU_STAR_COUNT):
+            star_x = star_random.randint(0, width)
+            star_y = star_random.randint(0, height)
+            star_size = star_random.randint(1, 3)
             
             # 不同大小的星星用不同亮度
             if star_size == 1:
@@ -254,54 +292,20 @@ class MenuSystem:
         screen (pygame.Surface): 遊戲畫面物件\n
         mouse_pos (tuple): 滑鼠位置 (x, y)，可選參數\n
         """
-        # 一般遊戲模式按鈕
-        normal_button_rect = pygame.Rect(SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 + 30, 90, 40)
-        is_hovering_normal = mouse_pos and normal_button_rect.collidepoint(mouse_pos)
-        
-        # 背景顏色隨 hover 狀態變化
-        normal_bg_color = (70, 70, 70) if is_hovering_normal else (50, 50, 50)
-        pygame.draw.rect(screen, normal_bg_color, normal_button_rect)
-        pygame.draw.rect(screen, GREEN, normal_button_rect, 2)
-        
-        normal_text = self.small_font.render("一般模式", True, WHITE)
-        normal_text_rect = normal_text.get_rect(center=normal_button_rect.center)
-        screen.blit(normal_text, normal_text_rect)
-        
-        # Ship Battle 模式按鈕
-        battle_button_rect = pygame.Rect(SCREEN_WIDTH // 2 - 95, SCREEN_HEIGHT // 2 + 30, 90, 40)
-        is_hovering_battle = mouse_pos and battle_button_rect.collidepoint(mouse_pos)
-        
-        battle_bg_color = (70, 70, 70) if is_hovering_battle else (50, 50, 50)
-        pygame.draw.rect(screen, battle_bg_color, battle_button_rect)
-        pygame.draw.rect(screen, RED, battle_button_rect, 2)
-        
-        battle_text = self.small_font.render("Ship Battle", True, WHITE)
-        battle_text_rect = battle_text.get_rect(center=battle_button_rect.center)
-        screen.blit(battle_text, battle_text_rect)
-        
-        # 躲貓貓模式按鈕
-        hide_seek_button_rect = pygame.Rect(SCREEN_WIDTH // 2 + 10, SCREEN_HEIGHT // 2 + 30, 90, 40)
-        is_hovering_hide_seek = mouse_pos and hide_seek_button_rect.collidepoint(mouse_pos)
-        
-        hide_seek_bg_color = (70, 70, 70) if is_hovering_hide_seek else (50, 50, 50)
-        pygame.draw.rect(screen, hide_seek_bg_color, hide_seek_button_rect)
-        pygame.draw.rect(screen, PURPLE, hide_seek_button_rect, 2)
-        
-        hide_seek_text = self.small_font.render("躲貓貓", True, WHITE)
-        hide_seek_text_rect = hide_seek_text.get_rect(center=hide_seek_button_rect.center)
-        screen.blit(hide_seek_text, hide_seek_text_rect)
-        
-        # Boss Fight 模式按鈕
-        boss_fight_button_rect = pygame.Rect(SCREEN_WIDTH // 2 + 115, SCREEN_HEIGHT // 2 + 30, 90, 40)
-        is_hovering_boss_fight = mouse_pos and boss_fight_button_rect.collidepoint(mouse_pos)
-        
-        boss_fight_bg_color = (70, 70, 70) if is_hovering_boss_fight else (50, 50, 50)
-        pygame.draw.rect(screen, boss_fight_bg_color, boss_fight_button_rect)
-        pygame.draw.rect(screen, ORANGE, boss_fight_button_rect, 2)
-        
-        boss_fight_text = self.small_font.render("Boss Fight", True, WHITE)
-        boss_fight_text_rect = boss_fight_text.get_rect(center=boss_fight_button_rect.center)
-        screen.blit(boss_fight_text, boss_fight_text_rect)
+        hover = self.get_hover_target(mouse_pos) if mouse_pos else None
+        for name, button_rect in self.hover_rects:
+            if name not in self.mode_button_styles:
+                continue
+            label, border_color = self.mode_button_styles[name]
+            
+            # 背景顏色隨 hover 狀態變化
+            bg_color = (70, 70, 70) if hover == name else (50, 50, 50)
+            pygame.draw.rect(screen, bg_color, button_rect)
+            pygame.draw.rect(screen, border_color, button_rect, 2)
+            
+            text = self.small_font.render(label, True, WHITE)
+            text_rect = text.get_rect(center=button_rect.center)
+            screen.blit(text, text_rect)
     
     def _draw_instructions(self, screen):
         """
@@ -329,7 +333,7 @@ class MenuSystem:
                 color = WHITE
             
             # 使用18像素間距，更緊湊的排列
-            instruction_text = self.small_font.render(instruction, True, color)
+            instruction_text = render_text(self.small_font, instruction, True, color)
             instruction_rect = instruction_text.get_rect(center=(SCREEN_WIDTH // 2, instructions_y + i * 18))
             screen.blit(instruction_text, instruction_rect)
     
@@ -380,7 +384,7 @@ class MenuSystem:
             else:
                 color = (180, 180, 180)
             
-            credit_text = credit_font.render(credit, True, color)
+            credit_text = render_text(credit_font, credit, True, color)
             credit_rect = credit_text.get_rect(center=(left_x, safe_start_y + i * 14))  # 縮減為14像素間距
             screen.blit(credit_text, credit_rect)
         
@@ -392,17 +396,44 @@ class MenuSystem:
             else:
                 color = (180, 180, 180)
             
-            credit_text = credit_font.render(credit, True, color)
+            credit_text = render_text(credit_font, credit, True, color)
             credit_rect = credit_text.get_rect(center=(right_x, safe_start_y + i * 14))  # 縮減為14像素間距
             screen.blit(credit_text, credit_rect)
         
         # 繪製底部版權資訊
         bottom_y = safe_start_y + len(left_credits) * 14 + 8  # 縮減間距
         if bottom_y + 14 <= SCREEN_HEIGHT - 5:  # 確保不超出視窗底部
-            bottom_text = credit_font.render(bottom_credit, True, (150, 150, 150))
+            bottom_text = render_text(credit_font, bottom_credit, True, (150, 150, 150))
             bottom_rect = bottom_text.get_rect(center=(SCREEN_WIDTH // 2, bottom_y))
             screen.blit(bottom_text, bottom_rect)
     
+    def get_visual_state(self, mouse_pos):
+        """
+        取得決定主畫面外觀的狀態（閒置時用來判斷是否需要重畫）\n
+        \n
+        參數:\n
+        mouse_pos (tuple): 滑鼠位置 (x, y)\n
+        \n
+        回傳:\n
+        tuple: (hover 的區域, 名稱, 是否編輯中, 游標閃爍相位)，任何一項改變都代表畫面不同\n
+        """
+        hover = self.get_hover_target(mouse_pos)
+        
+        # 游標每 500 毫秒閃爍一次（與 _draw_player_name_section 相同）
+        blink = (pygame.time.get_ticks() // 500) % 2 if self.is_editing_name else 0
+        return (hover, self.player_name, self.is_editing_name, blink)
+    
+    def get_animation_interval(self):
+        """
+        取得主畫面動畫的更新間隔（閒置等待事件的逾時時間）\n
+        \n
+        回傳:\n
+        int: 毫秒數，沒有動畫時回傳 None\n
+        """
+        if self.is_editing_name:
+            return 500 - pygame.time.get_ticks() % 500  # 等到下一次游標閃爍
+        return None
+    
     def handle_click(self, mouse_pos):
         """
         處理滑鼠點擊事件\n
@@ -413,34 +444,33 @@ class MenuSystem:
         回傳:\n
         str: 遊戲狀態變更 ("start_game", "ship_battle", "hide_seek", "edit_name", None)\n
         """
+        target = self.get_hover_target(mouse_pos)
+        
         # 檢查是否點擊名稱輸入框
-        if self.name_input_rect.collidepoint(mouse_pos):
+        if target == "name":
             print("開始編輯玩家名稱")
             self.is_editing_name = True
             self.player_name = ""  # 清空名稱重新輸入
             return "edit_name"
         
         # 檢查遊戲模式按鈕
-        normal_button_rect = pygame.Rect(SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 + 30, 90, 40)
-        if normal_button_rect.collidepoint(mouse_pos):
-            print("點擊開始一般遊戲")
-            return "start_game"
-        
-        battle_button_rect = pygame.Rect(SCREEN_WIDTH // 2 - 95, SCREEN_HEIGHT // 2 + 30, 90, 40)
-        if battle_button_rect.collidepoint(mouse_pos):
-            print(f"玩家 {self.player_name} 點擊開始 Ship Battle 模式")
-            return "ship_battle"
-        
-        hide_seek_button_rect = pygame.Rect(SCREEN_WIDTH // 2 + 10, SCREEN_HEIGHT // 2 + 30, 90, 40)
-        if hide_seek_button_rect.collidepoint(mouse_pos):
-            print(f"玩家 {self.player_name} 點擊開始躲貓貓遊戲")
-            return "hide_seek"
-        
-        boss_fight_button_rect = pygame.Rect(SCREEN_WIDTH // 2 + 115, SCREEN_HEIGHT // 2 + 30, 90, 40)
-        if boss_fight_button_rect.collidepoint(mouse_pos):
-            print(f"玩家 {self.player_name} 點擊開始 Boss Fight 模式")
-            return "boss_fight"
-        
+        if target is not None:
+            print(f"玩家 {self.player_name} 點擊開始 {self.mode_button_styles[target][0]}")
+        return target
+    
+    def get_hover_target(self, mouse_pos):
+        """
+        取得滑鼠位置所在的區域（名稱輸入框或遊戲模式按鈕）\n
+        \n
+        參數:\n
+        mouse_pos (tuple): 滑鼠位置 (x, y)\n
+        \n
+        回傳:\n
+        str: 區域名稱（"name" 或遊戲模式的狀態變更），不在任何區域時回傳 None\n
+        """
+        for name, rect in self.hover_rects:
+            if rect.collidepoint(mouse_pos):
+                return name
         return None
     
     def get_player_name(self):
@@ -462,13 +492,4 @@ class MenuSystem:
         回傳:\n
         bool: 如果滑鼠懸停在任何按鈕上返回 True\n
         """
-        normal_button_rect = pygame.Rect(SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 + 30, 90, 40)
-        battle_button_rect = pygame.Rect(SCREEN_WIDTH // 2 - 95, SCREEN_HEIGHT // 2 + 30, 90, 40)
-        hide_seek_button_rect = pygame.Rect(SCREEN_WIDTH // 2 + 10, SCREEN_HEIGHT // 2 + 30, 90, 40)
-        boss_fight_button_rect = pygame.Rect(SCREEN_WIDTH // 2 + 115, SCREEN_HEIGHT // 2 + 30, 90, 40)
-        
-        return (normal_button_rect.collidepoint(mouse_pos) or 
-                battle_button_rect.collidepoint(mouse_pos) or
-                hide_seek_button_rect.collidepoint(mouse_pos) or
-                boss_fight_button_rect.collidepoint(mouse_pos) or
-                self.name_input_rect.collidepoint(mouse_pos))
\ No newline at end of file
+        return self.get_hover_target(mouse_pos) is not None
\ No newline at end of file
@@ -0,0 +1,128 @@
+######################載入套件######################
+import pygame
+from config import *
+from .glyph_atlas import draw_numeric_text
+from .frame_profiler import frame_profiler
+
+######################效能疊加層######################
+class PerformanceOverlay:
+    """
+    效能疊加層 - 在畫面上顯示 FPS、幀時間曲線、各階段耗時和物件數量\n
+    \n
+    資料來自 frame_profiler 的環狀緩衝區；疊加層開啟時才啟用分析器，\n
+    關閉時遊戲中的計時探針幾乎沒有成本。\n
+    """
+
+    def __init__(self, profiler=None):
+        """
+        初始化效能疊加層\n
+        \n
+        參數:\n
+        profiler (FrameProfiler): 幀時間分析器，None 表示使用全域分析器\n
+        """
+        self.profiler = profiler or frame_profiler
+        self.config = PERFORMANCE_OVERLAY_SETTINGS
+        self.font = None
+        self.panel = None
+        self.visible = False
+
+    def toggle(self):
+        """
+        切換疊加層顯示，同時開啟或關閉分析器\n
+        """
+        self.visible = not self.visible
+        self.profiler.set_active("overlay", self.visible)
+        print(f"效能疊加層{'開啟' if self.visible else '關閉'}")
+
+    def _build_panel(self, height):
+        """
+        建立半透明背景（高度改變時才重建）\n
+        \n
+        參數:\n
+        height (int): 背景高度\n
+        """
+        self.panel = pygame.Surface((self.config["width"], height), pygame.SRCALPHA)
+        self.panel.fill(self.config["background_color"])
+
+    def draw(self, screen, fps, entity_lists):
+        """
+        繪製效能疊加層\n
+        \n
+        參數:\n
+        screen (pygame.Surface): 遊戲畫面\n
+        fps (float): 目前 FPS（clock.get_fps()）\n
+        entity_lists (dict): 串列名稱 → 物件串列\n
+        """
+        config = self.config
+        if self.font is None:
+            self.font = create_font(FONT_SIZES["mini"])
+        font = self.font
+        line_height = font.get_linesize()
+
+        averages = self.profiler.averages(config["average_frames"])
+        phase_names = [name for name in config["phases"] if name in averages]
+        counts = [(name, len(objects)) for name, objects in entity_lists.items()]
+
+        graph_height = config["graph_height"]
+        height = (config["padding"] * 3 + graph_height
+                  + line_height * (1 + len(phase_names) + len(counts)))
+        if self.panel is None or self.panel.get_height() != height:
+            self._build_panel(height)
+
+        x, y = config["x"], config["y"]
+        screen.blit(self.panel, (x, y))
+        text_x = x + config["padding"]
+        line_y = y + config["padding"]
+
+        # FPS 與最近平均幀時間
+        frame_times = self.profiler.recent_frame_times()
+        recent = frame_times[-config["average_frames"]:]
+        average_frame = sum(recent) / len(recent) if recent else 0.0
+        draw_numeric_text(screen, font, ("FPS ", round(fps, 1), "  frame ", round(average_frame, 2), " ms"),
+                          True, config["text_color"], topleft=(text_x, line_y))
+        line_y += line_height + config["padding"]
+
+        # 幀時間曲線（虛線為一幀的時間預算）
+        self._draw_graph(screen, frame_times, text_x, line_y, config["width"] - config["padding"] * 2, graph_height)
+        line_y += graph_height + config["padding"]
+
+        # 各階段平均耗時
+        for name in phase_names:
+            draw_numeric_text(screen, font, (f"{name}: ", round(averages[name], 3), " ms"),
+                              True, config["phase_color"], topleft=(text_x, line_y))
+            line_y += line_height
+
+        # 各串列目前的物件數量
+        for name, count in counts:
+            draw_numeric_text(screen, font, (f"{name}: ", count), True, config["count_color"], topleft=(text_x, line_y))
+            line_y += line_height
+
+    def _draw_graph(self, screen, frame_times, x, y, width, height):
+        """
+        繪製幀時間曲線\n
+        \n
+        參數:\n
+        screen (pygame.Surface): 遊戲畫面\n
+        frame_times (list): 每幀毫秒數（由舊到新）\n
+        x (int): 左上角 x 座標\n
+        y (int): 左上角 y 座標\n
+        width (int): 寬度\n
+        height (int): 高度\n
+        """
+        config = self.config
+        budget_ms = 1000.0 / FPS
+        scale_ms = budget_ms * config["graph_scale_budgets"]
+        pygame.draw.rect(screen, config["graph_border_color"], (x, y, width, height), 1)
+
+        budget_y = y + height - int(height * budget_ms / scale_ms)
+        for dash_x in range(x, x + width, 8):
+            pygame.draw.line(screen, config["budget_color"], (dash_x, budget_y), (min(dash_x + 4, x + width), budget_y))
+
+        if len(frame_times) < 2:
+            return
+        # 整個環狀緩衝區對應曲線寬度，最新的一幀畫在最右邊
+        step = width / self.profiler.history_size
+        offset = self.profiler.history_size - len(frame_times)
+        points = [(x + int((offset + i) * step), y + height - int(height * min(ms, scale_ms) / scale_ms))
+                  for i, ms in enumerate(frame_times)]
+        pygame.draw.lines(screen, config["graph_color"], False, points)
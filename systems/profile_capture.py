@@ -0,0 +1,162 @@
+######################載入套件######################
+import io
+import os
+import time
+import pstats
+import cProfile
+from config import *
+
+######################分析區段######################
+class _CaptureSection:
+    """
+    cProfile 分析區段 - 進入時開始記錄、離開時暫停\n
+    """
+
+    __slots__ = ("profile",)
+
+    def __init__(self, profile):
+        self.profile = profile
+
+    def __enter__(self):
+        self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profile.disable()
+        return False
+
+class _NullSection:
+    """
+    沒有在錄製時使用的空區段（什麼都不做）\n
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NULL_SECTION = _NullSection()
+
+######################cProfile 錄製######################
+class ProfileCapture:
+    """
+    cProfile 錄製 - 用熱鍵開始和停止，只記錄遊戲更新與繪製\n
+    \n
+    錄製期間主迴圈用 section() 包住 update_game_objects() 和 render()，\n
+    事件處理和 clock.tick() 的等待時間不會算進去。\n
+    停止時輸出兩個檔案（檔名包含開始錄製時的模式與時間）:\n
+    1. .pstats: 可以用 python -m pstats 或 snakeviz 等工具開啟\n
+    2. .txt: 依累計時間排序的前幾名函式摘要\n
+    """
+
+    def __init__(self):
+        """
+        初始化 cProfile 錄製\n
+        """
+        self.config = PROFILE_CAPTURE_SETTINGS
+        self.profile = None
+        self._section = None
+        self.mode = None
+        self.started_at = None
+        self.frames = 0
+
+    @property
+    def active(self):
+        """
+        是否正在錄製\n
+        """
+        return self.profile is not None
+
+    def toggle(self, mode):
+        """
+        開始或停止錄製\n
+        \n
+        參數:\n
+        mode (str): 目前的遊戲模式（用於檔名）\n
+        \n
+        回傳:\n
+        tuple: 停止錄製時回傳 (pstats 路徑, 摘要路徑)，開始錄製時回傳 None\n
+        """
+        if self.active:
+            return self.stop()
+        self.start(mode)
+        return None
+
+    def start(self, mode):
+        """
+        開始錄製\n
+        \n
+        參數:\n
+        mode (str): 目前的遊戲模式（用於檔名）\n
+        """
+        self.profile = cProfile.Profile()
+        self._section = _CaptureSection(self.profile)
+        self.mode = mode
+        self.started_at = time.localtime()
+        self.frames = 0
+        print(f"開始 cProfile 錄製（模式：{mode}），再按一次停止")
+
+    def section(self):
+        """
+        取得分析區段（沒有錄製時回傳空區段）\n
+        \n
+        回傳:\n
+        context manager: with 區塊內的函式呼叫會被記錄\n
+        """
+        if self.profile is None:
+            return _NULL_SECTION
+        self.frames += 1
+        return self._section
+
+    def stop(self):
+        """
+        停止錄製並寫出 .pstats 與文字摘要\n
+        \n
+        回傳:\n
+        tuple: (pstats 路徑, 摘要路徑)\n
+        """
+        profile = self.profile
+        self.profile = None
+        self._section = None
+        if profile is None:
+            return None
+
+        output_dir = self.config["output_dir"]
+        os.makedirs(output_dir, exist_ok=True)
+        base_name = time.strftime(f"profile-{self.mode}-%Y%m%d-%H%M%S", self.started_at)
+        stats_path = os.path.join(output_dir, base_name + ".pstats")
+        summary_path = os.path.join(output_dir, base_name + ".txt")
+
+        profile.dump_stats(stats_path)
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write(self.build_summary(profile))
+
+        print(f"cProfile 錄製結束（{self.frames} 幀），已寫入 {stats_path} 和 {summary_path}")
+        return stats_path, summary_path
+
+    def build_summary(self, profile):
+        """
+        產生依累計時間排序的函式摘要\n
+        \n
+        參數:\n
+        profile (cProfile.Profile): 錄製結果\n
+        \n
+        回傳:\n
+        str: 摘要文字\n
+        """
+        stream = io.StringIO()
+        stream.write(f"模式: {self.mode}\n")
+        stream.write(f"開始時間: {time.strftime('%Y-%m-%d %H:%M:%S', self.started_at)}\n")
+        stream.write(f"錄製幀數: {self.frames}\n\n")
+
+        try:
+            stats = pstats.Stats(profile, stream=stream)
+        except TypeError:
+            # 錄製期間沒有執行任何一幀時，pstats 會因為沒有資料而失敗
+            stream.write("沒有記錄到任何函式呼叫\n")
+            return stream.getvalue()
+        stats.strip_dirs().sort_stats(self.config["sort_by"]).print_stats(self.config["top_functions"])
+        return stream.getvalue()
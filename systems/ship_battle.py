@@ -3,8 +3,9 @@ import pygame
 import random
 import os
 from config import *
-from entities import Robot
+from entities import Robot, ProjectileStore, release_bullet
 from systems.collision import check_collision
+from systems.frame_profiler import frame_profiler
 
 # 持久化記錄上次使用的太空船類型
 LAST_SHIP_FILE = ".last_ship.txt"
@@ -43,8 +44,8 @@ class ShipBattleSystem:
     屬性:\n
     player (Player): 玩家物件\n
     robot (Robot): 機器人對手\n
-    player_bullets (list): 玩家子彈列表\n
-    robot_bullets (list): 機器人子彈列表\n
+    player_bullets (ProjectileStore): 玩家子彈列表\n
+    robot_bullets (ProjectileStore): 機器人子彈列表\n
     battle_state (str): 戰鬥狀態\n
     prepare_timer (int): 準備階段倒數計時器\n
     result_timer (int): 結果顯示計時器\n
@@ -61,12 +62,14 @@ class ShipBattleSystem:
         self.battle_state = "inactive"  # inactive, prepare, fighting, victory, defeat
         self.prepare_timer = 0
         self.result_timer = 0
+        self.excluded_ship = ""  # 這一局從選項中排除的太空船（上一局使用的，錄製檔會記錄）
         
         # 戰鬥物件
         self.player = None
         self.robot = None
-        self.player_bullets = []
-        self.robot_bullets = []
+        # 子彈使用陣列式儲存（轉存後子彈物件立即歸還物件池）
+        self.player_bullets = ProjectileStore(ProjectileStore.TEAM_PLAYER, cull_margin=None, release=release_bullet)
+        self.robot_bullets = ProjectileStore(ProjectileStore.TEAM_ENEMY, cull_margin=None, release=release_bullet)
         
         # 玩家資訊
         self.player_name = "Player"
@@ -76,13 +79,15 @@ class ShipBattleSystem:
         
         print("Ship Battle 系統初始化完成")
     
-    def start_battle(self, player, player_name="Player"):
+    def start_battle(self, player, player_name="Player", last_ship=None):
         """
         開始 Ship Battle 對戰\n
         \n
         參數:\n
         player (Player): 玩家物件\n
         player_name (str): 玩家名稱\n
+        last_ship (str): 要排除的上一局太空船，None 表示讀取 .last_ship.txt\n
+                         （重播時傳入錄製檔記錄的值，空字串表示不排除）\n
         """
         print(f"開始 Ship Battle 對戰！玩家：{player_name} vs 機器人：RoboWarrior")
         
@@ -98,15 +103,19 @@ class ShipBattleSystem:
         available_ships = list(SPACESHIP_STATS.keys())
         
         # 取得上次使用的太空船類型
-        last_ship = get_last_spaceship_type()
+        # （固定對局種子時不參考上一局，同一個種子才會選到相同的太空船）
+        if last_ship is None:
+            last_ship = "" if is_rng_seed_fixed() else get_last_spaceship_type()
         
         # 如果有上次使用的太空船類型，則從可選列表中移除
+        self.excluded_ship = ""
         if last_ship and last_ship in available_ships and len(available_ships) > 1:
             available_ships.remove(last_ship)
+            self.excluded_ship = last_ship
             print(f"上次使用了 {last_ship}，本次將從其他太空船中隨機選擇")
         
         # 隨機選擇太空船類型
-        selected_ship = random.choice(available_ships)
+        selected_ship = get_rng("spawning").choice(available_ships)
         
         # 儲存本次選擇的太空船類型
         save_last_spaceship_type(selected_ship)
@@ -123,7 +132,7 @@ class ShipBattleSystem:
         print(f"玩家和機器人將使用相同的太空船進行對戰")
         
         # 創建機器人（使用與玩家相同的太空船類型）
-        robot_x = random.randint(100, SCREEN_WIDTH - 100)
+        robot_x = get_rng("spawning").randint(100, SCREEN_WIDTH - 100)
         robot_y = 100
         self.robot = Robot(robot_x, robot_y)
         
@@ -197,7 +206,8 @@ class ShipBattleSystem:
         self._update_player(keys)
         
         # 更新機器人
-        robot_bullets = self.robot.update(self.player.x, self.player.y)
+        with frame_profiler.probe("ai"):
+            robot_bullets = self.robot.update(self.player.x, self.player.y)
         if robot_bullets:  # 如果機器人發射了子彈
             self.robot_bullets.extend(robot_bullets)
             # 播放機器人射擊音效（音量稍小以區別）
@@ -208,7 +218,9 @@ class ShipBattleSystem:
         self._update_bullets()
         
         # 碰撞檢測
-        battle_result = self._handle_collisions()
+        with frame_profiler.probe("collisions"):
+            battle_result = self._handle_collisions()
+        
         if battle_result != "continue":
             return battle_result
         
@@ -229,7 +241,7 @@ class ShipBattleSystem:
         if keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]:
             new_bullet = self.player.shoot()
             if new_bullet:
-                self.player_bullets.append(new_bullet)
+                self.player_bullets.add_bullet(new_bullet)
                 # 播放玩家射擊音效
                 from config import play_sound
                 play_sound(self.sounds, "laser_shoot")
@@ -269,17 +281,10 @@ class ShipBattleSystem:
         """
         更新所有子彈位置\n
         """
-        # 更新玩家子彈
-        for bullet in self.player_bullets[:]:
-            bullet.move()
-            if bullet.is_off_screen():
-                self.player_bullets.remove(bullet)
-        
-        # 更新機器人子彈
-        for bullet in self.robot_bullets[:]:
-            bullet.move()
-            if bullet.is_off_screen():
-                self.robot_bullets.remove(bullet)
+        # 整批移動並剔除出界子彈
+        for store in (self.player_bullets, self.robot_bullets):
+            store.step()
+            store.cull_off_screen()
     
     def _handle_collisions(self):
         """
@@ -288,36 +293,38 @@ class ShipBattleSystem:
         回傳:\n
         str: 戰鬥結果（"continue", "victory", "defeat"）\n
         """
-        # 玩家子彈打中機器人
-        for bullet in self.player_bullets[:]:
-            if check_collision(bullet.x, bullet.y, bullet.width, bullet.height,
-                             self.robot.x, self.robot.y, self.robot.width, self.robot.height):
-                
-                # 機器人受傷
-                robot_dead = self.robot.take_damage(bullet.damage)
-                self.player_bullets.remove(bullet)
-                
-                if robot_dead:
-                    print(f"玩家獲勝！擊敗了機器人 {self.robot.name}")
-                    self.battle_state = "victory"
-                    self.result_timer = SHIP_BATTLE_STATS["victory_display_time"]
-                    return "victory"
+        # 一對一對戰只有兩個目標，不用空間網格：
+        # 把每顆子彈放進網格要跑 Python 迴圈，直接用 hit_test() 對整欄子彈做向量化判斷更快
+        # 玩家子彈打中機器人（依子彈順序結算，擊敗機器人之後的子彈保留）
+        hits = self.player_bullets.hit_test([self.robot])
+        damage = self.player_bullets.damage
+        for index, (row, _) in enumerate(hits):
+            # 機器人受傷
+            robot_dead = self.robot.take_damage(int(damage[row]))
+            
+            if robot_dead:
+                self.player_bullets.remove_rows(row for row, _ in hits[:index + 1])
+                print(f"玩家獲勝！擊敗了機器人 {self.robot.name}")
+                self.battle_state = "victory"
+                self.result_timer = SHIP_BATTLE_STATS["victory_display_time"]
+                return "victory"
+        self.player_bullets.remove_rows(row for row, _ in hits)
         
         # 機器人子彈打中玩家
-        for bullet in self.robot_bullets[:]:
-            if check_collision(bullet.x, bullet.y, bullet.width, bullet.height,
-                             self.player.x, self.player.y, self.player.width, self.player.height):
-                
-                # 玩家受傷
-                self.player.health -= bullet.damage
-                self.robot_bullets.remove(bullet)
-                
-                if self.player.health <= 0:
-                    self.player.health = 0
-                    print(f"機器人 {self.robot.name} 獲勝！玩家被擊敗")
-                    self.battle_state = "defeat"
-                    self.result_timer = SHIP_BATTLE_STATS["victory_display_time"]
-                    return "defeat"
+        hits = self.robot_bullets.hit_test([self.player])
+        damage = self.robot_bullets.damage
+        for index, (row, _) in enumerate(hits):
+            # 玩家受傷
+            self.player.health -= int(damage[row])
+            
+            if self.player.health <= 0:
+                self.robot_bullets.remove_rows(row for row, _ in hits[:index + 1])
+                self.player.health = 0
+                print(f"機器人 {self.robot.name} 獲勝！玩家被擊敗")
+                self.battle_state = "defeat"
+                self.result_timer = SHIP_BATTLE_STATS["victory_display_time"]
+                return "defeat"
+        self.robot_bullets.remove_rows(row for row, _ in hits)
         
         # 玩家與機器人直接碰撞（同時扣血）
         if check_collision(self.player.x, self.player.y, self.player.width, self.player.height,
@@ -398,13 +405,12 @@ class ShipBattleSystem:
         # 清空螢幕（深太空背景）
         screen.fill((5, 5, 20))
         
-        # 繪製簡單的星空背景
-        import random
-        random.seed(42)  # 固定種子確保星星位置一致
+        # 繪製簡單的星空背景（私有的亂數產生器和固定種子：星星位置每幀一致，也不會重設遊戲使用的亂數）
+        star_random = random.Random(42)
         for _ in range(80):
-            star_x = random.randint(0, SCREEN_WIDTH)
-            star_y = random.randint(0, SCREEN_HEIGHT)
-            star_brightness = random.randint(50, 200)
+            star_x = star_random.randint(0, SCREEN_WIDTH)
+            star_y = star_random.randint(0, SCREEN_HEIGHT)
+            star_brightness = star_random.randint(50, 200)
             star_color = (star_brightness, star_brightness, star_brightness)
             pygame.draw.circle(screen, star_color, (star_x, star_y), 1)
         
@@ -415,10 +421,46 @@ class ShipBattleSystem:
             self.robot.draw(screen)
         
         # 繪製子彈
-        for bullet in self.player_bullets:
-            bullet.draw(screen)
-        for bullet in self.robot_bullets:
-            bullet.draw(screen)
+        self.player_bullets.draw(screen)
+        self.robot_bullets.draw(screen)
+    
+    def get_entity_lists(self):
+        """
+        取得這個模式中的物件串列（記憶體報告使用）\n
+        \n
+        回傳:\n
+        dict: 串列名稱 → 物件串列\n
+        """
+        return {
+            "player_bullets": self.player_bullets,
+            "robot_bullets": self.robot_bullets
+        }
+    
+    def save_state(self, writer):
+        """
+        把對戰狀態寫入快照\n
+        \n
+        參數:\n
+        writer (SnapshotWriter): 快照寫入\n
+        """
+        writer.fields(self, ("battle_state", "prepare_timer", "result_timer", "player_name"))
+        writer.object(self.player)
+        writer.object(self.robot)
+        self.player_bullets.save_state(writer)
+        self.robot_bullets.save_state(writer)
+    
+    def load_state(self, reader):
+        """
+        從快照還原對戰狀態\n
+        \n
+        參數:\n
+        reader (SnapshotReader): 快照讀取\n
+        """
+        reader.fields(self)
+        self.player = reader.object()
+        self.robot = reader.object()
+        self.player_bullets.load_state(reader)
+        self.robot_bullets.load_state(reader)
     
     def reset(self):
         """
@@ -432,5 +474,6 @@ class ShipBattleSystem:
         self.player_bullets.clear()
         self.robot_bullets.clear()
         self.player_name = "Player"
+        self.excluded_ship = ""
         
         print("Ship Battle 系統已重置")
\ No newline at end of file
@@ -1,6 +1,7 @@
 ######################載入套件######################
 import pygame
 from config import *
+from .text_cache import render_text
 
 ######################商店系統類別######################
 class ShopSystem:
@@ -36,12 +37,12 @@ class ShopSystem:
         pygame.draw.rect(screen, WHITE, (100, 100, 600, 400), 3)
         
         # 商店標題
-        title_text = self.font.render("SPACE SHOP", True, WHITE)
+        title_text = render_text(self.font, "SPACE SHOP", True, WHITE)
         title_rect = title_text.get_rect(center=(400, 130))
         screen.blit(title_text, title_rect)
         
         # 星星數量顯示
-        stars_text = self.small_font.render(f"Stars: {stars}", True, YELLOW)
+        stars_text = render_text(self.small_font, f"Stars: {stars}", True, YELLOW)
         screen.blit(stars_text, (120, 150))
         
         # 商品項目
@@ -61,7 +62,7 @@ class ShopSystem:
         y_offset = 180
         for i, item in enumerate(items):
             # 商品名稱和價格
-            item_text = self.small_font.render(f"{item['key']}. {item['name']} - {item['price']} stars", True, WHITE)
+            item_text = render_text(self.small_font, f"{item['key']}. {item['name']} - {item['price']} stars", True, WHITE)
             
             # 檢查是否買得起
             if stars >= item['price']:
@@ -72,7 +73,7 @@ class ShopSystem:
             screen.blit(item_text, (120, y_offset + i * 30))
             
             # 價格顏色標示
-            price_text = self.small_font.render(f"{item['price']}", True, color)
+            price_text = render_text(self.small_font, f"{item['price']}", True, color)
             screen.blit(price_text, (350, y_offset + i * 30))
         
         # 操作說明
@@ -83,7 +84,7 @@ class ShopSystem:
         ]
         
         for i, instruction in enumerate(instructions):
-            instruction_text = self.small_font.render(instruction, True, WHITE)
+            instruction_text = render_text(self.small_font, instruction, True, WHITE)
             screen.blit(instruction_text, (120, 350 + i * 25))
     
     def handle_purchase(self, key, player, stars):
@@ -0,0 +1,764 @@
+######################載入套件######################
+import sys
+import struct
+import operator
+from array import array
+from config import *
+from entities import (Player, Robot, Enemy, Boss, Bullet, RobotBullet, PowerUp, Firework, FireworkParticle,
+                      HideSeekPlayer, Ghost, AllyShip, acquire_blank_bullet)
+from entities.boss_fight_boss import BossFightBoss, BossBullet
+from .visual_effects import Snowflake, Crow
+
+######################檔案格式######################
+# 快照是一段 bytes：
+#   檔頭（識別碼、版本、常數數量、欄位配置數量、常數表和欄位配置表的總長度）
+#   常數表：字串、tuple（顏色）、None 等不可變的值，每個只存一次，紀錄中以索引代替
+#   欄位配置表：(類別名稱, 欄位名稱, 欄位型別代碼)，同一類別、同一組型別的物件共用一個配置
+#   內容：一連串「配置索引 + struct 打包的欄位值」紀錄，物件紀錄另外帶物件編號（給引用使用）
+# 整數與浮點數分開存放（d / q），還原後的型別和快照前完全相同，接著模擬的結果也會相同
+# 同一局的快照常數表和欄位配置表通常完全相同，讀取時以表格內容為鍵保留解析結果，不必每次重新解碼
+# 欄位配置的 struct 和常數的編碼結果在模組層級快取，每次寫入快照只需要查表，不必重新編譯或編碼
+_HEADER = struct.Struct("<4sHIII")
+_MAGIC = b"GBSS"
+_VERSION = 3
+_TABLE_CACHE_SIZE = 16
+_CONSTANT_CACHE_SIZE = 4096
+_RNG_CACHE_SIZE = 64
+_RECORD = struct.Struct("<H")
+_OBJECT = struct.Struct("<HI")
+_COUNT = struct.Struct("<I")
+_REF = struct.Struct("<i")
+_NO_OBJECT = 0xFFFF
+
+# 欄位值的型別 → 型別代碼（c: 常數表索引，l: 串列，以 tuple 常數存放，還原成 list）
+_TYPE_KINDS = {float: "d", int: "q", bool: "?", str: "c", tuple: "c", type(None): "c", list: "l"}
+# 型別代碼 → struct 格式（r: 引用其他物件的物件編號）
+_KIND_FORMATS = {"d": "d", "q": "q", "?": "?", "c": "I", "l": "I", "r": "i"}
+
+######################物件類別設定######################
+class _ClassSpec:
+    """
+    可以寫入快照的物件類別\n
+    \n
+    沒有列在 exclude 和 children 中的欄位都會寫入快照，\n
+    欄位值必須是數字、布林、字串、tuple、None、串列或其他可快照物件（以引用存放）。\n
+    """
+
+    def __init__(self, cls, exclude=(), children=(), after_restore=None):
+        """
+        參數:\n
+        cls (type): 物件類別\n
+        exclude (tuple): 不寫入的欄位（例如由其他欄位推導的設定字典）\n
+        children (tuple): 存放子物件串列的欄位，子物件緊接在這個物件之後寫入\n
+        after_restore (callable): 還原欄位後呼叫，補回 exclude 的欄位\n
+        """
+        self.cls = cls
+        self.exclude = frozenset(exclude) | frozenset(children)
+        self.children = tuple(children)
+        self.after_restore = after_restore
+        self.uses_slots = cls.__dictoffset__ == 0
+        self.layouts = {}  # 物件 __dict__ 的欄位順序 → (寫入的欄位名稱, 取值函式)
+        # 上一個物件使用的欄位配置（同類別的物件幾乎都相同，比對欄位名稱和型別就能直接沿用）
+        self.last_names = None
+        self.last_types = None
+        self.last_layout = None
+
+        if self.uses_slots:
+            names = []
+            for base in reversed(cls.__mro__):
+                names.extend(name for name in base.__dict__.get("__slots__", ()) if name not in self.exclude)
+            self.slot_names = tuple(names)
+            self.slot_getter = _tuple_getter(operator.attrgetter, self.slot_names)
+
+    def names_and_values(self, obj):
+        """
+        取得物件要寫入的欄位名稱與值\n
+        \n
+        回傳:\n
+        tuple: (欄位名稱 tuple, 欄位值 tuple)\n
+        """
+        if self.uses_slots:
+            try:
+                return self.slot_names, self.slot_getter(obj)
+            except AttributeError:
+                # 有些欄位只在特定情況設定（例如盟友導向子彈的 dx、dy），只寫入已設定的欄位
+                names = tuple(name for name in self.slot_names if hasattr(obj, name))
+                return names, tuple(getattr(obj, name) for name in names)
+
+        fields = obj.__dict__
+        keys = tuple(fields)
+        layout = self.layouts.get(keys)
+        if layout is None:
+            kept = [index for index, name in enumerate(keys) if name not in self.exclude]
+            layout = self.layouts[keys] = (tuple(keys[index] for index in kept),
+                                           _tuple_getter(operator.itemgetter, kept) if len(kept) < len(keys) else None)
+        names, getter = layout
+        if getter is None:
+            return names, tuple(fields.values())
+        return names, getter(list(fields.values()))
+
+def _tuple_getter(getter_factory, keys):
+    """
+    建立一律回傳 tuple 的 attrgetter/itemgetter（只有一個欄位時 operator 會直接回傳值）\n
+    """
+    if not keys:
+        return lambda obj: ()
+    getter = getter_factory(*keys)
+    if len(keys) == 1:
+        return lambda obj: (getter(obj),)
+    return getter
+
+def _restore_boss_config(boss):
+    """
+    Boss 的設定字典由 Boss 編號重新取得（不寫入快照）\n
+    """
+    boss.boss_config = BOSS_FIGHT_BOSSES[boss.boss_index]
+
+_CLASS_SPECS = {spec.cls: spec for spec in (
+    _ClassSpec(Player),
+    _ClassSpec(Robot),
+    _ClassSpec(Enemy),
+    _ClassSpec(Boss),
+    _ClassSpec(Bullet),
+    _ClassSpec(RobotBullet),
+    _ClassSpec(BossBullet),
+    _ClassSpec(PowerUp),
+    _ClassSpec(Firework, children=("particles",)),
+    _ClassSpec(FireworkParticle),
+    _ClassSpec(HideSeekPlayer),
+    _ClassSpec(Ghost),
+    _ClassSpec(AllyShip),
+    _ClassSpec(BossFightBoss, exclude=("boss_config",), after_restore=_restore_boss_config),
+    _ClassSpec(Snowflake),
+    _ClassSpec(Crow),
+)}
+_CLASSES_BY_NAME = {cls.__name__: cls for cls in _CLASS_SPECS}
+
+######################欄位配置######################
+class _Layout:
+    """
+    一種紀錄的欄位配置（類別、欄位名稱、型別代碼）與對應的 struct\n
+    """
+
+    __slots__ = ("cls", "names", "kinds", "struct", "record_struct", "constants", "lists", "refs", "unset")
+
+    def __init__(self, cls, names, kinds):
+        self.cls = cls
+        self.names = names
+        self.kinds = kinds
+        formats = "".join(_KIND_FORMATS[kind] for kind in kinds)
+        self.struct = struct.Struct("<" + formats)
+        # 寫入時連同紀錄開頭（配置索引，物件紀錄另外帶物件編號）一次打包
+        self.record_struct = struct.Struct(("<HI" if cls is not None else "<H") + formats)
+        self.constants = [i for i, kind in enumerate(kinds) if kind == "c"]
+        self.lists = [i for i, kind in enumerate(kinds) if kind == "l"]
+        self.refs = [i for i, kind in enumerate(kinds) if kind == "r"]
+        # __slots__ 類別中這個配置沒有設定的欄位（從物件池取出的子彈可能還留著舊值，還原時刪除）
+        spec = _CLASS_SPECS.get(cls)
+        self.unset = tuple(name for name in spec.slot_names if name not in names) if spec and spec.uses_slots else ()
+
+_LAYOUT_CACHE = {}  # (類別, 欄位名稱, 欄位型別) → _Layout，所有快照共用（組合數量由程式碼中的類別決定，不會無限成長）
+
+def _compiled_layout(cls, names, types):
+    """
+    取得這組欄位型別的欄位配置（第一次出現時檢查型別並編譯 struct）\n
+    \n
+    參數:\n
+    cls (type): 物件類別，values() 和 fields() 寫入的紀錄為 None\n
+    names (tuple): 欄位名稱，values() 寫入的紀錄為 None\n
+    types (tuple): 欄位值的型別\n
+    \n
+    回傳:\n
+    _Layout: 欄位配置\n
+    """
+    key = (cls, names, types)
+    layout = _LAYOUT_CACHE.get(key)
+    if layout is None:
+        kinds = []
+        for position, value_type in enumerate(types):
+            kind = _TYPE_KINDS.get(value_type)
+            if kind is None:
+                if value_type not in _CLASS_SPECS:
+                    owner = cls.__name__ if cls is not None else "值"
+                    name = names[position] if names is not None else position
+                    raise TypeError(f"無法寫入快照: {owner}.{name} 的型別是 {value_type.__name__}")
+                kind = "r"
+            kinds.append(kind)
+        layout = _LAYOUT_CACHE[key] = _Layout(cls, names, "".join(kinds))
+    return layout
+
+######################常數編碼######################
+_CONSTANT_CACHE = {}  # 常數鍵（和 SnapshotWriter 的常數表相同）→ 編碼後的 bytes
+
+def _pack_constant(value, out):
+    """
+    把常數（None、布林、數字、字串、tuple）編碼後加到 out\n
+    """
+    if value is None:
+        out += b"n"
+    elif isinstance(value, bool):
+        out += b"b" + struct.pack("<?", value)
+    elif isinstance(value, int):
+        out += b"i" + struct.pack("<q", value)
+    elif isinstance(value, float):
+        out += b"f" + struct.pack("<d", value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out += b"s" + _COUNT.pack(len(data)) + data
+    elif isinstance(value, tuple):
+        out += b"t" + _COUNT.pack(len(value))
+        for item in value:
+            _pack_constant(item, out)
+    else:
+        raise TypeError(f"無法寫入快照的常數型別: {type(value).__name__}")
+
+def _unpack_constant(data, offset):
+    """
+    解碼一個常數\n
+    \n
+    回傳:\n
+    tuple: (常數, 下一個常數的位置)\n
+    """
+    tag = data[offset:offset + 1]
+    offset += 1
+    if tag == b"n":
+        return None, offset
+    if tag == b"b":
+        return struct.unpack_from("<?", data, offset)[0], offset + 1
+    if tag == b"i":
+        return struct.unpack_from("<q", data, offset)[0], offset + 8
+    if tag == b"f":
+        return struct.unpack_from("<d", data, offset)[0], offset + 8
+    if tag == b"s":
+        (length,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        return bytes(data[offset:offset + length]).decode("utf-8"), offset + length
+    if tag == b"t":
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        items = []
+        for _ in range(count):
+            item, offset = _unpack_constant(data, offset)
+            items.append(item)
+        return tuple(items), offset
+    raise ValueError(f"快照常數表損壞（未知的標記 {tag!r}）")
+
+######################快照寫入######################
+class SnapshotWriter:
+    """
+    快照寫入 - 把遊戲狀態打包成緊湊的二進位資料（不使用 pickle，不包含 pygame 物件）\n
+    \n
+    各模式的 save_state() 依固定順序呼叫 values()、fields()、object()、objects()、\n
+    ref()、blob()，對應的 load_state() 以相同順序呼叫 SnapshotReader 的同名方法。\n
+    \n
+    同一類別、同一組欄位型別的物件共用一個欄位配置和預先編譯的 struct（所有快照共用），\n
+    每個物件只需要一次取值和一次 struct.pack()（連同紀錄開頭）。\n
+    """
+
+    def __init__(self):
+        """
+        初始化快照寫入\n
+        """
+        self.parts = []
+        self.constants = {}       # 常數鍵 → 常數索引
+        self.constant_ids = {}    # id(常數物件) → 常數索引（物件存在 constant_objects 中，寫入期間 id 不會被重複使用）
+        self.constant_objects = []
+        self.constant_keys = []
+        self.constant_values = []
+        self.layout_indexes = {}  # _Layout → 這份快照中的配置索引
+        self.layout_list = []
+        self.object_ids = {}      # id(物件) → 物件編號
+        self.written = set()      # 已寫入的物件編號
+        self.referenced = {}      # 物件編號 → 被引用的物件（檢查是否都有寫入）
+
+    def _constant(self, value):
+        """
+        取得常數的索引（第一次出現時加入常數表）\n
+        """
+        value_type = type(value)
+        if value_type is str:
+            # 字串不會和其他型別的值相等，直接當鍵（最常見的常數，省下建立 tuple）
+            key = value
+        elif value_type is tuple:
+            key = (tuple, value, tuple(map(type, value)))
+        else:
+            key = (value_type, value)
+        index = self.constants.get(key)
+        if index is None:
+            index = self.constants[key] = len(self.constant_values)
+            self.constant_keys.append(key)
+            self.constant_values.append(value)
+        return index
+
+    def _object_index(self, obj):
+        """
+        取得物件編號（第一次出現時配置新編號）\n
+        """
+        index = self.object_ids.get(id(obj))
+        if index is None:
+            index = self.object_ids[id(obj)] = len(self.object_ids)
+        return index
+
+    def _ref_index(self, obj):
+        """
+        取得被引用物件的編號（None 為 -1）\n
+        """
+        if obj is None:
+            return -1
+        index = self._object_index(obj)
+        self.referenced[index] = obj
+        return index
+
+    def _layout_index(self, layout):
+        """
+        取得欄位配置在這份快照中的索引（第一次出現時加入欄位配置表）\n
+        """
+        index = self.layout_indexes.get(layout)
+        if index is None:
+            index = self.layout_indexes[layout] = len(self.layout_list)
+            self.layout_list.append(layout)
+        return index
+
+    def _encode(self, layout, values):
+        """
+        依欄位配置轉換欄位值（常數和串列換成常數索引，物件換成物件編號）\n
+        """
+        if layout.constants or layout.lists or layout.refs:
+            values = list(values)
+            constant = self._constant
+            known = self.constant_ids
+            for i in layout.constants:
+                # 同一個常數物件（設定中的顏色、名稱字串）通常被很多物件共用，先以 id 查表
+                value = values[i]
+                index = known.get(id(value))
+                if index is None:
+                    index = known[id(value)] = constant(value)
+                    self.constant_objects.append(value)
+                values[i] = index
+            for i in layout.lists:
+                values[i] = constant(tuple(values[i]))
+            for i in layout.refs:
+                values[i] = self._ref_index(values[i])
+        return values
+
+    def values(self, *values):
+        """
+        寫入一組數值（例如全域分數）\n
+        \n
+        參數:\n
+        *values: 數字、布林、字串、tuple 或 None\n
+        """
+        layout = _compiled_layout(None, None, tuple(map(type, values)))
+        self.parts.append(layout.record_struct.pack(self._layout_index(layout), *self._encode(layout, values)))
+
+    def fields(self, obj, names):
+        """
+        寫入物件的指定欄位（例如系統的狀態和計時器，讀取時依欄位名稱設回）\n
+        \n
+        參數:\n
+        obj (object): 物件\n
+        names (tuple): 欄位名稱\n
+        """
+        names = tuple(names)
+        values = tuple(getattr(obj, name) for name in names)
+        layout = _compiled_layout(None, names, tuple(map(type, values)))
+        self.parts.append(layout.record_struct.pack(self._layout_index(layout), *self._encode(layout, values)))
+
+    def object(self, obj):
+        """
+        寫入一個遊戲物件（None 也可以）\n
+        \n
+        參數:\n
+        obj (object): 可快照的遊戲物件\n
+        """
+        if obj is None:
+            self.parts.append(_OBJECT.pack(_NO_OBJECT, 0))
+            return
+
+        spec = _CLASS_SPECS.get(type(obj))
+        if spec is None:
+            raise TypeError(f"無法寫入快照: 不支援的物件類別 {type(obj).__name__}")
+        names, values = spec.names_and_values(obj)
+        types = tuple(map(type, values))
+        if names is spec.last_names and types == spec.last_types:
+            layout = spec.last_layout
+        else:
+            layout = _compiled_layout(spec.cls, names, types)
+            spec.last_names, spec.last_types, spec.last_layout = names, types, layout
+        index = self._object_index(obj)
+        self.written.add(index)
+        self.parts.append(layout.record_struct.pack(self._layout_index(layout), index, *self._encode(layout, values)))
+
+        for name in spec.children:
+            self.objects(getattr(obj, name))
+
+    def objects(self, items):
+        """
+        寫入一串遊戲物件（list 或 EntityList，已標記失效的物件會略過）\n
+        \n
+        參數:\n
+        items (iterable): 遊戲物件\n
+        """
+        items = list(items)
+        self.parts.append(_COUNT.pack(len(items)))
+        for obj in items:
+            self.object(obj)
+
+    def ref(self, obj):
+        """
+        寫入對某個物件的引用（物件本身必須在同一個快照中寫入）\n
+        \n
+        參數:\n
+        obj (object): 遊戲物件或 None\n
+        """
+        self.parts.append(_REF.pack(self._ref_index(obj)))
+
+    def refs(self, items):
+        """
+        寫入一串物件引用（例如躲貓貓的搜尋者名單）\n
+        \n
+        參數:\n
+        items (iterable): 遊戲物件\n
+        """
+        indexes = array("i", (self._ref_index(obj) for obj in items))
+        if sys.byteorder == "big":
+            indexes.byteswap()
+        self.parts.append(_COUNT.pack(len(indexes)))
+        self.parts.append(indexes.tobytes())
+
+    def blob(self, data):
+        """
+        寫入一段原始資料（例如子彈欄位陣列）\n
+        \n
+        參數:\n
+        data (bytes): 資料\n
+        """
+        self.parts.append(_COUNT.pack(len(data)))
+        self.parts.append(data)
+
+    def getvalue(self):
+        """
+        組合出完整的快照\n
+        \n
+        回傳:\n
+        bytes: 快照資料\n
+        """
+        missing = [obj for index, obj in self.referenced.items() if index not in self.written]
+        if missing:
+            raise ValueError(f"快照引用了沒有寫入的物件: {type(missing[0]).__name__}")
+
+        # 欄位配置用到的類別名稱、欄位名稱和型別代碼也放進常數表
+        layouts = [(self._constant(layout.cls.__name__ if layout.cls is not None else None),
+                    self._constant(layout.names), self._constant(layout.kinds)) for layout in self.layout_list]
+
+        table = bytearray()
+        for key, value in zip(self.constant_keys, self.constant_values):
+            encoded = _CONSTANT_CACHE.get(key)
+            if encoded is None:
+                encoded = bytearray()
+                _pack_constant(value, encoded)
+                if len(_CONSTANT_CACHE) >= _CONSTANT_CACHE_SIZE:
+                    _CONSTANT_CACHE.clear()
+                encoded = _CONSTANT_CACHE[key] = bytes(encoded)
+            table += encoded
+        for entry in layouts:
+            table += struct.pack("<III", *entry)
+        header = _HEADER.pack(_MAGIC, _VERSION, len(self.constant_values), len(layouts), len(table))
+        return header + bytes(table) + b"".join(self.parts)
+
+######################快照讀取######################
+_TABLE_CACHE = {}   # 常數表和欄位配置表的內容 → (常數串列, 欄位配置串列)，只會讀取、不會修改
+
+def _parse_tables(table, constant_count, layout_count):
+    """
+    解析常數表和欄位配置表\n
+    \n
+    參數:\n
+    table (bytes): 檔頭之後的常數表和欄位配置表\n
+    constant_count (int): 常數數量\n
+    layout_count (int): 欄位配置數量\n
+    \n
+    回傳:\n
+    tuple: (常數串列, 欄位配置串列)\n
+    """
+    offset = 0
+    constants = []
+    for _ in range(constant_count):
+        value, offset = _unpack_constant(table, offset)
+        constants.append(value)
+
+    layouts = []
+    for _ in range(layout_count):
+        class_name, names, kinds = struct.unpack_from("<III", table, offset)
+        offset += 12
+        class_name = constants[class_name]
+        cls = _CLASSES_BY_NAME[class_name] if class_name is not None else None
+        layouts.append(_Layout(cls, constants[names], constants[kinds]))
+    if offset != len(table):
+        raise ValueError("快照常數表損壞（長度不符）")
+    return constants, layouts
+
+class SnapshotReader:
+    """
+    快照讀取 - 依寫入順序讀出數值與遊戲物件\n
+    \n
+    物件直接以 __new__ 建立再填入欄位，不經過 __init__\n
+    （不會印出訊息，也不會抽取亂數）；子彈優先從物件池取用。\n
+    物件欄位中的引用在 finish() 時才接上，被引用的物件可以在後面才讀到。\n
+    """
+
+    def __init__(self, data):
+        """
+        解析檔頭、常數表和欄位配置表\n
+        \n
+        參數:\n
+        data (bytes): SnapshotWriter.getvalue() 的結果\n
+        """
+        self.data = data
+        magic, version, constant_count, layout_count, table_size = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError("不是遊戲快照資料")
+        if version != _VERSION:
+            raise ValueError(f"不支援的快照版本: {version}")
+
+        table = bytes(data[_HEADER.size:_HEADER.size + table_size])
+        tables = _TABLE_CACHE.get(table)
+        if tables is None:
+            tables = _parse_tables(table, constant_count, layout_count)
+            if len(_TABLE_CACHE) >= _TABLE_CACHE_SIZE:
+                _TABLE_CACHE.clear()
+            _TABLE_CACHE[table] = tables
+        self.constants, self.layouts = tables
+
+        self.offset = _HEADER.size + table_size
+        self.objects = {}   # 物件編號 → 還原的物件
+        self.fixups = []    # (物件, 欄位名稱, 物件編號)
+
+    def _unpack(self, layout):
+        """
+        讀出一筆紀錄的欄位值（常數和串列換回原本的值，引用保留物件編號）\n
+        """
+        values = layout.struct.unpack_from(self.data, self.offset)
+        self.offset += layout.struct.size
+        if layout.constants or layout.lists:
+            values = list(values)
+            constants = self.constants
+            for i in layout.constants:
+                values[i] = constants[values[i]]
+            for i in layout.lists:
+                values[i] = list(constants[values[i]])
+        return values
+
+    def _read_layout(self):
+        (index,) = _RECORD.unpack_from(self.data, self.offset)
+        self.offset += _RECORD.size
+        return self.layouts[index]
+
+    def values(self):
+        """
+        讀出 SnapshotWriter.values() 寫入的一組數值\n
+        \n
+        回傳:\n
+        list: 數值\n
+        """
+        return list(self._unpack(self._read_layout()))
+
+    def fields(self, obj):
+        """
+        讀出 SnapshotWriter.fields() 寫入的欄位並設回物件\n
+        \n
+        參數:\n
+        obj (object): 物件\n
+        """
+        layout = self._read_layout()
+        for name, value in zip(layout.names, self._unpack(layout)):
+            setattr(obj, name, value)
+
+    def object(self, pooled=True):
+        """
+        讀出一個遊戲物件\n
+        \n
+        參數:\n
+        pooled (bool): 子彈是否從物件池取用（不會放進場上的物件傳 False，例如子彈原型）\n
+        \n
+        回傳:\n
+        object: 還原的物件，寫入時為 None 則回傳 None\n
+        """
+        layout_index, index = _OBJECT.unpack_from(self.data, self.offset)
+        self.offset += _OBJECT.size
+        if layout_index == _NO_OBJECT:
+            return None
+
+        layout = self.layouts[layout_index]
+        cls = layout.cls
+        spec = _CLASS_SPECS[cls]
+        values = self._unpack(layout)
+
+        obj = acquire_blank_bullet(cls) if pooled else None
+        if obj is None:
+            obj = cls.__new__(cls)
+        if spec.uses_slots:
+            for name, value in zip(layout.names, values):
+                setattr(obj, name, value)
+            for name in layout.unset:
+                if hasattr(obj, name):
+                    delattr(obj, name)
+        else:
+            obj.__dict__.update(zip(layout.names, values))
+        for i in layout.refs:
+            self.fixups.append((obj, layout.names[i], values[i]))
+        self.objects[index] = obj
+
+        for name in spec.children:
+            setattr(obj, name, self.objects_list())
+        if spec.after_restore is not None:
+            spec.after_restore(obj)
+        return obj
+
+    def objects_list(self, pooled=True):
+        """
+        讀出 SnapshotWriter.objects() 寫入的一串物件\n
+        \n
+        參數:\n
+        pooled (bool): 子彈是否從物件池取用\n
+        \n
+        回傳:\n
+        list: 還原的物件\n
+        """
+        (count,) = _COUNT.unpack_from(self.data, self.offset)
+        self.offset += _COUNT.size
+        return [self.object(pooled) for _ in range(count)]
+
+    def _resolve(self, index):
+        if index < 0:
+            return None
+        obj = self.objects.get(index)
+        if obj is None:
+            raise ValueError(f"快照引用的物件 {index} 不存在")
+        return obj
+
+    def ref(self):
+        """
+        讀出一個物件引用（被引用的物件必須已經讀出）\n
+        \n
+        回傳:\n
+        object: 物件或 None\n
+        """
+        (index,) = _REF.unpack_from(self.data, self.offset)
+        self.offset += _REF.size
+        return self._resolve(index)
+
+    def refs(self):
+        """
+        讀出一串物件引用\n
+        \n
+        回傳:\n
+        list: 物件\n
+        """
+        (count,) = _COUNT.unpack_from(self.data, self.offset)
+        self.offset += _COUNT.size
+        indexes = array("i")
+        indexes.frombytes(self.data[self.offset:self.offset + count * indexes.itemsize])
+        self.offset += count * indexes.itemsize
+        if sys.byteorder == "big":
+            indexes.byteswap()
+        return [self._resolve(index) for index in indexes]
+
+    def blob(self):
+        """
+        讀出一段原始資料\n
+        \n
+        回傳:\n
+        bytes: 資料\n
+        """
+        (length,) = _COUNT.unpack_from(self.data, self.offset)
+        self.offset += _COUNT.size
+        data = self.data[self.offset:self.offset + length]
+        self.offset += length
+        return data
+
+    def finish(self):
+        """
+        接上物件欄位中的引用，並確認整份快照都已讀完\n
+        """
+        for obj, name, index in self.fixups:
+            setattr(obj, name, self._resolve(index))
+        self.fixups.clear()
+        if self.offset != len(self.data):
+            raise ValueError(f"快照還有 {len(self.data) - self.offset} bytes 沒有讀取，寫入和讀取的順序不一致")
+
+######################亂數串流######################
+_STATE_STRUCTS = {}     # 狀態長度 → 預先編譯的 struct（Mersenne Twister 固定是 625 個 32 位元整數）
+_RNG_STATE_CACHE = {}   # 打包後的內部狀態 → 狀態 tuple（沒有抽過亂數的串列在連續快照中完全相同）
+
+def _state_struct(length):
+    """
+    取得打包 length 個 32 位元無號整數的 struct\n
+    """
+    packer = _STATE_STRUCTS.get(length)
+    if packer is None:
+        packer = _STATE_STRUCTS[length] = struct.Struct(f"<{length}I")
+    return packer
+
+def _unpack_state(data):
+    """
+    把打包的內部狀態解回 tuple（相同內容直接使用上次的結果）\n
+    """
+    internal = _RNG_STATE_CACHE.get(data)
+    if internal is None:
+        internal = _state_struct(len(data) // 4).unpack(data)
+        if len(_RNG_STATE_CACHE) >= _RNG_CACHE_SIZE:
+            _RNG_STATE_CACHE.clear()
+        _RNG_STATE_CACHE[data] = internal
+    return internal
+
+def write_random_state(writer, rng):
+    """
+    寫入一個亂數產生器的內部狀態\n
+    \n
+    參數:\n
+    writer (SnapshotWriter): 快照寫入\n
+    rng (random.Random): 亂數產生器\n
+    """
+    version, internal, gauss_next = rng.getstate()
+    writer.values(version, gauss_next)
+    writer.blob(_state_struct(len(internal)).pack(*internal))
+
+def read_random_state(reader, rng):
+    """
+    讀出並套用 write_random_state() 寫入的亂數產生器狀態\n
+    \n
+    參數:\n
+    reader (SnapshotReader): 快照讀取\n
+    rng (random.Random): 要還原的亂數產生器\n
+    """
+    version, gauss_next = reader.values()
+    rng.setstate((version, _unpack_state(bytes(reader.blob())), gauss_next))
+
+def write_rng_state(writer):
+    """
+    寫入所有亂數串流的內部狀態（還原後抽出的亂數和快照時接下去的完全相同）\n
+    \n
+    所有串流共用一筆紀錄（名稱、版本、gauss 暫存值）和一段連續的狀態資料。\n
+    \n
+    參數:\n
+    writer (SnapshotWriter): 快照寫入\n
+    """
+    streams = tuple(RNG_SETTINGS["streams"])
+    states = [get_rng(name).getstate() for name in streams]
+    writer.values(streams, tuple(state[0] for state in states), tuple(state[2] for state in states))
+    writer.blob(b"".join(_state_struct(len(state[1])).pack(*state[1]) for state in states))
+
+def read_rng_state(reader):
+    """
+    讀出並套用所有亂數串流的內部狀態\n
+    \n
+    參數:\n
+    reader (SnapshotReader): 快照讀取\n
+    """
+    streams, versions, gauss_values = reader.values()
+    data = bytes(reader.blob())
+    size = len(data) // len(streams) if streams else 0
+    for index, name in enumerate(streams):
+        internal = _unpack_state(data[index * size:(index + 1) * size])
+        get_rng(name).setstate((versions[index], internal, gauss_values[index]))
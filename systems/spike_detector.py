@@ -0,0 +1,132 @@
+######################載入套件######################
+import os
+import json
+import time
+import statistics
+from config import *
+from .frame_profiler import frame_profiler
+
+######################幀時間突波偵測器######################
+class SpikeDetector:
+    """
+    幀時間突波偵測器 - 找出比平常慢很多的幀並把當時的狀況寫成檔案\n
+    \n
+    每幀結束後比較這一幀的耗時與最近幾百幀的中位數，\n
+    超過「中位數 × 倍數」（且超過最低門檻）就視為突波，\n
+    把突波幀和前幾幀的各階段耗時、各階段平常的中位數，\n
+    以及遊戲狀態（模式、物件數量）寫入有時間戳記的 JSON 檔。\n
+    \n
+    各階段耗時來自 frame_profiler，偵測器開啟時會一併開啟分析器。\n
+    """
+
+    def __init__(self, profiler=None):
+        """
+        初始化突波偵測器\n
+        \n
+        參數:\n
+        profiler (FrameProfiler): 幀時間分析器，None 表示使用全域分析器\n
+        """
+        self.profiler = profiler or frame_profiler
+        self.config = SPIKE_DETECTOR_SETTINGS
+        self.enabled = False
+        self.cooldown = 0
+        self.spike_count = 0
+        self.last_report_path = None
+        if self.config["enabled"]:
+            self.toggle()
+
+    def toggle(self):
+        """
+        開啟或關閉突波偵測\n
+        """
+        self.enabled = not self.enabled
+        self.profiler.set_active("spike_detector", self.enabled)
+        self.cooldown = 0
+        print(f"幀時間突波偵測{'開啟' if self.enabled else '關閉'}")
+
+    def check(self, game):
+        """
+        檢查剛結束的一幀是否為突波，是的話寫出報告\n
+        \n
+        參數:\n
+        game (GameController): 遊戲控制器（用來取得遊戲狀態和物件數量）\n
+        \n
+        回傳:\n
+        str: 報告檔路徑，沒有突波時回傳 None\n
+        """
+        if not self.enabled:
+            return None
+
+        config = self.config
+        profiler = self.profiler
+        if profiler.count <= config["warmup_frames"]:
+            return None
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return None
+
+        frame_times = profiler.recent_frame_times()
+        frame_ms = frame_times[-1]
+        # 快速排除：還沒超過最低門檻就不必計算中位數
+        if frame_ms <= config["min_spike_ms"]:
+            return None
+
+        median_ms = statistics.median(frame_times[:-1])
+        threshold_ms = max(median_ms * config["median_factor"], config["min_spike_ms"])
+        if frame_ms <= threshold_ms:
+            return None
+
+        self.cooldown = config["cooldown_frames"]
+        self.spike_count += 1
+        report = self.build_report(game, frame_ms, median_ms, threshold_ms)
+        self.last_report_path = self.write_report(report)
+        print(f"偵測到幀時間突波：{frame_ms:.1f} ms（中位數 {median_ms:.1f} ms），報告已寫入 {self.last_report_path}")
+        return self.last_report_path
+
+    def build_report(self, game, frame_ms, median_ms, threshold_ms):
+        """
+        整理突波報告內容\n
+        \n
+        參數:\n
+        game (GameController): 遊戲控制器\n
+        frame_ms (float): 突波幀耗時\n
+        median_ms (float): 最近幾幀的中位數\n
+        threshold_ms (float): 判定門檻\n
+        \n
+        回傳:\n
+        dict: 報告內容\n
+        """
+        profiler = self.profiler
+        # 各階段平常的耗時，和突波幀對照就能看出是哪個階段變慢
+        phase_medians = {name: round(value, 3) for name, value in profiler.medians(skip_latest=1).items()}
+
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "frame_ms": round(frame_ms, 3),
+            "median_ms": round(median_ms, 3),
+            "threshold_ms": round(threshold_ms, 3),
+            "game_state": game.get_debug_state(),
+            "entity_counts": {name: len(objects) for name, objects in game.get_entity_lists().items()},
+            "phase_medians_ms": phase_medians,
+            # 突波幀在最後，前面是它之前的幾幀
+            "frames": profiler.recent_frames(self.config["context_frames"] + 1)
+        }
+
+    def write_report(self, report):
+        """
+        把報告寫入有時間戳記的 JSON 檔\n
+        \n
+        參數:\n
+        report (dict): 報告內容\n
+        \n
+        回傳:\n
+        str: 報告檔路徑\n
+        """
+        report_dir = self.config["report_dir"]
+        os.makedirs(report_dir, exist_ok=True)
+        mode = report["game_state"]["game_state"]
+        filename = time.strftime(f"spike-{mode}-%Y%m%d-%H%M%S") + f"-{self.spike_count}.json"
+        path = os.path.join(report_dir, filename)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return path
@@ -0,0 +1,118 @@
+######################載入套件######################
+from collections import OrderedDict
+from config import *
+
+######################文字快取類別######################
+class TextSurfaceCache:
+    """
+    文字 Surface 快取 - 以 LRU 方式保存 font.render() 的結果\n
+    \n
+    以 (字體, 文字, 顏色, 反鋸齒) 為鍵，內容不變的文字只需要 render 一次，\n
+    之後每幀只花一次 blit。快取以位元組數為上限，超出時移除最久未使用的項目。\n
+    \n
+    注意：回傳的 Surface 是共用的，呼叫端不可以修改它（例如 set_alpha 或 fill）\n
+    """
+
+    def __init__(self, max_bytes):
+        """
+        初始化文字快取\n
+        \n
+        參數:\n
+        max_bytes (int): 快取中所有 Surface 像素資料的位元組上限\n
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # 鍵 → (Surface, 位元組數)
+        self.current_bytes = 0
+
+        # 統計資料
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, antialias, color):
+        """
+        取得文字的 Surface，參數順序與 font.render() 相同\n
+        \n
+        參數:\n
+        font (pygame.font.Font): 字體物件\n
+        text (str): 要顯示的文字\n
+        antialias (bool): 是否反鋸齒\n
+        color (tuple): 文字顏色\n
+        \n
+        回傳:\n
+        pygame.Surface: 文字 Surface（共用，請勿修改）\n
+        """
+        if not isinstance(color, tuple):
+            color = tuple(color)
+        key = (font, text, color, antialias)
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        size = surface.get_pitch() * surface.get_height()
+        self.entries[key] = (surface, size)
+        self.current_bytes += size
+
+        # 超出記憶體上限時移除最久未使用的文字（至少保留剛加入的這一筆）
+        while self.current_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, old_size) = self.entries.popitem(last=False)
+            self.current_bytes -= old_size
+            self.evictions += 1
+
+        return surface
+
+    def clear(self):
+        """
+        清空快取（統計資料保留）\n
+        """
+        self.entries.clear()
+        self.current_bytes = 0
+
+    def get_stats(self):
+        """
+        取得快取統計資料\n
+        \n
+        回傳:\n
+        dict: 包含 hits、misses、evictions、entries、bytes、max_bytes\n
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes
+        }
+
+######################共用快取######################
+# 全遊戲共用一份文字快取
+text_cache = TextSurfaceCache(TEXT_CACHE_SETTINGS["max_bytes"])
+
+def render_text(font, text, antialias, color):
+    """
+    透過共用快取繪製文字，參數順序與 font.render() 相同\n
+    \n
+    參數:\n
+    font (pygame.font.Font): 字體物件\n
+    text (str): 要顯示的文字\n
+    antialias (bool): 是否反鋸齒\n
+    color (tuple): 文字顏色\n
+    \n
+    回傳:\n
+    pygame.Surface: 文字 Surface（共用，請勿修改）\n
+    """
+    return text_cache.render(font, text, antialias, color)
+
+def get_text_cache_stats():
+    """
+    取得共用文字快取的統計資料\n
+    \n
+    回傳:\n
+    dict: 快取統計資料\n
+    """
+    return text_cache.get_stats()
@@ -1,6 +1,8 @@
 ######################載入套件######################
 import pygame
 from config import *
+from .text_cache import render_text
+from .glyph_atlas import draw_numeric_text
 
 ######################UI系統類別######################
 class UISystem:
@@ -51,57 +53,56 @@ class UISystem:
         pygame.draw.rect(screen, WHITE, (health_bar_x, health_bar_y, health_bar_width, health_bar_height), 2)
         
         # 生命值文字
-        health_text = self.small_font.render(f"Health: {player.health}/{player.max_health}", True, WHITE)
-        screen.blit(health_text, (health_bar_x, health_bar_y + health_bar_height + 5))
+        draw_numeric_text(screen, self.small_font, ("Health: ", player.health, "/", player.max_health), True, WHITE,
+                          topleft=(health_bar_x, health_bar_y + health_bar_height + 5))
         
         # 分數顯示
-        score_text = self.font.render(f"Score: {score}", True, WHITE)
-        screen.blit(score_text, (10, 60))
+        draw_numeric_text(screen, self.font, ("Score: ", score), True, WHITE, topleft=(10, 60))
         
         # 星星數量顯示
-        stars_text = self.font.render(f"Stars: {stars}", True, YELLOW)
-        screen.blit(stars_text, (10, 100))
+        draw_numeric_text(screen, self.font, ("Stars: ", stars), True, YELLOW, topleft=(10, 100))
         
         # 當前武器顯示
-        weapon_text = self.small_font.render(f"Weapon: {player.current_weapon.title()}", True, WHITE)
+        weapon_text = render_text(self.small_font, f"Weapon: {player.current_weapon.title()}", True, WHITE)
         screen.blit(weapon_text, (10, 140))
         
         # 當前太空船顯示
-        ship_text = self.small_font.render(f"Ship: {player.spaceship_type.title()}", True, WHITE)
+        ship_text = render_text(self.small_font, f"Ship: {player.spaceship_type.title()}", True, WHITE)
         screen.blit(ship_text, (10, 160))
         
         # 特殊攻擊冷卻顯示
         if player.special_attack_cooldown > 0:
-            special_text = self.small_font.render(f"Special Attack: {player.special_attack_cooldown // 60 + 1}s", True, RED)
+            draw_numeric_text(screen, self.small_font, ("Special Attack: ", player.special_attack_cooldown // 60 + 1, "s"), True, RED,
+                              topleft=(10, 180))
         else:
-            special_text = self.small_font.render("Special Attack: Ready!", True, GREEN)
-        screen.blit(special_text, (10, 180))
+            special_text = render_text(self.small_font, "Special Attack: Ready!", True, GREEN)
+            screen.blit(special_text, (10, 180))
         
         # 藥水庫存顯示
         potions_y = 200
         
         # 回血藥水
-        health_potion_text = self.small_font.render(f"Health Potions: {player.health_potions} (Press 1)", True, GREEN)
-        screen.blit(health_potion_text, (10, potions_y))
+        draw_numeric_text(screen, self.small_font, ("Health Potions: ", player.health_potions, " (Press 1)"), True, GREEN,
+                          topleft=(10, potions_y))
         
         # 加速藥水
-        speed_potion_text = self.small_font.render(f"Speed Potions: {player.speed_potions} (Press 2)", True, BLUE)
-        screen.blit(speed_potion_text, (10, potions_y + 20))
+        draw_numeric_text(screen, self.small_font, ("Speed Potions: ", player.speed_potions, " (Press 2)"), True, BLUE,
+                          topleft=(10, potions_y + 20))
         
         # 防護藥水
-        protect_potion_text = self.small_font.render(f"Protect Potions: {player.protect_potions} (Press 3)", True, PURPLE)
-        screen.blit(protect_potion_text, (10, potions_y + 40))
+        draw_numeric_text(screen, self.small_font, ("Protect Potions: ", player.protect_potions, " (Press 3)"), True, PURPLE,
+                          topleft=(10, potions_y + 40))
         
         # 藥水效果狀態顯示
         effects_y = potions_y + 60
         if player.speed_boost_timer > 0:
-            speed_effect_text = self.small_font.render(f"Speed Boost: {player.speed_boost_timer // 60 + 1}s", True, CYAN)
-            screen.blit(speed_effect_text, (10, effects_y))
+            draw_numeric_text(screen, self.small_font, ("Speed Boost: ", player.speed_boost_timer // 60 + 1, "s"), True, CYAN,
+                              topleft=(10, effects_y))
             effects_y += 20
         
         if player.protect_boost_timer > 0:
-            protect_effect_text = self.small_font.render(f"Protection: {player.protect_boost_timer // 60 + 1}s", True, YELLOW)
-            screen.blit(protect_effect_text, (10, effects_y))
+            draw_numeric_text(screen, self.small_font, ("Protection: ", player.protect_boost_timer // 60 + 1, "s"), True, YELLOW,
+                              topleft=(10, effects_y))
         
         # 操作說明（調整位置以避免與藥水顯示重疊）
         controls_y = SCREEN_HEIGHT - 140
@@ -116,17 +117,17 @@ class UISystem:
         ]
         
         for i, control in enumerate(controls):
-            control_text = self.small_font.render(control, True, WHITE)
+            control_text = render_text(self.small_font, control, True, WHITE)
             screen.blit(control_text, (10, controls_y + i * 20))
         
         # 解鎖商店提示
         if stars >= SHOP_UNLOCK_STARS:
-            unlock_text = self.small_font.render("Press 'S' to open Shop!", True, GREEN)
+            unlock_text = render_text(self.small_font, "Press 'S' to open Shop!", True, GREEN)
             screen.blit(unlock_text, (SCREEN_WIDTH - 200, 10))
         else:
             need_stars = SHOP_UNLOCK_STARS - stars
-            unlock_text = self.small_font.render(f"Need {need_stars} stars for Shop", True, WHITE)
-            screen.blit(unlock_text, (SCREEN_WIDTH - 200, 10))
+            draw_numeric_text(screen, self.small_font, ("Need ", need_stars, " stars for Shop"), True, WHITE,
+                              topleft=(SCREEN_WIDTH - 200, 10))
     
     def draw_victory_message(self, screen, victory_timer):
         """
@@ -292,13 +293,11 @@ class UISystem:
         pygame.draw.rect(screen, WHITE, (x, y, bar_width, bar_height), 2)
         
         # 血量數值
-        health_text = self.small_font.render(f"{health}/{max_health}", True, WHITE)
-        text_rect = health_text.get_rect(center=(x + bar_width // 2, y + bar_height // 2))
-        screen.blit(health_text, text_rect)
+        draw_numeric_text(screen, self.small_font, (health, "/", max_health), True, WHITE,
+                          center=(x + bar_width // 2, y + bar_height // 2))
         
         # 血瓶數量
-        potion_text = self.small_font.render(f"血瓶: {potions}", True, CYAN)
-        screen.blit(potion_text, (x, y + bar_height + 5))
+        draw_numeric_text(screen, self.small_font, ("血瓶: ", potions), True, CYAN, topleft=(x, y + bar_height + 5))
     
     def _draw_ship_battle_controls(self, screen):
         """
@@ -1,6 +1,5 @@
 ######################載入套件######################
 import pygame
-import random
 import math
 from config import *
 
@@ -22,6 +21,9 @@ class Snowflake:
     drift_speed (float): 水平漂移速度\n
     """
     
+    # 雪花是大量生成的粒子，不需要每片都帶一個 __dict__
+    __slots__ = ("x", "y", "size", "fall_speed", "drift_speed", "alpha", "rotation", "rotation_speed")
+    
     def __init__(self, x=None, y=None):
         """
         初始化雪花\n
@@ -30,27 +32,29 @@ class Snowflake:
         x (int): 起始 x 座標，None 時隨機生成\n
         y (int): 起始 y 座標，None 時隨機生成\n
         """
+        rng = get_rng("visuals")  # 視覺效果使用獨立的亂數串流，不影響遊戲結果
+        
         # 位置設定
         if x is None:
-            self.x = random.randint(0, SCREEN_WIDTH)
+            self.x = rng.randint(0, SCREEN_WIDTH)
         else:
             self.x = float(x)
         
         if y is None:
-            self.y = random.randint(-50, 0)  # 從螢幕上方開始落下
+            self.y = rng.randint(-50, 0)  # 從螢幕上方開始落下
         else:
             self.y = float(y)
         
         # 雪花屬性
         snowflake_config = SHIP_BATTLE_EFFECTS["snowflake"]
-        self.size = random.randint(snowflake_config["size_min"], snowflake_config["size_max"])
-        self.fall_speed = random.uniform(1, snowflake_config["fall_speed"])
-        self.drift_speed = random.uniform(-0.5, 0.5)  # 左右漂移
+        self.size = rng.randint(snowflake_config["size_min"], snowflake_config["size_max"])
+        self.fall_speed = rng.uniform(1, snowflake_config["fall_speed"])
+        self.drift_speed = rng.uniform(-0.5, 0.5)  # 左右漂移
         
         # 視覺效果
-        self.alpha = random.randint(150, 255)  # 透明度
-        self.rotation = random.uniform(0, 360)  # 旋轉角度
-        self.rotation_speed = random.uniform(-2, 2)  # 旋轉速度
+        self.alpha = rng.randint(150, 255)  # 透明度
+        self.rotation = rng.uniform(0, 360)  # 旋轉角度
+        self.rotation_speed = rng.uniform(-2, 2)  # 旋轉速度
     
     def update(self):
         """
@@ -142,6 +146,8 @@ class Crow:
     wing_flap (float): 翅膀拍動狀態\n
     """
     
+    __slots__ = ("x", "y", "width", "height", "fly_speed", "wing_flap", "wing_flap_speed", "vertical_offset")
+    
     def __init__(self, x=None, y=None):
         """
         初始化烏鴉\n
@@ -150,6 +156,8 @@ class Crow:
         x (int): 起始 x 座標，None 時從左側開始\n
         y (int): 起始 y 座標，None 時隨機高度\n
         """
+        rng = get_rng("visuals")
+        
         # 位置設定
         if x is None:
             self.x = -50  # 從螢幕左側開始
@@ -157,7 +165,7 @@ class Crow:
             self.x = float(x)
         
         if y is None:
-            self.y = random.randint(50, SCREEN_HEIGHT // 2)  # 在螢幕上半部飛行
+            self.y = rng.randint(50, SCREEN_HEIGHT // 2)  # 在螢幕上半部飛行
         else:
             self.y = float(y)
         
@@ -165,12 +173,12 @@ class Crow:
         crow_config = SHIP_BATTLE_EFFECTS["crow"]
         self.width = crow_config["width"]
         self.height = crow_config["height"]
-        self.fly_speed = random.uniform(crow_config["fly_speed"] * 0.8, crow_config["fly_speed"] * 1.2)
+        self.fly_speed = rng.uniform(crow_config["fly_speed"] * 0.8, crow_config["fly_speed"] * 1.2)
         
         # 飛行效果
         self.wing_flap = 0  # 翅膀拍動週期
-        self.wing_flap_speed = random.uniform(0.2, 0.4)
-        self.vertical_offset = random.uniform(-1, 1)  # 垂直移動偏移
+        self.wing_flap_speed = rng.uniform(0.2, 0.4)
+        self.vertical_offset = rng.uniform(-1, 1)  # 垂直移動偏移
     
     def update(self):
         """
@@ -295,7 +303,7 @@ class VisualEffectsSystem:
         crow_count = SHIP_BATTLE_EFFECTS["crow"]["count"]
         for i in range(crow_count):
             delay_x = -50 - (i * 40)  # 每隻烏鴉間隔40像素
-            crow_y = random.randint(80, SCREEN_HEIGHT // 2)
+            crow_y = get_rng("visuals").randint(80, SCREEN_HEIGHT // 2)
             crow = Crow(delay_x, crow_y)
             self.crows.append(crow)
     
@@ -369,6 +377,40 @@ class VisualEffectsSystem:
         """
         return self.effect_type is not None and (self.snowflakes or self.crows)
     
+    def get_entity_lists(self):
+        """
+        取得視覺效果的粒子串列（記憶體報告使用）\n
+        \n
+        回傳:\n
+        dict: 串列名稱 → 物件串列\n
+        """
+        return {
+            "snowflakes": self.snowflakes,
+            "crows": self.crows
+        }
+    
+    def save_state(self, writer):
+        """
+        把視覺效果狀態寫入快照\n
+        \n
+        參數:\n
+        writer (SnapshotWriter): 快照寫入\n
+        """
+        writer.fields(self, ("effect_type", "effect_timer"))
+        writer.objects(self.snowflakes)
+        writer.objects(self.crows)
+    
+    def load_state(self, reader):
+        """
+        從快照還原視覺效果狀態\n
+        \n
+        參數:\n
+        reader (SnapshotReader): 快照讀取\n
+        """
+        reader.fields(self)
+        self.snowflakes = reader.objects_list()
+        self.crows = reader.objects_list()
+    
     def stop_effects(self):
         """
         停止所有效果\n
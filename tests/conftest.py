@@ -0,0 +1,10 @@
+######################測試設定######################
+import os
+import sys
+
+# 測試在沒有螢幕和音效卡的機器上執行，必須在載入 pygame 之前指定 SDL 驅動
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 遊戲模組以專案根目錄為載入路徑（與 main.py、headless.py 相同）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
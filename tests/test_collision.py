@@ -0,0 +1,123 @@
+######################載入套件######################
+import random
+
+import pytest
+
+from config import SPATIAL_HASH_SETTINGS
+from entities import ProjectileStore
+from systems import SpatialHash
+
+######################輔助類別######################
+class Box:
+    """
+    測試用的矩形物件（只有 SpatialHash 需要的 x、y、width、height）\n
+    """
+
+    def __init__(self, name, x, y, width=30, height=25):
+        self.name = name
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    def __repr__(self):
+        return self.name
+
+def _grid(boxes, layer="enemies", cell_size=64):
+    grid = SpatialHash(cell_size)
+    grid.rebuild(layer, boxes)
+    return grid
+
+######################SpatialHash######################
+def test_query_rect_keeps_insertion_order():
+    # 後放入的物件在前面的格子、跨越多個格子的物件只出現一次，結果仍依插入順序
+    boxes = [Box("late", 200, 10), Box("wide", 0, 0, 300, 40), Box("first", 10, 10), Box("big", 5, 5, 140, 140)]
+    grid = _grid(boxes)
+    assert grid.query_rect(0, 0, 400, 60, "enemies") == boxes
+    assert grid.query_rect(15, 15, 4, 4, "enemies") == [boxes[1], boxes[2], boxes[3]]
+    assert grid.query_rect(500, 500, 10, 10, "enemies") == []
+    assert grid.query_rect(0, 0, 10, 10, "missing") == []
+
+def test_query_rect_edges_do_not_overlap():
+    # 只碰到邊不算重疊（和 check_collision 相同）
+    grid = _grid([Box("box", 64, 64, 10, 10)])
+    assert grid.query_rect(54, 64, 10, 10, "enemies") == []
+    assert grid.query_rect(74, 64, 10, 10, "enemies") == []
+    assert [box.name for box in grid.query_rect(55, 64, 10, 10, "enemies")] == ["box"]
+
+def test_remove_and_reinsert():
+    first, second = Box("first", 10, 10), Box("second", 20, 10)
+    grid = _grid([first, second])
+    grid.remove(first, "enemies")
+    assert grid.query_rect(0, 0, 100, 100, "enemies") == [second]
+
+    # 重新放入的物件排在最後；移動後舊位置不再查得到
+    grid.insert(first, "enemies", 300, 300, 30, 25)
+    assert grid.query_rect(0, 0, 100, 100, "enemies") == [second]
+    assert grid.query_rect(0, 0, 400, 400, "enemies") == [second, first]
+
+    grid.clear("enemies")
+    assert grid.query_rect(0, 0, 400, 400, "enemies") == []
+
+def test_candidate_pairs_between_layers():
+    bullets = [Box("b0", 12, 12, 5, 10), Box("b1", 500, 500, 5, 10), Box("b2", 38, 20, 5, 10)]
+    enemies = [Box("e0", 10, 10), Box("e1", 35, 15)]
+    grid = _grid(enemies)
+    grid.rebuild("bullets", bullets)
+    assert grid.candidate_pairs("bullets", "enemies") == [(bullets[0], enemies[0]), (bullets[2], enemies[0]),
+                                                         (bullets[2], enemies[1])]
+    grid.remove(enemies[0], "enemies")
+    assert grid.candidate_pairs("bullets", "enemies") == [(bullets[2], enemies[1])]
+    assert grid.candidate_pairs("bullets", "missing") == []
+
+def test_query_radius():
+    boxes = [Box("near", 100, 100, 10, 10), Box("corner", 125, 125, 10, 10), Box("far", 300, 300)]
+    grid = _grid(boxes)
+    # 圓心到 corner 最近的角落距離約 21.2，到 near 的邊是 5
+    assert grid.query_radius(115, 115, 15, "enemies") == [boxes[0], boxes[1]]
+    assert grid.query_radius(115, 105, 6, "enemies") == [boxes[0]]
+
+@pytest.mark.parametrize("batch_min_rects", [0, 10 ** 9])
+@pytest.mark.parametrize("seed", range(5))
+def test_query_rects_matches_query_rect(seed, batch_min_rects, monkeypatch):
+    # 整批計算（門檻 0）和逐一查詢（門檻極大）結果都要和 query_rect 相同
+    monkeypatch.setitem(SPATIAL_HASH_SETTINGS, "batch_min_rects", batch_min_rects)
+    rng = random.Random(seed)
+    boxes = [Box(f"e{i}", rng.randint(-40, 780), rng.randint(-40, 400), rng.randint(10, 150), rng.randint(10, 90))
+             for i in range(40)]
+    grid = _grid(boxes)
+    for box in boxes[::7]:
+        grid.remove(box, "enemies")
+
+    count = 300
+    xs = [rng.uniform(-100, 900) for _ in range(count)]
+    ys = [rng.uniform(-100, 700) for _ in range(count)]
+    widths = [rng.choice((4, 5, 10, 70, 140)) for _ in range(count)]
+    heights = [rng.choice((8, 10, 20, 130)) for _ in range(count)]
+    expected = []
+    for index, rect in enumerate(zip(xs, ys, widths, heights)):
+        found = grid.query_rect(*rect, "enemies")
+        if found:
+            expected.append((index, found))
+    assert expected
+    assert grid.query_rects(xs, ys, widths, heights, "enemies") == expected
+    assert grid.query_rects([], [], [], [], "enemies") == []
+
+######################ProjectileStore######################
+def test_store_query_grid_matches_brute_force():
+    rng = random.Random(7)
+    store = ProjectileStore(ProjectileStore.TEAM_PLAYER, cull_margin=None)
+    for _ in range(500):
+        store.add(rng.uniform(0, 800), rng.uniform(0, 600), 0, -8, 5, 10, 10, 0, ProjectileStore.TEAM_PLAYER)
+    enemies = [Box(f"e{i}", rng.randint(0, 770), rng.randint(0, 300)) for i in range(25)]
+    grid = _grid(enemies)
+
+    expected = []
+    for row in range(store.count):
+        x, y, w, h = float(store.x[row]), float(store.y[row]), int(store.w[row]), int(store.h[row])
+        found = [enemy for enemy in enemies
+                 if x < enemy.x + enemy.width and x + w > enemy.x and y < enemy.y + enemy.height and y + h > enemy.y]
+        if found:
+            expected.append((row, found))
+    assert expected
+    assert store.query_grid(grid, "enemies") == expected
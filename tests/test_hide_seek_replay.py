@@ -0,0 +1,95 @@
+######################載入套件######################
+import random
+import struct
+
+import pytest
+
+from config import *
+from headless import HeadlessRunner, RandomInput
+from systems import HideSeekReplayWriter, HideSeekReplayFile
+from systems.hide_seek_replay import PLAYER_RECORD_SIZE, pack_player_into, unpack_player
+
+# 約 1600 次更新會經過大廳、傳送、身分顯示、遊戲中，並且出現幽靈（種子 2 還會進入結束畫面）
+TICKS = 1600
+SEEKS = 60
+
+######################輔助函式######################
+def _expected_state(system):
+    """
+    直接從躲貓貓系統取出這一幀應該讀回的狀態（浮點數經過和重播檔相同的 float32 轉換）\n
+    """
+    buffer = bytearray(PLAYER_RECORD_SIZE)
+    players = []
+    for player in system.players:
+        pack_player_into(buffer, 0, player)
+        players.append(unpack_player(buffer, 0))
+    index = {player.player_id: i for i, player in enumerate(system.players)}
+    ghosts = [struct.unpack("<Hff", struct.pack("<Hff", index[ghost.player_id], ghost.x, ghost.y))
+              for ghost in system.ghosts]
+    return {"phase": system.game_state, "phase_timer": system.phase_timer, "game_timer": system.game_timer,
+            "game_over": bool(system.game_over), "game_over_timer": max(system.game_over_timer, 0),
+            "victory_message": system.victory_message, "players": players, "ghosts": ghosts}
+
+def _record_match(path, seed):
+    """
+    模擬一局躲貓貓並寫入重播檔，同時保存每一幀的預期狀態\n
+    \n
+    回傳:\n
+    list: 每一幀的預期狀態\n
+    """
+    runner = HeadlessRunner("hide", seed=seed)
+    game = runner.game
+    game.input_session.hide_seek_replay = HideSeekReplayWriter(str(path), game.hide_seek_system, game.match_seed)
+    keys = RandomInput(HEADLESS_SETTINGS["mode_keys"]["hide"], seed=seed)
+    expected = []
+    for tick in range(TICKS):
+        system = game.hide_seek_system
+        runner.step(keys.keys_for(tick))
+        expected.append(_expected_state(system))
+        if not runner.is_running():
+            break
+    game.input_session.stop()
+    return expected
+
+def _assert_frame(replay, frame, expected):
+    state = replay.state_at(frame)
+    assert state["tick"] == frame
+    for name, value in expected.items():
+        assert state[name] == value, f"第 {frame} 幀的 {name} 不同"
+
+######################測試######################
+@pytest.mark.parametrize("seed", [1, 2])
+def test_random_seeks_match_recorded_states(tmp_path, seed):
+    path = tmp_path / "match.gbhs"
+    expected = _record_match(path, seed)
+
+    replay = HideSeekReplayFile(str(path))
+    try:
+        assert replay.frame_count == len(expected)
+        # 前後任意跳轉（包含第一幀、最後一幀和關鍵幀前後），每次都要得到錄製時的狀態
+        rng = random.Random(seed)
+        interval = replay.keyframe_interval
+        frames = [0, len(expected) - 1, interval - 1, interval, interval + 1]
+        frames += [rng.randrange(len(expected)) for _ in range(SEEKS)]
+        for frame in frames:
+            if 0 <= frame < len(expected):
+                _assert_frame(replay, frame, expected[frame])
+    finally:
+        replay.close()
+
+def test_file_without_index_is_scanned(tmp_path):
+    path = tmp_path / "crashed.gbhs"
+    expected = _record_match(path, 3)
+
+    # 模擬錄製中當機：去掉檔尾的位置索引，開啟時必須循序掃描出相同的幀位置
+    data = path.read_bytes()
+    index_size = len(expected) * 8 + struct.calcsize("<QI4s")
+    path.write_bytes(data[:-index_size])
+
+    replay = HideSeekReplayFile(str(path))
+    try:
+        assert replay.frame_count == len(expected)
+        for frame in random.Random(3).sample(range(len(expected)), 30):
+            _assert_frame(replay, frame, expected[frame])
+    finally:
+        replay.close()
@@ -0,0 +1,47 @@
+######################載入套件######################
+import pytest
+
+from config import *
+from headless import HeadlessRunner, RandomInput, MODE_STATES, mode_for_state
+from systems import InputRecorder, InputReplay
+
+MODES = ("classic", "ship", "hide", "boss")
+TICKS = 400          # 錄製的更新次數（這段時間內各模式都還在對局中）
+PLAYER_NAME = "Tester"
+
+######################輔助函式######################
+def _record(path, mode, seed):
+    """
+    用 RandomInput 模擬一局並錄製輸入\n
+    \n
+    回傳:\n
+    tuple: (錄製的更新次數, 最後的快照)\n
+    """
+    keys = RandomInput(HEADLESS_SETTINGS["mode_keys"][mode], seed=seed)
+    inputs = [keys.keys_for(tick) for tick in range(TICKS)]
+    runner = HeadlessRunner(mode, seed=seed, player_name=PLAYER_NAME, last_ship="")
+    game = runner.game
+    recorder = InputRecorder(str(path), MODE_STATES[mode][0], game.match_seed, PLAYER_NAME, last_ship="")
+    for tick_keys in inputs:
+        recorder.record(tick_keys)
+        runner.step(tick_keys)
+        if not runner.is_running():
+            break
+    recorder.close()
+    return recorder.ticks, game.snapshot()
+
+######################測試######################
+@pytest.mark.parametrize("mode", MODES)
+def test_replay_reproduces_recorded_match(mode, tmp_path):
+    path = tmp_path / f"{mode}.gbr"
+    ticks, expected = _record(path, mode, seed=5)
+    assert ticks == TICKS
+
+    # 錄製的模擬器先取得快照再建立重播模擬器（對局亂數串流是整個程式共用的）
+    replay = InputReplay.load(str(path))
+    assert (replay.ticks, replay.seed, replay.player_name) == (TICKS, 5, PLAYER_NAME)
+    runner = HeadlessRunner(mode_for_state(replay.game_state), seed=replay.seed,
+                            player_name=replay.player_name, last_ship=replay.last_ship)
+    result = runner.run(replay.ticks, replay)
+    assert result["ticks"] == TICKS
+    assert runner.game.snapshot() == expected
@@ -0,0 +1,74 @@
+######################載入套件######################
+import pytest
+
+from config import *
+from headless import HeadlessRunner, RandomInput
+
+MODES = ("classic", "ship", "hide", "boss")
+START = 150       # 建立快照前先模擬的更新次數
+CONTINUE = 300    # 還原後接著比對的更新次數
+
+######################輔助函式######################
+def _inputs(mode, seed, ticks):
+    """
+    預先產生每一次更新的按鍵（RandomInput 依呼叫順序抽亂數，不能從中間重新開始）\n
+    """
+    keys = RandomInput(HEADLESS_SETTINGS["mode_keys"][mode], seed=seed)
+    return [keys.keys_for(tick) for tick in range(ticks)]
+
+def _continue(runner, inputs, start):
+    """
+    從第 start 次更新接著模擬，記錄每一次更新後的快照\n
+    \n
+    回傳:\n
+    list: 每一次更新後的快照（這一局提前結束時較短）\n
+    """
+    runner.ticks = start
+    trace = []
+    for tick in range(start, start + CONTINUE):
+        runner.step(inputs[tick])
+        if not runner.is_running():
+            break
+        trace.append(runner.game.snapshot())
+    return trace
+
+######################測試######################
+@pytest.mark.parametrize("mode", MODES)
+def test_restore_continues_tick_identical(mode):
+    seed = 1
+    inputs = _inputs(mode, seed, START + CONTINUE)
+    runner = HeadlessRunner(mode, seed=seed)
+    for tick in range(START):
+        runner.step(inputs[tick])
+    assert runner.is_running()
+    snapshot = runner.game.snapshot()
+    expected = _continue(runner, inputs, START)
+    assert len(expected) > CONTINUE // 2
+
+    # 還原到同一個模擬器（之後已經多跑了幾百次更新），以及另一個種子的新模擬器
+    for target in (runner, HeadlessRunner(mode, seed=seed + 100)):
+        target.game.restore(snapshot)
+        assert target.game.snapshot() == snapshot
+        trace = _continue(target, inputs, START)
+        assert len(trace) == len(expected)
+        for offset, (actual, wanted) in enumerate(zip(trace, expected)):
+            assert actual == wanted, f"{mode} 還原後第 {START + offset + 1} 次更新的狀態不同"
+
+@pytest.mark.parametrize("mode, seed, ticks", [("classic", 1, 400), ("ship", 1, 400), ("boss", 1, 400),
+                                               ("hide", 2, 1500)])
+def test_rendering_does_not_change_snapshot(mode, seed, ticks):
+    # 同一個種子和輸入，有沒有繪製畫面，快照的每個 byte 都要相同（躲貓貓種子 2 會進入結束畫面）
+    inputs = _inputs(mode, seed, ticks)
+    snapshots = []
+    for render in (False, True):
+        runner = HeadlessRunner(mode, seed=seed, render=render)
+        taken = []
+        for tick in range(ticks):
+            runner.step(inputs[tick])
+            if not runner.is_running():
+                break
+            if tick % 50 == 49:
+                taken.append(runner.game.snapshot())
+        snapshots.append(taken)
+    assert snapshots[0]
+    assert snapshots[0] == snapshots[1]